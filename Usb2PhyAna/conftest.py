@@ -1,5 +1,5 @@
 import pytest
-from usb2phyana.tests.sim_test_mode import SimTestMode
+from usb2phyana.tests.sim_test_mode import SimTestMode, set_default_pdk
 
 # Create a lookup from string-value to enum variant
 modes = {m.value: m for m in SimTestMode}
@@ -21,3 +21,9 @@ def simtestmode(request):
     if parser_option not in modes:
         raise RuntimeError(f"Invalid SimTestMode: {parser_option}")
     return modes[parser_option]
+
+
+@pytest.fixture(autouse=True)
+def default_pdk():
+    """Set the default PDK before each test runs. Deferred from import, so that collection need not load it."""
+    set_default_pdk()
@@ -0,0 +1,5 @@
+"""
+# SerDes Generics
+
+Generic, re-usable SerDes circuits: CML buffers, dividers, oscillators, phase interpolators, and the like.
+"""
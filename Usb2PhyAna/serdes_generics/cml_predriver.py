@@ -6,16 +6,9 @@
 import hdl21 as h
 from hdl21 import Diff
 from hdl21.primitives import R
-import s130
-from s130 import IoMosParams
 
-Pmos = s130.modules.nmos
-PmosLvt = s130.modules.nmos_lvt
-Pmos = s130.modules.pmos
-PmosV5 = s130.modules.pmos_v5
-NmosV5 = s130.modules.nmos_v5
-Nmos = s130.modules.nmos
-NmosLvt = s130.modules.nmos_lvt
+# Local Imports
+from usb2phyana.pdk import s130
 
 
 @h.bundle
@@ -29,9 +22,9 @@ def CmlPreDriver(_: h.HasNoParams) -> h.Module:
 
     # Define a few reused device-parameter combos
     MIRROR_RATIO = 40
-    PswitchMini = PmosV5(IoMosParams(m=4))
-    Pswitch = PmosV5(IoMosParams(m=4 * MIRROR_RATIO))
-    Pbias = PmosV5(IoMosParams(l=1, m=10))
+    PswitchMini = s130.modules.pmos_v5(s130.IoMosParams(m=4))
+    Pswitch = s130.modules.pmos_v5(s130.IoMosParams(m=4 * MIRROR_RATIO))
+    Pbias = s130.modules.pmos_v5(s130.IoMosParams(l=1, m=10))
 
     m = h.Module()
     m.VDD18, m.VDD33, m.VSS = h.Ports(3)
@@ -60,6 +53,6 @@ def CmlPreDriver(_: h.HasNoParams) -> h.Module:
     m.r_a = R(r=500)(p=m.out.a, n=m.VVSS)
     m.r_b = R(r=500)(p=m.out.b, n=m.VVSS)
     m.r_c = R(r=500)(p=m.out.c, n=m.VVSS)
-    m.nmos_enable = NmosV5(m=200)(g=m.en, d=m.VVSS, s=m.VSS, b=m.VSS)
+    m.nmos_enable = s130.modules.nmos_v5(m=200)(g=m.en, d=m.VVSS, s=m.VSS, b=m.VSS)
 
     return m
@@ -5,20 +5,23 @@
 # Hdl & PDK Imports
 import hdl21 as h
 from hdl21 import Diff
-import s130
-from s130 import MosParams
 
 # Local Imports
-from ...cmlparams import CmlParams
+from ..cmlparams import CmlParams
+from usb2phyana.pdk import s130
 
 
-NmosLvt = s130.modules.nmos_lvt
 Cap = h.primitives.Cap
 Res = h.primitives.Res
 
+
 # Define a few reused device-parameter combos
-Nswitch = NmosLvt(MosParams(m=10))
-Nbias = NmosLvt(MosParams(w=1, l=1, m=100))
+def Nswitch() -> h.Instantiable:
+    return s130.modules.nmos_lvt(s130.MosParams(m=10))
+
+
+def Nbias() -> h.Instantiable:
+    return s130.modules.nmos_lvt(s130.MosParams(w=1, l=1, m=100))
 
 
 @h.generator
@@ -46,10 +49,10 @@ def CmlDelayBuf(p: CmlParams) -> h.Module:
         clp = Cap(Cap.Params(c=p.cl))(p=o.p, n=VDD)
         cln = Cap(Cap.Params(c=p.cl))(p=o.n, n=VDD)
         ## Current Bias
-        ni = Nbias(g=bias, s=VSS, b=VSS)
+        ni = Nbias()(g=bias, s=VSS, b=VSS)
         ## Input Pair
-        ndp = Nswitch(s=ni.d, g=i.p, d=o.n, b=VSS)
-        ndn = Nswitch(s=ni.d, g=i.n, d=o.p, b=VSS)
+        ndp = Nswitch()(s=ni.d, g=i.p, d=o.n, b=VSS)
+        ndn = Nswitch()(s=ni.d, g=i.n, d=o.p, b=VSS)
 
     return CmlDelayBuf
 
@@ -72,20 +75,20 @@ def CmlXor(p: CmlParams) -> h.Module:
         # Internal Implementation
         biasdrain = h.Signal()
         ## Bias Current
-        ni = Nbias(g=bias, d=biasdrain, s=VSS, b=VSS)
+        ni = Nbias()(g=bias, d=biasdrain, s=VSS, b=VSS)
 
         ## Intra-Quad Nets
         intra = h.Signal(width=4)
         ## Bottom Quad
-        napb = Nswitch(s=biasdrain, g=a.p, d=intra[0], b=VSS)
-        nanb = Nswitch(s=biasdrain, g=a.n, d=intra[1], b=VSS)
-        nbpb = Nswitch(s=biasdrain, g=b.p, d=intra[2], b=VSS)
-        nbnb = Nswitch(s=biasdrain, g=b.n, d=intra[3], b=VSS)
+        napb = Nswitch()(s=biasdrain, g=a.p, d=intra[0], b=VSS)
+        nanb = Nswitch()(s=biasdrain, g=a.n, d=intra[1], b=VSS)
+        nbpb = Nswitch()(s=biasdrain, g=b.p, d=intra[2], b=VSS)
+        nbnb = Nswitch()(s=biasdrain, g=b.n, d=intra[3], b=VSS)
         ## Top Quad
-        nbpt = Nswitch(s=intra[0], g=b.p, d=x.p, b=VSS)
-        nbnt = Nswitch(s=intra[1], g=b.n, d=x.p, b=VSS)
-        nant = Nswitch(s=intra[2], g=a.n, d=x.n, b=VSS)
-        napt = Nswitch(s=intra[3], g=a.p, d=x.n, b=VSS)
+        nbpt = Nswitch()(s=intra[0], g=b.p, d=x.p, b=VSS)
+        nbnt = Nswitch()(s=intra[1], g=b.n, d=x.p, b=VSS)
+        nant = Nswitch()(s=intra[2], g=a.n, d=x.n, b=VSS)
+        napt = Nswitch()(s=intra[3], g=a.p, d=x.n, b=VSS)
 
         ## Load Resistors
         rlp = Res(Res.Params(r=p.rl))(p=x.p, n=VDD)
@@ -115,7 +118,7 @@ def CmlPulseGen(p: CmlParams) -> h.Module:
 
         # Internal Implementation
         ## Current-Bias Transistor
-        nb = Nbias(g=ibias, d=ibias, s=VSS, b=VSS)
+        nb = Nbias()(g=ibias, d=ibias, s=VSS, b=VSS)
         ## Delay Buffer
         dly = Diff(desc="Delayed Input")
         buf = CmlDelayBuf(p)(
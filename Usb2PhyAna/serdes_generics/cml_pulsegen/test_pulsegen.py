@@ -4,22 +4,26 @@
 """
 
 import io
+from typing import Dict, List, Tuple
 
 # Hdl & PDK Imports
-import sitepdks as _
-import s130
+from usb2phyana.pdk import s130
 import hdl21 as h
 from hdl21 import Diff
 from hdl21.pdk import Corner
 from hdl21.sim import Sim
+import hdl21.sim as hs
 from hdl21.prefix import m, p, n, K, f, µ
 from hdl21.primitives import Vdc, Idc
 
 # DUT Imports
 from .pulsegen import CmlPulseGen, CmlParams
-from ...cmlbuf import CmlBuf
-from ...tests.diffclockgen import DiffClkGen, DiffClkParams
-from ...tests.sim_options import sim_options
+from ..cmlparams import at_swing
+from ..cmlbuf import CmlBuf
+from usb2phyana.tests.diffclockgen import DiffClkGen, DiffClkParams
+from usb2phyana.tests.sim_options import sim_options
+from usb2phyana.tests.search import Bracket
+from usb2phyana.tests.toggle import CONDITIONS, fmax_map, toggles, tran_input
 
 
 @h.paramclass
@@ -35,6 +39,7 @@ class Pvt:
 class TbParams:
     pvt = h.Param(dtype=Pvt, desc="Process, Voltage, and Temperature Parameters")
     cml = h.Param(dtype=CmlParams, desc="CML Parameters")
+    period = h.Param(dtype=h.Prefixed, desc="Input Clock Period (s)", default=4 * n)
 
 
 @h.generator
@@ -50,7 +55,11 @@ def CmlPulseGenTb(params: TbParams) -> h.Module:
     # Input clock generation
     tb.ckg = ckg = Diff()
     ckp = DiffClkParams(
-        period=4 * n, delay=125 * p, vc=1350 * m, vd=900 * m, trf=800 * p
+        period=params.period,
+        delay=125 * p,
+        vc=1350 * m,
+        vd=900 * m,
+        trf=params.period / 5,
     )
     tb.ckgen = DiffClkGen(ckp)(ck=ckg, VSS=tb.VSS)
 
@@ -78,7 +87,7 @@ def CmlPulseGenTb(params: TbParams) -> h.Module:
     return tb
 
 
-from ...tests.sim_test_mode import SimTestMode
+from usb2phyana.tests.sim_test_mode import SimTestMode
 
 
 def test_cml_pulsegen(simtestmode: SimTestMode):
@@ -97,3 +106,66 @@ def sim_cml_pulsegen():
     sim.tran(tstop=12 * n)
     results = sim.run(sim_options)
     print(results)
+
+
+# Maximum-frequency search conditions
+conditions = [Pvt(p=proc, v=v, t=t) for (proc, v, t) in CONDITIONS]
+
+# CML parameters of the fmax-vs-bias map: bias currents, each at a fixed 400mV swing, well within the supply
+cmls = at_swing(0.4, [100 * µ, 175 * µ, 250 * µ, 400 * µ], cl=25 * f)
+
+# Input clock cycles simulated per frequency, and those skipped for startup
+NCYCLES = 16
+NSKIP = 4
+
+
+def sim_input(params: TbParams) -> hs.Sim:
+    """Transient Sim of `CmlPulseGenTb` at `params`, for `NCYCLES` input clock cycles"""
+    tstop = 125 * p + NCYCLES * params.period
+    return tran_input(CmlPulseGenTb(params), params.pvt, tstop)
+
+
+def pulses(params: TbParams, result: hs.SimResult) -> bool:
+    """Whether the output pulses once per input edge, i.e. twice per input cycle, at full CML swing"""
+    tr = result.an[0].data
+    vin = tr["xtop.ckg_p"] - tr["xtop.ckg_n"]
+    vout = tr["xtop.out_p"] - tr["xtop.out_n"]
+    swing = 2 * float(params.cml.ib) * float(params.cml.rl)
+    skip = NSKIP * float(params.period)
+    return toggles(tr["time"], vin, vout, ratio=2, swing=swing, skip=skip)
+
+
+def cml_pulsegen_fmax(
+    conds: List[Pvt] = conditions, cmls: List[CmlParams] = cmls
+) -> Dict[Tuple[int, int], Bracket]:
+    """
+    Maximum input frequency (GHz) at which the pulse generator produces full-swing pulses, at each of `conds`, and each of `cmls`.
+    All `(condition, cml)` pairs are bisected concurrently, and recorded per `fmax_map`.
+    """
+
+    def params(pvt: Pvt, cml: CmlParams, ghz: float) -> TbParams:
+        return TbParams(pvt=pvt, cml=cml, period=h.Prefixed.new(1e-9 / ghz))
+
+    return fmax_map(
+        "CmlPulseGen",
+        conds,
+        cmls,
+        sim=lambda pvt, cml, ghz: sim_input(params(pvt, cml, ghz)),
+        works=lambda pvt, cml, ghz, result: pulses(params(pvt, cml, ghz), result),
+        lo=0.05,
+        hi=5.0,
+    )
+
+
+def test_cml_pulsegen_fmax(simtestmode: SimTestMode):
+    """CML Pulse Generator Maximum-Frequency Search"""
+
+    if simtestmode == SimTestMode.NETLIST:
+        params = TbParams(pvt=conditions[1], cml=cmls[0], period=1 * n)
+        h.netlist(CmlPulseGenTb(params), dest=io.StringIO())
+    elif simtestmode == SimTestMode.MIN:
+        cml_pulsegen_fmax(conds=conditions[:1], cmls=cmls[2:3])
+    elif simtestmode == SimTestMode.TYP:
+        cml_pulsegen_fmax(conds=[Pvt()])
+    else:
+        cml_pulsegen_fmax()
@@ -5,19 +5,23 @@
 # Hdl & PDK Imports
 import hdl21 as h
 from hdl21 import Diff
-import s130
-from s130 import MosParams
 
 # Local Imports
 from .cmlparams import CmlParams
+from usb2phyana.pdk import s130
+
 
-NmosLvt = s130.modules.nmos_lvt
 Cap = h.primitives.Cap
 Res = h.primitives.Res
 
+
 # Define a few reused device-parameter combos
-Nswitch = NmosLvt(MosParams(m=10))
-Nbias = NmosLvt(MosParams(w=1, l=1, m=100))
+def Nswitch() -> h.Instantiable:
+    return s130.modules.nmos_lvt(s130.MosParams(m=10))
+
+
+def Nbias() -> h.Instantiable:
+    return s130.modules.nmos_lvt(s130.MosParams(w=1, l=1, m=100))
 
 
 @h.generator
@@ -45,10 +49,10 @@ def CmlBuf(p: CmlParams) -> h.Module:
         clp = Cap(Cap.Params(c=p.cl))(p=o.p, n=VDD)
         cln = Cap(Cap.Params(c=p.cl))(p=o.n, n=VDD)
         ## Current Mirror
-        nd = Nbias(g=ibias, d=ibias, s=VSS, b=VSS)
-        ni = Nbias(g=ibias, s=VSS, b=VSS)
+        nd = Nbias()(g=ibias, d=ibias, s=VSS, b=VSS)
+        ni = Nbias()(g=ibias, s=VSS, b=VSS)
         ## Input Pair
-        ndp = Nswitch(s=ni.d, g=i.p, d=o.n, b=VSS)
-        ndn = Nswitch(s=ni.d, g=i.n, d=o.p, b=VSS)
+        ndp = Nswitch()(s=ni.d, g=i.p, d=o.n, b=VSS)
+        ndn = Nswitch()(s=ni.d, g=i.n, d=o.p, b=VSS)
 
     return CmlBuf
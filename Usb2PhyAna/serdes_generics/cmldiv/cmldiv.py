@@ -5,19 +5,23 @@
 # Hdl & PDK Imports
 import hdl21 as h
 from hdl21 import Diff, inverse
-import s130
-from s130 import MosParams
 
 # Local Imports
 from ..cmlparams import CmlParams
+from usb2phyana.pdk import s130
+
 
-NmosLvt = s130.modules.nmos_lvt
 Cap = h.primitives.Cap
 Res = h.primitives.Res
 
+
 # Define a few reused device-parameter combos
-Nswitch = NmosLvt(MosParams(m=10))
-Nbias = NmosLvt(MosParams(w=1, l=1, m=100))
+def Nswitch() -> h.Instantiable:
+    return s130.modules.nmos_lvt(s130.MosParams(m=10))
+
+
+def Nbias() -> h.Instantiable:
+    return s130.modules.nmos_lvt(s130.MosParams(w=1, l=1, m=100))
 
 
 @h.generator
@@ -45,16 +49,16 @@ def CmlLatch(p: CmlParams) -> h.Module:
         clp = Cap(Cap.Params(c=p.cl))(p=q.p, n=VDD)
         cln = Cap(Cap.Params(c=p.cl))(p=q.n, n=VDD)
         ## Current Source
-        ni = Nbias(g=bias, s=VSS, b=VSS)
+        ni = Nbias()(g=bias, s=VSS, b=VSS)
         ## Clock Steering Pair
-        ncp = Nswitch(s=ni.d, g=clk.p, b=VSS)
-        ncn = Nswitch(s=ni.d, g=clk.n, b=VSS)
+        ncp = Nswitch()(s=ni.d, g=clk.p, b=VSS)
+        ncn = Nswitch()(s=ni.d, g=clk.n, b=VSS)
         ## Data Input Pair
-        ndp = Nswitch(s=ncp.d, g=d.p, d=q.n, b=VSS)
-        ndn = Nswitch(s=ncp.d, g=d.n, d=q.p, b=VSS)
+        ndp = Nswitch()(s=ncp.d, g=d.p, d=q.n, b=VSS)
+        ndn = Nswitch()(s=ncp.d, g=d.n, d=q.p, b=VSS)
         ## Cross-Coupled Feedback Pair
-        nxp = Nswitch(s=ncn.d, g=q.p, d=q.n, b=VSS)
-        nxn = Nswitch(s=ncn.d, g=q.n, d=q.p, b=VSS)
+        nxp = Nswitch()(s=ncn.d, g=q.p, d=q.n, b=VSS)
+        nxn = Nswitch()(s=ncn.d, g=q.n, d=q.p, b=VSS)
 
     return CmlLatch
 
@@ -78,7 +82,7 @@ def CmlDiv(p: CmlParams) -> h.Module:
 
         # Internal Implementation
         ## Current-Bias Transistor
-        nb = Nbias(g=ibias, d=ibias, s=VSS, b=VSS)
+        nb = Nbias()(g=ibias, d=ibias, s=VSS, b=VSS)
         ## Input / Quadrature-Phase Generator Latch
         lq = CmlLatch(p)(
             clk=inverse(clk),  # Negate Clock Polarity
@@ -4,51 +4,77 @@
 """
 
 import io
+from typing import Dict, List, Tuple
 
 # Hdl & PDK Imports
-import sitepdks as _
-import s130
+from usb2phyana.pdk import s130
 import hdl21 as h
 from hdl21 import Diff
 from hdl21.pdk import Corner
 from hdl21.sim import Sim
+import hdl21.sim as hs
 from hdl21.prefix import m, p, n, K, f, µ
 from hdl21.primitives import Vdc, Idc
 
 # DUT Imports
 from .cmldiv import CmlDiv, CmlParams
+from ..cmlparams import at_swing
 from ..cmlbuf import CmlBuf
-from ..tests.diffclockgen import DiffClkGen, DiffClkParams
-from ..tests.sim_options import sim_options
+from usb2phyana.tests.diffclockgen import DiffClkGen, DiffClkParams
+from usb2phyana.tests.sim_options import sim_options
+from usb2phyana.tests.search import Bracket
+from usb2phyana.tests.toggle import CONDITIONS, fmax_map, toggles, tran_input
+
+
+@h.paramclass
+class Pvt:
+    """Process, Voltage, and Temperature Parameters"""
+
+    p = h.Param(dtype=Corner, desc="Process Corner", default=Corner.TYP)
+    v = h.Param(dtype=h.Prefixed, desc="Supply Voltage Value (V)", default=1800 * m)
+    t = h.Param(dtype=int, desc="Simulation Temperature (C)", default=25)
+
+
+@h.paramclass
+class TbParams:
+    cml = h.Param(dtype=CmlParams, desc="CML Parameters")
+    pvt = h.Param(
+        dtype=Pvt, desc="Process, Voltage, and Temperature Parameters", default=Pvt()
+    )
+    period = h.Param(dtype=h.Prefixed, desc="Input Clock Period (s)", default=1 * n)
 
 
 @h.generator
-def CmlDivTb(params: CmlParams) -> h.Module:
+def CmlDivTb(params: TbParams) -> h.Module:
     """CML Divider Testbench"""
 
     tb = h.sim.tb("CmlDivTb")
     tb.ckg = ckg = Diff()
     tb.ckd = ckd = Diff()
     ckp = DiffClkParams(
-        period=1 * n, delay=125 * p, vc=1350 * m, vd=900 * m, trf=200 * p
+        period=params.period,
+        delay=125 * p,
+        vc=1350 * m,
+        vd=900 * m,
+        trf=params.period / 5,
     )
     tb.ckgen = DiffClkGen(ckp)(ck=ckg, VSS=tb.VSS)
 
     tb.VDD = h.Signal()
-    tb.vvdd = Vdc(Vdc.Params(dc=1800 * m, ac=0 * m))(p=tb.VDD, n=tb.VSS)
+    tb.vvdd = Vdc(Vdc.Params(dc=params.pvt.v, ac=0 * m))(p=tb.VDD, n=tb.VSS)
 
     # CML buffer the input clock, bring it into our CML levels
     tb.bufbias = bufbias = h.Signal()
-    tb.iibuf = Idc(Idc.Params(dc=-1 * params.ib))(p=bufbias, n=tb.VSS)
-    tb.ckbuf = CmlBuf(params)(i=ckg, o=ckd, ibias=bufbias, VDD=tb.VDD, VSS=tb.VSS)
+    tb.iibuf = Idc(Idc.Params(dc=-1 * params.cml.ib))(p=bufbias, n=tb.VSS)
+    tb.ckbuf = CmlBuf(params.cml)(i=ckg, o=ckd, ibias=bufbias, VDD=tb.VDD, VSS=tb.VSS)
 
     tb.i = i = Diff()
     tb.q = q = Diff()
     tb.ibias = ibias = h.Signal()
-    tb.ii = Idc(Idc.Params(dc=-1 * params.ib))(p=ibias, n=tb.VSS)
+    tb.ii = Idc(Idc.Params(dc=-1 * params.cml.ib))(p=ibias, n=tb.VSS)
 
     # Create the parameterized DUT
-    tb.dut = CmlDiv(params)(
+    tb.dut = CmlDiv(params.cml)(
         clk=ckd,
         q=q,
         i=i,
@@ -59,22 +85,86 @@ def CmlDivTb(params: CmlParams) -> h.Module:
     return tb
 
 
-from ..tests.sim_test_mode import SimTestMode
+from usb2phyana.tests.sim_test_mode import SimTestMode
 
 
 def test_cml_div(simtestmode: SimTestMode):
     """CML Divider Test(s)"""
 
     if simtestmode == SimTestMode.NETLIST:
-        params = CmlParams(rl=4 * K, cl=25 * f, ib=250 * µ)
+        params = TbParams(cml=CmlParams(rl=4 * K, cl=25 * f, ib=250 * µ))
         h.netlist(CmlDivTb(params), dest=io.StringIO())
     else:
         sim_cml_div()
 
 
 def sim_cml_div():
-    params = CmlParams(rl=4 * K, cl=25 * f, ib=250 * µ)
+    params = TbParams(cml=CmlParams(rl=4 * K, cl=25 * f, ib=250 * µ))
     sim = Sim(tb=CmlDivTb(params), attrs=s130.install.include(Corner.TYP))
     sim.tran(tstop=12 * n)
     results = sim.run(sim_options)
     print(results)
+
+
+# Maximum-frequency search conditions
+conditions = [Pvt(p=proc, v=v, t=t) for (proc, v, t) in CONDITIONS]
+
+# CML parameters of the fmax-vs-bias map: bias currents, each at a fixed 400mV swing, well within the supply
+cmls = at_swing(0.4, [100 * µ, 175 * µ, 250 * µ, 400 * µ], cl=25 * f)
+
+# Input clock cycles simulated per frequency, and those skipped for startup
+NCYCLES = 24
+NSKIP = 4
+
+
+def sim_input(params: TbParams) -> hs.Sim:
+    """Transient Sim of `CmlDivTb` at `params`, for `NCYCLES` input clock cycles"""
+    tstop = 125 * p + NCYCLES * params.period
+    return tran_input(CmlDivTb(params), params.pvt, tstop)
+
+
+def divides(params: TbParams, result: hs.SimResult) -> bool:
+    """Whether both divider outputs toggle at half the input clock's rate, at full CML swing"""
+    tr = result.an[0].data
+    t = tr["time"]
+    vin = tr["xtop.ckg_p"] - tr["xtop.ckg_n"]
+    swing = 2 * float(params.cml.ib) * float(params.cml.rl)
+    skip = NSKIP * float(params.period)
+    return all(
+        toggles(t, vin, tr[f"xtop.{o}_p"] - tr[f"xtop.{o}_n"], 0.5, swing, skip=skip)
+        for o in ("i", "q")
+    )
+
+
+def cml_div_fmax(
+    conds: List[Pvt] = conditions, cmls: List[CmlParams] = cmls
+) -> Dict[Tuple[int, int], Bracket]:
+    """
+    Maximum input frequency (GHz) at which the divider divides correctly, at each of `conds`, and each of `cmls`.
+    All `(condition, cml)` pairs are bisected concurrently, and recorded per `fmax_map`.
+    """
+
+    def params(pvt: Pvt, cml: CmlParams, ghz: float) -> TbParams:
+        return TbParams(pvt=pvt, cml=cml, period=h.Prefixed.new(1e-9 / ghz))
+
+    return fmax_map(
+        "CmlDiv",
+        conds,
+        cmls,
+        sim=lambda pvt, cml, ghz: sim_input(params(pvt, cml, ghz)),
+        works=lambda pvt, cml, ghz, result: divides(params(pvt, cml, ghz), result),
+    )
+
+
+def test_cml_div_fmax(simtestmode: SimTestMode):
+    """CML Divider Maximum-Frequency Search"""
+
+    if simtestmode == SimTestMode.NETLIST:
+        params = TbParams(pvt=conditions[1], cml=cmls[0], period=200 * p)
+        h.netlist(CmlDivTb(params), dest=io.StringIO())
+    elif simtestmode == SimTestMode.MIN:
+        cml_div_fmax(conds=conditions[:1], cmls=cmls[2:3])
+    elif simtestmode == SimTestMode.TYP:
+        cml_div_fmax(conds=[Pvt()])
+    else:
+        cml_div_fmax()
@@ -1,3 +1,6 @@
+# Std-Lib Imports
+from typing import List, Sequence
+
 # Hdl & PDK Imports
 import hdl21 as h
 
@@ -9,3 +12,13 @@ class CmlParams:
     rl = h.Param(dtype=h.Prefixed, desc="Load Res Value (Ohms)")
     cl = h.Param(dtype=h.Prefixed, desc="Load Cap Value (F)")
     ib = h.Param(dtype=h.Prefixed, desc="Bias Current Value (A)")
+
+
+def at_swing(
+    swing: float, ibs: Sequence[h.Prefixed], cl: h.Prefixed
+) -> List[CmlParams]:
+    """CML parameters at each of bias currents `ibs`, each with its load resistance set for single-ended swing `ib * rl` of `swing` (V)"""
+    return [
+        CmlParams(rl=h.Prefixed.new(round(swing / float(ib))), cl=cl, ib=ib)
+        for ib in ibs
+    ]
@@ -6,24 +6,33 @@
 import hdl21 as h
 from hdl21.primitives import Res, Cap, Vdc
 from hdl21.prefix import m
-import s130
-from s130 import MosParams
 
 # Local Imports
 from ..cmlparams import CmlParams
-from ..width import Width
-from ..idac import NmosIdac as Idac
+from usb2phyana.width import Width
+from usb2phyana.idac import NmosIdac as Idac
+from usb2phyana.pdk import s130
 
-Nmos = s130.modules.nmos
-NmosLvt = s130.modules.nmos_lvt
-Pmos = s130.modules.pmos
 
 # Define a few reused device-parameter combos
-Pswitch = Pmos(MosParams(m=10))
-Pbias = Pmos(MosParams(w=1, l=1, m=100))
-PbiasHalf = Pmos(MosParams(w=1, l=1, m=50))
-Nswitch = NmosLvt(MosParams(m=10))
-Nload = Nmos(MosParams(w=1, l=1, m=4))
+def Pswitch() -> h.Instantiable:
+    return s130.modules.pmos(s130.MosParams(m=10))
+
+
+def Pbias() -> h.Instantiable:
+    return s130.modules.pmos(s130.MosParams(w=1, l=1, m=100))
+
+
+def PbiasHalf() -> h.Instantiable:
+    return s130.modules.pmos(s130.MosParams(w=1, l=1, m=50))
+
+
+def Nswitch() -> h.Instantiable:
+    return s130.modules.nmos_lvt(s130.MosParams(m=10))
+
+
+def Nload() -> h.Instantiable:
+    return s130.modules.nmos(s130.MosParams(w=1, l=1, m=4))
 
 
 @h.generator
@@ -32,7 +41,7 @@ def NmosCmlStage(params: CmlParams) -> h.Module:
 
     Rl = Res(Res.Params(r=params.rl))
     Cl = Cap(Cap.Params(c=params.cl))
-    Nbias = NmosLvt(MosParams(w=1, l=1, m=100))
+    Nbias = s130.modules.nmos_lvt(s130.MosParams(w=1, l=1, m=100))
 
     @h.module
     class NmosCmlStage:
@@ -50,7 +59,7 @@ def NmosCmlStage(params: CmlParams) -> h.Module:
         ## Current Bias
         ni = Nbias(g=bias, s=VSS, b=VSS)
         ## Input Pair
-        ns = h.Pair(Nswitch)(s=ni.d, g=i, d=h.inverse(o), b=VSS)
+        ns = h.Pair(Nswitch())(s=ni.d, g=i, d=h.inverse(o), b=VSS)
         ## Load Resistors
         rl = h.Pair(Rl)(p=o, n=VDD)
         ## Load Caps
@@ -80,12 +89,12 @@ def PmosCmlStage(params: CmlParams) -> h.Module:
 
         # Internal Implementation
         ## Current Bias
-        pi = Pbias(g=pbias, s=VDD, b=VDD)
+        pi = Pbias()(g=pbias, s=VDD, b=VDD)
         ## Input Pair
-        ps = h.Pair(Pbias)(s=pi.d, g=i, d=h.inverse(o), b=VDD)
+        ps = h.Pair(Pbias())(s=pi.d, g=i, d=h.inverse(o), b=VDD)
         ## Load Nmos
-        nl = h.Pair(Nload)(d=o, g=nbias, s=VSS, b=VSS)
-        nd = h.Pair(Nload)(d=o, g=o, s=VSS, b=VSS)
+        nl = h.Pair(Nload())(d=o, g=nbias, s=VSS, b=VSS)
+        nd = h.Pair(Nload())(d=o, g=o, s=VSS, b=VSS)
         ## Load Caps
         cl = h.Pair(Cl)(p=o, n=VSS)
 
@@ -107,13 +116,13 @@ def BiasStage(params: CmlParams) -> h.Module:
         # Internal Implementation
         fb = h.Signal()
         ## Current Bias - Idac / 2
-        pi = PbiasHalf(g=pbias, s=VDD, b=VDD)
+        pi = PbiasHalf()(g=pbias, s=VDD, b=VDD)
         ## Input Pair - each Idac / 4
-        prf = Pswitch(s=pi.d, g=swing, d=nbias, b=VDD)
-        pfb = Pswitch(s=pi.d, g=fb, d=fb, b=VDD)
+        prf = Pswitch()(s=pi.d, g=swing, d=nbias, b=VDD)
+        pfb = Pswitch()(s=pi.d, g=fb, d=fb, b=VDD)
         ## Load Nmos - each Idac / 4
-        ndi = Nload(d=nbias, g=nbias, s=VSS, b=VSS)
-        nld = Nload(d=fb, g=nbias, s=VSS, b=VSS)
+        ndi = Nload()(d=nbias, g=nbias, s=VSS, b=VSS)
+        nld = Nload()(d=fb, g=nbias, s=VSS, b=VSS)
 
     return BiasStage
 
@@ -159,7 +168,7 @@ def CmlRo(params: CmlParams) -> h.Module:
         )
 
         ## Current-Bias Diode Transistor
-        pb = Pbias(g=pbias, d=pbias, s=VDD, b=VDD)
+        pb = Pbias()(g=pbias, d=pbias, s=VDD, b=VDD)
 
     return CmlRo
 
@@ -168,7 +177,7 @@ def CmlRo(params: CmlParams) -> h.Module:
 def CmosEdgeDetector(params: Width) -> h.Module:
     """# Cmos Single-Ended Input Falling-Edge Detector"""
 
-    from ..logiccells import Inv, Nor3
+    from usb2phyana.logiccells import Inv, Nor3
     from hdl21.generators import SeriesPar
 
     # Call the series-parallel generator to get a delay-chain worth of inverters
@@ -206,7 +215,7 @@ def CmosInjector(params: Width) -> h.Module:
     """# Cmos Injection Cell
     Just a binary-weighted bank of Nmos pull-down transistors"""
 
-    Nswitch = NmosLvt(MosParams(m=4))
+    Nswitch = s130.modules.nmos_lvt(s130.MosParams(m=4))
 
     @h.module
     class CmosInjector:
@@ -247,7 +256,7 @@ def CmlIlDco(params: CmlParams) -> h.Module:
         # Internal Implementation
         ## Current-Bias Diode Pmos
         pbias = h.Signal(desc="Pmos Gate Bias, Output of Current Dac")
-        pb = Pbias(g=pbias, d=pbias, s=VDD, b=VDD)
+        pb = Pbias()(g=pbias, d=pbias, s=VDD, b=VDD)
 
         ## Frequency-Control Current Dac
         idac = Idac()(ibias=ibias, code=fctrl, out=pbias, VDD=VDD, VSS=VSS)
@@ -263,7 +272,7 @@ def CmlIlDco(params: CmlParams) -> h.Module:
         edet = CmosEdgeDetector(width=3)(
             inp=refclk, en=_injection_strength, VDD=VDD, VSS=VSS
         )
-        ninj = 3 * Nswitch(g=edet.out, d=stg0.p, s=stg0.n, b=VSS)
+        ninj = 3 * Nswitch()(g=edet.out, d=stg0.p, s=stg0.n, b=VSS)
         # inj0p = CmosInjector(width=3)(inp=edet.out, out=stg0.p, VDD=VDD, VSS=VSS)
         # inj0n = CmosInjector(width=3)(inp=_off, out=stg0.n, VDD=VDD, VSS=VSS)
         # inj1p = CmosInjector(width=3)(inp=edet.out, out=stg1.p, VDD=VDD, VSS=VSS)
@@ -10,7 +10,6 @@ from pathlib import Path
 
 from pydantic.dataclasses import dataclass
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Hdl & PDK Imports
 import hdl21 as h
@@ -19,12 +18,11 @@ from hdl21.pdk import Corner
 from hdl21.sim import Sim, LogSweep
 from hdl21.prefix import m, µ, f, n, p, T, K
 from hdl21.primitives import Vdc, Vpulse, Idc, C
-import s130
-import sitepdks as _
+from usb2phyana.pdk import s130
 
 # Local Imports
-from ...tests.sim_options import sim_options
-from ...tests.vcode import Vcode
+from usb2phyana.tests.sim_options import sim_options
+from usb2phyana.tests.vcode import Vcode
 from ...cmlparams import CmlParams
 from ..cmlro import CmlRo, CmlIlDco
 
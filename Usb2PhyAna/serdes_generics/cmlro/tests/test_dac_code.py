@@ -9,7 +9,6 @@ from copy import copy
 
 from pydantic.dataclasses import dataclass
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Hdl & PDK Imports
 import hdl21 as h
@@ -18,8 +17,8 @@ from hdl21.pdk import Corner
 from hdl21.prefix import m, µ, f, K
 
 # Local Imports
-from ...tests.sim_options import sim_options
-from ...tests.sim_test_mode import SimTestMode
+from usb2phyana.tests.sim_options import sim_options
+from usb2phyana.tests.sim_test_mode import SimTestMode
 from ...cmlparams import CmlParams
 from .tb import Pvt, TbParams, CmlRoFreqTb, sim_input, run_typ
 
@@ -81,6 +80,7 @@ def codesweep(tbgen: h.Generator, pvt: Pvt) -> List[hs.SimResult]:
 
 def plot(result: Result, title: str, fname: str):
     """Plot a `Result` and save to file `fname`"""
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots()
     codes = np.array(result.codes)
@@ -3,13 +3,12 @@
 """
 
 import pickle, io
-from typing import List
+from typing import List, Sequence
 from dataclasses import asdict
 from copy import copy
 
 from pydantic.dataclasses import dataclass
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Hdl & PDK Imports
 import hdl21 as h
@@ -18,11 +17,13 @@ from hdl21.pdk import Corner
 from hdl21.sim import Sim, LogSweep
 from hdl21.prefix import m, µ, f, n, p, T, K
 from hdl21.primitives import Vdc, Vpulse, Idc, C
-import s130
-import sitepdks as _
+from usb2phyana.pdk import s130
 
 # Local Imports
-from ...tests.sim_options import sim_options
+from usb2phyana.tests.sim_options import sim_options
+from usb2phyana.tests import ringosc
+from usb2phyana.tests.search import Root
+from usb2phyana.tests.sensitivity import Factor, Sensitivity
 
 # from ...tests.vcode import VCode
 from ...cmlparams import CmlParams
@@ -35,6 +36,8 @@ ibs = [val * µ for val in range(5, 50, 5)]
 rls = [cml.rl] * len(ibs)
 # rls = [1.0 / float(ib) for ib in ibs]
 results_pickle_file = "scratch/cmlro.freq.pkl"
+# Result-store table name, for `solve_ibias`
+TABLE = "cmlro_ibias"
 
 
 @h.paramclass
@@ -46,6 +49,15 @@ class Pvt:
     t = h.Param(dtype=int, desc="Simulation Temperature (C)", default=25)
 
 
+# PVT Conditions
+conditions = [
+    Pvt(p, v, t)
+    for p in [Corner.TYP, Corner.FAST, Corner.SLOW]
+    for v in [1620 * m, 1800 * m, 1980 * m]
+    for t in [-25, 25, 75]
+]
+
+
 @h.paramclass
 class TbParams:
     # Required CML Generator Params
@@ -171,12 +183,6 @@ def run_corners(tbgen: h.Generator) -> Result:
     """Run `sim` on `tbgen`, across corners"""
 
     # Initialize our results
-    conditions = [
-        Pvt(p, v, t)
-        for p in [Corner.TYP, Corner.FAST, Corner.SLOW]
-        for v in [1620 * m, 1800 * m, 1980 * m]
-        for t in [-25, 25, 75]
-    ]
     result = Result(conditions=conditions, ibs=ibs, rls=rls, results=[])
 
     # Run conditions one at a time, parallelizing across bias currents
@@ -189,8 +195,28 @@ def run_corners(tbgen: h.Generator) -> Result:
     return result
 
 
+def solve_ibias(
+    tbgen: h.Generator = CmlRoFreqTb,
+    conds: Sequence[Pvt] = conditions,
+    target: float = 480e6,
+) -> List[Root]:
+    """
+    Solve for the bias current (µA) at which `tbgen` runs at frequency `target` (Hz), at each of `conds`.
+    Searches the range of `ibs`, at the fixed load `cml.rl`, per `ringosc.solve_ibias`.
+    """
+    sim = lambda pvt, ib: sim_input(
+        tbgen=tbgen,
+        params=TbParams(pvt=pvt, cml=CmlParams(ib=ib * µ, rl=cml.rl, cl=10 * f)),
+    )
+    lo, hi = (1e6 * float(ib) for ib in (ibs[0], ibs[-1]))
+    return ringosc.solve_ibias(
+        ringosc.simulated(sim), conds, lo, hi, tbgen.name, TABLE, target=target
+    )
+
+
 def plot(result: Result, title: str, fname: str):
     """Plot a `Result` and save to file `fname`"""
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots()
     ibs = np.array([1e6 * float(v) for v in result.ibs])
@@ -236,6 +262,26 @@ def tperiod(results: hs.SimResult) -> float:
     return results.an[0].measurements["tperiod"]
 
 
+def sensitivities(pvt: Pvt = Pvt(), central: bool = True) -> Sensitivity:
+    """
+    Sensitivity of frequency and supply current to the CML parameters, supply and temperature, around `cml` at `pvt`.
+    Temperature sensitivities are per 100C. Central differences if `central`, else the cheaper forward differences.
+    """
+    return ringosc.sensitivities(
+        lambda params: sim_input(CmlRoFreqTb, params),
+        nominal=TbParams(pvt=pvt, cml=cml),
+        factors=[
+            "cml.rl",
+            "cml.cl",
+            "cml.ib",
+            "pvt.v",
+            Factor("pvt.t", step=25, scale=100),
+        ],
+        metrics=lambda result: dict(idd=abs(idd(result))),
+        central=central,
+    )
+
+
 def run_typ():
     """Run a typical-case sim"""
 
@@ -258,16 +304,30 @@ def run_and_plot_corners():
     plot(result, "Cml Ro - Freq vs Ibias", "scratch/CmlRoFreqIbias.png")
 
 
-from ...tests.sim_test_mode import SimTestMode
+from usb2phyana.tests.sim_test_mode import SimTestMode
 
 
 def test_cml_freq(simtestmode: SimTestMode):
     """CmlRo Frequence Test(s)"""
 
     if simtestmode == SimTestMode.MAX:
+        solve_ibias()
         run_and_plot_corners()
     elif simtestmode == SimTestMode.NETLIST:
         params = TbParams(pvt=Pvt(), cml=CmlParams(rl=25 * K, cl=10 * f, ib=40 * µ))
         h.netlist(CmlRoFreqTb(params), dest=io.StringIO())
+    elif simtestmode == SimTestMode.TYP:
+        solve_ibias(conds=[Pvt()])
     else:
         run_typ()
+
+
+def test_cml_sensitivity(simtestmode: SimTestMode):
+    """CmlRo Parameter Sensitivity"""
+
+    if simtestmode in (SimTestMode.NETLIST, SimTestMode.MIN):
+        h.netlist(CmlRoFreqTb(TbParams(pvt=Pvt(), cml=cml)), dest=io.StringIO())
+    elif simtestmode == SimTestMode.TYP:
+        sensitivities(central=False)
+    else:
+        sensitivities()
@@ -6,8 +6,8 @@ from enum import Enum, auto
 import hdl21 as h
 
 # Local Imports
-from .width import Width
-from .logiccells import Inv, Flop
+from usb2phyana.width import Width
+from usb2phyana import logiccells
 
 
 @h.generator
@@ -20,6 +20,8 @@ def Counter(p: Width) -> h.Module:
     m.out = h.Output(width=p.width, desc="Counterer Output State")
 
     # Divide-by-two stages
-    m.invs = p.width * Inv()(i=m.out, VDD=m.VDD, VSS=m.VSS)
-    m.flops = p.width * Flop()(d=m.invs.z, q=m.out, clk=m.clk, VDD=m.VDD, VSS=m.VSS)
+    m.invs = p.width * logiccells.Inv()(i=m.out, VDD=m.VDD, VSS=m.VSS)
+    m.flops = p.width * logiccells.Flop()(
+        d=m.invs.z, q=m.out, clk=m.clk, VDD=m.VDD, VSS=m.VSS
+    )
     return m
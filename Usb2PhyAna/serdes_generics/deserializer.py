@@ -6,9 +6,9 @@
 import hdl21 as h
 
 # Local Imports
-from ..logiccells import Latch, Flop
-from ..encoders import OneHotEncoder
-from ..counter import Counter
+from usb2phyana import logiccells
+from usb2phyana.encoders import OneHotEncoder
+from .counter import Counter
 
 
 @h.generator
@@ -33,8 +33,8 @@ def RxDeSerializer(_: h.HasNoParams) -> h.Module:
     # The bank of load-registers, all with data-inputs tied to serial data,
     # "clocked" by the one-hot counter state.
     # Note output `q`s are connected by later instance-generation statements.
-    m.load_latches = 8 * Latch()(d=m.sdata, clk=m.encoder.out)
+    m.load_latches = 8 * logiccells.Latch()(d=m.sdata, clk=m.encoder.out)
     # The bank of output flops
-    m.output_flops = 8 * Flop()(d=m.load_latches.q, q=m.pdata, clk=m.pclk)
+    m.output_flops = 8 * logiccells.Flop()(d=m.load_latches.q, q=m.pdata, clk=m.pclk)
 
     return m
@@ -0,0 +1,77 @@
+"""
+# Phase Interpolator Characterization
+
+Code-to-phase linearity of each phase-interpolator architecture, across PVT conditions.
+`run` simulates every architecture, condition and code in a single `sim_runner` batch,
+and analyzes each architecture's delays with `usb2phyana.tests.pilinearity`.
+"""
+
+# Std-Lib Imports
+from typing import Dict, Sequence
+
+# PyPi Imports
+import numpy as np
+
+# Hdl & PDK Imports
+import hdl21 as h
+from hdl21.pdk import Corner
+from hdl21.prefix import m
+
+# Local Imports
+from .tb import TbParams, qclk, sim_input, tdelay
+from usb2phyana.tests.sim_options import sim_options
+from usb2phyana.tests.result_store import result_store
+from usb2phyana.tests import sim_runner
+from usb2phyana.tests.pilinearity import PiLinearity, analyze
+
+# PI architectures, each the module of its `PhaseInterp` generator
+ARCHS = ("cmospi", "cmospi2", "flashpi", "cmlpi")
+
+# PVT conditions, as `TbParams` fields
+CONDITIONS = [
+    dict(corner=corner, temper=temper, VDD=VDD)
+    for corner in [Corner.TYP, Corner.FAST, Corner.SLOW]
+    for temper in [-25, 25, 75]
+    for VDD in [1620 * m, 1800 * m, 1980 * m]
+]
+
+
+def name(cond: Dict) -> str:
+    """Name of PVT condition `cond`"""
+    return f"{cond['corner']} {cond['VDD']} {cond['temper']}"
+
+
+def tbgen(arch: str) -> h.Generator:
+    """Testbench generator for PI architecture `arch`"""
+    if arch == "cmlpi":
+        from .test_cmlpi import PhaseInterpTb
+    else:
+        from .test_pi import PhaseInterpTb
+    return PhaseInterpTb
+
+
+def run(
+    archs: Sequence[str] = ARCHS,
+    conditions: Sequence[Dict] = CONDITIONS,
+    codes: Sequence[int] = range(32),
+) -> Dict[str, PiLinearity]:
+    """
+    Characterize each of `archs`, at each of `conditions` and `codes`.
+    Every sim runs in one `sim_runner` batch. Failed sims are excluded from each analysis.
+    """
+    points = [
+        (arch, cond, code) for arch in archs for cond in conditions for code in codes
+    ]
+    params = [TbParams(arch=arch, code=code, **cond) for (arch, cond, code) in points]
+    sims = [sim_input(tb=tbgen(p.arch)(p), params=p) for p in params]
+    label = lambda idx: name(points[idx][1])
+    jobs = sim_runner.run(sims, sim_options, store=result_store, corner=label)
+
+    delays = np.array([tdelay(j.result) if j.ok else np.nan for j in jobs])
+    delays = delays.reshape(len(archs), len(conditions), len(codes))
+    period = float(qclk(params[0]).period)
+    names = [name(c) for c in conditions]
+    return {
+        arch: analyze(arch_delays, period, names)
+        for (arch, arch_delays) in zip(archs, delays)
+    }
@@ -10,22 +10,25 @@ import hdl21 as h
 from hdl21 import Diff
 from hdl21.prefix import K, f, µ
 from hdl21.primitives import Idc
-import s130
-from s130 import MosParams
 
-NmosLvt = s130.modules.nmos_lvt
+# Local Imports
+from ..quadclock import QuadClock
+from usb2phyana import logiccells
+from usb2phyana.pdk import s130
+from ..cmlparams import CmlParams
+from .encoder import PiEncoder
+
 Cap = h.primitives.Cap
 Res = h.primitives.Res
 
-Nswitch = NmosLvt(MosParams(m=4))
-Nbias = NmosLvt(MosParams(w=1, l=1, m=100))
 
+# Define a few reused device-parameter combos
+def Nswitch() -> h.Instantiable:
+    return s130.modules.nmos_lvt(s130.MosParams(m=4))
 
-# Local Imports
-from ...quadclock import QuadClock
-from ...logiccells import Inv
-from ...cmlparams import CmlParams
-from .encoder import PiEncoder
+
+def Nbias() -> h.Instantiable:
+    return s130.modules.nmos_lvt(s130.MosParams(w=1, l=1, m=100))
 
 
 @h.paramclass
@@ -90,11 +93,11 @@ def IdacUnit(_: CmlParams) -> h.Module:
 
         ## Gate Bias and Current Source
         bias = h.Input()
-        nb = Nbias(g=bias, s=VSS, b=VSS)
+        nb = Nbias()(g=bias, s=VSS, b=VSS)
 
         ## Differential Current-Switch
-        swi = Nswitch(g=eni, d=out.i, s=nb.d, b=VSS)
-        swq = Nswitch(g=enq, d=out.q, s=nb.d, b=VSS)
+        swi = Nswitch()(g=eni, d=out.i, s=nb.d, b=VSS)
+        swq = Nswitch()(g=enq, d=out.q, s=nb.d, b=VSS)
 
     return IdacUnit
 
@@ -129,14 +132,14 @@ def PhaseInterp(p: PiParams) -> h.Module:
             VDD=VDD,
             VSS=VSS,
         )
-        invqsel = Inv(i=qsel, z=qselb, VDD=VDD, VSS=VSS)
-        invisel = Inv(i=isel, z=iselb, VDD=VDD, VSS=VSS)
+        invqsel = logiccells.Inv(i=qsel, z=qselb, VDD=VDD, VSS=VSS)
+        invisel = logiccells.Inv(i=isel, z=iselb, VDD=VDD, VSS=VSS)
 
         ## Current DAC
         ## FIXME: cheating! bias current being ideally generated internally, sue us
         ibias = h.Signal()
         ii = Idc(Idc.Params(dc=-1 * params.ib))(p=ibias, n=VSS)
-        nb = Nbias(g=ibias, d=ibias, s=VSS, b=VSS)
+        nb = Nbias()(g=ibias, d=ibias, s=VSS, b=VSS)
         daci, dacq = h.Signals(2)
         idac = IdacTherm(params)(
             qtherm=qtherm,
@@ -149,7 +152,7 @@ def PhaseInterp(p: PiParams) -> h.Module:
 
         ## The "MSB Mux": a set of four polarity-inverting switches
         ckpairsources = h.Signal(width=4)
-        mux = 4 * NmosLvt(MosParams(m=40))(
+        mux = 4 * s130.modules.nmos_lvt(s130.MosParams(m=40))(
             d=ckpairsources,
             g=h.Concat(isel, iselb, qsel, qselb),
             s=h.Concat(daci, daci, dacq, dacq),
@@ -171,7 +174,7 @@ def PhaseInterp(p: PiParams) -> h.Module:
     g = [Pi.ckq.ck0, Pi.ckq.ck180, Pi.ckq.ck0, Pi.ckq.ck180]
     s = 2 * [Pi.ckpairsources[0]] + 2 * [Pi.ckpairsources[1]]
     for idx in range(4):
-        inst = Nswitch(
+        inst = Nswitch()(
             d=d[idx],
             g=g[idx],
             s=s[idx],
@@ -182,7 +185,7 @@ def PhaseInterp(p: PiParams) -> h.Module:
     g = [Pi.ckq.ck90, Pi.ckq.ck270, Pi.ckq.ck90, Pi.ckq.ck270]
     s = 2 * [Pi.ckpairsources[2]] + 2 * [Pi.ckpairsources[3]]
     for idx in range(4):
-        inst = Nswitch(
+        inst = Nswitch()(
             d=d[idx],
             g=g[idx],
             s=s[idx],
@@ -8,11 +8,11 @@ from hdl21.prefix import f
 Cap = h.primitives.Cap
 
 # Local Imports
-from ...diff import Diff
-from ...quadclock import QuadClock
-from ...encoders import OneHotEncoder, ThermoEncoder3to8
-from ...triinv import TriInv
-from ...logiccells import Inv
+from hdl21 import Diff
+from ..quadclock import QuadClock
+from usb2phyana.encoders import OneHotEncoder, ThermoEncoder3to8
+from ..triinv import TriInv
+from usb2phyana import logiccells
 
 
 @h.paramclass
@@ -41,8 +41,8 @@ def FineInterp(_: PiParams) -> h.Module:
         ## Binary to Thermometer Encoding
         therm = h.Signal(width=8, desc="Thermometer Encoded Selection Input")
         thermb = h.Signal(width=8, desc="Inverted `therm`")
-        tinvs = 8 * Inv()(i=therm, z=thermb, VDD=VDD, VSS=VSS)
-        encoder = ThermoEncoder3to8(bin=sel, out=therm, en=VDD, VDD=VDD, VSS=VSS)
+        tinvs = 8 * logiccells.Inv()(i=therm, z=thermb, VDD=VDD, VSS=VSS)
+        encoder = ThermoEncoder3to8()(bin=sel, out=therm, en=VDD, VDD=VDD, VSS=VSS)
 
         ## Main Event: the interpolation tristate inverters
         outb = h.Signal()
@@ -12,10 +12,10 @@ from hdl21 import Diff
 Cap = h.primitives.Cap
 
 # Local Imports
-from ...quadclock import QuadClock
+from ..quadclock import QuadClock
 from .encoder import PiEncoder
-from ...triinv import TriInv
-from ...logiccells import Inv
+from ..triinv import TriInv
+from usb2phyana import logiccells
 
 
 @h.paramclass
@@ -60,20 +60,24 @@ def FineInterp(_: PiParams) -> h.Module:
     return FineInterp
 
 
-@h.module
-class Mux2to1:
+@h.generator
+def Mux2to1(_: h.HasNoParams) -> h.Module:
     """Two to One Tri-State Mux"""
 
-    # IO Interface
-    VDD, VSS = h.Ports(2)
-    if0, if1 = h.Inputs(2, width=1, desc="Data Inputs")
-    sel = h.Input(width=1, desc="Select")
-    out = h.Output(width=1, desc="Output")
+    @h.module
+    class Mux2to1:
+        # IO Interface
+        VDD, VSS = h.Ports(2)
+        if0, if1 = h.Inputs(2, width=1, desc="Data Inputs")
+        sel = h.Input(width=1, desc="Select")
+        out = h.Output(width=1, desc="Output")
+
+        # Internal Implementation
+        isel = logiccells.Inv()(i=sel, VDD=VDD, VSS=VSS)
+        ta = TriInv(width=1)(i=if1, z=out, en=sel, VDD=VDD, VSS=VSS)
+        tb = TriInv(width=1)(i=if0, z=out, en=isel.z, VDD=VDD, VSS=VSS)
 
-    # Internal Implementation
-    isel = Inv()(i=sel, VDD=VDD, VSS=VSS)
-    ta = TriInv(width=1)(i=if1, z=out, en=sel, VDD=VDD, VSS=VSS)
-    tb = TriInv(width=1)(i=if0, z=out, en=isel.z, VDD=VDD, VSS=VSS)
+    return Mux2to1
 
 
 @h.generator
@@ -96,7 +100,7 @@ def PhaseInterp(p: PiParams) -> h.Module:
         encoder = PiEncoder(width=p.nbits)(bin=sel, en=VDD, VDD=VDD, VSS=VSS)
 
         ## MSB Selection Mux
-        qmux = Mux2to1(
+        qmux = Mux2to1()(
             if0=ckq.ck90,
             if1=ckq.ck270,
             sel=encoder.qmuxsel,
@@ -104,7 +108,7 @@ def PhaseInterp(p: PiParams) -> h.Module:
             VDD=VDD,
             VSS=VSS,
         )
-        imux = Mux2to1(
+        imux = Mux2to1()(
             if0=ckq.ck0,
             if1=ckq.ck180,
             sel=encoder.imuxsel,
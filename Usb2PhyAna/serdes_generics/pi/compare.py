@@ -1,61 +1,25 @@
 """
-# Phase Interpolator Comparisons 
+# Phase Interpolator Comparisons
 """
 
-import copy
-import matplotlib.pyplot as plt
+from typing import Dict
 
-import hdl21 as h
-from hdl21.pdk import Corner
-from hdl21.prefix import m
+from .tb import save_plot
+from .characterize import ARCHS, run
+from usb2phyana.tests.pilinearity import PiLinearity
 
-from .tb import TbParams, save_plot, unwrap, sim_input, tdelay
-from ...tests.sim_options import sim_options
 
-
-def run_corners(tbgen: h.Generator, label: str, fname: str):
-    """Run `sim` on `tbgen`, across corners"""
-
-    opts = copy.copy(sim_options)
-    opts.rundir = None
+def plot(lin: PiLinearity, label: str, fname: str):
+    """Plot the unwrapped code-to-phase curve of `lin`, per condition"""
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots()
-
-    # PVT Conditions
-    conditions = [
-        {
-            "corner": corner,
-            "temper": temper,
-            "VDD": VDD,
-        }
-        for corner in [Corner.TYP, Corner.FAST, Corner.SLOW]
-        for temper in [-25, 25, 75]
-        for VDD in [1620 * m, 1800 * m, 1980 * m]
-    ]
-
-    # Run conditions one at a time, parallelizing across PI codes
-    for cond in conditions:
-        # Create a list of per-code tb parameters
-        pvt = TbParams(**cond)
-        params = [TbParams(code=code, **cond) for code in range(32)]
-
-        # Create the simulation inputs
-        sims = [sim_input(tb=tbgen(p), params=p) for p in params]
-
-        # Run sims
-        results = h.sim.run(sims, opts)
-
-        # Post-process the results into (code, delay) curves
-        delays = [tdelay(r) for r in results]
-        delays = unwrap(delays)
-
-        # And plot the results
-        label = f"{pvt.corner} {pvt.VDD} {pvt.temper}"
-        ax.plot(delays * 1e12, label=label)
+    for (cond, phase) in zip(lin.conditions, lin.phase):
+        ax.plot(phase, label=cond)
 
     # Set up all the other data on our plot
     ax.set_title(label)
-    ax.set_ylabel("Delay (ps)")
+    ax.set_ylabel("Phase (degrees)")
     ax.set_xlabel("PI Code")
     ax.legend()
 
@@ -63,11 +27,11 @@ def run_corners(tbgen: h.Generator, label: str, fname: str):
     fig.savefig(fname)
 
 
-def compare():
-    """Compare CMOS and CML Phase Interpolators"""
-
-    from .test_pi import PhaseInterpTb as CmosTb
-    from .test_cmlpi import PhaseInterpTb as CmlTb
+def compare() -> Dict[str, PiLinearity]:
+    """Compare the linearity of each Phase Interpolator architecture, across corners"""
 
-    run_corners(CmosTb, "CMOS PI", "scratch/cmospi.png")
-    run_corners(CmlTb, "CML PI", "scratch/cmlpi.png")
+    results = run(ARCHS)
+    for (arch, lin) in results.items():
+        print(lin.report(arch))
+        plot(lin, arch, f"scratch/{arch}.png")
+    return results
@@ -20,11 +20,11 @@ in all cases, equal zero.
 import hdl21 as h
 
 # Local Imports
-from ...width import Width
-from ...logiccells import Inv, And2, And3, Or2, Buf, Xor2
-from ...quadclock import QuadClock
-from ...encoders import OneHotEncoder, ThermoEncoder3to8
-from ...triinv import TriInv
+from usb2phyana.width import Width
+from usb2phyana import logiccells
+from ..quadclock import QuadClock
+from usb2phyana.encoders import OneHotEncoder, ThermoEncoder3to8
+from ..triinv import TriInv
 
 
 @h.generator
@@ -49,15 +49,15 @@ def PiEncoder(p: Width) -> h.Module:
 
         ## MSB "Encoder"
         ### Really just a buffer and XOR
-        b0 = Buf(i=bin[-1], z=qmuxsel, VDD=VDD, VSS=VSS)
-        x0 = Xor2(a=bin[-1], b=bin[-2], z=imuxsel, VDD=VDD, VSS=VSS)
+        b0 = logiccells.Buf(i=bin[-1], z=qmuxsel, VDD=VDD, VSS=VSS)
+        x0 = logiccells.Xor2(a=bin[-1], b=bin[-2], z=imuxsel, VDD=VDD, VSS=VSS)
 
         ## Controls for sawtooth ramping: invert LSBs when Q leads
         therm_in = h.Signal(width=3, desc="Thermometer input")
-        xors = 3 * Xor2(a=bin[-2], b=bin[:-2], z=therm_in, VDD=VDD, VSS=VSS)
+        xors = 3 * logiccells.Xor2(a=bin[-2], b=bin[:-2], z=therm_in, VDD=VDD, VSS=VSS)
 
         ## Thermometer LSB Encoder
-        encoder = ThermoEncoder3to8(bin=therm_in, out=qtherm, en=en, VDD=VDD, VSS=VSS)
-        therm_invs = 8 * Inv(i=qtherm, z=itherm, VDD=VDD, VSS=VSS)
+        encoder = ThermoEncoder3to8()(bin=therm_in, out=qtherm, en=en, VDD=VDD, VSS=VSS)
+        therm_invs = 8 * logiccells.Inv(i=qtherm, z=itherm, VDD=VDD, VSS=VSS)
 
     return PiEncoder
@@ -3,17 +3,13 @@
 """
 # Hdl & PDK Imports
 import hdl21 as h
-import s130
-from s130 import MosParams
-
-nmos = s130.modules.nmos
-pmos = s130.modules.pmos
 
 # Local Imports
-from ...diff import Diff
-from ...quadclock import QuadClock
-from ...encoders import OneHotEncoder
-from ...triinv import TriInv
+from hdl21 import Diff
+from usb2phyana.pdk import s130
+from ..quadclock import QuadClock
+from usb2phyana.encoders import OneHotEncoder
+from ..triinv import TriInv
 
 
 @h.paramclass
@@ -28,8 +24,12 @@ def WeightInv(p: WeightInvParams) -> h.Module:
     m.VDD, m.VSS = h.Ports(2)
     m.i = h.Input()
     m.z = h.Output()
-    m.n = nmos(MosParams(w=1, m=p.weight))(d=m.z, g=m.i, s=m.VSS, b=m.VSS)
-    m.p = pmos(MosParams(w=2, m=p.weight))(d=m.z, g=m.i, s=m.VDD, b=m.VDD)
+    m.n = s130.modules.nmos(s130.MosParams(w=1, m=p.weight))(
+        d=m.z, g=m.i, s=m.VSS, b=m.VSS
+    )
+    m.p = s130.modules.pmos(s130.MosParams(w=2, m=p.weight))(
+        d=m.z, g=m.i, s=m.VDD, b=m.VDD
+    )
 
     return m
 
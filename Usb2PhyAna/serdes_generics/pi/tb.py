@@ -9,19 +9,18 @@ from typing import Sequence
 
 # PyPi Imports
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Hdl & PDK Imports
-import sitepdks as _
-import s130
+from usb2phyana.pdk import s130
 import hdl21 as h
 from hdl21.pdk import Corner
 from hdl21.sim import Sim, LinearSweep, SaveMode
-from hdl21.prefix import m, n
+from hdl21.prefix import m, n, PICO
 from vlsirtools.spice.sim_data import SimResult
 
 # Local Imports
-from ...tests.sim_options import sim_options
+from usb2phyana.tests.sim_options import sim_options
+from ..quadclockgen import QclkParams
 
 
 @h.paramclass
@@ -30,6 +29,17 @@ class TbParams:
     VDD = h.Param(dtype=h.Prefixed, desc="Supply Voltage Value", default=1800 * m)
     temper = h.Param(dtype=int, desc="Simulation Temperature (C)", default=25)
     code = h.Param(dtype=int, desc="PI Code", default=11)
+    period = h.Param(dtype=h.Prefixed, desc="Input Clock Period", default=2 * n)
+    arch = h.Param(
+        dtype=str,
+        desc="CMOS PI Architecture (cmospi, cmospi2, flashpi)",
+        default="cmospi2",
+    )
+
+
+def qclk(params: TbParams) -> QclkParams:
+    """Quadrature input-clock stimulus, per `params`"""
+    return QclkParams(v1=0 * m, v2=params.VDD, period=params.period, trf=100 * PICO)
 
 
 def sim_input(tb: h.Instantiable, params: TbParams) -> Sim:
@@ -74,24 +84,29 @@ def tdelay(results: SimResult) -> float:
 
     if not isinstance(results, SimResult):
         raise TypeError
-    print(results.an[0].measurements)
     # And return the delay value
     return results.an[0].measurements["tdelay"]
 
 
-def unwrap(delays: Sequence[float]) -> np.ndarray:
-    """A small bit of "data munging", to remove periodic wraps modulo the reference period."""
-    delays = np.array(delays) % 2e-9  # FIXME: testbench period here
+def unwrap(delays: Sequence[float], period: float) -> np.ndarray:
+    """A small bit of "data munging", to remove periodic wraps modulo the reference period `period`."""
+    delays = np.array(delays) % period
     amin = np.argmin(delays)
     delays = np.concatenate((delays[amin:], delays[:amin]))
     return delays
 
 
-def save_plot(delays: Sequence[float], label: str, fname: str = "scratch/delays.png"):
+def save_plot(
+    delays: Sequence[float],
+    label: str,
+    period: float,
+    fname: str = "scratch/delays.png",
+):
     """Save a plot of the delays.
-    Includes a small bit of "data munging", to remove periodic wraps modulo the reference period."""
+    Includes a small bit of "data munging", to remove periodic wraps modulo the reference period `period`."""
+    import matplotlib.pyplot as plt
 
-    delays = unwrap(delays)
+    delays = unwrap(delays, period)
     print(delays)
 
     # And save a plot of the results
@@ -13,12 +13,12 @@ from hdl21.primitives import Vdc, Idc
 
 # DUT Imports
 from .cmlpi import PhaseInterp
-from .tb import TbParams, tdelay
-from ...quadclock import QuadClock
-from ...cmlbuf import CmlBuf
-from ...cmlparams import CmlParams
-from ...tests.quadclockgen import QuadClockGen, QclkParams
-from ...tests.sim_options import sim_options
+from .tb import TbParams, qclk, tdelay
+from ..quadclock import QuadClock
+from ..cmlbuf import CmlBuf
+from ..cmlparams import CmlParams
+from ..quadclockgen import QuadClockGen
+from usb2phyana.tests.sim_options import sim_options
 
 
 @h.generator
@@ -35,8 +35,7 @@ def PhaseInterpTb(p: TbParams) -> h.Module:
 
     # Generate the input quadrature clock
     tb.ckq = ckq = QuadClock()
-    qckparams = QclkParams(v1=0 * m, v2=p.VDD, period=2 * n, trf=100 * PICO)
-    tb.ckgen = QuadClockGen(qckparams)(ckq=ckq, VSS=tb.VSS)
+    tb.ckgen = QuadClockGen(qclk(p))(ckq=ckq, VSS=tb.VSS)
 
     # Buffer both input clocks, pulling them into our CML levels
     tb.ckibuf = Diff()
@@ -102,7 +101,7 @@ def PhaseInterpTb(p: TbParams) -> h.Module:
     return tb
 
 
-from ...tests.sim_test_mode import SimTestMode
+from usb2phyana.tests.sim_test_mode import SimTestMode
 
 
 def test_phase_interp(simtestmode: SimTestMode):
@@ -128,4 +127,4 @@ def test_phase_interp(simtestmode: SimTestMode):
         results = h.sim.run(sims, opts=sim_options)
 
         delays = [tdelay(r) for r in results]
-        save_plot(delays, "CML PI", "scratch/cmlpi.png")
+        save_plot(delays, "CML PI", float(qclk(params[0]).period), "scratch/cmlpi.png")
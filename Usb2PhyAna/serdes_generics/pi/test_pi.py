@@ -12,11 +12,14 @@ from hdl21.prefix import m, n, PICO
 from hdl21.primitives import Vdc
 
 # DUT Imports
-from . import PhaseInterp
-from .tb import TbParams, tdelay
-from ...quadclock import QuadClock
-from ...tests.quadclockgen import QuadClockGen, QclkParams
-from ...tests.sim_options import sim_options
+from . import cmospi, cmospi2, flashpi
+from .tb import TbParams, qclk, tdelay
+from ..quadclock import QuadClock
+from ..quadclockgen import QuadClockGen
+from usb2phyana.tests.sim_options import sim_options
+
+# CMOS PI architectures, all sharing an interface, by `TbParams.arch`
+archs = dict(cmospi=cmospi, cmospi2=cmospi2, flashpi=flashpi)
 
 
 @h.generator
@@ -27,8 +30,7 @@ def PhaseInterpTb(p: TbParams) -> h.Module:
 
     # Generate the input quadrature clock
     tb.ckq = ckq = QuadClock()
-    ckp = QclkParams(v1=0 * m, v2=p.VDD, period=2 * n, trf=100 * PICO)
-    tb.ckgen = QuadClockGen(ckp)(ckq=ckq, VSS=tb.VSS)
+    tb.ckgen = QuadClockGen(qclk(p))(ckq=ckq, VSS=tb.VSS)
 
     # Generate and drive VDD
     tb.VDD = h.Signal()
@@ -67,13 +69,13 @@ def PhaseInterpTb(p: TbParams) -> h.Module:
     tb.vdckn = Vdc(Vdc.Params(dc=p.VDD / 2, ac=0 * m))(p=tb.dck.n, n=tb.VSS)
 
     # Finally, create the DUT
-    tb.dut = PhaseInterp(nbits=5)(
+    tb.dut = archs[p.arch].PhaseInterp(nbits=5)(
         VDD=tb.VDD, VSS=tb.VSS, ckq=tb.ckq, sel=tb.code, out=tb.dck
     )
     return tb
 
 
-from ...tests.sim_test_mode import SimTestMode
+from usb2phyana.tests.sim_test_mode import SimTestMode
 
 
 def test_phase_interp(simtestmode: SimTestMode):
@@ -99,4 +101,6 @@ def test_phase_interp(simtestmode: SimTestMode):
         results = h.sim.run(sims, opts=sim_options)
 
         delays = [tdelay(r) for r in results]
-        save_plot(delays, "CMOS PI", "scratch/cmospi.png")
+        save_plot(
+            delays, "CMOS PI", float(qclk(params[0]).period), "scratch/cmospi.png"
+        )
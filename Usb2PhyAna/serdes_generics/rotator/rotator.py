@@ -6,8 +6,8 @@
 import hdl21 as h
 
 # Local Imports
-from ..width import Width
-from ..logiccells import Inv, And2, FlopResetLow, FlopResetHigh
+from usb2phyana.width import Width
+from usb2phyana import logiccells
 
 
 @h.generator
@@ -29,16 +29,16 @@ def OneHotRotator(p: Width) -> h.Module:
     m.nxt = h.Signal(width=p.width, desc="Next state; D pins of state flops")
 
     # The core logic: each next-bit is the AND of the prior bit, and the inverse of the current bit.
-    m.out_invs = p.width * Inv()(i=m.out, z=m.outb, VDD=m.VDD, VSS=m.VSS)
-    m.ands = p.width * And2()(
+    m.out_invs = p.width * logiccells.Inv()(i=m.out, z=m.outb, VDD=m.VDD, VSS=m.VSS)
+    m.ands = p.width * logiccells.And2()(
         a=m.outb, b=h.Concat(m.out[-1], m.out[0:-1]), z=m.nxt, VDD=m.VDD, VSS=m.VSS
     )
     # LSB flop, output asserted while in reset
-    m.lsb_flop = FlopResetHigh()(
+    m.lsb_flop = logiccells.FlopResetHigh()(
         d=m.nxt[0], clk=m.sclk, q=m.out[0], rstn=m.rstn, VDD=m.VDD, VSS=m.VSS
     )
     # All other flops, outputs de-asserted in reset
-    m.flops = (p.width - 1) * FlopResetLow()(
+    m.flops = (p.width - 1) * logiccells.FlopResetLow()(
         d=m.nxt[1:], clk=m.sclk, q=m.out[1:], rstn=m.rstn, VDD=m.VDD, VSS=m.VSS
     )
 
@@ -5,15 +5,14 @@
 import io
 
 # HDL & PDK Imports
-import sitepdks as _
-import s130
+from usb2phyana.pdk import s130
 import hdl21 as h
 from hdl21.pdk import Corner
 from hdl21.prefix import m, n, p, f
 from hdl21.primitives import Vdc, Vpulse, Cap
 
 # DUT Imports
-from ..tests.sim_options import sim_options
+from usb2phyana.tests.sim_options import sim_options
 from .rotator import OneHotRotator
 
 
@@ -58,7 +57,7 @@ def rotator_tb() -> h.Module:
     return tb
 
 
-from ..tests.sim_test_mode import SimTestMode
+from usb2phyana.tests.sim_test_mode import SimTestMode
 
 
 def test_onehot_rotator(simtestmode: SimTestMode):
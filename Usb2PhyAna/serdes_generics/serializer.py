@@ -6,10 +6,10 @@
 import hdl21 as h
 
 # Local Imports
-from ..width import Width
-from ..encoders import OneHotEncoder
-from ..counter import Counter
-from ..triinv import TriInv
+from usb2phyana.width import Width
+from usb2phyana.encoders import OneHotEncoder
+from .counter import Counter
+from .triinv import TriInv
 
 
 @h.generator
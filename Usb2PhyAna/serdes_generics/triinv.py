@@ -4,14 +4,10 @@
 
 # Hdl & PDK Imports
 import hdl21 as h
-import s130
-from s130 import MosParams
-
-NmosLvt = s130.modules.nmos_lvt
-Pmos = s130.modules.pmos
 
 # Local Imports
-from .width import Width
+from usb2phyana.width import Width
+from usb2phyana.pdk import s130
 
 
 @h.generator
@@ -25,13 +21,21 @@ def TriInv(p: Width) -> h.Module:
     m.enb = h.Signal()
 
     # Enable inversion inverter
-    m.pinv = Pmos(MosParams(w=1, m=1))(d=m.enb, g=m.en, s=m.VDD, b=m.VDD)
-    m.ninv = NmosLvt(MosParams(w=1, m=1))(d=m.enb, g=m.en, s=m.VSS, b=m.VSS)
+    m.pinv = s130.modules.pmos(s130.MosParams(w=1, m=1))(
+        d=m.enb, g=m.en, s=m.VDD, b=m.VDD
+    )
+    m.ninv = s130.modules.nmos_lvt(s130.MosParams(w=1, m=1))(
+        d=m.enb, g=m.en, s=m.VSS, b=m.VSS
+    )
 
     # Main Tristate Inverter
-    m.pi = Pmos(MosParams(w=2, m=p.width))(g=m.i, s=m.VDD, b=m.VDD)
-    m.pe = Pmos(MosParams(w=2, m=p.width))(d=m.z, g=m.enb, s=m.pi.d, b=m.VDD)
-    m.ne = NmosLvt(MosParams(w=1, m=p.width))(d=m.z, g=m.en, b=m.VSS)
-    m.ni = NmosLvt(MosParams(w=1, m=p.width))(d=m.ne.s, g=m.i, s=m.VSS, b=m.VSS)
+    m.pi = s130.modules.pmos(s130.MosParams(w=2, m=p.width))(g=m.i, s=m.VDD, b=m.VDD)
+    m.pe = s130.modules.pmos(s130.MosParams(w=2, m=p.width))(
+        d=m.z, g=m.enb, s=m.pi.d, b=m.VDD
+    )
+    m.ne = s130.modules.nmos_lvt(s130.MosParams(w=1, m=p.width))(d=m.z, g=m.en, b=m.VSS)
+    m.ni = s130.modules.nmos_lvt(s130.MosParams(w=1, m=p.width))(
+        d=m.ne.s, g=m.i, s=m.VSS, b=m.VSS
+    )
 
     return m
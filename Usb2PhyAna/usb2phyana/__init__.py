@@ -1,5 +1,19 @@
-""" 
+"""
 USB 2.0 Phy Custom / Analog
 """
 
-from .phy import Usb2PhyAna, AnaDigBundle
+# The top-level exports are loaded lazily, on first attribute access.
+# Importing any `usb2phyana` sub-module (e.g. a test helper) otherwise pays for elaborating the full PHY hierarchy.
+__all__ = ["Usb2PhyAna", "AnaDigBundle"]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        from . import phy
+
+        return getattr(phy, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + __all__)
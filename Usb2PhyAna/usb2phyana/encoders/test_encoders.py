@@ -7,8 +7,7 @@
 import io
 
 # Hdl & PDK Imports
-import sitepdks as _
-import s130
+from ..pdk import s130
 import hdl21 as h
 from hdl21.pdk import Corner
 from hdl21.sim import Sim, LinearSweep, SaveMode
@@ -65,7 +64,7 @@ def ThermoEncoderTb(p: TbParams) -> h.Module:
     vcode(p.code)
 
     tb.therm = h.Signal(width=8)
-    tb.dut = ThermoEncoder3to8(
+    tb.dut = ThermoEncoder3to8()(
         VDD=tb.VDD, VSS=tb.VSS, bin=tb.code, out=tb.therm, en=tb.VDD
     )
     return tb
@@ -1,21 +1,29 @@
+import io
 from dataclasses import replace
 from pprint import pprint
+from typing import List, Optional, Sequence, Tuple
 
 # Hdl Imports
 import hdl21 as h
 import hdl21.sim as hs
+from vlsirtools.spice.sim_data import OpResult
 from hdl21.pdk import Corner
-from hdl21.prefix import m, µ, f, n, T, PICO
+from hdl21.prefix import m, µ, f, T, PICO
+
+# PyPi Imports
+import numpy as np
 
 # PDK Imports
-import s130
-import sitepdks as _
+from ..pdk import s130
 
 # Local Imports
 from .fcasc import Fcasc, UnityGainBuffer
-from ..pvt import Pvt
+from ..pvt import Pvt, Project, all_pvts
 from ..tests.sim_test_mode import SimTest, SimTestMode
 from ..tests.sim_options import sim_options
+from ..tests.supplyvals import SupplyVals
+from ..tests.acfeatures import AcFeatures, features, grid, out, sweep
+from ..tests.macromodel import Macro, Rational, extract
 
 
 @h.paramclass
@@ -52,7 +60,7 @@ def FcascTb(params: TbParams) -> h.Module:
     tb = hs.tb("FcascTb")
     # Generate and drive VDD
     tb.VDD = VDD = h.Signal()
-    tb.vvdd = h.Vdc(dc=1800 * m)(p=tb.VDD, n=tb.VSS)
+    tb.vvdd = h.Vdc(dc=SupplyVals.corner(params.pvt.v).VDD18)(p=tb.VDD, n=tb.VSS)
 
     # Input voltage
     tb.inp = h.Diff()
@@ -85,39 +93,83 @@ def FcascTb(params: TbParams) -> h.Module:
     return tb
 
 
-def sim_fcasc():
-    """# Fcasc Sims"""
+def ac_sim(tbgen: h.Generator, params: TbParams) -> hs.Sim:
+    """AC Sim of `tbgen` at `params`, including its PVT conditions"""
 
     # Create our parametric testbench
-    tb_ = FcascTb(TbParams())
+    tb_ = tbgen(params)
     s130.compile(tb_)
 
     # And simulation input for it
     @hs.sim
-    class FcascSim:
+    class AmpAcSim:
         tb = tb_
         op = hs.Op()
-        # tr = hs.Tran(tstop=20 * n)
-        ac = hs.Ac(sweep=hs.LogSweep(start=1, stop=1 * T, npts=10))
-        dc_gain = hs.Meas(analysis=ac, expr="find 'vdb(xtop.out)' at=1")
-        ugbw = hs.Meas(analysis=ac, expr="when vdb(xtop.out)=0")
+        ac = hs.Ac(sweep=hs.LogSweep(start=1, stop=1 * T, npts=20))
+        l = hs.Literal(
+            f"""
+            simulator lang=spice
+            .temp {Project.temper(params.pvt.t)}
+            simulator lang=spectre
+        """
+        )
+
+    AmpAcSim.add(*s130.install.include(params.pvt.p))
+    return AmpAcSim
+
 
-    FcascSim.add(*s130.install.include(Corner.TYP))
+def sim_ac(tbgen: h.Generator, fname: str) -> AcFeatures:
+    """Run a typical-case AC sim of `tbgen`, and plot its response to `fname`"""
 
-    # Run some spice
     opts = replace(sim_options, rundir="./scratch")
-    results = FcascSim.run(opts)
+    results = ac_sim(tbgen, TbParams()).run(opts)
     ac_result = results.an[1]
-    pprint(ac_result.data.keys())
-    pprint(ac_result.measurements)
+    result = features(ac_result.freq, out(ac_result))
+    pprint(result.point(0))
 
-    import numpy as np
     import matplotlib.pyplot as plt
 
-    plt.plot(ac_result.freq, np.abs(ac_result.data["xtop.out"]))
+    plt.plot(ac_result.freq, 20 * np.log10(np.abs(out(ac_result))))
     plt.xscale("log")
-    plt.yscale("log")
-    plt.savefig("scratch/Fcasc.ac.png")
+    plt.ylabel("Gain (dB)")
+    plt.savefig(fname)
+    return result
+
+
+def sim_fcasc():
+    """# Fcasc Sims"""
+    return sim_ac(FcascTb, "scratch/Fcasc.ac.png")
+
+
+def sweep_ac(tbgen: h.Generator, pvts: Sequence[Pvt]) -> AcFeatures:
+    """AC features of `tbgen` across the shared amplifier grid (`acfeatures.AXES`) and `pvts`, all in one batch"""
+    return sweep(TbParams(), sim=lambda p: ac_sim(tbgen, p), name=tbgen.name, pvts=pvts)
+
+
+def levels(op: OpResult) -> Tuple[float, float]:
+    """Input and output DC levels. Differential (`FcascTb`) inputs have none."""
+    return (op.data.get("xtop.inp", 0.0), op.data["xtop.out"])
+
+
+def macromodels(
+    tbgen: h.Generator, pvts: Optional[Sequence[Pvt]] = None, npoles: int = 6
+) -> List[Optional[Macro]]:
+    """
+    Pole-zero macromodels of the amp in `tbgen` at each of `pvts`, by default every corner, all simulated in one batch.
+    Realize each for top-level sims with e.g. `macro.module(like=Fcasc(h.Default), inp="inp", out="out")`.
+    """
+    points = grid(TbParams(), pvt=pvts if pvts is not None else all_pvts())
+    macros = extract(
+        points,
+        sim=lambda p: ac_sim(tbgen, p),
+        response=out,
+        levels=levels,
+        name=tbgen.name,
+        npoles=npoles,
+    )
+    for (params, macro) in zip(points, macros):
+        print(params.pvt, "failed" if macro is None else f"rms error {macro.rms:.2e}")
+    return macros
 
 
 # def test_fcasc():
@@ -132,7 +184,7 @@ def UnityGainTb(params: TbParams) -> h.Module:
     tb = hs.tb("UnityGainTb")
     # Generate and drive VDD
     tb.VDD = VDD = h.Signal()
-    tb.vvdd = h.Vdc(dc=1800 * m)(p=tb.VDD, n=tb.VSS)
+    tb.vvdd = h.Vdc(dc=SupplyVals.corner(params.pvt.v).VDD18)(p=tb.VDD, n=tb.VSS)
 
     # Input voltage
     tb.inp = h.Signal()
@@ -160,45 +212,62 @@ def UnityGainTb(params: TbParams) -> h.Module:
 
 def sim_unity_gain_buffer():
     """# UnityGain Sims"""
+    return sim_ac(UnityGainTb, "scratch/UnityGain.ac.png")
 
-    # Create our parametric testbench
-    tb_ = UnityGainTb(TbParams())
-    s130.compile(tb_)
 
-    # And simulation input for it
-    @hs.sim
-    class UnityGainSim:
-        tb = tb_
-        op = hs.Op()
-        # tr = hs.Tran(tstop=20 * n)
-        ac = hs.Ac(sweep=hs.LogSweep(start=1, stop=1 * T, npts=10))
-        dc_gain = hs.Meas(analysis=ac, expr="find 'vdb(xtop.out)' at=1")
+def test_unity_gain_buffer():
+    return sim_unity_gain_buffer()
 
-    UnityGainSim.add(*s130.install.include(Corner.TYP))
 
-    # Run some spice
-    opts = replace(sim_options, rundir="./scratch")
-    results = UnityGainSim.run(opts)
-    op_result = results.an[0]
-    print(op_result)
-    ac_result = results.an[1]
-    pprint(ac_result.measurements)
+class TestFcascSweep(SimTest):
+    """Fcasc AC-Feature Sweep"""
 
-    import numpy as np
-    import matplotlib.pyplot as plt
+    tbgen = FcascTb
 
-    plt.plot(ac_result.freq, np.abs(ac_result.data["xtop.out"]))
-    plt.xscale("log")
-    plt.yscale("log")
-    plt.savefig("scratch/UnityGain.ac.png")
+    def min(self):
+        return self.netlist()
 
+    def typ(self):
+        return sweep_ac(FcascTb, pvts=[Pvt()])
 
-def test_unity_gain_buffer():
-    return sim_unity_gain_buffer()
+    def max(self):
+        return sweep_ac(FcascTb, pvts=all_pvts())
+
+
+class TestUnityGainSweep(SimTest):
+    """Unity-Gain Buffer AC-Feature Sweep"""
+
+    tbgen = UnityGainTb
+
+    def min(self):
+        return self.netlist()
+
+    def typ(self):
+        return sweep_ac(UnityGainTb, pvts=[Pvt()])
+
+    def max(self):
+        return sweep_ac(UnityGainTb, pvts=all_pvts())
+
+
+class TestFcascMacro(SimTest):
+    """Fcasc Macromodel Extraction"""
+
+    tbgen = FcascTb
 
+    def min(self):
+        macro = Macro(
+            model=Rational(poles=np.array([-1e4]), residues=np.array([1e7]), d=0.0),
+            in_dc=0.0,
+            out_dc=0.9,
+            rms=0.0,
+        )
+        module = macro.module(like=Fcasc(h.Default), inp="inp", out="out")
+        h.netlist(module, dest=io.StringIO())
 
-# class UnityGainTest(SimTest):
-#     tbgen = UnityGainTb
+    def typ(self):
+        (macro,) = macromodels(FcascTb, pvts=[Pvt()])
+        assert macro is not None and macro.rms < 0.05
+        return macro
 
-#     def typ(self):
-#         return sim_unity_gain_buffer()
+    def max(self):
+        return macromodels(FcascTb) + macromodels(UnityGainTb)
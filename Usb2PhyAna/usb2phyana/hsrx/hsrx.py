@@ -12,7 +12,6 @@ from ..ilo import Ilo
 from ..pulse_gen import PulseGen
 from ..phyroles import PhyRoles
 from ..supplies import PhySupplies
-from ..logiccells import Nor2, Inv, Xor2
 
 
 @h.bundle
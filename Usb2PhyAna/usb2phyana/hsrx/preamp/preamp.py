@@ -9,18 +9,17 @@ from hdl21.primitives import R
 from hdl21 import Diff, Pair
 
 # PDK Imports
-import s130
-from s130 import IoMosParams
-
-PmosIo = s130.modules.pmos_v5
-Psf = PmosIo(IoMosParams(w=500 * m, l=500 * m, m=50))
-Pbias = PmosIo(IoMosParams(w=10, l=10, m=50))
+from ...pdk import s130
 
 
 @h.generator
 def PreAmp(_: h.HasNoParams) -> h.Module:
     """# RX Pre-Amp"""
 
+    PmosIo = s130.modules.pmos_v5
+    Psf = PmosIo(s130.IoMosParams(w=500 * m, l=500 * m, m=50))
+    Pbias = PmosIo(s130.IoMosParams(w=10, l=10, m=50))
+
     @h.module
     class PreAmp:
         # IO
@@ -3,25 +3,38 @@
 """
 
 import io
+from typing import List, Optional, Sequence, Tuple
+from dataclasses import asdict, replace
+
+import numpy as np
 
 # Hdl Imports
 import hdl21 as h
 import hdl21.sim as hs
+from vlsirtools.spice.sim_data import AcResult, OpResult
 from hdl21 import Diff
 from hdl21.pdk import Corner
 from hdl21.prefix import m, µ, f, n, T, PICO
 from hdl21.primitives import Vdc, Idc, C
 
 # PDK Imports
-import s130
-import sitepdks as _
+from ...pdk import s130
 
 
 # Local Imports
 from .preamp import PreAmp
-from ...tests.diffclockgen import DiffClkGen
+from ...tests.diffclockgen import DiffClkGen, DiffPulseGen
 from ...tests.sim_options import sim_options
 from ...tests.sim_test_mode import SimTestMode
+from ...tests import sim_runner
+from ...tests.result_store import result_store
+from ...tests.stateye import PulseResponse, EyeMetrics, stateye
+from ...tests.superposition import EdgeResponses
+from ...tests.patterns import prbs
+from ...tests import eye
+from ...tests.acfeatures import AcFeatures, features, grid, sweep
+from ...tests.macromodel import Macro, Rational, extract
+from ...pvt import TEMPERATURES, all_pvts
 
 
 @h.paramclass
@@ -59,6 +72,34 @@ class TbParams:
     ib = h.Param(dtype=h.Prefixed, desc="Bias Current Value (A)", default=1 * m)
     vc = h.Param(dtype=h.Prefixed, desc="Common-Mode Voltage (V)", default=200 * m)
     cl = h.Param(dtype=h.Prefixed, desc="Load Cap (Single-Ended) (F)", default=50 * f)
+    pulse = h.Param(
+        dtype=h.Optional[h.Prefixed],
+        desc="Width of a single input pulse, driven rather than a clock pattern",
+        default=None,
+    )
+    ac = h.Param(
+        dtype=bool,
+        desc="Drive the input from an AC balun, rather than a transient pattern",
+        default=False,
+    )
+
+
+# USB High-Speed Unit Interval, 1 / 480Mb/s
+UI = 2083 * PICO
+# Delay before the input pulse, for the bench to settle
+PULSE_DELAY = 2 * n
+# Input rise / fall time
+TRF = 100 * PICO
+# Time for the bench to settle after each input edge
+SETTLE = 20 * UI
+# Supply voltages of the slow, typical and fast voltage corners
+SUPPLIES = [2970 * m, 3300 * m, 3630 * m]
+# AC sweep axes: bias current, load capacitance and input common-mode
+AXES = dict(
+    ib=[100 * µ, 200 * µ, 500 * µ, 1 * m],
+    cl=[5 * f, 10 * f, 50 * f],
+    vc=[100 * m, 200 * m, 400 * m],
+)
 
 
 @h.generator
@@ -74,13 +115,18 @@ def PreAmpTb(p: TbParams) -> h.Module:
     # Input voltage
     tb.inp = Diff()
 
-    ## FIXME! we need different stimulus for Ac vs Tran, manage swapping between these
     ## For Ac: the "balun"
-    ## tb.balun = Balun(vc=p.vc)(diff=tb.inp, VSS=tb.VSS)
-    ## For Tran: generate a differential clock pattern
-    tb.ckg = DiffClkGen(
-        period=4 * n, delay=0 * m, vd=200 * m, vc=200 * m, trf=800 * PICO
-    )(ck=tb.inp, VSS=tb.VSS)
+    ## For Tran: generate a differential clock pattern, or a single pulse
+    if p.ac:
+        tb.balun = Balun(vc=p.vc)(diff=tb.inp, VSS=tb.VSS)
+    elif p.pulse is not None:
+        tb.pg = DiffPulseGen(
+            width=p.pulse, delay=PULSE_DELAY, vd=200 * m, vc=200 * m, trf=TRF
+        )(out=tb.inp, VSS=tb.VSS)
+    else:
+        tb.ckg = DiffClkGen(
+            period=4 * n, delay=0 * m, vd=200 * m, vc=200 * m, trf=800 * PICO
+        )(ck=tb.inp, VSS=tb.VSS)
 
     # Output & Load Caps
     tb.out = Diff()
@@ -141,3 +187,181 @@ def sim_preamp():
     # results = sim.run(sim_options)
 
     print(results)
+
+
+def ac_sim(params: TbParams) -> hs.Sim:
+    """AC Sim of the Pre-Amp bench at `params`, including its PVT conditions. Drives the input from the AC balun."""
+
+    params = replace(params, ac=True)
+
+    @hs.sim
+    class PreAmpAcSim:
+        tb = PreAmpTb(params)
+        op = hs.Op()
+        ac = hs.Ac(sweep=hs.LogSweep(start=1, stop=1 * T, npts=20))
+        l = hs.Literal(
+            f"""
+            simulator lang=spice
+            .temp {params.pvt.t}
+            simulator lang=spectre
+        """
+        )
+
+    PreAmpAcSim.add(*s130.install.include(params.pvt.p))
+    return PreAmpAcSim
+
+
+def vout(ac: AcResult) -> np.ndarray:
+    """Complex differential output response, per volt of differential input"""
+    return ac.data["xtop.out_p"] - ac.data["xtop.out_n"]
+
+
+def sweep_preamp(pvts: Optional[Sequence[Pvt]] = None, **axes) -> AcFeatures:
+    """
+    Pre-Amp AC features across a grid of bias current, load, common-mode and PVT, all in one batch.
+    Any of the grid's `axes` may be overridden, e.g. `ib=[200 * µ]`. PVT defaults to every corner.
+    """
+    if pvts is None:
+        pvts = all_pvts(Pvt, voltages=SUPPLIES, temperatures=TEMPERATURES)
+    return sweep(
+        TbParams(),
+        sim=ac_sim,
+        name="PreAmpTb",
+        pvts=pvts,
+        response=vout,
+        axes={**AXES, **axes},
+    )
+
+
+def levels(op: OpResult) -> Tuple[float, float]:
+    """Input and output common-mode levels"""
+    vic = (op.data["xtop.inp_p"] + op.data["xtop.inp_n"]) / 2
+    voc = (op.data["xtop.out_p"] + op.data["xtop.out_n"]) / 2
+    return (vic, voc)
+
+
+def macromodels(
+    pvts: Optional[Sequence[Pvt]] = None, npoles: int = 6
+) -> List[Optional[Macro]]:
+    """
+    Pole-zero macromodels of the Pre-Amp at each of `pvts`, by default every corner, all simulated in one batch.
+    Realize each for top-level sims with `macro.module(like=PreAmp(h.Default), inp="inp", out="out")`.
+    """
+    params = TbParams(pvt=Pvt(), vc=200 * m, cl=10 * f, ib=200 * µ)
+    points = grid(
+        params,
+        pvt=pvts
+        if pvts is not None
+        else all_pvts(Pvt, voltages=SUPPLIES, temperatures=TEMPERATURES),
+    )
+    macros = extract(
+        points,
+        sim=ac_sim,
+        response=vout,
+        levels=levels,
+        name="PreAmpTb",
+        npoles=npoles,
+    )
+    for (params, macro) in zip(points, macros):
+        print(params.pvt, "failed" if macro is None else f"rms error {macro.rms:.2e}")
+    return macros
+
+
+def test_preamp_macro(simtestmode: SimTestMode):
+    if simtestmode == SimTestMode.NETLIST:
+        macro = Macro(
+            model=Rational(poles=np.array([-1e9]), residues=np.array([3e9]), d=0.0),
+            in_dc=0.0,
+            out_dc=2.5,
+            rms=0.0,
+        )
+        module = macro.module(like=PreAmp(h.Default), inp="inp", out="out")
+        h.netlist(module, dest=io.StringIO())
+    elif simtestmode == SimTestMode.MIN:
+        (macro,) = macromodels(pvts=[Pvt()])
+        assert macro is not None and macro.rms < 0.05
+    elif simtestmode == SimTestMode.TYP:
+        macromodels(pvts=[Pvt(p) for p in [Corner.TYP, Corner.FAST, Corner.SLOW]])
+    else:
+        macromodels()
+
+
+def test_preamp_ac(simtestmode: SimTestMode):
+    if simtestmode == SimTestMode.NETLIST:
+        params = TbParams(pvt=Pvt(), vc=200 * m, cl=10 * f, ib=200 * µ, ac=True)
+        h.netlist(PreAmpTb(params), dest=io.StringIO())
+    elif simtestmode == SimTestMode.MIN:
+        params = TbParams(pvt=Pvt(), vc=200 * m, cl=10 * f, ib=200 * µ)
+        ac = ac_sim(params).run(sim_options).an[1]
+        print(features(ac.freq, vout(ac)).point(0))
+    elif simtestmode == SimTestMode.TYP:
+        sweep_preamp(pvts=[Pvt()])
+    else:
+        sweep_preamp()
+
+
+def test_preamp_eye(simtestmode: SimTestMode):
+    if simtestmode == SimTestMode.NETLIST:
+        params = TbParams(pvt=Pvt(), vc=200 * m, cl=10 * f, ib=200 * µ, pulse=UI)
+        h.netlist(PreAmpTb(params), dest=io.StringIO())
+    else:
+        sim_preamp_eye()
+
+
+def sim_preamp_pulse(pvt: Pvt, width: h.Prefixed) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate the Pre-Amp bench, driven by a single input pulse of `width`,
+    until `SETTLE` after the pulse ends. Returns the differential output voltage `(t, v)`."""
+
+    params = TbParams(pvt=pvt, vc=200 * m, cl=10 * f, ib=200 * µ, pulse=width)
+
+    @hs.sim
+    class PreAmpPulseSim:
+        tb = PreAmpTb(params)
+        tr = hs.Tran(tstop=PULSE_DELAY + width + SETTLE)
+
+    PreAmpPulseSim.add(*s130.install.include(pvt.p))
+
+    job = sim_runner.run_job(
+        PreAmpPulseSim, sim_options, store=result_store, corner=str(pvt)
+    )
+    if not job.ok:
+        raise RuntimeError(f"PreAmpTb failed: {job.failure.value}\n{job.log}")
+
+    tr = job.result.an[0]
+    return tr.data["time"], tr.data["xtop.out_p"] - tr.data["xtop.out_n"]
+
+
+def sim_preamp_eye(pvt: Pvt = Pvt(), rj: float = 0, dj: float = 0) -> EyeMetrics:
+    """Pre-Amp statistical eye, from a single pulse-response sim.
+    Optionally adds random jitter of RMS `rj` and deterministic jitter of peak-to-peak `dj`, in seconds."""
+
+    t, vout = sim_preamp_pulse(pvt, width=UI)
+    pr = PulseResponse.from_tran(t, vout, ui=float(UI), delay=float(PULSE_DELAY))
+    metrics = stateye(pr, rj=rj, dj=dj).metrics(ber=1e-12)
+    result_store.put("stateye", dict(tb="PreAmpTb", corner=str(pvt), **asdict(metrics)))
+    print(metrics)
+    return metrics
+
+
+def test_preamp_edges(simtestmode: SimTestMode):
+    if simtestmode == SimTestMode.NETLIST:
+        params = TbParams(pvt=Pvt(), vc=200 * m, cl=10 * f, ib=200 * µ, pulse=SETTLE)
+        h.netlist(PreAmpTb(params), dest=io.StringIO())
+    else:
+        # Synthesize a long PRBS pattern from the edge responses, and measure its eye
+        edges = sim_preamp_edges()
+        vout = edges.synthesize(prbs(15, 100_000))
+        result = eye.measure(eye.fold(edges.time(len(vout)), vout, ui=float(UI)))
+        eye.record(result, tb="PreAmpTb", corner=str(Pvt()), source="superposition")
+        print(result)
+
+
+def sim_preamp_edges(pvt: Pvt = Pvt()) -> EdgeResponses:
+    """Pre-Amp rising and falling edge responses.
+    For synthesizing long-pattern waveforms with `EdgeResponses.synthesize`."""
+
+    t, vout = sim_preamp_pulse(pvt, width=SETTLE)
+    # Input edges are at the fifty-percent points of the input pulse
+    rise = float(PULSE_DELAY) + float(TRF) / 2
+    fall = rise + float(SETTLE)
+    return EdgeResponses.from_tran(t, vout, ui=float(UI), rise=rise, fall=fall)
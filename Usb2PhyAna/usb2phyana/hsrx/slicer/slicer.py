@@ -8,18 +8,18 @@ FIXME: sizing of all transistors, all of which are thus far default values.
 import hdl21 as h
 from hdl21 import Diff, Pair
 
-import s130
-from s130 import MosParams
-
-# Create the default-param'ed NMOS and PMOS
-Pmos = s130.modules.pmos(MosParams())
-Nmos = s130.modules.nmos_lvt(MosParams())
+# PDK Imports
+from ...pdk import s130
 
 
 @h.generator
 def Slicer(_: h.HasNoParams) -> h.Module:
     """# StrongArm Based Slicer Generator"""
 
+    # Create the default-param'ed NMOS and PMOS
+    Pmos = s130.modules.pmos(s130.MosParams())
+    Nmos = s130.modules.nmos_lvt(s130.MosParams())
+
     @h.module
     class Nor2:
         """# Nor2 for SR Latch
@@ -3,6 +3,9 @@
 """
 
 import io
+from typing import Hashable, List, Sequence, Tuple
+
+import numpy as np
 
 # Hdl & PDK Imports
 import hdl21 as h
@@ -12,11 +15,16 @@ from hdl21.pdk import Corner
 from hdl21.sim import Sim, LogSweep
 from hdl21.prefix import m, µ, f, n, PICO
 from hdl21.primitives import Vdc, Idc, C, Vpulse
-import s130
-import sitepdks as _
+from ...pdk import s130
 
 from ...tests.sim_options import sim_options
 from ...tests.diffclockgen import DiffClkGen, DiffClkParams
+from ...tests import sim_runner
+from ...tests.result_store import result_store
+from ...tests.mismatch import variant
+from ...tests.highsigma import YieldEstimate, highsigma
+from ...tests.search import Bracket, bisect
+from ...tests.metastability import TauFit, decision_times, fit_tau
 
 # DUT Imports
 from .slicer import Slicer
@@ -99,21 +107,217 @@ def test_slicer(simtestmode: SimTestMode):
         sim_slicer()
 
 
-def sim_slicer():
-    """Slicer Test(s)"""
-
-    # Create our parametric testbench
-    params = TbParams(pvt=Pvt(), vc=900 * m, vd=1 * m)
+def sim_input(testbench: h.Module, pvt: Pvt) -> hs.Sim:
+    """Transient Sim of `testbench`, at conditions `pvt`. Clocks a decision every 2ns."""
 
     # Create our simulation input
     @hs.sim
     class SlicerSim:
-        tb = SlicerTb(params)
+        tb = testbench
         tr = hs.Tran(tstop=12 * n)
+        l = hs.Literal(
+            f"""
+            simulator lang=spice
+            .temp {pvt.t}
+            simulator lang=spectre
+        """
+        )
 
     # Add the PDK dependencies
-    SlicerSim.add(*s130.install.include(params.pvt.p))
+    SlicerSim.add(*s130.install.include(pvt.p))
+    return SlicerSim
+
+
+def sim_slicer():
+    """Slicer Test(s)"""
+
+    # Create our parametric testbench
+    params = TbParams(pvt=Pvt(), vc=900 * m, vd=1 * m)
 
     # Run some spice
-    results = SlicerSim.run(sim_options)
+    results = sim_input(SlicerTb(params), params.pvt).run(sim_options)
     print(results)
+
+
+# Decision times (s): rising clock edges, once the input and latch have settled after startup
+DECISIONS = np.arange(2, 12, 2) * 1e-9
+
+
+def errors(result: hs.SimResult) -> int:
+    """
+    Number of wrong decisions, comparing the sign of the latched output just before each next decision to that of the input at its clock edge.
+    Agnostic to the slicer's polarity: whichever of agreeing or disagreeing decisions are fewer are errors.
+    """
+    tr = result.an[0].data
+    t = tr["time"]
+    vin = np.interp(DECISIONS, t, tr["xtop.inp_p"] - tr["xtop.inp_n"])
+    vout = np.interp(DECISIONS + 1.9e-9, t, tr["xtop.out_p"] - tr["xtop.out_n"])
+    # Outputs within half their largest swing of zero are undecided, and always errors
+    decided = np.abs(vout) > np.max(np.abs(vout)) / 2
+    agree = int(np.sum(decided & (np.sign(vin) == np.sign(vout))))
+    disagree = int(np.sum(decided)) - agree
+    return min(agree, disagree) + int(np.sum(~decided))
+
+
+def offset_yield(
+    pvt: Pvt = Pvt(), vd: h.Prefixed = 10 * m, runs: int = 100
+) -> YieldEstimate:
+    """
+    High-sigma probability that mismatch offsets the slicer by more than differential input `vd`, making a wrong decision.
+    Offsets of either polarity fail, as the input alternates.
+    """
+
+    def fails(job: sim_runner.JobResult) -> bool:
+        return errors(job.result) > 0
+
+    return highsigma(
+        tb=SlicerTb(TbParams(pvt=pvt, vd=vd)),
+        sim=lambda tb: sim_input(tb, pvt),
+        fails=fails,
+        name=f"offset_{float(vd) * 1e3:g}mV",
+        corner=str(pvt),
+        runs=runs,
+        multiplicity=2,
+    )
+
+
+def test_slicer_offset_yield(simtestmode: SimTestMode):
+    """Test Slicer Offset Yield"""
+
+    if simtestmode == SimTestMode.NETLIST:
+        tb = variant(SlicerTb(TbParams(pvt=Pvt(), vd=10 * m)), seed=0)
+        h.netlist(tb, dest=io.StringIO())
+    elif simtestmode == SimTestMode.MIN:
+        offset_yield(runs=16)
+    else:
+        offset_yield()
+
+
+# Characterization conditions: typical, and the slow and fast extremes
+conditions = [
+    Pvt(),
+    Pvt(p=Corner.SLOW, v=1620 * m, t=75),
+    Pvt(p=Corner.FAST, v=1980 * m, t=-25),
+]
+
+# Decision budget (s): the clock's high phase, after which the StrongArm resets
+BUDGET = 1e-9
+
+# Differential inputs (mV) of the decision-time curves
+VDS = np.logspace(-3, 2, 11)
+
+# Largest input (mV) fit for the regeneration time constant.
+# Larger inputs are resolved by the input pair's large-signal current, rather than by regeneration.
+VMAX = 10
+
+# Result-store table names
+SENSITIVITY_TABLE = "slicer_sensitivity"
+TAU_TABLE = "slicer_tau"
+
+
+def clk_to_q(result: hs.SimResult) -> np.ndarray:
+    """
+    Clock-to-Q delay (s) of each of `DECISIONS`: from the clock edge to the flip of the latched output.
+    The input alternates every decision, so every correct decision flips the output.
+    NaN where a decision is not resolved within `BUDGET`.
+    """
+    tr = result.an[0].data
+    vout = tr["xtop.out_p"] - tr["xtop.out_n"]
+    return decision_times(tr["time"], vout, DECISIONS, window=BUDGET)
+
+
+def sim_vds(points: Sequence[Tuple[Pvt, float]]) -> List[np.ndarray]:
+    """Clock-to-Q delays at each `(pvt, vd)` pair, with `vd` in mV, all simulated in one batch. All NaN for failed sims, or wrong decisions."""
+    sims = [
+        sim_input(SlicerTb(TbParams(pvt=pvt, vd=vd * m)), pvt) for (pvt, vd) in points
+    ]
+    jobs = sim_runner.run(
+        sims,
+        sim_options,
+        store=result_store,
+        corner=lambda idx: str(points[idx][0]),
+    )
+    nan = np.full(len(DECISIONS), np.nan)
+    return [
+        clk_to_q(job.result) if job.ok and errors(job.result) == 0 else nan
+        for job in jobs
+    ]
+
+
+def sensitivity(
+    conds: Sequence[Pvt] = conditions,
+    lo: float = 1e-3,
+    hi: float = 100,
+    rtol: float = 0.05,
+) -> List[Bracket]:
+    """
+    Sensitivity: the smallest differential input (mV) which every decision resolves, correctly and within `BUDGET`, at each of `conds`.
+    Bisects geometrically between `lo` and `hi`, all conditions concurrently (`tests/search.py`).
+    The sensitivity is each bracket's `hi`; infinite if even `hi` fails.
+    """
+
+    def evaluate(points: List[Tuple[Hashable, float]]) -> List[bool]:
+        delays = sim_vds([(conds[idx], vd) for (idx, vd) in points])
+        # `bisect` searches for the largest "passing" value: here, the largest input which fails to resolve
+        return [not np.all(np.isfinite(d)) for d in delays]
+
+    brackets = bisect(evaluate, range(len(conds)), lo=lo, hi=hi, rtol=rtol, log=True)
+
+    results = [brackets[idx] for idx in range(len(conds))]
+    for (pvt, b) in zip(conds, results):
+        vd_min = None if b.passed_all else b.hi
+        print(f"{pvt}: sensitivity {vd_min} mV, in {b.evaluations} sims")
+        result_store.put(
+            SENSITIVITY_TABLE,
+            dict(corner=str(pvt), vd_min=vd_min, evaluations=b.evaluations),
+        )
+    return results
+
+
+def metastability(
+    conds: Sequence[Pvt] = conditions, vds: Sequence[float] = VDS
+) -> List[TauFit]:
+    """
+    Decision-time curves, clock-to-Q versus differential input `vds` (mV), at each of `conds`, all simulated in one batch.
+    Fits each curve's regeneration time constant, and records the curves and fits to the result store.
+    """
+    delays = sim_vds([(pvt, vd) for pvt in conds for vd in vds])
+    # Mean delay per input, over its decisions. NaN if any is unresolved.
+    curves = np.array([np.mean(d) for d in delays]).reshape(len(conds), len(vds))
+
+    fits = []
+    for (pvt, curve) in zip(conds, curves):
+        fit = fit_tau(np.asarray(vds) * 1e-3, curve, vmax=VMAX * 1e-3)
+        fits.append(fit)
+        print(
+            f"{pvt}: tau {fit.tau * 1e12:.1f}ps, t0 {fit.t0 * 1e12:.1f}ps, r2 {fit.r2:.4f}"
+        )
+        result_store.put(
+            TAU_TABLE,
+            dict(
+                corner=str(pvt),
+                vd=[float(vd) for vd in vds],
+                delay=[float(d) for d in curve],
+                tau=float(fit.tau),
+                t0=float(fit.t0),
+                r2=float(fit.r2),
+                vd_budget=fit.sensitivity(BUDGET) * 1e3,
+            ),
+        )
+    return fits
+
+
+def test_slicer_metastability(simtestmode: SimTestMode):
+    """Test Slicer Sensitivity, Decision Time, and Metastability"""
+
+    if simtestmode == SimTestMode.NETLIST:
+        params = TbParams(pvt=conditions[1], vd=10 * µ)
+        h.netlist(SlicerTb(params), dest=io.StringIO())
+    elif simtestmode == SimTestMode.MIN:
+        metastability(conds=[Pvt()], vds=[1e-2, 1e-1, 1])
+    elif simtestmode == SimTestMode.TYP:
+        sensitivity(conds=[Pvt()])
+        metastability(conds=[Pvt()])
+    else:
+        sensitivity()
+        metastability()
@@ -2,6 +2,13 @@
 # High-Speed RX Tests
 """
 
+# Std-Lib Imports
+import io
+from pathlib import Path
+
+# PyPi Imports
+import numpy as np
+
 # Hdl Imports
 import hdl21 as h
 import hdl21.sim as hs
@@ -10,15 +17,18 @@ from hdl21.prefix import m, µ, f, n, T, p, PICO
 from hdl21.primitives import Vdc, Vpulse, Idc, C
 
 # PDK Imports
-import s130
-import sitepdks as _
+from ...pdk import s130
 
 # Local Imports
 from ...tests.sim_options import sim_options
+from ...tests import sim_runner
+from ...tests.result_store import result_store
 from ...tests.supplyvals import SupplyVals
 from ...tests.diffclockgen import DiffClkGen
+from ...tests.pwlgen import DiffPwlParams, DiffPwlGen, diff_pwl
+from ...tests.patterns import Pid, hs_packet, hs_packets
 from ...tests.vcode import Vcode
-from ...tests.sim_test_mode import SimTest
+from ...tests.sim_test_mode import SimTest, SimTestMode
 from ..hsrx import HsRx
 from ...ilo import IloParams
 
@@ -40,6 +50,17 @@ class TbParams:
     )
     ib = h.Param(dtype=h.Optional[h.Prefixed], desc="Bias Current", default=120 * µ)
     code = h.Param(dtype=int, desc="Fctrl Dac Code", default=16)
+    pwl = h.Param(
+        dtype=h.Optional[DiffPwlParams],
+        desc="PWL pad data pattern, driven rather than a clock pattern",
+        default=None,
+    )
+
+
+# USB High-Speed Unit Interval, 1 / 480Mb/s
+UI = 2083 * p
+# Delay before the pad data pattern
+DATA_DELAY = 125 * p
 
 
 @h.generator
@@ -58,10 +79,13 @@ def HsRxTb(params: TbParams) -> h.Module:
 
     # Pad data generator
     tb.pads = pads = h.Diff()
-    data_gen_params = DiffClkGen.Params(
-        period=4167 * p, delay=125 * p, vc=200 * m, vd=400 * m, trf=800 * p
-    )
-    tb.ckgen = DiffClkGen(data_gen_params)(ck=pads, VSS=tb.VSS)
+    if params.pwl is not None:
+        tb.datagen = DiffPwlGen(params.pwl)(out=pads, VSS=tb.VSS)
+    else:
+        data_gen_params = DiffClkGen.Params(
+            period=4167 * p, delay=DATA_DELAY, vc=200 * m, vd=400 * m, trf=800 * p
+        )
+        tb.ckgen = DiffClkGen(data_gen_params)(ck=pads, VSS=tb.VSS)
 
     # Frequency DAC Code
     tb.fctrl = fctrl = h.Signal(width=5)
@@ -134,6 +158,71 @@ def sim_hsrx():
     print(results)
 
 
+def packets_stim(dest: Path = Path("scratch")) -> DiffPwlParams:
+    """Write the pad waveforms of a few USB High-Speed packets, under directory `dest`.
+    A 400mV differential swing about a 200mV common mode.
+    The SE0 of the idle bus is differentially zero, at the common mode."""
+    levels = packets_levels()
+    return diff_pwl(
+        Path(dest) / "HsRxTb.packets",
+        levels,
+        ui=float(UI),
+        trf=500e-12,
+        vc=0.2,
+        vd=0.4,
+        delay=float(DATA_DELAY),
+    )
+
+
+def packets_levels() -> np.ndarray:
+    """Line states, per UI, of the packets of `packets_stim`"""
+    return hs_packets(
+        [
+            hs_packet(Pid.DATA0, bytes(range(16))),
+            hs_packet(Pid.ACK),
+        ]
+    )
+
+
+def test_hsrx_packets(simtestmode: SimTestMode, tmp_path: Path):
+    """Test HS RX, receiving a few USB High-Speed packets"""
+    if simtestmode == SimTestMode.NETLIST:
+        params = TbParams(pwl=packets_stim(dest=tmp_path))
+        h.netlist(HsRxTb(params), dest=io.StringIO())
+    else:
+        sim_hsrx_packets()
+
+
+def sim_hsrx_packets(pvt: Pvt = Pvt()) -> hs.SimResult:
+    """High Speed RX, receiving a few USB High-Speed packets"""
+
+    params = TbParams(pvt=pvt, pwl=packets_stim())
+
+    @hs.sim
+    class HsrxPacketSim:
+        tb = HsRxTb(params)
+        tr = hs.Tran(tstop=DATA_DELAY + len(packets_levels()) * UI)
+        l = hs.Literal(
+            f"""
+            simulator lang=spice
+            .ic xtop.stg0_p 900m
+            .ic xtop.stg0_n 0
+            .temp {params.pvt.t}
+            simulator lang=spectre
+        """
+        )
+        i = hs.Include(s130.resources / "stdcells.sp")
+
+    HsrxPacketSim.add(*s130.install.include(params.pvt.p))
+
+    (job,) = sim_runner.run(
+        [HsrxPacketSim], sim_options, store=result_store, corner=str(pvt)
+    )
+    (result,) = sim_runner.results([job])
+    print(result)
+    return result
+
+
 class TestHsRx(SimTest):
     """High-Speed RX Test(s)"""
 
@@ -0,0 +1,214 @@
+"""
+# High-Speed RX Jitter Tolerance
+
+Largest sinusoidal jitter (SJ) the RX tolerates without slicer errors, at each of several jitter frequencies,
+on top of a fixed random jitter (RJ). Each sim drives `HsRxTb` with a jittered PRBS7 PWL pattern,
+and compares the slicer's output bits to those transmitted.
+
+The amplitude search per frequency is a parallel bisection (`tests/search.py`).
+Within each batch, once a frequency fails at one amplitude, its not-yet-started sims at larger amplitudes are skipped.
+"""
+
+# Std-Lib Imports
+import io, re, threading
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+import hdl21.sim as hs
+
+# PDK Imports
+from ...pdk import s130
+
+# Local Imports
+from .test_hsrx import HsRxTb, TbParams, Pvt, UI, DATA_DELAY
+from ...tests.sim_options import sim_options
+from ...tests.supplyvals import SupplyVals
+from ...tests.sim_test_mode import SimTestMode
+from ...tests import sim_runner
+from ...tests.result_store import result_store
+from ...tests.pwlgen import DiffPwlParams, diff_pwl
+from ...tests.patterns import prbs, align, first_error
+from ...tests.eye import crossings
+from ...tests.search import Bracket, bisect
+
+# Result-store table name
+TABLE = "jtol"
+
+# Bits ignored at the start of each sim, while the CDR locks
+LOCK_BITS = 200
+# Bits ignored at the end of each sim, still in flight through the RX
+TAIL_BITS = 16
+# Default SJ frequencies (Hz)
+FREQS = (1e6, 4e6, 16e6, 48e6)
+# Default RJ (UI, RMS)
+RJ = 0.01
+
+
+@dataclass(frozen=True)
+class Jitter:
+    """# Jitter Stimulus Parameters"""
+
+    freq: float  # SJ frequency (Hz)
+    amp: float  # SJ amplitude (UI, peak)
+    rj: float  # RJ (UI, RMS)
+
+
+def nbits(freq: float) -> int:
+    """Pattern length for SJ at `freq`: the lock period, plus at least two SJ periods"""
+    return LOCK_BITS + max(500, int(np.ceil(2 / (freq * float(UI)))))
+
+
+def stimulus(
+    jitter: Jitter, pvt: Pvt, seed: int = 0, dest: Path = Path("scratch/jtol")
+) -> Tuple[DiffPwlParams, np.ndarray]:
+    """Write the PWL pad stimulus for `jitter`, under directory `dest`. Returns its `DiffPwlGen` parameters, and the transmitted bits."""
+    ui = float(UI)
+    bits = prbs(7, nbits(jitter.freq))
+
+    # Time-interval error of each UI boundary
+    tk = ui * np.arange(1, len(bits))
+    rng = np.random.default_rng(seed)
+    tie = jitter.amp * np.sin(
+        2 * np.pi * jitter.freq * tk
+    ) + jitter.rj * rng.standard_normal(len(tk))
+
+    corner = re.sub(r"[^\w.\-]", "_", str(pvt))
+    path = Path(dest) / corner / f"f{jitter.freq:.3e}_a{jitter.amp:.4f}"
+    stim = diff_pwl(
+        path,
+        2 * bits.astype(int) - 1,
+        ui=ui,
+        trf=300e-12,
+        vc=0.2,
+        vd=0.4,
+        delay=float(DATA_DELAY),
+        jitter=ui * tie,
+    )
+    return stim, bits
+
+
+def jtol_sim(stim: DiffPwlParams, pvt: Pvt, nbits: int) -> hs.Sim:
+    """Simulation of `HsRxTb`, driven by `stim`"""
+
+    params = TbParams(pvt=pvt, pwl=stim)
+
+    @hs.sim
+    class HsRxJtolSim:
+        tb = HsRxTb(params)
+        tr = hs.Tran(tstop=DATA_DELAY + nbits * UI)
+        l = hs.Literal(
+            f"""
+            simulator lang=spice
+            .ic xtop.stg0_p 900m
+            .ic xtop.stg0_n 0
+            .temp {pvt.t}
+            simulator lang=spectre
+        """
+        )
+        i = hs.Include(s130.resources / "stdcells.sp")
+
+    HsRxJtolSim.add(*s130.install.include(pvt.p))
+    return HsRxJtolSim
+
+
+def received(result: hs.SimResult, vdd: float) -> np.ndarray:
+    """Slicer output bits: `sdata` at each rising edge of the recovered clock `sck`, which the slicer's latch holds until then"""
+    tr = result.an[0]
+    t, sck, sdata = tr.data["time"], tr.data["xtop.sck"], tr.data["xtop.sdata"]
+    edges = crossings(t, sck, vdd / 2, rising=True)
+    return np.interp(edges, t, sdata) > vdd / 2
+
+
+def passes(result: hs.SimResult, bits: np.ndarray, vdd: float) -> bool:
+    """Whether the RX received `bits` without error, once locked"""
+    rx = received(result, vdd)[LOCK_BITS - 32 :]
+    tx = bits[LOCK_BITS:-TAIL_BITS]
+    if len(rx) < len(tx):
+        return False  # Lost clock edges
+    lag, inverted = align(rx, tx, maxlag=min(64, len(rx) - len(tx)))
+    return first_error(rx, tx, lag, inverted) is None
+
+
+def jtol(
+    pvt: Pvt = Pvt(),
+    freqs: Sequence[float] = FREQS,
+    rj: float = RJ,
+    lo: float = 0.05,
+    hi: float = 1.0,
+    rtol: float = 0.1,
+    width: int = 2,
+) -> Dict[float, Bracket]:
+    """
+    Jitter tolerance at `pvt`: the largest SJ amplitude, in UI, passing at each of `freqs`, searched between `lo` and `hi`.
+    Records each to the result store.
+    Note `hi` is limited by the stimulus: SJ slew of `2 * pi * freq * amp * UI` must leave successive edges in order.
+    """
+    vdd = float(SupplyVals.corner(pvt.v).VDD18)
+
+    def evaluate(points: List[Tuple[float, float]]) -> List[bool]:
+        trials = [stimulus(Jitter(freq, amp, rj), pvt) for (freq, amp) in points]
+        sims = [jtol_sim(stim, pvt, len(bits)) for (stim, bits) in trials]
+
+        # Lowest failing amplitude per frequency, so far in this batch
+        failed: Dict[float, float] = dict()
+        lock = threading.Lock()
+        outcomes = [False] * len(points)
+
+        def done(idx: int, job: sim_runner.JobResult) -> None:
+            outcomes[idx] = job.ok and passes(job.result, trials[idx][1], vdd)
+            if not outcomes[idx]:
+                (freq, amp) = points[idx]
+                with lock:
+                    failed[freq] = min(amp, failed.get(freq, amp))
+
+        def skip(idx: int) -> bool:
+            (freq, amp) = points[idx]
+            with lock:
+                return amp > failed.get(freq, np.inf)
+
+        sim_runner.run(
+            sims, sim_options, store=result_store, corner=str(pvt), skip=skip, done=done
+        )
+        return outcomes
+
+    brackets = bisect(
+        evaluate, list(freqs), lo=lo, hi=hi, rtol=rtol, width=width, log=True
+    )
+
+    for (freq, b) in brackets.items():
+        result_store.put(
+            TABLE,
+            dict(
+                tb="HsRxTb",
+                corner=str(pvt),
+                freq=freq,
+                rj=rj,
+                tolerance=b.lo,
+                fails=None if b.passed_all else b.hi,
+                evaluations=b.evaluations,
+            ),
+        )
+        print(
+            f"SJ {freq / 1e6:8.2f}MHz: {b.lo:.3f}UI {'(all passed)' if b.passed_all else ''}"
+        )
+    return brackets
+
+
+def test_jtol(simtestmode: SimTestMode, tmp_path: Path):
+    if simtestmode == SimTestMode.NETLIST:
+        jitter = Jitter(freq=FREQS[0], amp=0.1, rj=RJ)
+        stim, bits = stimulus(jitter, Pvt(), dest=tmp_path)
+        assert len(bits) == nbits(jitter.freq)
+        netlist = io.StringIO()
+        h.netlist(HsRxTb(TbParams(pwl=stim)), dest=netlist)
+        assert stim.p in netlist.getvalue() and stim.n in netlist.getvalue()
+    elif simtestmode == SimTestMode.MIN:
+        jtol(freqs=FREQS[-1:], rtol=0.5)
+    else:
+        jtol()
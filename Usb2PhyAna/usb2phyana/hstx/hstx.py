@@ -8,16 +8,8 @@ from enum import Enum, auto
 import hdl21 as h
 from hdl21 import Diff
 
-import s130
-from s130 import IoMosParams
-
-Pmos = s130.modules.pmos
-PmosV5 = s130.modules.pmos_v5
-NmosV5 = s130.modules.nmos_v5
-Nmos = s130.modules.nmos
-NmosLvt = s130.modules.nmos_lvt
-
 # Local Imports
+from ..pdk import s130
 from ..supplies import PhySupplies
 from ..phyroles import PhyRoles
 
@@ -63,10 +55,10 @@ def CmosPreDriver(_: h.HasNoParams) -> h.Module:
     m.out = h.Output()
 
     # This right here is the fun transistor, where the 1.8-3.3V dependency is injected!
-    m.pdata = Pmos(m=60)(d=m.out, g=m.datab_1v8, s=m.VDD18, b=m.VDD33)
-    m.pen = PmosV5(m=4)(d=m.out, g=m.en_3v3, s=m.VDD33, b=m.VDD33)
-    m.nen = NmosV5(m=20)(d=m.out, g=m.en_3v3, b=m.VSS)
-    m.data = NmosLvt(m=40)(d=m.nen.s, g=m.datab_1v8, s=m.VSS, b=m.VSS)
+    m.pdata = s130.modules.pmos(m=60)(d=m.out, g=m.datab_1v8, s=m.VDD18, b=m.VDD33)
+    m.pen = s130.modules.pmos_v5(m=4)(d=m.out, g=m.en_3v3, s=m.VDD33, b=m.VDD33)
+    m.nen = s130.modules.nmos_v5(m=20)(d=m.out, g=m.en_3v3, b=m.VSS)
+    m.data = s130.modules.nmos_lvt(m=40)(d=m.nen.s, g=m.datab_1v8, s=m.VSS, b=m.VSS)
 
     return m
 
@@ -77,9 +69,9 @@ def HsTxDriver(_: h.HasNoParams) -> h.Module:
 
     # Define a few reused device-parameter combos
     MIRROR_RATIO = 170  # ?!?!
-    PswitchMini = PmosV5(IoMosParams(m=4))
-    Pswitch = PmosV5(IoMosParams(m=4 * MIRROR_RATIO))
-    Pbias = PmosV5(IoMosParams(l=1, m=10))
+    PswitchMini = s130.modules.pmos_v5(s130.IoMosParams(m=4))
+    Pswitch = s130.modules.pmos_v5(s130.IoMosParams(m=4 * MIRROR_RATIO))
+    Pbias = s130.modules.pmos_v5(s130.IoMosParams(l=1, m=10))
 
     m = h.Module()
 
@@ -2,7 +2,7 @@
 # High-Speed TX Tests
 """
 
-import sys, pickle, os, pytest
+import io, sys, pickle, os, pytest
 from typing import List, Tuple, Optional
 from dataclasses import asdict
 from copy import copy
@@ -10,7 +10,6 @@ from pathlib import Path
 
 from pydantic.dataclasses import dataclass
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Hdl & PDK Imports
 import hdl21 as h
@@ -19,13 +18,22 @@ from hdl21.pdk import Corner
 from hdl21.sim import Sim, LogSweep
 from hdl21.prefix import m, µ, f, n, T, p, PICO
 from hdl21.primitives import Vdc, Vpulse, Idc, C, R
-import s130
-import sitepdks as _
+from ...pdk import s130
 
 from ...tests.sim_options import sim_options
 from ...tests.supplyvals import SupplyVals
-from ...tests.diffclockgen import DiffClkGen
+from ...tests.diffclockgen import DiffClkGen, DiffPulseGen
 from ...tests.vcode import Vcode
+from ...tests import sim_runner
+from ...tests.result_store import result_store
+from ...tests.stateye import PulseResponse, EyeMetrics, stateye
+from ...tests.superposition import EdgeResponses
+from ...tests.pwlgen import DiffPwlParams, DiffPwlGen, diff_pwl
+from ...tests.patterns import prbs
+from ...tests import eye
+from ...tests import oppoint
+from ...tests.oppoint import OpPoints, Rule
+from ...pvt import TEMPERATURES, all_pvts
 
 # DUT Imports
 from ..hstx import HsTx, HsTxDriver, CmosPreDriver
@@ -44,6 +52,26 @@ class Pvt:
 class TbParams:
     pvt = h.Param(dtype=Pvt, desc="PVT Conditions", default=Pvt())
     ib = h.Param(dtype=h.Optional[h.Prefixed], desc="Bias Current", default=100 * µ)
+    pulse = h.Param(
+        dtype=h.Optional[h.Prefixed],
+        desc="Width of a single data pulse, driven rather than a clock pattern",
+        default=None,
+    )
+    pwl = h.Param(
+        dtype=h.Optional[DiffPwlParams],
+        desc="PWL data pattern, driven rather than a clock pattern",
+        default=None,
+    )
+
+
+# USB High-Speed Unit Interval, 1 / 480Mb/s
+UI = 2083 * p
+# Delay before the data pulse, for the bench to settle
+PULSE_DELAY = 2 * n
+# Data rise / fall time
+TRF = 100 * p
+# Time for the bench to settle after each data edge
+SETTLE = 20 * UI
 
 
 @h.generator
@@ -73,12 +101,21 @@ def HsTxDriverTb(params: TbParams) -> h.Module:
     # Data Generation
     tb.data_p = h.Signal()
     tb.data_n = h.Signal()
-    data_gen_params = DiffClkGen.Params(
-        period=4167 * p, delay=125 * p, vc=900 * m, vd=1800 * m, trf=100 * p
-    )
-    tb.datagen = DiffClkGen(data_gen_params)(
-        ck=h.AnonymousBundle(p=tb.data_p, n=tb.data_n), VSS=tb.VSS
-    )
+    if params.pwl is not None:
+        tb.datagen = DiffPwlGen(params.pwl)(
+            out=h.AnonymousBundle(p=tb.data_p, n=tb.data_n), VSS=tb.VSS
+        )
+    elif params.pulse is not None:
+        tb.datagen = DiffPulseGen(
+            width=params.pulse, delay=PULSE_DELAY, vc=900 * m, vd=1800 * m, trf=TRF
+        )(out=h.AnonymousBundle(p=tb.data_p, n=tb.data_n), VSS=tb.VSS)
+    else:
+        data_gen_params = DiffClkGen.Params(
+            period=4167 * p, delay=125 * p, vc=900 * m, vd=1800 * m, trf=100 * p
+        )
+        tb.datagen = DiffClkGen(data_gen_params)(
+            ck=h.AnonymousBundle(p=tb.data_p, n=tb.data_n), VSS=tb.VSS
+        )
 
     ## PreDrivers
     tb.dp_b, tb.dn_b, tb.shunt_b = h.Signals(3)
@@ -138,6 +175,191 @@ def sim_hstx_driver():
     print(results)
 
 
+def test_hstx_driver_eye(simtestmode: SimTestMode):
+    if simtestmode == SimTestMode.NETLIST:
+        h.netlist(HsTxDriverTb(TbParams(pulse=UI)), dest=io.StringIO())
+    else:
+        sim_hstx_driver_eye()
+
+
+def sim_hstx_driver_pulse(pvt: Pvt, width: h.Prefixed) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate the TX Driver bench, driven by a single data pulse of `width`,
+    until `SETTLE` after the pulse ends. Returns the differential pad voltage `(t, v)`."""
+
+    params = TbParams(pvt=pvt, pulse=width)
+
+    @hs.sim
+    class HsTxDriverPulseSim:
+        tb = HsTxDriverTb(params)
+        tr = hs.Tran(tstop=PULSE_DELAY + width + SETTLE)
+
+    HsTxDriverPulseSim.add(*s130.install.include(params.pvt.p))
+
+    job = sim_runner.run_job(
+        HsTxDriverPulseSim, sim_options, store=result_store, corner=str(pvt)
+    )
+    if not job.ok:
+        raise RuntimeError(f"HsTxDriverTb failed: {job.failure.value}\n{job.log}")
+
+    tr = job.result.an[0]
+    return tr.data["time"], tr.data["xtop.pads_p"] - tr.data["xtop.pads_n"]
+
+
+def sim_hstx_driver_eye(pvt: Pvt = Pvt(), rj: float = 0, dj: float = 0) -> EyeMetrics:
+    """High Speed TX Driver statistical eye, from a single pulse-response sim.
+    Optionally adds random jitter of RMS `rj` and deterministic jitter of peak-to-peak `dj`, in seconds."""
+
+    t, vpads = sim_hstx_driver_pulse(pvt, width=UI)
+    pr = PulseResponse.from_tran(t, vpads, ui=float(UI), delay=float(PULSE_DELAY))
+    metrics = stateye(pr, rj=rj, dj=dj).metrics(ber=1e-12)
+    result_store.put(
+        "stateye", dict(tb="HsTxDriverTb", corner=str(pvt), **asdict(metrics))
+    )
+    print(metrics)
+    return metrics
+
+
+def test_hstx_driver_edges(simtestmode: SimTestMode):
+    if simtestmode == SimTestMode.NETLIST:
+        h.netlist(HsTxDriverTb(TbParams(pulse=SETTLE)), dest=io.StringIO())
+    else:
+        # Synthesize a long PRBS pattern from the edge responses, and check its eye
+        edges = sim_hstx_driver_edges()
+        vpads = edges.synthesize(prbs(15, 100_000))
+        check_hstx_driver_eye(
+            edges.time(len(vpads)), vpads, Pvt(), skip=0, source="superposition"
+        )
+
+
+def sim_hstx_driver_edges(pvt: Pvt = Pvt()) -> EdgeResponses:
+    """High Speed TX Driver rising and falling edge responses, into its 22.5Ω / 500fF load.
+    For synthesizing long-pattern waveforms with `EdgeResponses.synthesize`."""
+
+    t, vpads = sim_hstx_driver_pulse(pvt, width=SETTLE)
+    # Input edges are at the fifty-percent points of the data pulse
+    rise = float(PULSE_DELAY) + float(TRF) / 2
+    fall = rise + float(SETTLE)
+    return EdgeResponses.from_tran(t, vpads, ui=float(UI), rise=rise, fall=fall)
+
+
+def prbs_stim(order: int, nbits: int, dest: Path = Path("scratch")) -> DiffPwlParams:
+    """Write PWL data-stimulus files for `nbits` of PRBS of `order`, under directory `dest`"""
+    levels = 2 * prbs(order, nbits).astype(int) - 1
+    return diff_pwl(
+        Path(dest) / f"HsTxDriverTb.prbs{order}",
+        levels,
+        ui=float(UI),
+        trf=float(TRF),
+        vc=0.9,
+        vd=1.8,
+        delay=float(PULSE_DELAY),
+    )
+
+
+def test_hstx_driver_prbs(simtestmode: SimTestMode, tmp_path: Path):
+    if simtestmode == SimTestMode.NETLIST:
+        params = TbParams(pwl=prbs_stim(order=7, nbits=127, dest=tmp_path))
+        h.netlist(HsTxDriverTb(params), dest=io.StringIO())
+    else:
+        t, vpads = sim_hstx_driver_prbs()
+        check_hstx_driver_eye(t, vpads, Pvt(), skip=float(PULSE_DELAY), source="prbs7")
+
+
+def sim_hstx_driver_prbs(
+    pvt: Pvt = Pvt(), order: int = 7, nbits: int = 127
+) -> Tuple[np.ndarray, np.ndarray]:
+    """High Speed TX Driver, driven by `nbits` of PRBS of `order`.
+    Returns the differential pad voltage `(t, v)`."""
+
+    params = TbParams(pvt=pvt, pwl=prbs_stim(order, nbits))
+
+    @hs.sim
+    class HsTxDriverPrbsSim:
+        tb = HsTxDriverTb(params)
+        tr = hs.Tran(tstop=PULSE_DELAY + nbits * UI)
+
+    HsTxDriverPrbsSim.add(*s130.install.include(params.pvt.p))
+
+    job = sim_runner.run_job(
+        HsTxDriverPrbsSim, sim_options, store=result_store, corner=str(pvt)
+    )
+    if not job.ok:
+        raise RuntimeError(f"HsTxDriverTb failed: {job.failure.value}\n{job.log}")
+
+    tr = job.result.an[0]
+    return tr.data["time"], tr.data["xtop.pads_p"] - tr.data["xtop.pads_n"]
+
+
+def check_hstx_driver_eye(
+    t: np.ndarray, vpads: np.ndarray, pvt: Pvt, skip: float, source: str
+) -> eye.TemplateResult:
+    """Measure the TX Driver's pad eye, ignoring its first `skip` seconds, and check it against the USB HS transmit template.
+    Records both to the result store, tagged with the waveform's `source`."""
+
+    folded = eye.fold(t, vpads, ui=float(UI), skip=skip)
+    result = eye.measure(folded)
+    tx = eye.check(folded, eye.HS_TX_TEMPLATE1)
+    eye.record(result, tb="HsTxDriverTb", corner=str(pvt), template=tx, source=source)
+    print(result)
+    print(tx)
+    return tx
+
+
+# The bias mirror's diode and current sources must stay in saturation. Switches are exempt.
+SATURATION_RULES = [
+    Rule(margin=0.1, paths="xtop.dut.pdiode"),
+    Rule(margin=0.1, paths="xtop.dut.psrc_*"),
+]
+
+
+def test_hstx_driver_saturation(simtestmode: SimTestMode):
+    if simtestmode == SimTestMode.NETLIST:
+        assert oppoint.devices(HsTxDriverTb(TbParams(pulse=UI)))
+    elif simtestmode == SimTestMode.MIN:
+        sim_hstx_driver_saturation([Pvt()])
+    else:
+        sim_hstx_driver_saturation(all_pvts(Pvt, temperatures=TEMPERATURES))
+
+
+def sim_hstx_driver_saturation(pvts: List[Pvt]) -> OpPoints:
+    """Operating points of every TX driver and pre-driver device, with data static before its first pulse,
+    across `pvts`. Fails if any are short of saturation, per `SATURATION_RULES`."""
+
+    def sim(pvt: Pvt) -> hs.Sim:
+        @hs.sim
+        class HsTxDriverOpSim:
+            tb = HsTxDriverTb(TbParams(pvt=pvt, pulse=UI))
+            op = hs.Op()
+            l = hs.Literal(
+                f"""
+                simulator lang=spice
+                .temp {pvt.t}
+                simulator lang=spectre
+            """
+            )
+
+        HsTxDriverOpSim.add(*s130.install.include(pvt.p))
+        return HsTxDriverOpSim
+
+    tb = HsTxDriverTb(TbParams(pulse=UI))
+    missing = oppoint.missing_tables(
+        oppoint.devices(tb), {(pvt.p, pvt.t) for pvt in pvts}
+    )
+    if missing:
+        pytest.skip(f"gm/Id tables {missing} not built")
+    ops = oppoint.extract(
+        tb,
+        [sim(pvt) for pvt in pvts],
+        pvts,
+        corner=lambda pvt: (pvt.p, pvt.t),
+        name="HsTxDriverTb",
+    )
+    found = oppoint.violations(ops, SATURATION_RULES)
+    print(oppoint.report(found))
+    assert not found, f"{len(found)} saturation violations"
+    return ops
+
+
 def test_hstx(simtestmode: SimTestMode):
     # FIXME: simulation-based tests; thus far just netlisting
     h.netlist(HsTx(), sys.stdout)
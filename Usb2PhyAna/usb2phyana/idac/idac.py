@@ -6,25 +6,18 @@
 import hdl21 as h
 from hdl21.primitives import Res, Cap, Vdc
 from hdl21.prefix import m
-import s130
-from s130 import MosParams
 
-
-Nmos = s130.modules.nmos
-NmosLvt = s130.modules.nmos_lvt
-Pmos = s130.modules.pmos
-
-# Define a few reused device-parameter combos
-Pswitch = Pmos(MosParams(m=10))
-Pbias = Pmos(MosParams(w=1, l=1, m=100))
+# PDK Imports
+from ..pdk import s130
 
 
 @h.generator
 def NmosIdac(_: h.HasNoParams) -> h.Module:
     """# Nmos Current Dac"""
 
-    Nswitch = NmosLvt(MosParams(m=4))
-    Nbias = NmosLvt(MosParams(w=1, l=20, m=1))
+    NmosLvt = s130.modules.nmos_lvt
+    Nswitch = NmosLvt(s130.MosParams(m=4))
+    Nbias = NmosLvt(s130.MosParams(w=1, l=20, m=1))
 
     @h.module
     class NmosIdacUnit:
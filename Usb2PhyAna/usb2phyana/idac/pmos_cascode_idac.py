@@ -4,49 +4,54 @@
 
 # Hdl & PDK Imports
 import hdl21 as h
-import s130
-from s130 import MosParams
 
-from ..logiccells import Inv
+# Local Imports
+from ..pdk import s130
+from .. import logiccells
 
 
-Pmos = s130.modules.nmos
-PmosLvt = s130.modules.nmos_lvt
-Pmos = s130.modules.pmos
+@h.generator
+def PmosIdacUnit(_: h.HasNoParams) -> h.Module:
+    """# Pmos Current Dac Unit"""
 
-# Define a few reused device-parameter combos
-Pswitch = Pmos(MosParams(m=4))
-# Unit PMOS - sized for 1µA
-Pbias = Pmos(w=1, l=1)
+    Pmos = s130.modules.pmos
 
+    # Define a few reused device-parameter combos
+    Pswitch = Pmos(s130.MosParams(m=4))
+    # Unit PMOS - sized for 1µA
+    Pbias = Pmos(w=1, l=1)
 
-@h.module
-class PmosIdacUnit:
-    """Dac Unit Current"""
+    @h.module
+    class PmosIdacUnit:
+        """Dac Unit Current"""
 
-    # IO Interface
-    VDDA33, VSS = h.Ports(2)
-    ## Primary I/O
-    en, enb = h.Inputs(2, desc="Unit Current Enable")
-    out = h.Output(desc="Dac Output")
-    ## Gate Bias
-    pbias, cbias = h.Ports(2, desc="Gate Biases for Source & Cascode")
-    cascode_source = h.Port(desc="Cascode Source - only for bias unit!")
+        # IO Interface
+        VDDA33, VSS = h.Ports(2)
+        ## Primary I/O
+        en, enb = h.Inputs(2, desc="Unit Current Enable")
+        out = h.Output(desc="Dac Output")
+        ## Gate Bias
+        pbias, cbias = h.Ports(2, desc="Gate Biases for Source & Cascode")
+        cascode_source = h.Port(desc="Cascode Source - only for bias unit!")
+
+        # Bias Pmos
+        psrc = Pbias(g=pbias, d=cascode_source, s=VDDA33, b=VDDA33)
+        # Cascode Pmos
+        switch_source = h.Signal()
+        pcasc = Pbias(g=cbias, d=switch_source, s=cascode_source, b=VDDA33)
+        # Differential Switch Pmoses
+        sw_out = Pswitch(g=enb, d=out, s=switch_source, b=VDDA33)
+        sw_vss = Pswitch(g=en, d=VSS, s=switch_source, b=VDDA33)
 
-    # Bias Pmos
-    psrc = Pbias(g=pbias, d=cascode_source, s=VDDA33, b=VDDA33)
-    # Cascode Pmos
-    switch_source = h.Signal()
-    pcasc = Pbias(g=cbias, d=switch_source, s=cascode_source, b=VDDA33)
-    # Differential Switch Pmoses
-    sw_out = Pswitch(g=enb, d=out, s=switch_source, b=VDDA33)
-    sw_vss = Pswitch(g=en, d=VSS, s=switch_source, b=VDDA33)
+    return PmosIdacUnit
 
 
 @h.generator
 def PmosIdac(_: h.HasNoParams) -> h.Module:
     """# Pmos Current Dac"""
 
+    Unit = PmosIdacUnit()
+
     @h.module
     class PmosIdac:
         # IO Interface
@@ -59,11 +64,11 @@ def PmosIdac(_: h.HasNoParams) -> h.Module:
 
         # Internal Implementation
         codeb = h.Signal(width=5)
-        code_invs = 5 * Inv()(i=code, z=codeb, VDD=VDD18, VSS=VSS)
+        code_invs = 5 * logiccells.Inv()(i=code, z=codeb, VDD=VDD18, VSS=VSS)
 
         ## Diode Connected Bias Unit
         pbias = h.Signal()
-        udiode = 128 * PmosIdacUnit(
+        udiode = 128 * Unit(
             out=ibias,
             cbias=ibias,
             pbias=pbias,
@@ -74,7 +79,7 @@ def PmosIdac(_: h.HasNoParams) -> h.Module:
             VSS=VSS,
         )
         ## Always-On Units
-        uon = 128 * PmosIdacUnit(
+        uon = 128 * Unit(
             out=out,
             cbias=ibias,
             pbias=pbias,
@@ -93,7 +98,7 @@ def PmosIdac(_: h.HasNoParams) -> h.Module:
     size = lambda idx: 4 * (2**idx)
 
     for idx in range(5):
-        inst = size(idx) * PmosIdacUnit(
+        inst = size(idx) * Unit(
             out=P.out,
             cbias=P.ibias,
             pbias=P.pbias,
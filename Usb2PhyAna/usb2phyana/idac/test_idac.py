@@ -5,12 +5,10 @@
 import pickle, io
 from typing import List, Tuple
 from dataclasses import asdict
-from copy import copy
 from pathlib import Path
 
 from pydantic.dataclasses import dataclass
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Hdl & PDK Imports
 import hdl21 as h
@@ -19,13 +17,14 @@ from hdl21.pdk import Corner
 from hdl21.sim import Sim, LogSweep
 from hdl21.prefix import m, µ, f, n, p, T, K
 from hdl21.primitives import Vdc, Vpulse, Idc, C
-import s130
-import sitepdks as _
 
 # Local Imports
+from ..pdk import s130
 from ..tests.sim_options import sim_options
+from ..tests import sim_runner
+from ..tests.result_store import result_store
 from ..tests.vcode import Vcode
-from .idac import NmosIdac as Idac, Pbias
+from .idac import NmosIdac as Idac
 
 
 result_pickle_file = "scratch/idac.codesweep.pkl"
@@ -72,6 +71,7 @@ def IdacSweepTb(params: TbParams) -> h.Module:
 
     # Current Output, into a load equal to that in the CML RO
     tb.out, tb.pbias = out, pbias = h.Signals(2)
+    Pbias = s130.modules.pmos(s130.MosParams(w=1, l=1, m=100))
     tb.pload = Pbias(g=pbias, d=pbias, s=VDD, b=VDD)
     tb.vout = Vdc(Vdc.Params(dc=0 * m, ac=0 * m))(p=pbias, n=out)
 
@@ -119,16 +119,14 @@ def codesweep(tbgen: h.Generator, pvt: Pvt) -> List[hs.SimResult]:
 
     # FIXME: share this stuff with `Result`
     codes = range(0, 32)
-    opts = copy(sim_options)
-    opts.rundir = None
-
     params = [TbParams(pvt=pvt, code=code) for code in codes]
 
     # Create the simulation inputs
     sims = [sim_input(tbgen=tbgen, params=p) for p in params]
 
-    # Run sims
-    return h.sim.run(sims, opts)
+    # Run sims, recording their telemetry
+    jobs = sim_runner.run(sims, sim_options, store=result_store, corner=str(pvt))
+    return sim_runner.results(jobs)
 
 
 @dataclass
@@ -189,6 +187,7 @@ def run_typ() -> List[hs.SimResult]:
 
 def plot(result: Result, title: str, fname: str):
     """Plot code sweeps, parameterized by PVT"""
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots()
     codes = np.array(result.codes)
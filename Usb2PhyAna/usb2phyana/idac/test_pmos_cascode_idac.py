@@ -5,11 +5,10 @@
 import pickle, io
 from typing import List
 from dataclasses import asdict
-from copy import copy
 
 from pydantic.dataclasses import dataclass
 import numpy as np
-import matplotlib.pyplot as plt
+import pytest
 
 # Hdl Imports
 import hdl21 as h
@@ -19,13 +18,21 @@ from hdl21.prefix import µ, m
 from hdl21.primitives import Vdc, Idc
 
 # PDK Imports
-import s130
-import sitepdks as _
+from ..pdk import s130
 
 # Local Imports
 from ..tests.supplyvals import SupplyVals
 from ..tests.sim_options import sim_options
+from ..tests import sim_runner
+from ..tests.result_store import result_store
 from ..tests.vcode import Vcode
+from ..tests.montecarlo import McResult, Target, montecarlo
+from ..tests.mismatch import variant
+from ..tests.highsigma import YieldEstimate, highsigma
+from ..tests.linearity import Linearity, analyze
+from ..tests import oppoint
+from ..tests.oppoint import OpPoints, Rule
+from ..pvt import TEMPERATURES, all_pvts
 from .pmos_cascode_idac import PmosIdac
 
 
@@ -49,6 +56,11 @@ class TbParams:
     ib = h.Param(dtype=h.Prefixed, desc="Bias Current Value (A)", default=100 * µ)
     pvt = h.Param(dtype=Pvt, desc="PVT Conditions", default=Pvt())
     code = h.Param(dtype=int, desc="DAC Code", default=16)
+    step = h.Param(
+        dtype=bool,
+        desc="Step from `code - 1` to `code`, per sim parameter `vstep`",
+        default=False,
+    )
 
 
 @h.generator
@@ -72,9 +84,22 @@ def IdacSweepTb(params: TbParams) -> h.Module:
 
     # DAC Code
     tb.code = code = h.Signal(width=5)
-    tb.vcode = Vcode(code=params.code, width=5, vhi=supplyvals.VDD18)(
-        code=code, VSS=tb.VSS
-    )
+    if params.step:
+        # Bits which differ between `code - 1` and `code` follow sim parameter `vstep`,
+        # so that a DC sweep of `vstep` from zero to VDD18 steps between them.
+        vhi = float(supplyvals.VDD18)
+        lo, hi = params.code - 1, params.code
+        for idx in range(5):
+            blo, bhi = (lo >> idx) & 1, (hi >> idx) & 1
+            if blo == bhi:
+                dc = vhi * bhi
+            else:
+                dc = "vstep" if bhi else f"{vhi} - vstep"
+            tb.add(Vdc(dc=dc)(p=code[idx], n=tb.VSS), name=f"vcode{idx}")
+    else:
+        tb.vcode = Vcode(code=params.code, width=5, vhi=supplyvals.VDD18)(
+            code=code, VSS=tb.VSS
+        )
 
     # Current Output, into a load equal to that in the CML RO
     # tb.out, tb.pbias = out, pbias = h.Signals(2)
@@ -92,12 +117,17 @@ def IdacSweepTb(params: TbParams) -> h.Module:
 
 def sim_input(tbgen: h.Generator, params: TbParams) -> hs.Sim:
     """Idac Code Sweep Sim"""
+    return op_sim(tbgen(params), params.pvt)
+
+
+def op_sim(testbench: h.Module, pvt: Pvt) -> hs.Sim:
+    """Operating-point Sim of `testbench`, at conditions `pvt`"""
 
     # Create some simulation stimulus
     @hs.sim
     class IdacCodeSweepSim:
         # The testbench
-        tb = tbgen(params)
+        tb = testbench
 
         # Our sole analysis: DC operating point
         op = hs.Op()
@@ -106,7 +136,7 @@ def sim_input(tbgen: h.Generator, params: TbParams) -> hs.Sim:
         l = hs.Literal(
             f"""
             simulator lang=spice
-            .temp {params.pvt.t}
+            .temp {pvt.t}
             simulator lang=spectre
         """
         )
@@ -114,7 +144,7 @@ def sim_input(tbgen: h.Generator, params: TbParams) -> hs.Sim:
         i = hs.Include(s130.resources / "stdcells.sp")
 
     # Add the PDK dependencies
-    IdacCodeSweepSim.add(*s130.install.include(params.pvt.p))
+    IdacCodeSweepSim.add(*s130.install.include(pvt.p))
 
     return IdacCodeSweepSim
 
@@ -123,21 +153,36 @@ def iout(result: hs.SimResult) -> float:
     return result.an[0].data["xtop.vout:p"]
 
 
+def step_sim(testbench: h.Module, pvt: Pvt) -> hs.Sim:
+    """Sim of step testbench `testbench`, at conditions `pvt`: an operating point per code, as a DC sweep of `vstep`"""
+    sim = op_sim(testbench, pvt)
+    vhi = float(SupplyVals.corner(pvt.v).VDD18)
+    sim.add(
+        hs.Param(name="vstep", val=0),
+        hs.Dc(var="vstep", sweep=hs.PointSweep([0, vhi]), name="step"),
+    )
+    return sim
+
+
+def step(result: hs.SimResult) -> float:
+    """Output-current step from `code - 1` to `code`, from a `step_sim`"""
+    lo, hi = np.abs(result.an[1].data["xtop.vout:p"])
+    return hi - lo
+
+
 def codesweep(tbgen: h.Generator, pvt: Pvt) -> List[hs.SimResult]:
     """Run `sim` on `tbgen`, across codes, at conditions `pvt`."""
 
     # FIXME: share this stuff with `Result`
     codes = range(0, 32)
-    opts = copy(sim_options)
-    opts.rundir = None
-
     params = [TbParams(pvt=pvt, code=code) for code in codes]
 
     # Create the simulation inputs
     sims = [sim_input(tbgen=tbgen, params=p) for p in params]
 
-    # Run sims
-    return h.sim.run(sims, opts)
+    # Run sims, recording their telemetry
+    jobs = sim_runner.run(sims, sim_options, store=result_store, corner=str(pvt))
+    return sim_runner.results(jobs)
 
 
 @dataclass
@@ -156,12 +201,7 @@ def run_corners(tbgen: h.Generator) -> Result:
     """Run `sim` on `tbgen`, across corners"""
 
     # Initialize our results
-    conditions = [
-        Pvt(p, v, t)
-        for p in [Corner.TYP, Corner.FAST, Corner.SLOW]
-        for v in [Corner.TYP, Corner.FAST, Corner.SLOW]
-        for t in [-25, 25, 75]
-    ]
+    conditions = all_pvts(Pvt, temperatures=TEMPERATURES)
     result = Result(conditions=conditions, codes=list(range(0, 32)), results=[])
 
     # Run conditions one at a time, parallelizing across codes
@@ -175,6 +215,34 @@ def run_corners(tbgen: h.Generator) -> Result:
     return result
 
 
+def saturation_rules(code: int) -> List[Rule]:
+    """Saturation rules at `code`: the source and cascode of every enabled unit. Switches, and disabled units, are exempt."""
+    units = ["udiode_*", "uon_*"] + [f"u{idx}_*" for idx in range(5) if code >> idx & 1]
+    return [
+        Rule(margin=0.1, paths=f"xtop.dut.{unit}.{device}")
+        for unit in units
+        for device in ("psrc", "pcasc")
+    ]
+
+
+def saturation(pvts: List[Pvt], code: int = 16) -> OpPoints:
+    """Operating points of every device at `code`, across `pvts`. Fails if any are short of saturation."""
+    tb = IdacSweepTb(TbParams(code=code))
+    missing = oppoint.missing_tables(
+        oppoint.devices(tb), {(pvt.p, pvt.t) for pvt in pvts}
+    )
+    if missing:
+        pytest.skip(f"gm/Id tables {missing} not built")
+    sims = [sim_input(IdacSweepTb, TbParams(pvt=pvt, code=code)) for pvt in pvts]
+    ops = oppoint.extract(
+        tb, sims, pvts, corner=lambda pvt: (pvt.p, pvt.t), name=f"PmosIdac_code{code}"
+    )
+    found = oppoint.violations(ops, saturation_rules(code))
+    print(oppoint.report(found))
+    assert not found, f"{len(found)} saturation violations"
+    return ops
+
+
 def run_one() -> hs.SimResult:
     """Run a typical-case, mid-code sim"""
 
@@ -196,8 +264,50 @@ def run_typ() -> List[hs.SimResult]:
     print(results)
 
 
+def mismatch(pvt: Pvt = Pvt(), code: int = 16, target: Target = Target()) -> McResult:
+    """Monte Carlo of the output current at `code`, from mismatch of the unit current sources, until `target` is met."""
+
+    result = montecarlo(
+        tb=IdacSweepTb(TbParams(pvt=pvt, code=code)),
+        sim=lambda tb: op_sim(tb, pvt),
+        measure=lambda job: abs(iout(job.result)),
+        target=target,
+        name=f"iout_code{code}",
+        corner=str(pvt),
+    )
+    print(f"Code {code} Output Current: {result}")
+    return result
+
+
+def monotonic_yield(pvt: Pvt = Pvt(), code: int = 16, runs: int = 100) -> YieldEstimate:
+    """
+    High-sigma probability that mismatch makes the Dac non-monotonic at `code`,
+    i.e. its output current does not increase from `code - 1`. Most likely at the major carry, code 16.
+    """
+
+    def fails(job: sim_runner.JobResult) -> bool:
+        return step(job.result) <= 0
+
+    return highsigma(
+        tb=IdacSweepTb(TbParams(pvt=pvt, code=code, step=True)),
+        sim=lambda tb: step_sim(tb, pvt),
+        fails=fails,
+        name=f"monotonic_code{code}",
+        corner=str(pvt),
+        runs=runs,
+        multiplicity=1,
+    )
+
+
+def linearity(result: Result) -> Linearity:
+    """Linearity of the output current versus code, across all conditions of `result`"""
+    iouts = np.abs(np.array([[iout(r) for r in cond] for cond in result.results]))
+    return analyze(iouts, result.codes, [str(c) for c in result.conditions])
+
+
 def plot(result: Result, title: str, fname: str):
     """Plot code sweeps, parameterized by PVT"""
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots()
     codes = np.array(result.codes)
@@ -205,7 +315,6 @@ def plot(result: Result, title: str, fname: str):
     for (cond, cond_results) in zip(result.conditions, result.results):
         iouts = 1e6 * np.abs(np.array([iout(r) for r in cond_results]))
         label = f"{str(cond.p), str(cond.v), str(cond.t)}"
-        print(label, iouts[15])
         ax.plot(codes, iouts, label=label)
 
     # Set up all the other data on our plot
@@ -228,6 +337,9 @@ def run_and_plot_corners():
     # And make some pretty pictures
     plot(result, "IdacCodeSweep", "scratch/IdacCodeSweep.png")
 
+    # And summarize linearity, flagging the failing conditions
+    print(linearity(result).report(scale=1e6))
+
 
 from ..tests.sim_test_mode import SimTestMode
 
@@ -244,3 +356,38 @@ def test_idac_code_sweep(simtestmode: SimTestMode):
         codesweep(pvt=Pvt())
     else:
         run_and_plot_corners()
+
+
+def test_idac_saturation(simtestmode: SimTestMode):
+    """Test DAC Device Saturation Margins"""
+
+    if simtestmode == SimTestMode.NETLIST:
+        assert oppoint.devices(IdacSweepTb(TbParams(code=16)))
+    elif simtestmode == SimTestMode.MIN:
+        saturation([Pvt()])
+    else:
+        saturation(all_pvts(Pvt, temperatures=TEMPERATURES))
+
+
+def test_idac_mismatch(simtestmode: SimTestMode):
+    """Test DAC Output Current Mismatch"""
+
+    if simtestmode == SimTestMode.NETLIST:
+        tb = variant(IdacSweepTb(TbParams(pvt=Pvt(), code=16)), seed=0)
+        h.netlist(tb, dest=io.StringIO())
+    elif simtestmode == SimTestMode.MIN:
+        mismatch(target=Target(min_runs=8, max_runs=8))
+    else:
+        mismatch()
+
+
+def test_idac_monotonic_yield(simtestmode: SimTestMode):
+    """Test DAC Monotonicity Yield"""
+
+    if simtestmode == SimTestMode.NETLIST:
+        tb = variant(IdacSweepTb(TbParams(pvt=Pvt(), code=16, step=True)), seed=0)
+        h.netlist(tb, dest=io.StringIO())
+    elif simtestmode == SimTestMode.MIN:
+        monotonic_yield(runs=16)
+    else:
+        monotonic_yield()
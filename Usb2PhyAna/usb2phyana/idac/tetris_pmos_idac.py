@@ -6,7 +6,7 @@
 import hdl21 as h
 
 from ..tetris.mos import Pmos
-from ..logiccells import Inv
+from .. import logiccells
 
 # Unit PMOS - sized for 64µA
 Pbias = Pmos(npar=48, nser=4)
@@ -47,7 +47,7 @@ def PmosIdac(_: h.HasNoParams) -> h.Module:
 
         # Internal Implementation
         codeb = h.Signal(width=5)
-        code_invs = 5 * Inv()(i=code, z=codeb, VDD=VDD18, VSS=VSS)
+        code_invs = 5 * logiccells.Inv()(i=code, z=codeb, VDD=VDD18, VSS=VSS)
 
         ## Diode Connected Bias Unit
         ## Total 6 * 64µA = 384µA
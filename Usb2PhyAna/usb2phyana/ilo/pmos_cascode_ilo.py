@@ -10,19 +10,13 @@ from hdl21.prefix import f
 from hdl21.primitives import C
 from hdl21 import Pair, Diff, inverse
 
-import s130
-from s130 import MosParams
-
 # Local Imports
+from ..pdk import s130
 from ..idac.pmos_cascode_idac import PmosIdac
 from ..width import Width
 from ..supplies import PhySupplies
 
 
-Pmos = s130.modules.pmos
-Nmos = s130.modules.nmos
-
-
 @h.bundle
 class OctalClock:
     """# Octal Clock
@@ -43,6 +37,8 @@ class OctalClock:
 @h.paramclass
 class IloParams:
     cl = h.Param(dtype=h.Prefixed, desc="Capacitance Load", default=10 * f)
+    fwd = h.Param(dtype=int, desc="Forward Inverter Width", default=16)
+    cross = h.Param(dtype=int, desc="Cross-Coupled Inverter Width", default=4)
 
 
 @h.generator
@@ -56,8 +52,8 @@ def IloInv(p: Width) -> h.Module:
         i = h.Input()
         o = h.Output()
         # Internal Implementation
-        nmos = Nmos(MosParams(m=p.width))(g=i, d=o, s=VSS, b=VSS)
-        pmos = Pmos(MosParams(m=p.width))(g=i, d=o, s=VDD, b=VDD)
+        nmos = s130.modules.nmos(s130.MosParams(m=p.width))(g=i, d=o, s=VSS, b=VSS)
+        pmos = s130.modules.pmos(s130.MosParams(m=p.width))(g=i, d=o, s=VDD, b=VDD)
 
     return IloInv
 
@@ -78,9 +74,11 @@ def IloStage(params: IloParams) -> h.Module:
 
         # Internal Implementation
         ## Forward Inverters
-        fwd = Pair(IloInv(width=16))(i=inp, o=out, VDD=VDD, VSS=VSS)
+        fwd = Pair(IloInv(width=params.fwd))(i=inp, o=out, VDD=VDD, VSS=VSS)
         ## Cross-Coupled Output Inverters
-        cross = Pair(IloInv(width=4))(i=out, o=inverse(out), VDD=VDD, VSS=VSS)
+        cross = Pair(IloInv(width=params.cross))(
+            i=out, o=inverse(out), VDD=VDD, VSS=VSS
+        )
         ## Load Caps
         cl = Pair(C(c=params.cl))(p=out, n=VSS)
 
@@ -90,7 +88,7 @@ def IloStage(params: IloParams) -> h.Module:
 @h.generator
 def IloRing(params: IloParams) -> h.Module:
     """# ILO Ring Oscillator"""
-    Ninj = Nmos(m=2)
+    Ninj = s130.modules.nmos(m=2)
 
     @h.module
     class IloRing:
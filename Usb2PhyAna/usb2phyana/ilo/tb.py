@@ -10,13 +10,11 @@ import hdl21.sim as hs
 from hdl21.pdk import Corner
 from hdl21.prefix import m, µ, n, PICO
 
-# PDK Imports
-import s130
-import sitepdks as _
-
 # Local Imports
+from ..pdk import s130
 from ..tests.supplyvals import SupplyVals
 from ..tests.vcode import Vcode
+from ..tests.tracing import tracer
 from .ilo import IloInner, IloParams
 
 
@@ -35,6 +33,7 @@ class TbParams:
     ilo = h.Param(dtype=IloParams, desc="Ilo Generator Parameters", default=IloParams())
     ib = h.Param(dtype=h.Optional[h.Prefixed], desc="Bias Current", default=120 * µ)
     code = h.Param(dtype=int, desc="Fctrl Dac Code", default=16)
+    tinj = h.Param(dtype=h.Prefixed, desc="Injection Period", default=16667 * PICO)
 
 
 def IloSharedTb(params: TbParams, name: Optional[str] = None) -> h.Module:
@@ -115,8 +114,9 @@ def IloFreqTb(params: TbParams) -> h.Module:
 def sim_input(tbgen: h.Generator, params: TbParams) -> hs.Sim:
     """Ilo Frequency Sim"""
 
-    tb_ = tbgen(params)
-    s130.compile(tb_)
+    with tracer.span("sim_input", tb=tbgen.name, code=params.code):
+        tb_ = tbgen(params)
+        s130.compile(tb_)
 
     # Create some simulation stimulus
     @hs.sim
@@ -134,6 +134,8 @@ def sim_input(tbgen: h.Generator, params: TbParams) -> hs.Sim:
         trise15 = hs.Meas(tr, expr="when 'V(xtop.stg0_p)-V(xtop.stg0_n)'=0 rise=15")
         tperiod = hs.Meas(tr, expr="param='(trise15-trise5)/10'")
         idd = hs.Meas(tr, expr="avg I(xtop.vvdd) from=trise5 to=trise15")
+        idd18 = hs.Meas(tr, expr="avg I(xtop.vvdd18) from=trise5 to=trise15")
+        idd33 = hs.Meas(tr, expr="avg I(xtop.vvdd33) from=trise5 to=trise15")
 
         # The stuff we can't first-class represent, and need to stick in a literal.
         l = hs.Literal(
@@ -159,3 +161,12 @@ def idd(results: hs.SimResult) -> float:
 
 def tperiod(results: hs.SimResult) -> float:
     return results.an[0].measurements["tperiod"]
+
+
+def power(results: hs.SimResult, pvt: Pvt) -> float:
+    """Average power (W) drawn from both supplies, at conditions `pvt`"""
+    supplyvals = SupplyVals.corner(pvt.v)
+    meas = results.an[0].measurements
+    return abs(float(supplyvals.VDD18) * meas["idd18"]) + abs(
+        float(supplyvals.VDDA33) * meas["idd33"]
+    )
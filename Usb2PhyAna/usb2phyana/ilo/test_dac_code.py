@@ -6,11 +6,9 @@ import pickle, io
 from pathlib import Path
 from typing import List
 from dataclasses import asdict, replace
-from copy import copy
 
 from pydantic.dataclasses import dataclass
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Hdl & PDK Imports
 import hdl21 as h
@@ -20,7 +18,13 @@ from hdl21.pdk import Corner
 # Local Imports
 from .tb import IloFreqTb, Pvt, TbParams, sim_input
 from ..tests.sim_options import sim_options
+from ..tests import sim_runner
+from ..tests.result_store import result_store
+from ..tests import telemetry
+from ..tests.tracing import tracer
+from ..tests.sim_runner import JobResult, SimStatus
 from ..tests.sim_test_mode import SimTestMode, SimTest
+from ..tests.linearity import Linearity, frequency_linearity
 
 
 # Module-wide reused parameters
@@ -32,20 +36,29 @@ codes = list(range(0, 32))
 class SingleSimSummary:
     freq: float
     idd: float
+    status: SimStatus = SimStatus.OK
 
     @classmethod
     def build(cls, sim_result: hs.SimResult) -> "SingleSimSummary":
+        # Note `tperiod` is NaN when the ring fails to oscillate,
+        # or goes slower than we care to simulate. This is common at low Vdd.
+        # Such points are kept as NaN, and masked out by `valid`.
         freq = 1 / tperiod(sim_result)
         idd_ = abs(1e6 * idd(sim_result))
-
-        # Numpy interpolation requires the x-axis array be NaN-free
-        # This often happens at low Vdd, when the ring fails to oscillate,
-        # or goes slower than we care to simulate.
-        # Replace any such NaN values with zero.
-        # If there are any later in the array, this interpolation will fail.
-        freq = np.nan_to_num(freq, copy=True, nan=0)
         return SingleSimSummary(freq, idd=idd_)
 
+    @classmethod
+    def from_job(cls, job: JobResult) -> "SingleSimSummary":
+        if not job.ok:
+            return SingleSimSummary(freq=np.nan, idd=np.nan, status=job.status)
+        summary = cls.build(job.result)
+        summary.status = job.status
+        return summary
+
+    @property
+    def valid(self) -> bool:
+        return self.status != SimStatus.FAILED and bool(np.isfinite(self.freq))
+
 
 @dataclass
 class ConditionResult:
@@ -75,12 +88,13 @@ def run_corners(tbgen: h.Generator) -> Result:
         for v in [Corner.TYP, Corner.FAST, Corner.SLOW]
         for t in [25, 75, -25]
     ]
-    result = Result(conditions=conditions, codes=codes, results=[])
+    result = Result(conditions=conditions, codes=codes, cond_results=[])
 
     # Run conditions one at a time, parallelizing across codes
     for pvt in conditions:
         print(f"Simulating {pvt}")
-        cond_results = codesweep(tbgen, pvt)
+        with tracer.span("condition", pvt=str(pvt)):
+            cond_results = codesweep(tbgen, pvt)
         result.cond_results.append(cond_results)
 
     pickle.dump(asdict(result), open(result_pickle_file, "wb"))
@@ -90,31 +104,32 @@ def run_corners(tbgen: h.Generator) -> Result:
 def codesweep(tbgen: h.Generator, pvt: Pvt) -> ConditionResult:
     """Run `sim` on `tbgen`, across codes, at conditions `pvt`."""
 
-    opts = copy(sim_options)
-    opts.rundir = None
-
     params = [TbParams(pvt=pvt, code=code) for code in codes]
 
     # Create the simulation inputs
     sims = [sim_input(tbgen=tbgen, params=p) for p in params]
 
-    # Run sims
-    sim_results = h.sim.run(sims, opts)
-    return ConditionResult(
-        cond=pvt,
-        codes=codes,
-        summaries=[SingleSimSummary.build(s) for s in sim_results],
-    )
+    # Run sims, recording their telemetry.
+    # Failed jobs are reported, and summarized with NaN results.
+    jobs = sim_runner.run(sims, sim_options, store=result_store, corner=str(pvt))
+    for (code, job) in zip(codes, jobs):
+        if not job.ok:
+            print(f"Code {code} at {pvt} failed: {job.failure.value}")
+    with tracer.span("postprocess", pvt=str(pvt)):
+        return ConditionResult(
+            cond=pvt,
+            codes=codes,
+            summaries=[SingleSimSummary.from_job(j) for j in jobs],
+        )
 
 
 def plot(result: Result, title: str, fname: str):
     """Plot a `Result` and save to file `fname`"""
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots()
-    codes = np.array(result.codes)
-
-    for (cond, cond_results) in zip(result.conditions, result.cond_results):
-        plot_cond(ax, codes, cond, cond_results)
+    for cond_results in result.cond_results:
+        plot_cond(ax, cond_results)
 
     # Set up all the other data on our plot
     ax.grid()
@@ -132,32 +147,22 @@ def plot_cond(ax, cond_results: ConditionResult):
     cond = cond_results.cond
     codes = cond_results.codes
     label = f"{str(cond.p), str(cond.v), str(cond.t)}"
-
-    # Post-process the results into (ib, period) curves
     freqs = np.array([r.freq for r in cond_results.summaries])
-    idds = np.array([r.idd for r in cond_results.summaries])
-
-    # Numpy interpolation requires the x-axis array be NaN-free
-    # This often happens at low Vdd, when the ring fails to oscillate,
-    # or goes slower than we care to simulate.
-    # Replace any such NaN values with zero.
-    # If there are any later in the array, this interpolation will fail.
-    freqs_no_nan = np.nan_to_num(freqs, copy=True, nan=0)
-    idd_480 = np.interp(x=480e6, xp=freqs_no_nan, fp=idds)
-    # print(idd_480)
-
-    # Check for non-monotonic frequencies
-    freq_steps = np.diff(freqs_no_nan)
-    if np.any(freq_steps < 0):
-        print(cond)
-    min_freq = np.min(freqs_no_nan) / 1e6
-    max_freq = np.max(freqs_no_nan) / 1e6
-    print(label, min_freq, max_freq)
-    if min_freq > 480 or max_freq < 480:
-        print("OUT OF RANGE")
-
-    # And plot the results
-    ax.plot(codes, freqs / 1e6, label=label)
+    valid = np.array([r.valid for r in cond_results.summaries])
+
+    # And plot the results. Failed and non-oscillating points are left as gaps.
+    ax.plot(codes, np.where(valid, freqs, np.nan) / 1e6, label=label)
+
+
+def report(result: Result, target: float = 480e6) -> Linearity:
+    """Print the linearity of `result`, and the conditions whose frequency range misses `target`"""
+    lin = frequency_linearity(result)
+    print(lin.report(scale=1e-6))
+    misses = ~((lin.lo <= target) & (lin.hi >= target))
+    print(
+        f"{np.count_nonzero(misses)} conditions miss {target / 1e6:g}MHz: {list(np.array(lin.conditions)[misses])}"
+    )
+    return lin
 
 
 def idd(results: hs.SimResult) -> float:
@@ -186,6 +191,8 @@ class TestIloDacCode(SimTest):
 
     def typ(self):
         """Sweep DAC codes at typical PVT conditions"""
+        import matplotlib.pyplot as plt
+
         results = codesweep(tbgen=IloFreqTb, pvt=Pvt())
         fig, ax = plt.subplots()
         plot_cond(ax, results)
@@ -202,3 +209,9 @@ class TestIloDacCode(SimTest):
 
         # And make some pretty pictures
         plot(result, "Cmos Ilo - Dac vs Freq", "scratch/CmosIloDacFreq.png")
+
+        # Summarize linearity and tuning range, flagging the failing conditions
+        report(result)
+
+        # Summarize simulator runtime, per corner
+        telemetry.report(tb="IloFreqTb")
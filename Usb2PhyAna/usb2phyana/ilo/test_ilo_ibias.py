@@ -3,13 +3,12 @@
 """
 
 import pickle, io
-from typing import List
+from typing import List, Sequence
 from dataclasses import asdict
 from copy import copy
 
 from pydantic.dataclasses import dataclass
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Hdl Imports
 import hdl21 as h
@@ -17,17 +16,27 @@ import hdl21.sim as hs
 from hdl21.pdk import Corner
 from hdl21.prefix import µ
 
-# PDK Imports
-import sitepdks as _
-
 # Local Imports
 from ..tests.sim_options import sim_options
 from ..tests.sim_test_mode import SimTest
-from .tb import Pvt, TbParams, IloFreqTb, sim_input
+from ..tests import ringosc
+from ..tests.search import Root
+from ..tests.sensitivity import Factor, Sensitivity
+from .tb import Pvt, TbParams, IloFreqTb, sim_input, power
 
 
 ibs = [val * µ for val in range(100, 300, 10)]
 result_pickle_file = "scratch/cmosilo.freq.pkl"
+# Result-store table name, for `solve_ibias`
+TABLE = "ilo_ibias"
+
+# PVT Conditions
+conditions = [
+    Pvt(p, v, t)
+    for p in [Corner.TYP, Corner.FAST, Corner.SLOW]
+    for v in [Corner.TYP, Corner.FAST, Corner.SLOW]
+    for t in [-25, 25, 75]
+]
 
 
 @dataclass
@@ -49,12 +58,6 @@ def run_corners(tbgen: h.Generator) -> Result:
     opts.rundir = None
 
     # Initialize our results
-    conditions = [
-        Pvt(p, v, t)
-        for p in [Corner.TYP, Corner.FAST, Corner.SLOW]
-        for v in [Corner.TYP, Corner.FAST, Corner.SLOW]
-        for t in [-25, 25, 75]
-    ]
     result = Result(conditions=conditions, ibs=ibs, results=[])
 
     # Run conditions one at a time, parallelizing across bias currents
@@ -82,8 +85,26 @@ def ibias_sweep(tbgen: h.Generator, pvt: Pvt) -> List[hs.SimResult]:
     return h.sim.run(sims, opts)
 
 
+def solve_ibias(
+    tbgen: h.Generator = IloFreqTb,
+    conds: Sequence[Pvt] = conditions,
+    target: float = 480e6,
+) -> List[Root]:
+    """
+    Solve for the bias current (µA) at which `tbgen` runs at frequency `target` (Hz), at each of `conds`.
+    Searches the range of `ibs`, per `ringosc.solve_ibias`.
+    """
+    sim = lambda pvt, ib: sim_input(tbgen=tbgen, params=TbParams(pvt=pvt, ib=ib * µ))
+    lo, hi = (1e6 * float(ib) for ib in (ibs[0], ibs[-1]))
+    return ringosc.solve_ibias(
+        ringosc.simulated(sim), conds, lo, hi, tbgen.name, TABLE, target=target
+    )
+
+
 def plot(result: Result, title: str, fname: str):
 
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots()
     # ax2 = ax.twinx()
     ibs = np.array([1e6 * float(v) for v in result.ibs])
@@ -127,6 +148,27 @@ def tperiod(results: hs.SimResult) -> float:
     return results.an[0].measurements["tperiod"]
 
 
+def sensitivities(pvt: Pvt = Pvt(), central: bool = True) -> Sensitivity:
+    """
+    Sensitivity of frequency and power to the stage sizing, bias current and temperature, around the default design at `pvt`.
+    Temperature sensitivities are per 100C. Supplies are set by `pvt`'s voltage corner, and so are not perturbed.
+    Central differences if `central`, else the cheaper forward differences.
+    """
+    return ringosc.sensitivities(
+        lambda params: sim_input(IloFreqTb, params),
+        nominal=TbParams(pvt=pvt),
+        factors=[
+            "ilo.cl",
+            "ilo.fwd",
+            "ilo.cross",
+            "ib",
+            Factor("pvt.t", step=25, scale=100),
+        ],
+        metrics=lambda result: dict(power=power(result, pvt)),
+        central=central,
+    )
+
+
 def run_one():
     sim_input(tbgen=IloFreqTb, params=TbParams(pvt=Pvt(), ib=200 * µ)).run()
 
@@ -154,7 +196,26 @@ class TestIloFreqVsIbias(SimTest):
         return run_one()
 
     def typ(self):
-        return ibias_sweep(pvt=Pvt())
+        return solve_ibias(conds=[Pvt()])
 
     def max(self):
+        solve_ibias()
         return run_and_plot_corners()
+
+
+class TestIloSensitivity(SimTest):
+    """Ilo Parameter Sensitivity"""
+
+    tbgen = IloFreqTb
+
+    def default_params(self):
+        return IloFreqTb.Params(pvt=Pvt())
+
+    def min(self):
+        return self.netlist()
+
+    def typ(self):
+        return sensitivities(central=False)
+
+    def max(self):
+        return sensitivities()
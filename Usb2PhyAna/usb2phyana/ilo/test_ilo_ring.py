@@ -14,8 +14,7 @@ import hdl21.sim as hs
 from hdl21.prefix import m, n, PICO
 
 # PDK Imports
-import s130
-import sitepdks as _
+from ..pdk import s130
 
 # Local Imports
 from ..tests.sim_options import sim_options
@@ -2,7 +2,7 @@
 # ILO Tests 
 """
 
-import pickle, io, copy
+import pickle, io
 from pathlib import Path
 import numpy as np
 
@@ -13,8 +13,7 @@ from hdl21.prefix import m, n, PICO
 from hdl21.primitives import Vpulse
 
 # PDK Imports
-import s130
-import sitepdks as _
+from ..pdk import s130
 
 # Local/ DUT Imports
 from .ilo import IloParams
@@ -22,6 +21,8 @@ from .tb import Pvt, TbParams, IloSharedTb, tperiod
 from .test_dac_code import Result, result_pickle_file as dac_code_result_pickle_file
 from ..tests.sim_options import sim_options
 from ..tests.sim_test_mode import SimTest
+from ..tests import sim_runner
+from ..tests.waveforms import RawFile, lttb
 
 
 def best_dac_code(result: Result, pvt: Pvt) -> int:
@@ -58,7 +59,7 @@ def IloInjectionTb(params: TbParams) -> h.Module:
     tb.vinj = Vpulse(
         v1=0 * m,
         v2=1800 * m,
-        period=16667 * PICO,  # ~ 60MHz
+        period=params.tinj,  # ~ 60MHz by default
         rise=10 * PICO,
         fall=10 * PICO,
         width=100 * PICO,
@@ -68,16 +69,9 @@ def IloInjectionTb(params: TbParams) -> h.Module:
     return tb
 
 
-def sim_ilo_injection():
-    pvt = Pvt()
+def injection_sim(params: TbParams, tstop: h.Prefixed) -> hs.Sim:
+    """Transient simulation of `IloInjectionTb`, through `tstop`"""
 
-    # Get the best DAC code from saved frequency-sweep results
-    # FIXME: recreate good values in this pickled data! It's gotten outta whack
-    # dac_code_result = Result(**pickle.load(open(dac_code_result_pickle_file, "rb")))
-    # dac_code = best_dac_code(result=dac_code_result, pvt=pvt)
-    dac_code = 11
-
-    params = TbParams(pvt=pvt, ilo=IloParams(), code=dac_code)
     tb_ = IloInjectionTb(params)
     h.pdk.compile(tb_)
 
@@ -87,9 +81,8 @@ def sim_ilo_injection():
         # The testbench
         tb = tb_
 
-        # Our sole analysis: transient, for much longer than we need.
-        # But auto-stopping when measurements complete.
-        tr = hs.Tran(tstop=7500 * n)
+        # Our sole analysis: transient
+        tr = hs.Tran(tstop=tstop)
 
         # The stuff we can't first-class represent, and need to stick in a literal.
         l = hs.Literal(
@@ -106,12 +99,31 @@ def sim_ilo_injection():
 
     # Add the PDK dependencies
     IloSim.add(*s130.install.include(params.pvt.p))
+    return IloSim
+
+
+def sim_ilo_injection():
+    pvt = Pvt()
+
+    # Get the best DAC code from saved frequency-sweep results
+    # FIXME: recreate good values in this pickled data! It's gotten outta whack
+    # dac_code_result = Result(**pickle.load(open(dac_code_result_pickle_file, "rb")))
+    # dac_code = best_dac_code(result=dac_code_result, pvt=pvt)
+    dac_code = 11
+
+    params = TbParams(pvt=pvt, ilo=IloParams(), code=dac_code)
+    IloSim = injection_sim(params, tstop=7500 * n)
 
-    opts = copy.copy(sim_options)
-    opts.rundir = Path("scratch")
+    # Keep the (large) raw waveform file, and decode only the nodes we need from it
+    outputs = sim_runner.JobOutputs(rawdir=Path("scratch"), waveforms=False)
+    job = sim_runner.run_job(IloSim, sim_options, outputs=outputs)
+    if not job.ok:
+        raise RuntimeError(f"IloInjectionTb failed: {job.failure.value}\n{job.log}")
 
-    results = IloSim.run(opts)
-    print(results)
+    tr = RawFile(job.raw)["tr"]
+    t, vout = tr.diff("xtop.stg0_p", "xtop.stg0_n", dtype=np.float32)
+    print(f"Decoded {len(t)} points from {job.raw}")
+    return lttb(t, vout, 2000)
 
 
 class TestIloInjection(SimTest):
@@ -123,7 +135,7 @@ class TestIloInjection(SimTest):
         return self.netlist()
 
     def typ(self):
-        return sim_ilo_injection()
+        sim_ilo_injection()
 
     def max(self):
         # FIXME: add corner runs
@@ -0,0 +1,109 @@
+"""
+# ILO Jitter
+
+Transient-noise jitter and phase noise of the ILO, free-running (`IloFreqTb`) and injection-locked (`IloInjectionTb`),
+each across many random seeds in parallel. See `tests/tnoise.py`.
+"""
+
+# Std-Lib Imports
+from typing import List, Optional
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+import hdl21.sim as hs
+from hdl21.pdk import Corner
+from hdl21.prefix import n
+
+# PDK Imports
+from ..pdk import s130
+
+# Local Imports
+from .tb import IloFreqTb, Pvt, TbParams
+from .test_injection import IloInjectionTb
+from ..tests.sim_test_mode import SimTest
+from ..tests.waveforms import Plot
+from ..tests.eye import crossings
+from ..tests.jitter import JitterResult
+from ..tests.tnoise import noise_tran, run_seeds, report
+
+# Testbench per mode
+MODES = dict(free=IloFreqTb, locked=IloInjectionTb)
+# Transient length, and the initial start-up and lock time excluded from measurement
+TSTOP = 3000 * n
+SETTLE = 1000 * n
+
+
+def noise_sim(tbgen: h.Generator, params: TbParams, seed: int) -> hs.Sim:
+    """Transient-noise simulation of `tbgen`, with random seed `seed`"""
+
+    tb_ = tbgen(params)
+    s130.compile(tb_)
+
+    @hs.sim
+    class IloNoiseSim:
+        tb = tb_
+        tr = noise_tran(tstop=TSTOP, seed=seed)
+        l = hs.Literal(
+            f"""
+            simulator lang=spice
+            .ic xtop.stg0_p 900m
+            .ic xtop.stg0_n 0
+            .temp {params.pvt.t}
+            simulator lang=spectre
+        """
+        )
+        i = hs.Include(s130.resources / "stdcells.sp")
+
+    IloNoiseSim.add(*s130.install.include(params.pvt.p))
+    return IloNoiseSim
+
+
+def edges(tr: Plot) -> np.ndarray:
+    """Rising-edge times of the ring's first stage, after `SETTLE`"""
+    t, v = tr.diff("xtop.stg0_p", "xtop.stg0_n", start=float(SETTLE))
+    return crossings(t, v, rising=True)
+
+
+def ilo_jitter(
+    pvt: Pvt = Pvt(), code: int = 16, mode: str = "free", nseeds: int = 16
+) -> List[Optional[JitterResult]]:
+    """Jitter of the ILO at `pvt` and DAC `code`, in `mode` "free" or "locked", across `nseeds` seeds"""
+    tbgen = MODES[mode]
+    params = TbParams(pvt=pvt, code=code)
+    results = run_seeds(
+        sim=lambda seed: noise_sim(tbgen, params, seed),
+        edges=edges,
+        seeds=range(nseeds),
+        tb=tbgen.name,
+        corner=str(pvt),
+        mode=mode,
+        code=code,
+    )
+    report(tb=tbgen.name, corner=str(pvt), mode=mode, code=code)
+    return results
+
+
+class TestIloJitter(SimTest):
+    """Ilo Transient-Noise Jitter Test(s)"""
+
+    tbgen = IloFreqTb
+
+    def min(self):
+        return self.netlist()
+
+    def typ(self):
+        for mode in MODES:
+            ilo_jitter(Pvt(), mode=mode, nseeds=8)
+
+    def max(self):
+        conditions = [
+            Pvt(p, v, 25)
+            for p in [Corner.TYP, Corner.FAST, Corner.SLOW]
+            for v in [Corner.TYP, Corner.FAST, Corner.SLOW]
+        ]
+        for pvt in conditions:
+            for mode in MODES:
+                ilo_jitter(pvt, mode=mode, nseeds=32)
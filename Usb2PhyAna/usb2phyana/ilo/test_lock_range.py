@@ -0,0 +1,215 @@
+"""
+# ILO Injection Lock Range
+
+Maps the ILO's injection-lock range over injection frequency, DAC code and PVT, and its lock time near the range's edges.
+
+Lock is judged from the ring's phase relative to the injection pulses (`tests/lock.py`).
+Rather than simulating a full grid of injection frequencies, each code's range is found by a pair of searches,
+for the largest lockable detuning below and above its free-running frequency (`tests/search.py`),
+which concentrate their sims near the locked/unlocked boundary.
+
+Transients are run in stages of increasing length. Only those neither locked nor clearly unlocked by the end of one stage
+are re-run, longer, in the next. And once a search is unlocked at one detuning,
+its not-yet-started sims at larger detunings are skipped.
+"""
+
+# Std-Lib Imports
+import threading
+from pathlib import Path
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+from hdl21.pdk import Corner
+from hdl21.prefix import n, PICO
+
+# Local Imports
+from .tb import IloFreqTb, Pvt, TbParams, sim_input, tperiod
+from .test_injection import IloInjectionTb, injection_sim
+from ..tests.sim_options import sim_options
+from ..tests.sim_test_mode import SimTest
+from ..tests.supplyvals import SupplyVals
+from ..tests import sim_runner
+from ..tests.result_store import result_store
+from ..tests.waveforms import RawFile
+from ..tests.eye import crossings
+from ..tests.lock import LockState, LockResult, phase, classify
+from ..tests.search import bisect
+
+# Result-store table names
+RANGE_TABLE = "ilo_lock_range"
+TIME_TABLE = "ilo_lock_time"
+
+# Ring cycles per injection period: 480MHz from 60MHz
+DIVIDE = 8
+# Transient lengths of each stage
+STAGES = (2000 * n, 4000 * n, 8000 * n)
+# Keep each job's raw waveform file, and decode only the nodes we need from it
+OUTPUTS = sim_runner.JobOutputs(rawdir=Path("scratch/ilo_lock"), waveforms=False)
+
+
+def free_running(pvt: Pvt, codes: Sequence[int]) -> Dict[int, float]:
+    """Free-running frequency (Hz) of each of `codes`. NaN where the ring fails to oscillate, or its sim fails."""
+    sims = [sim_input(IloFreqTb, TbParams(pvt=pvt, code=code)) for code in codes]
+    jobs = sim_runner.run(sims, sim_options, store=result_store, corner=str(pvt))
+    return {
+        code: 1 / tperiod(job.result) if job.ok else np.nan
+        for (code, job) in zip(codes, jobs)
+    }
+
+
+def lock_result(job: sim_runner.JobResult, vdd: float) -> LockResult:
+    """Lock state of a completed injection sim, from its ring and injection edges"""
+    tr = RawFile(job.raw)["tr"]
+    t, vring = tr.diff("xtop.stg0_p", "xtop.stg0_n")
+    _, vinj = tr.signal("xtop.inj")
+    ring = crossings(t, vring, rising=True)
+    ref = crossings(t, vinj, vdd / 2, rising=True)
+    if len(ref) < 2:
+        return LockResult(LockState.UNKNOWN)
+    return classify(*phase(ring, ref, DIVIDE))
+
+
+def simulate(
+    pvt: Pvt, points: List[Tuple[Hashable, float]], trials: List[Tuple[int, float]]
+) -> List[LockResult]:
+    """
+    Lock results of each of `trials`, pairs of `(code, finj)`, for search `points` of `(key, detuning)`.
+    Runs each in stages, until it is locked or unlocked, or the last stage ends.
+    """
+    vdd = float(SupplyVals.corner(pvt.v).VDD18)
+    results = [LockResult(LockState.UNKNOWN) for _ in trials]
+    pending = list(range(len(trials)))
+
+    # Lowest unlocked detuning per search, so far
+    failed: Dict[Hashable, float] = dict()
+    lock = threading.Lock()
+
+    for tstop in STAGES:
+
+        def done(idx: int, job: sim_runner.JobResult) -> None:
+            i = pending[idx]
+            if job.ok:
+                results[i] = lock_result(job, vdd)
+            if results[i].state == LockState.UNLOCKED:
+                (key, detune) = points[i]
+                with lock:
+                    failed[key] = min(detune, failed.get(key, detune))
+
+        def skip(idx: int) -> bool:
+            (key, detune) = points[pending[idx]]
+            with lock:
+                return detune > failed.get(key, np.inf)
+
+        sims = []
+        for i in pending:
+            (code, finj) = trials[i]
+            tinj = round(1e12 / finj) * PICO
+            sims.append(injection_sim(TbParams(pvt=pvt, code=code, tinj=tinj), tstop))
+        jobs = sim_runner.run(
+            sims,
+            sim_options,
+            outputs=OUTPUTS,
+            store=result_store,
+            corner=str(pvt),
+            skip=skip,
+            done=done,
+        )
+        pending = [
+            i
+            for (i, job) in zip(pending, jobs)
+            if job.ok and results[i].state == LockState.UNKNOWN
+        ]
+        if not pending:
+            break
+
+    return results
+
+
+def lock_range(
+    pvt: Pvt = Pvt(),
+    codes: Sequence[int] = (16,),
+    hi: float = 0.1,
+    rtol: float = 0.1,
+    width: int = 2,
+) -> Dict[int, Tuple[float, float]]:
+    """
+    Injection-lock range at `pvt` of each of `codes`: the lowest and highest ring frequencies (Hz), `DIVIDE` times the injection frequency,
+    to which it locks. Searched up to a fractional detuning of `hi` from its free-running frequency, in either direction.
+    Records each range, and each simulated point's lock time, to the result store.
+    """
+    ffree = free_running(pvt, codes)
+    oscillating = [code for code in codes if np.isfinite(ffree[code])]
+    keys = [(code, side) for code in oscillating for side in (-1, 1)]
+
+    def evaluate(points: List[Tuple[Hashable, float]]) -> List[bool]:
+        trials = [
+            (code, ffree[code] * (1 + side * detune) / DIVIDE)
+            for ((code, side), detune) in points
+        ]
+        results = simulate(pvt, points, trials)
+        for ((code, finj), r) in zip(trials, results):
+            result_store.put(
+                TIME_TABLE,
+                dict(
+                    tb="IloInjectionTb",
+                    corner=str(pvt),
+                    code=code,
+                    ffree=ffree[code],
+                    finj=finj,
+                    state=r.state,
+                    lock_time=r.lock_time,
+                ),
+            )
+        return [r.state == LockState.LOCKED for r in results]
+
+    brackets = bisect(evaluate, keys, lo=0.0, hi=hi, rtol=rtol, width=width)
+
+    ranges = dict()
+    for code in oscillating:
+        below, above = brackets[(code, -1)], brackets[(code, 1)]
+        flo, fhi = ffree[code] * (1 - below.lo), ffree[code] * (1 + above.lo)
+        ranges[code] = (flo, fhi)
+        result_store.put(
+            RANGE_TABLE,
+            dict(
+                tb="IloInjectionTb",
+                corner=str(pvt),
+                code=code,
+                ffree=ffree[code],
+                flo=flo,
+                fhi=fhi,
+                # Whether either end reached the searched limit
+                limited=below.passed_all or above.passed_all,
+                evaluations=below.evaluations + above.evaluations,
+            ),
+        )
+        print(
+            f"{pvt} code {code}: {ffree[code] / 1e6:.1f}MHz free-running, "
+            f"locks {flo / 1e6:.1f}-{fhi / 1e6:.1f}MHz"
+        )
+    return ranges
+
+
+class TestIloLockRange(SimTest):
+    """Ilo Injection Lock-Range Test(s)"""
+
+    tbgen = IloInjectionTb
+
+    def min(self):
+        return self.netlist()
+
+    def typ(self):
+        lock_range(Pvt(), codes=(16,), rtol=0.25)
+
+    def max(self):
+        conditions = [
+            Pvt(p, v, t)
+            for p in [Corner.TYP, Corner.FAST, Corner.SLOW]
+            for v in [Corner.TYP, Corner.FAST, Corner.SLOW]
+            for t in [25, 75, -25]
+        ]
+        for pvt in conditions:
+            lock_range(pvt, codes=range(4, 32, 4))
@@ -0,0 +1,121 @@
+"""
+# ILO Sizing Optimization
+
+Sizes the ILO's delay stages and bias current for the least power which still reaches 480MHz at every PVT condition,
+at the frequency-control DAC's mid-scale code (`tests/optimize.py`).
+
+Designs are parameterized by the stages' forward and cross-coupled inverter widths, their load capacitance, and the bias current.
+Each design is simulated at each of `conditions`, and measured for:
+
+* `power`: power (W) at typical conditions
+* `fmin`: the lowest free-running frequency (Hz) across conditions, which must reach `TARGET`
+
+Every design's metrics are cached in the result store, so re-runs, and re-proposed designs, need no sims.
+Cached metrics are keyed by the conditions, testbench defaults and target too, so changing any of them re-simulates.
+"""
+
+# Std-Lib Imports
+from typing import List
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+from hdl21.pdk import Corner
+from hdl21.prefix import f, µ
+
+# Local Imports
+from ..tests.sim_test_mode import SimTest
+from ..tests import sim_runner
+from ..tests.optimize import Constraint, Metrics, OptResult, Point, Range
+from ..tests.optimize import optimize, simulated
+from .ilo import IloParams
+from .tb import IloFreqTb, Pvt, TbParams, power, sim_input, tperiod
+
+# Target frequency (Hz)
+TARGET = 480e6
+
+# PVT conditions. Typical first, for power. Then the slowest and fastest.
+conditions = [
+    Pvt(),
+    Pvt(p=Corner.SLOW, v=Corner.SLOW, t=75),
+    Pvt(p=Corner.FAST, v=Corner.FAST, t=-25),
+]
+
+# Design space. Inverter widths in unit devices, load capacitance in fF, and bias current in µA.
+space = dict(
+    fwd=Range(lo=4, hi=32, step=2),
+    cross=Range(lo=1, hi=16, step=1),
+    cl=Range(lo=1, hi=40, step=1),
+    ib=Range(lo=50, hi=300, step=5),
+)
+
+# The current, hand-picked design
+current = dict(fwd=16, cross=4, cl=10, ib=120)
+
+
+def params(point: Point, pvt: Pvt) -> TbParams:
+    """Testbench parameters for design `point` at conditions `pvt`"""
+    ilo = IloParams(
+        fwd=int(point["fwd"]), cross=int(point["cross"]), cl=point["cl"] * f
+    )
+    return TbParams(pvt=pvt, ilo=ilo, ib=point["ib"] * µ)
+
+
+def metrics(point: Point, jobs: List[sim_runner.JobResult]) -> Metrics:
+    """
+    Power at typical conditions, and lowest frequency across conditions.
+    Rings which fail to oscillate run at zero frequency. NaN where a sim fails, so that it is retried.
+    """
+    freqs = [
+        np.nan_to_num(1 / tperiod(job.result), nan=0.0) if job.ok else np.nan
+        for job in jobs
+    ]
+    typ = jobs[0]
+    return dict(
+        power=power(typ.result, conditions[0]) if typ.ok else np.nan,
+        fmin=float(np.min(freqs)),
+    )
+
+
+def optimize_sizing(batch: int = 32, generations: int = 20) -> OptResult:
+    """Optimize the ILO's sizing, starting from the current design"""
+
+    evaluate = simulated(
+        name="ilo_sizing",
+        sims=lambda point: [
+            sim_input(IloFreqTb, params(point, pvt)) for pvt in conditions
+        ],
+        measure=metrics,
+        conditions=conditions,
+        context=f"{IloFreqTb.name} {TbParams()} target={TARGET}",
+    )
+    result = optimize(
+        evaluate,
+        space,
+        objective="power",
+        constraints=[Constraint("fmin", lo=TARGET)],
+        x0=current,
+        batch=batch,
+        generations=generations,
+    )
+    print(result)
+    return result
+
+
+class TestIloSizing(SimTest):
+    """Ilo Sizing Optimization"""
+
+    tbgen = IloFreqTb
+
+    def default_params(self):
+        return params(current, Pvt())
+
+    def min(self):
+        return self.netlist()
+
+    def typ(self):
+        return optimize_sizing(batch=8, generations=2)
+
+    def max(self):
+        return optimize_sizing()
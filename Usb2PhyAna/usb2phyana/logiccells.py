@@ -8,8 +8,23 @@ and PDK-provided logic cells.
 # Hdl & PDK Imports
 import hdl21 as h
 
-# Logic cells from the technology library
-from s130.scs130lp import *
+
+def __getattr__(name: str):
+    """
+    # Logic cells from the technology library
+    Loaded lazily, on first access to any cell, e.g. `logiccells.Inv`.
+    Importing the full cell library is a substantial share of our import time.
+    """
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import s130.scs130lp as lib
+
+    try:
+        return getattr(lib, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 """
 Generic "Headers" for Theoretical, Descriptive External Modules 
@@ -1,22 +1,25 @@
 from dataclasses import replace
 from pprint import pprint
 
+# PyPi Imports
+import numpy as np
+
 # Hdl Imports
 import hdl21 as h
 import hdl21.sim as hs
-from hdl21.pdk import Corner
 from hdl21.prefix import m, µ, f, T
 
 # PDK Imports
-import s130
-import sitepdks as _
+from ..pdk import s130
 
 # Local Imports
 from . import OpAmp5T
 from ..tetris.mos import Nmos, Pmos
-from ..pvt import Pvt
+from ..pvt import Pvt, Project, all_pvts
 from ..tests.sim_test_mode import SimTest
 from ..tests.sim_options import sim_options
+from ..tests.supplyvals import SupplyVals
+from ..tests.acfeatures import AcFeatures, features, out, sweep
 
 
 @h.paramclass
@@ -57,7 +60,7 @@ def Tb(params: TbParams) -> h.Module:
     tb = hs.tb("Tb")
     # Generate and drive VDD
     tb.VDD = VDD = h.Signal()
-    tb.vvdd = h.Vdc(dc=1800 * m)(p=tb.VDD, n=tb.VSS)
+    tb.vvdd = h.Vdc(dc=SupplyVals.corner(params.pvt.v).VDD18)(p=tb.VDD, n=tb.VSS)
 
     # Input voltage
     tb.inp = h.Diff()
@@ -88,8 +91,8 @@ def Tb(params: TbParams) -> h.Module:
     return tb
 
 
-def sim(params: TbParams):
-    """# OpAmp5T Sims"""
+def ac_sim(params: TbParams) -> hs.Sim:
+    """AC Sim of the OpAmp5T bench at `params`, including its PVT conditions"""
 
     # Create our parametric testbench
     tb_ = Tb(params)
@@ -100,27 +103,36 @@ def sim(params: TbParams):
     class OpAmp5TSim:
         tb = tb_
         op = hs.Op()
-        # tr = hs.Tran(tstop=20 * n)
-        ac = hs.Ac(sweep=hs.LogSweep(start=1, stop=1 * T, npts=10))
-        dc_gain = hs.Meas(analysis=ac, expr="find 'vdb(xtop.out)' at=1")
-        ugbw = hs.Meas(analysis=ac, expr="when vdb(xtop.out)=0")
+        ac = hs.Ac(sweep=hs.LogSweep(start=1, stop=1 * T, npts=20))
+        l = hs.Literal(
+            f"""
+            simulator lang=spice
+            .temp {Project.temper(params.pvt.t)}
+            simulator lang=spectre
+        """
+        )
+
+    OpAmp5TSim.add(*s130.install.include(params.pvt.p))
+    return OpAmp5TSim
 
-    OpAmp5TSim.add(*s130.install.include(Corner.TYP))
+
+def sim(params: TbParams) -> AcFeatures:
+    """# OpAmp5T Sims"""
 
     # Run some spice
     opts = replace(sim_options, rundir="./scratch")
-    results = OpAmp5TSim.run(opts)
+    results = ac_sim(params).run(opts)
     ac_result = results.an[1]
-    pprint(ac_result.data.keys())
-    pprint(ac_result.measurements)
+    result = features(ac_result.freq, out(ac_result))
+    pprint(result.point(0))
 
-    import numpy as np
     import matplotlib.pyplot as plt
 
-    plt.plot(ac_result.freq, np.abs(ac_result.data["xtop.out"]))
+    plt.plot(ac_result.freq, np.abs(out(ac_result)))
     plt.xscale("log")
     plt.yscale("log")
     plt.savefig("scratch/OpAmp5T.ac.png")
+    return result
 
 
 class Test(SimTest):
@@ -141,3 +153,6 @@ class Test(SimTest):
 
     def typ(self):
         return sim(self.default_params())
+
+    def max(self):
+        return sweep(self.default_params(), sim=ac_sim, name="OpAmp5T", pvts=all_pvts())
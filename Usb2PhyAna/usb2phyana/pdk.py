@@ -0,0 +1,42 @@
+"""
+# PDK
+
+The `s130` PDK, loaded on first use.
+
+Importing the PDK, and its site installation (`sitepdks`), is a substantial share of our import time,
+and is unnecessary for e.g. test collection. Circuits and testbenches instead import the proxy `s130` from here,
+and refer to its contents (`s130.modules.nmos`, `s130.MosParams`, `s130.install`, ...) only inside generators and functions.
+The first such reference imports `sitepdks` and then `s130`.
+"""
+
+# Std-Lib Imports
+import importlib
+from types import ModuleType
+
+
+class LazyModule:
+    """# Lazily-Imported Module
+    Proxy for module `name`, imported on first attribute access, after each of modules `requires`."""
+
+    def __init__(self, name: str, *requires: str):
+        self._name = name
+        self._requires = requires
+        self._module = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            for name in self._requires:
+                importlib.import_module(name)
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __repr__(self) -> str:
+        return f"LazyModule({self._name!r})"
+
+
+s130 = LazyModule("s130", "sitepdks")
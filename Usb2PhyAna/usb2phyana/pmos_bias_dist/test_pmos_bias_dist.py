@@ -1,21 +1,26 @@
 from dataclasses import replace
 from pprint import pprint
+from typing import List, Sequence
+
+import pytest
 
 # Hdl Imports
 import hdl21 as h
 import hdl21.sim as hs
+from hdl21.pdk import Corner
 from hdl21.prefix import m, µ
 
 # PDK Imports
-import s130
-import sitepdks as _
+from ..pdk import s130
 
 # Local Imports
 from . import PmosBiasDist
 from ..tetris.mos import Pmos
-from ..pvt import Pvt
+from ..pvt import Pvt, Project, all_pvts
 from ..tests.sim_test_mode import SimTest, SimTestMode
 from ..tests.sim_options import sim_options
+from ..tests import oppoint
+from ..tests.oppoint import OpPoints, Rule
 
 
 @h.paramclass
@@ -75,6 +80,48 @@ def sim(params: TbParams):
     pprint(results)
 
 
+def op_sim(params: TbParams) -> hs.Sim:
+    """Operating-point Sim of `params`, including its temperature"""
+
+    tb_ = Tb(params)
+    s130.compile(tb_)
+
+    @hs.sim
+    class BiasDistOpSim:
+        tb = tb_
+        op = hs.Op()
+        l = hs.Literal(
+            f"""
+            simulator lang=spice
+            .temp {Project.temper(params.pvt.t)}
+            simulator lang=spectre
+        """
+        )
+
+    BiasDistOpSim.add(*s130.install.include(params.pvt.p))
+    return BiasDistOpSim
+
+
+# Every device is a mirror or cascode, and must stay in saturation
+SATURATION_RULES = [Rule(margin=0.1, paths="xtop.dut.*")]
+
+
+def saturation(params: TbParams, pvts: Sequence[Pvt]) -> OpPoints:
+    """Operating points of every device, across `pvts`. Fails if any are short of saturation."""
+    corner = lambda pvt: (pvt.p, Project.temper(pvt.t))
+    missing = oppoint.missing_tables(
+        oppoint.devices(Tb(params)), {corner(pvt) for pvt in pvts}
+    )
+    if missing:
+        pytest.skip(f"gm/Id tables {missing} not built")
+    sims = [op_sim(replace(params, pvt=pvt)) for pvt in pvts]
+    ops = oppoint.extract(Tb(params), sims, pvts, corner=corner, name="PmosBiasDist")
+    found = oppoint.violations(ops, SATURATION_RULES)
+    print(oppoint.report(found))
+    assert not found, f"{len(found)} saturation violations"
+    return ops
+
+
 class Test(SimTest):
     """# PmosBiasDist Test Class"""
 
@@ -93,3 +140,6 @@ class Test(SimTest):
 
     def typ(self):
         return sim(self.default_params())
+
+    def max(self):
+        return saturation(self.default_params(), all_pvts())
@@ -8,7 +8,7 @@ import hdl21 as h
 # Local Imports
 from .phyroles import PhyRoles
 from .supplies import PhySupplies
-from .logiccells import Nor2, Inv, Xor2
+from . import logiccells
 
 
 @h.generator
@@ -28,14 +28,18 @@ def PulseGen(_: h.HasNoParams) -> h.Module:
         en_n, inp_n, inp_dly = h.Signals(3)
 
         # Invert Enable
-        ien = Inv()(i=en, z=en_n, VDD=SUPPLIES.VDD18, VSS=SUPPLIES.VSS)
+        ien = logiccells.Inv()(i=en, z=en_n, VDD=SUPPLIES.VDD18, VSS=SUPPLIES.VSS)
         # Enable Gating
-        nr_en = Nor2()(a=inp, b=en_n, z=inp_n, VDD=SUPPLIES.VDD18, VSS=SUPPLIES.VSS)
+        nr_en = logiccells.Nor2()(
+            a=inp, b=en_n, z=inp_n, VDD=SUPPLIES.VDD18, VSS=SUPPLIES.VSS
+        )
         # Delay Invs
-        idly0 = Inv()(i=inp_n, z=inp_dly, VDD=SUPPLIES.VDD18, VSS=SUPPLIES.VSS)
+        idly0 = logiccells.Inv()(
+            i=inp_n, z=inp_dly, VDD=SUPPLIES.VDD18, VSS=SUPPLIES.VSS
+        )
 
         # Output Pulse Generation
-        nr_pulse = Xor2()(
+        nr_pulse = logiccells.Xor2()(
             a=inp_dly, b=inp, z=pulse, VDD=SUPPLIES.VDD18, VSS=SUPPLIES.VSS
         )
 
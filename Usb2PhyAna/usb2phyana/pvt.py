@@ -1,3 +1,5 @@
+from typing import List, Optional, Sequence
+
 import hdl21 as h
 from hdl21.pdk import Corner
 
@@ -24,3 +26,25 @@ class Project:
     def temper(corner: Corner) -> int:
         vals = {Corner.SLOW: -25, Corner.TYP: 25, Corner.FAST: 75}
         return vals[corner]
+
+
+# Process, voltage and temperature corners, in sweep order
+CORNERS = [Corner.TYP, Corner.FAST, Corner.SLOW]
+# Simulation temperatures (C) of each of `CORNERS`
+TEMPERATURES = [Project.temper(corner) for corner in CORNERS]
+
+
+def all_pvts(
+    cls: type = Pvt,
+    voltages: Optional[Sequence] = None,
+    temperatures: Optional[Sequence] = None,
+) -> List:
+    """
+    # All PVT Conditions
+    Every combination of process, voltage and temperature, as instances of `cls`.
+    Voltages and temperatures default to `CORNERS`. Testbenches with their own `Pvt` types,
+    which take supply voltages or temperatures (C) as values, pass those here, e.g. `temperatures=TEMPERATURES`.
+    """
+    voltages = CORNERS if voltages is None else voltages
+    temperatures = CORNERS if temperatures is None else temperatures
+    return [cls(p, v, t) for p in CORNERS for v in voltages for t in temperatures]
@@ -0,0 +1,228 @@
+"""
+# AC Response Features
+
+Amplifier frequency-response features, extracted from complex AC responses of many design and PVT points at once:
+
+* DC gain (dB), at the lowest simulated frequency
+* -3dB bandwidth (Hz): the first frequency at which the gain falls 3dB below its DC value
+* Unity-gain bandwidth (Hz): the first frequency at which the gain falls through 0dB
+* Phase margin (degrees): 180 less the phase lag, relative to DC, at the unity-gain frequency
+* Gain margin (dB): the loss at the first frequency at which the phase lag reaches 180 degrees
+* Peaking (dB): the largest gain above its DC value
+
+Responses arrive as a `(npoints, nfreqs)` complex array over a shared frequency grid, and every feature is a single array operation.
+Crossings are interpolated in log-frequency. Features which never occur in the simulated band, e.g. a unity-gain frequency of an amp
+without gain, are NaN.
+
+`ac_sweep` simulates a grid of testbench parameters (`grid`) in a single `sim_runner` batch,
+and records each point's parameters and features to the result store's `ac_features` table.
+`sweep` does so over the amplifier testbenches' shared grid of bias current, load, common-mode and PVT.
+
+Example:
+
+```
+points = grid(TbParams(), ib=[1 * µ, 2 * µ], cl=[10 * f, 50 * f])
+result = ac_sweep(points, sim=ac_sim, response=out, name="FcascTb")
+result = sweep(TbParams(), sim=ac_sim, name="FcascTb", pvts=all_pvts())
+```
+"""
+
+# Std-Lib Imports
+import dataclasses, itertools
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, List, Sequence
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+import hdl21.sim as hs
+from hdl21.prefix import m, µ, f, n
+
+# Local Imports
+from .sim_options import sim_options
+from .result_store import ResultStore, result_store
+from .sensitivity import replace
+from . import sim_runner
+
+# Result-store table name
+TABLE = "ac_features"
+
+# Default `sweep` axes: bias current `ib`, load capacitance `cl` and input common-mode `vc`
+AXES = dict(
+    ib=[500 * n, 1 * µ, 2 * µ, 5 * µ],
+    cl=[10 * f, 50 * f, 200 * f],
+    vc=[700 * m, 900 * m, 1100 * m],
+)
+
+
+@dataclass
+class AcFeatures:
+    """# AC Response Features, per Point"""
+
+    dc_gain: np.ndarray  # DC gain (dB), shape (npoints,)
+    bw: np.ndarray  # -3dB bandwidth (Hz)
+    ugbw: np.ndarray  # Unity-gain bandwidth (Hz)
+    phase_margin: np.ndarray  # Phase margin (degrees)
+    gain_margin: np.ndarray  # Gain margin (dB)
+    peaking: np.ndarray  # Peaking above DC gain (dB)
+
+    def __len__(self) -> int:
+        return len(self.dc_gain)
+
+    def point(self, idx: int) -> Dict[str, float]:
+        """Features of point `idx`, by name"""
+        return {
+            field.name: float(getattr(self, field.name)[idx])
+            for field in dataclasses.fields(self)
+        }
+
+
+def features(freq: np.ndarray, response: np.ndarray) -> AcFeatures:
+    """Extract the features of complex `response`, shape `(npoints, nfreqs)`, at increasing frequencies `freq`, shape `(nfreqs,)`"""
+    freq = np.asarray(freq, dtype=np.float64)
+    resp = np.atleast_2d(np.asarray(response, dtype=np.complex128))
+    logf = np.log10(freq)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        db = 20 * np.log10(np.abs(resp))
+        # Phase lag relative to DC, unwrapped along frequency
+        lag = -np.degrees(np.unwrap(np.angle(resp), axis=1))
+        lag = lag - lag[:, :1]
+
+        dc_gain = db[:, 0]
+        bw = 10 ** _falling(logf, db - dc_gain[:, None], -3.0)
+        ugbw = 10 ** _falling(logf, db, 0.0)
+        phase_margin = 180.0 - _interp_rows(logf, lag, np.log10(ugbw))
+        f180 = _falling(logf, -lag, -180.0)
+        gain_margin = -_interp_rows(logf, db, f180)
+        peaking = np.maximum(np.nanmax(db, axis=1) - dc_gain, 0.0)
+
+    return AcFeatures(
+        dc_gain=dc_gain,
+        bw=bw,
+        ugbw=ugbw,
+        phase_margin=phase_margin,
+        gain_margin=gain_margin,
+        peaking=peaking,
+    )
+
+
+def _falling(x: np.ndarray, y: np.ndarray, level: float) -> np.ndarray:
+    """Row-wise `x` at which `y` first falls through `level`, linearly interpolated. NaN if it never does."""
+    above = y >= level
+    # Index of the first point below `level` which follows one at or above it
+    falls = above[:, :-1] & ~above[:, 1:]
+    found = falls.any(axis=1)
+    idx = np.argmax(falls, axis=1)
+    rows = np.arange(y.shape[0])
+    y0, y1 = y[rows, idx], y[rows, idx + 1]
+    frac = (y0 - level) / (y0 - y1)
+    return np.where(found, x[idx] + frac * (x[idx + 1] - x[idx]), np.nan)
+
+
+def _interp_rows(x: np.ndarray, y: np.ndarray, at: np.ndarray) -> np.ndarray:
+    """Row-wise linear interpolation of `y` at `at`, shape `(nrows,)`. NaN where `at` is NaN."""
+    found = np.isfinite(at)
+    idx = np.clip(np.searchsorted(x, np.where(found, at, x[0])) - 1, 0, len(x) - 2)
+    rows = np.arange(y.shape[0])
+    frac = (at - x[idx]) / (x[idx + 1] - x[idx])
+    return np.where(
+        found, y[rows, idx] + frac * (y[rows, idx + 1] - y[rows, idx]), np.nan
+    )
+
+
+def grid(nominal: Any, **axes: Sequence[Any]) -> List[Any]:
+    """
+    Every combination of the values of `axes`, each a field of paramclass `nominal`, e.g. `ib` or `pvt`.
+    Nested fields are separated by double underscores, e.g. `pvt__t`. Later axes vary fastest.
+    """
+    paths = list(axes)
+    points = []
+    for values in itertools.product(*axes.values()):
+        params = nominal
+        for (path, value) in zip(paths, values):
+            params = replace(params, path.replace("__", "."), value)
+        points.append(params)
+    return points
+
+
+def flatten(params: Any, prefix: str = "") -> Dict[str, Any]:
+    """Paramclass `params` as a flat dictionary of JSON-friendly values, keyed by dotted path"""
+    flat = dict()
+    for field in dataclasses.fields(params):
+        value = getattr(params, field.name)
+        path = prefix + field.name
+        if dataclasses.is_dataclass(value):
+            flat.update(flatten(value, path + "."))
+        elif isinstance(value, h.Prefixed):
+            flat[path] = float(value)
+        elif isinstance(value, Enum):
+            flat[path] = value.value
+        elif isinstance(value, (bool, int, float, str)) or value is None:
+            flat[path] = value
+        else:
+            flat[path] = str(value)
+    return flat
+
+
+def ac_sweep(
+    points: Sequence[Any],
+    sim: Callable[[Any], hs.Sim],
+    response: Callable[[Any], np.ndarray],
+    name: str,
+    store: ResultStore = result_store,
+) -> AcFeatures:
+    """
+    Simulate testbench parameters `points`, each by `sim(params)`, in a single `sim_runner` batch,
+    and extract the features of each one's AC `response(ac_result)`. All sims must share a frequency grid.
+    Records each point's parameters and features, labeled `name`. Failed sims have NaN features.
+    """
+    jobs = sim_runner.run(
+        [sim(p) for p in points],
+        sim_options,
+        store=store,
+        corner=lambda idx: str(getattr(points[idx], "pvt", name)),
+    )
+    acs = [_ac(job.result) if job.ok else None for job in jobs]
+    freq = next((ac.freq for ac in acs if ac is not None), np.array([1.0, 10.0]))
+    nan = np.full(len(freq), np.nan, dtype=np.complex128)
+    responses = np.stack(
+        [np.asarray(response(ac)) if ac is not None else nan for ac in acs]
+    )
+    result = features(freq, responses)
+
+    for (idx, (params, job)) in enumerate(zip(points, jobs)):
+        store.put(
+            TABLE,
+            dict(tb=name, status=job.status, **flatten(params), **result.point(idx)),
+        )
+    return result
+
+
+def out(ac: Any) -> np.ndarray:
+    """Complex response at the (single-ended) output"""
+    return ac.data["xtop.out"]
+
+
+def sweep(
+    nominal: Any,
+    sim: Callable[[Any], hs.Sim],
+    name: str,
+    pvts: Sequence[Any],
+    response: Callable[[Any], np.ndarray] = out,
+    axes: Dict[str, Sequence[Any]] = AXES,
+) -> AcFeatures:
+    """
+    AC features around testbench parameters `nominal`, across the grid of `axes` and `pvts`, all in one batch, per `ac_sweep`.
+    Any of the default `AXES` may be overridden, e.g. `axes={**AXES, "ib": [1 * µ]}`.
+    """
+    points = grid(nominal, pvt=pvts, **axes)
+    return ac_sweep(points, sim=sim, response=response, name=name)
+
+
+def _ac(result: hs.SimResult) -> Any:
+    """The (first) AC analysis result of `result`"""
+    return next(an for an in result.an if hasattr(an, "freq"))
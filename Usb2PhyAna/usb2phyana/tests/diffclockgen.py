@@ -1,5 +1,5 @@
 """ 
-# Differential Clock Generator 
+# Differential Clock & Pulse Generators
 
 For simulation, from ideal pulse voltage sources 
 """
@@ -54,3 +54,49 @@ def DiffClkGen(p: DiffClkParams) -> h.Module:
     ckg.vn = Vpulse(vparams(False))(p=ck.n, n=VSS)
 
     return ckg
+
+
+@h.paramclass
+class DiffPulseParams:
+    """Differential Single-Pulse Generator Parameters"""
+
+    width = h.Param(dtype=hs.ParamVal, desc="Pulse Width, e.g. one Unit Interval")
+    delay = h.Param(dtype=hs.ParamVal, desc="Delay")
+    vd = h.Param(dtype=hs.ParamVal, desc="Differential Voltage")
+    vc = h.Param(dtype=hs.ParamVal, desc="Common-Mode Voltage")
+    trf = h.Param(dtype=hs.ParamVal, desc="Rise / Fall Time")
+
+
+@h.generator
+def DiffPulseGen(p: DiffPulseParams) -> h.Module:
+    """# Differential Single-Pulse Generator
+    A single pulse, e.g. one UI wide for pulse-response and statistical-eye analysis,
+    or long enough to settle for capturing edge responses.
+    Rests at the "zero" level, `-vd/2` differentially, before and after the pulse."""
+
+    pg = h.Module()
+    pg.VSS = VSS = h.Port()
+    pg.out = out = Diff(role=Diff.Roles.SINK, port=True)
+
+    def vparams(polarity: bool) -> Vpulse.Params:
+        """Closure to create the pulse-source parameters for each differential half."""
+        v1 = p.vc - p.vd / 2
+        v2 = p.vc + p.vd / 2
+        if not polarity:
+            v1, v2 = v2, v1
+        return Vpulse.Params(
+            v1=v1,
+            v2=v2,
+            # Repeat far later than any sim should run
+            period=10_000 * p.width,
+            rise=p.trf,
+            fall=p.trf,
+            # Fifty-percent points `width` apart
+            width=p.width - p.trf,
+            delay=p.delay,
+        )
+
+    pg.vp = Vpulse(vparams(True))(p=out.p, n=VSS)
+    pg.vn = Vpulse(vparams(False))(p=out.n, n=VSS)
+
+    return pg
@@ -0,0 +1,289 @@
+"""
+# Eye Diagrams
+
+Eye-diagram measurements of long simulated (or synthesized) waveforms, and USB 2.0 High-Speed eye-template checks.
+
+The waveform is resampled onto a uniform grid of `osr` points per UI, aligned to its mean threshold-crossing phase,
+and folded into a `(ntraces, osr)` array of UI-long traces. Every measurement is then an array operation over that,
+so millions of samples take well under a second.
+
+Example:
+
+```
+t, v = tr.diff("xtop.pads_p", "xtop.pads_n")
+eye = fold(t, v, ui=2.083e-9, skip=10e-9)
+result = measure(eye)
+tx = check(eye, HS_TX_TEMPLATE1)
+record(result, tb="HsTxDriverTb", corner=str(pvt), template=tx)
+```
+"""
+
+# Std-Lib Imports
+from dataclasses import dataclass, asdict
+from typing import List, Optional, Tuple
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .result_store import ResultStore, result_store
+
+# Result-store table name
+TABLE = "eye"
+
+
+@dataclass
+class Eye:
+    """
+    # Eye
+    A waveform folded into UI-long traces, each starting at the mean threshold-crossing phase.
+    """
+
+    traces: np.ndarray  # Folded samples (V), shape (ntraces, osr)
+    ui: float  # Unit interval (s)
+    t0: float  # Start time of the first trace (s)
+    threshold: float  # Decision threshold (V)
+    crossings: np.ndarray  # Threshold-crossing times (s)
+
+    @property
+    def osr(self) -> int:
+        return self.traces.shape[1]
+
+    @property
+    def phases(self) -> np.ndarray:
+        """Phase of each sample within its UI, in fractions of a UI"""
+        return np.arange(self.osr) / self.osr
+
+    @property
+    def bits(self) -> np.ndarray:
+        """Bit decisions per trace, at the center of the eye"""
+        return self.traces[:, self.osr // 2] > self.threshold
+
+    def tie(self) -> np.ndarray:
+        """Time-interval error (s) of each crossing, relative to the mean crossing phase"""
+        return (self.crossings - self.t0 + self.ui / 2) % self.ui - self.ui / 2
+
+    def histogram(self, nvolts: int = 128) -> Tuple[np.ndarray, np.ndarray]:
+        """Sample counts per (phase, voltage) bin, shape (osr, nvolts), and the voltage-bin edges"""
+        phases = np.broadcast_to(np.arange(self.osr), self.traces.shape)
+        vedges = np.linspace(self.traces.min(), self.traces.max(), nvolts + 1)
+        counts, _, _ = np.histogram2d(
+            phases.ravel(),
+            self.traces.ravel(),
+            bins=[np.arange(self.osr + 1) - 0.5, vedges],
+        )
+        return counts, vedges
+
+
+def crossings(
+    t: np.ndarray, v: np.ndarray, threshold: float = 0.0, rising: bool = False
+) -> np.ndarray:
+    """Times at which `v` crosses `threshold`, linearly interpolated between samples. Only upward crossings if `rising`."""
+    above = v > threshold
+    changes = above[1:] != above[:-1]
+    if rising:
+        changes &= above[1:]
+    idx = np.flatnonzero(changes)
+    frac = (threshold - v[idx]) / (v[idx + 1] - v[idx])
+    return t[idx] + frac * (t[idx + 1] - t[idx])
+
+
+def fold(
+    t: np.ndarray,
+    v: np.ndarray,
+    ui: float,
+    osr: int = 64,
+    threshold: float = 0.0,
+    skip: float = 0.0,
+) -> Eye:
+    """Fold waveform `(t, v)` into an `Eye` of UI-long traces, ignoring its first `skip` seconds"""
+    keep = t >= t[0] + skip
+    t, v = t[keep], v[keep]
+    tc = crossings(t, v, threshold)
+    if not len(tc):
+        raise ValueError("Cannot fold an eye from a waveform without any crossings")
+
+    # Mean crossing phase. A circular mean, as phases wrap around the UI.
+    angle = np.angle(np.mean(np.exp(2j * np.pi * tc / ui)))
+    phase = (angle / (2 * np.pi) % 1) * ui
+    t0 = t[0] + (phase - t[0]) % ui
+    ntraces = int((t[-1] - t0) / ui)
+
+    tu = t0 + ui * (np.arange(ntraces * osr) / osr)
+    traces = np.interp(tu, t, v).reshape(ntraces, osr)
+    return Eye(traces=traces, ui=float(ui), t0=t0, threshold=threshold, crossings=tc)
+
+
+@dataclass
+class EyeResult:
+    """# Eye Measurement Results"""
+
+    ntraces: int  # Number of UIs measured
+    height: float  # Vertical opening at the eye center (V)
+    width: float  # Horizontal opening, the UI less peak-to-peak jitter (s)
+    jitter_rms: float  # RMS time-interval error of crossings (s)
+    jitter_pp: float  # Peak-to-peak time-interval error of crossings (s)
+    level1: float  # Mean level of ones at the eye center (V)
+    level0: float  # Mean level of zeros at the eye center (V)
+
+
+def openings(eye: Eye) -> np.ndarray:
+    """Vertical opening (V) at each phase: the lowest one less the highest zero. Negative where closed."""
+    ones = eye.bits[:, None]
+    lowest1 = np.where(ones, eye.traces, np.inf).min(axis=0)
+    highest0 = np.where(ones, -np.inf, eye.traces).max(axis=0)
+    return lowest1 - highest0
+
+
+def measure(eye: Eye) -> EyeResult:
+    """Measure the eye's opening, jitter and levels"""
+    tie = eye.tie()
+    center = eye.traces[:, eye.osr // 2]
+    bits = eye.bits
+    return EyeResult(
+        ntraces=len(eye.traces),
+        height=float(openings(eye)[eye.osr // 2]),
+        width=float(eye.ui - np.ptp(tie)),
+        jitter_rms=float(np.std(tie)),
+        jitter_pp=float(np.ptp(tie)),
+        level1=float(center[bits].mean()) if bits.any() else float("nan"),
+        level0=float(center[~bits].mean()) if (~bits).any() else float("nan"),
+    )
+
+
+@dataclass(frozen=True)
+class EyeTemplate:
+    """
+    # Eye Template
+    A hexagonal keep-out region, plus outer voltage limits, for a differential eye.
+    The hexagon's four phases are in fractions of a UI: it widens linearly from zero at `phases[0]`
+    to `+/- inner` over `phases[1]` through `phases[2]`, then narrows back to zero at `phases[3]`.
+    The outer limit is `outer`, relaxed to `outer_transition` in UIs following a transition.
+    """
+
+    name: str
+    phases: Tuple[float, float, float, float]
+    inner: float  # (V)
+    outer: float  # (V)
+    outer_transition: float  # (V)
+
+    def keepout(self, phases: np.ndarray) -> np.ndarray:
+        """The hexagon's half-height (V) at each of `phases`, zero outside it"""
+        return self.inner * np.interp(
+            phases, self.phases, [0, 1, 1, 0], left=0, right=0
+        )
+
+
+# USB 2.0 High-Speed transmit eye, Template 1: measured at the device's connector (TP2).
+HS_TX_TEMPLATE1 = EyeTemplate(
+    name="hs_tx_template1",
+    phases=(0.075, 0.375, 0.625, 0.925),
+    inner=0.300,
+    outer=0.475,
+    outer_transition=0.525,
+)
+# USB 2.0 High-Speed receiver sensitivity eye, Template 4: the receiver's connector (TP3).
+HS_RX_TEMPLATE4 = EyeTemplate(
+    name="hs_rx_template4",
+    phases=(0.15, 0.35, 0.65, 0.85),
+    inner=0.150,
+    outer=0.575,
+    outer_transition=0.575,
+)
+
+
+@dataclass
+class TemplateResult:
+    """# Eye-Template Check Results"""
+
+    template: str  # Template name
+    passed: bool
+    inner_violations: int  # Number of samples inside the hexagon
+    outer_violations: int  # Number of samples beyond the outer limits
+    inner_margin: float  # Minimum of each sample's |v| over the hexagon's half-height at its phase, less one
+    outer_margin: float  # Minimum distance (V) of any sample inside the outer limits
+
+
+def check(eye: Eye, template: EyeTemplate) -> TemplateResult:
+    """Check `eye` against `template`"""
+    mag = np.abs(eye.traces)
+
+    keepout = template.keepout(eye.phases)
+    inside = keepout > 0
+    ratio = mag[:, inside] / keepout[inside]
+
+    # Outer limits per trace, relaxed for those following a transition
+    bits = eye.bits
+    transition = np.concatenate([[False], bits[1:] != bits[:-1]])
+    limit = np.where(transition, template.outer_transition, template.outer)
+    headroom = limit[:, None] - mag
+
+    inner_violations = int(np.count_nonzero(ratio < 1))
+    outer_violations = int(np.count_nonzero(headroom < 0))
+    return TemplateResult(
+        template=template.name,
+        passed=not (inner_violations or outer_violations),
+        inner_violations=inner_violations,
+        outer_violations=outer_violations,
+        inner_margin=float(ratio.min() - 1) if ratio.size else float("nan"),
+        outer_margin=float(headroom.min()),
+    )
+
+
+def record(
+    result: EyeResult,
+    tb: str,
+    corner: str = "",
+    template: Optional[TemplateResult] = None,
+    store: ResultStore = result_store,
+    **extra,
+) -> None:
+    """Record `result`, and optionally its `template` check, for testbench `tb` at `corner` in `store`."""
+    rec = dict(tb=tb, corner=corner, **extra, **asdict(result))
+    if template is not None:
+        rec.update(asdict(template))
+    store.put(TABLE, rec)
+
+
+def report(store: ResultStore = result_store, **where) -> List[dict]:
+    """Print the eye records in `store` matching `where`, e.g. `report(tb="HsTxDriverTb")`, one line per testbench and corner."""
+    records = list(store.records(TABLE, **where))
+    print(
+        f"{'tb':<16} {'corner':<32} {'source':<14} {'height(mV)':>10} {'width(ps)':>9} "
+        f"{'jrms(ps)':>8} {'template':<16} {'pass':>5} {'margin':>7}"
+    )
+    for r in records:
+        print(
+            f"{r['tb'][:16]:<16} {r['corner'][:32]:<32} {r.get('source', '')[:14]:<14} "
+            f"{r['height'] * 1e3:>10.1f} {r['width'] * 1e12:>9.1f} {r['jitter_rms'] * 1e12:>8.2f} "
+            f"{r.get('template', '-'):<16} {str(r.get('passed', '-')):>5} {r.get('inner_margin', float('nan')):>7.3f}"
+        )
+    return records
+
+
+def plot(eye: Eye, ax=None, template: Optional[EyeTemplate] = None):
+    """Plot the eye's density, over two UIs, optionally with `template` overlaid"""
+    import matplotlib.pyplot as plt
+
+    if ax is None:
+        _, ax = plt.subplots()
+    counts, vedges = eye.histogram()
+    density = np.log10(1 + np.concatenate([counts, counts]).T)
+    ax.imshow(
+        density,
+        origin="lower",
+        aspect="auto",
+        extent=[0, 2, vedges[0], vedges[-1]],
+        cmap="inferno",
+    )
+    if template is not None:
+        x0, x1, x2, x3 = template.phases
+        h = template.inner
+        for start in (0, 1):
+            xs = start + np.array([x0, x1, x2, x3, x2, x1, x0])
+            ax.plot(xs, [0, h, h, 0, -h, -h, 0], color="c")
+        for sign in (1, -1):
+            ax.axhline(sign * template.outer, color="c", linestyle="--")
+    ax.set_xlabel("Time (UI)")
+    ax.set_ylabel("Voltage (V)")
+    return ax
@@ -0,0 +1,393 @@
+"""
+# gm/Id Lookup Tables
+
+Precomputed small-signal characteristics of MOS devices, for analytic (gm/Id) sizing without simulation.
+
+Each `Lut` holds N-D arrays of drain current `id`, transconductance `gm`, output conductance `gds`,
+gate capacitance `cgg` and saturation voltage `vdsat`, over a grid of `vgs`, `vds`, `vsb` and length `l`,
+for a single device flavor, process corner and temperature. All voltages, currents and conductances are magnitudes,
+so NMOS and PMOS tables read alike. Quantities are those of a device of the table's `width` (µm), and scale linearly with it.
+
+Lookups interpolate multilinearly, and are vectorized: every coordinate may be an array, broadcast together,
+so e.g. a whole sizing sweep is a single call, in microseconds.
+
+* `gm` and `gds` are gradients of `id` along the swept `vgs` and `vds` grids.
+* `cgg` is measured in the same sim as `id`: from the gate current of a slow gate-voltage ramp, `cgg = ig / (dVg/dt)`, with other terminals held.
+* `vdsat` is the gm/Id-based estimate `2 * id / gm`, which approaches `vgs - vth` in strong inversion.
+
+Tables are built by `build`, one sim per `(device, corner, temperature, vds, vsb, l)` point, all in a single `sim_runner` batch,
+and saved as compressed `.npz` files, named `{device}.{corner}.{temp}C.npz`. Supply voltage does not enter:
+every terminal voltage is a table axis.
+
+Example:
+
+```
+lut = Lut.load("scratch/gmid", "nmos_lvt", Corner.TYP, temp=75)
+# Width for 100µA at gm/Id = 15, L = 0.5µm, Vds = 0.6V
+width = lut.width * 100e-6 / lut.at_gmid(15, "id", vds=0.6, l=0.5)
+# Intrinsic gain across lengths, in one call
+gain = lut.at_gmid(15, "gm", vds=0.6, l=ls) / lut.at_gmid(15, "gds", vds=0.6, l=ls)
+```
+"""
+
+# Std-Lib Imports
+import itertools
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+import hdl21.sim as hs
+from hdl21.pdk import Corner
+from hdl21.sim import LinearSweep
+
+# Local Imports
+from .sim_options import sim_options
+from .result_store import ResultStore, result_store
+from . import sim_runner
+
+# Grid axes, in array-dimension order, and tabulated quantities
+AXES = ("vgs", "vds", "vsb", "l")
+QUANTITIES = ("id", "gm", "gds", "cgg", "vdsat")
+
+# Default grid. Drain and body voltages (V).
+VDS = (0.05, 0.1, 0.2, 0.3, 0.45, 0.6, 0.9, 1.2, 1.5, 1.8)
+VSB = (0.0, 0.3, 0.6)
+# Gate-voltage step (V)
+VGS_STEP = 0.025
+# Duration (s) of the gate ramp measuring `cgg`. Slow enough to be quasi-static.
+TRAMP = 100e-9
+# Default table temperature (C)
+NOMINAL = 25
+
+Values = Union[float, np.ndarray]
+
+
+@dataclass
+class Lut:
+    """# gm/Id Lookup Table, for a single Device, Corner and Temperature"""
+
+    device: str  # Device name, e.g. "nmos_lvt"
+    corner: str  # Process corner name, e.g. "TYP"
+    width: float  # Width (µm) of the tabulated device
+    axes: Dict[str, np.ndarray]  # Grid along each of `AXES`
+    data: Dict[str, np.ndarray]  # Each of `QUANTITIES`, shaped by `axes`
+    temp: int = NOMINAL  # Temperature (C)
+
+    def __call__(
+        self,
+        name: str,
+        vgs: Values,
+        vds: Values,
+        vsb: Values = 0.0,
+        l: Optional[Values] = None,
+    ) -> np.ndarray:
+        """Quantity `name` at the (broadcast) coordinates. Length `l` defaults to the shortest. Coordinates beyond the grid are clamped to it."""
+        l = self.axes["l"][0] if l is None else l
+        coords = np.broadcast_arrays(
+            *(np.asarray(v, dtype=np.float64) for v in (vgs, vds, vsb, l))
+        )
+        return _interp([self.axes[a] for a in AXES], self.data[name], coords)
+
+    def gm_id(
+        self,
+        vgs: Values,
+        vds: Values,
+        vsb: Values = 0.0,
+        l: Optional[Values] = None,
+    ) -> np.ndarray:
+        """Transconductance efficiency, gm/Id (1/V)"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self("gm", vgs, vds, vsb, l) / self("id", vgs, vds, vsb, l)
+
+    def at_gmid(
+        self,
+        gmid: Values,
+        name: str,
+        vds: Values,
+        vsb: Values = 0.0,
+        l: Optional[Values] = None,
+    ) -> np.ndarray:
+        """
+        Quantity `name` at the gate bias at which gm/Id equals `gmid`, on the strong-inversion side of its peak.
+        NaN where gm/Id never falls to `gmid` within the grid, or exceeds its peak.
+        """
+        l = self.axes["l"][0] if l is None else l
+        gmid, vds, vsb, l = np.broadcast_arrays(
+            *(np.asarray(v, dtype=np.float64) for v in (gmid, vds, vsb, l))
+        )
+        vgs = self.axes["vgs"]
+        # gm/Id along the whole gate-voltage grid, at every point, shape (..., nvgs)
+        along = [v[..., None] for v in (vds, vsb, l)]
+        g = self.gm_id(vgs, *along)
+        g = np.where(np.isfinite(g), g, 0.0)
+        target = gmid[..., None]
+
+        # First grid point past the peak at which gm/Id has fallen to the target
+        peak = np.argmax(g, axis=-1)[..., None]
+        after = np.arange(len(vgs)) > peak
+        falls = after & (g <= target)
+        found = falls.any(axis=-1) & (np.take_along_axis(g, peak, -1)[..., 0] >= gmid)
+        hi = np.argmax(falls, axis=-1)[..., None]
+        lo = np.maximum(hi - 1, 0)
+        (g0, g1) = (np.take_along_axis(g, i, -1)[..., 0] for i in (lo, hi))
+        (v0, v1) = (vgs[i[..., 0]] for i in (lo, hi))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = np.where(g1 != g0, (g0 - gmid) / (g0 - g1), 0.0)
+        v = np.where(found, v0 + frac * (v1 - v0), np.nan)
+        return np.where(
+            found, self(name, np.where(found, v, vgs[0]), vds, vsb, l), np.nan
+        )
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Save to directory `path`, as `filename(device, corner, temp)`"""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        fname = path / filename(self.device, self.corner, self.temp)
+        np.savez_compressed(
+            fname,
+            device=self.device,
+            corner=self.corner,
+            temp=self.temp,
+            width=self.width,
+            **{f"axis_{a}": v for (a, v) in self.axes.items()},
+            **{f"data_{q}": v for (q, v) in self.data.items()},
+        )
+        return fname
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        device: str,
+        corner: Union[str, Corner],
+        temp: int = NOMINAL,
+    ) -> "Lut":
+        """Load the table of `device` at `corner` and `temp` from directory `path`"""
+        with np.load(Path(path) / filename(device, corner, temp)) as f:
+            return cls(
+                device=str(f["device"]),
+                corner=str(f["corner"]),
+                width=float(f["width"]),
+                axes={a: f[f"axis_{a}"] for a in AXES},
+                data={q: f[f"data_{q}"] for q in QUANTITIES},
+                temp=int(f["temp"]),
+            )
+
+
+def filename(device: str, corner: Union[str, Corner], temp: int = NOMINAL) -> str:
+    """File name of the table of `device` at `corner` and `temp`, e.g. `nmos_lvt.TYP.25C.npz`"""
+    corner = corner.name if isinstance(corner, Corner) else corner
+    return f"{device}.{corner}.{temp}C.npz"
+
+
+def _interp(
+    grids: Sequence[np.ndarray], values: np.ndarray, coords: Sequence[np.ndarray]
+) -> np.ndarray:
+    """Multilinear interpolation of `values`, on `grids`, at broadcast `coords`. Clamps to the grid."""
+    idx, frac = [], []
+    for (grid, x) in zip(grids, coords):
+        if len(grid) == 1:
+            idx.append(np.zeros(x.shape, dtype=int))
+            frac.append(np.zeros(x.shape))
+            continue
+        x = np.clip(x, grid[0], grid[-1])
+        i = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, len(grid) - 2)
+        idx.append(i)
+        frac.append((x - grid[i]) / (grid[i + 1] - grid[i]))
+
+    result = np.zeros(coords[0].shape)
+    for corner in itertools.product((0, 1), repeat=len(grids)):
+        if any(c and len(g) == 1 for (c, g) in zip(corner, grids)):
+            continue
+        weight = np.ones(coords[0].shape)
+        for (c, f) in zip(corner, frac):
+            weight = weight * (f if c else 1 - f)
+        result = result + weight * values[tuple(i + c for (i, c) in zip(idx, corner))]
+    return result
+
+
+def from_sweeps(
+    device: str,
+    corner: str,
+    width: float,
+    axes: Dict[str, np.ndarray],
+    id: np.ndarray,
+    cgg: np.ndarray,
+    temp: int = NOMINAL,
+) -> Lut:
+    """Table from measured drain-current and gate-capacitance magnitudes, shaped by `axes`. Derives `gm`, `gds` and `vdsat`."""
+
+    def gradient(axis: int) -> np.ndarray:
+        grid = axes[AXES[axis]]
+        if len(grid) < 2:
+            return np.zeros_like(id)
+        return np.gradient(id, grid, axis=axis)
+
+    gm = gradient(0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vdsat = np.where(gm > 0, 2 * id / gm, np.nan)
+    data = dict(id=id, gm=gm, gds=gradient(1), cgg=cgg, vdsat=vdsat)
+    return Lut(
+        device=device, corner=corner, width=width, axes=axes, data=data, temp=temp
+    )
+
+
+@dataclass
+class Device:
+    """# Device to Tabulate"""
+
+    name: str  # Table name, e.g. "nmos_lvt" or "tetris_pmos"
+    mostype: h.MosType
+    make: Callable[
+        [float], h.Instantiable
+    ]  # The device, at length-axis value `l`. PDK-compiled, if generic.
+    lengths: Sequence[
+        float
+    ]  # Length axis: L (µm) for PDK devices, or e.g. `nser` for Tetris stacks
+    width: float  # Width (µm)
+    body: Sequence[str] = ("b",)  # Body port(s)
+    vmax: float = 1.8  # Largest gate voltage (V)
+
+
+def sim_input(
+    device: Device,
+    corner: Corner,
+    l: float,
+    vds: float,
+    vsb: float,
+    include: Callable[[Corner], List],
+    temp: int = NOMINAL,
+) -> hs.Sim:
+    """
+    Sim of `device` at a single `(l, vds, vsb)` point, at temperature `temp` (C): a DC sweep of `vgs` for `id`,
+    and a transient gate ramp for `cgg`. PDK model includes are `include(corner)`.
+    """
+    sign = 1 if device.mostype == h.MosType.NMOS else -1
+
+    tb = hs.tb("MosLutTb")
+    tb.d = h.Signal()
+    tb.g = h.Signal()
+    tb.gx = h.Signal()
+    tb.b = h.Signal()
+    body = {port: tb.b for port in device.body}
+    tb.mos = device.make(l)(d=tb.d, g=tb.g, s=tb.VSS, **body)
+    tb.vd = h.Vdc(dc=sign * vds)(p=tb.d, n=tb.VSS)
+    tb.vb = h.Vdc(dc=-sign * vsb)(p=tb.b, n=tb.VSS)
+    # Gate: the DC-swept `vgs`, in series with a ramp which rests at zero for the DC sweep
+    tb.vg = h.Vdc(dc="polarity * vgs")(p=tb.g, n=tb.gx)
+    tb.vramp = h.Vpulse(
+        delay=0,
+        v1=0,
+        v2=sign * device.vmax,
+        period=4 * TRAMP,
+        rise=TRAMP,
+        fall=TRAMP,
+        width=TRAMP,
+    )(p=tb.gx, n=tb.VSS)
+    MosLutTb = tb
+
+    @hs.sim
+    class MosLutSim:
+        tb = MosLutTb
+        vgs = hs.Param(val=0)
+        polarity = hs.Param(val=sign)
+        dc = hs.Dc(var=vgs, sweep=LinearSweep(start=0, stop=device.vmax, step=VGS_STEP))
+        tr = hs.Tran(tstop=TRAMP)
+
+    MosLutSim.literal(
+        f"""
+        simulator lang=spice
+        .temp {temp}
+        simulator lang=spectre
+    """
+    )
+    MosLutSim.add(*include(corner))
+    return MosLutSim
+
+
+def build(
+    devices: Sequence[Device],
+    corners: Sequence[Corner],
+    include: Callable[[Corner], List],
+    vds: Sequence[float] = VDS,
+    vsb: Sequence[float] = VSB,
+    path: Union[str, Path] = "scratch/gmid",
+    store: ResultStore = result_store,
+    temperatures: Sequence[int] = (NOMINAL,),
+) -> List[Lut]:
+    """
+    Tabulate each of `devices` at each of `corners` and `temperatures` (C), over drain voltages `vds`, body voltages `vsb`, and each device's lengths.
+    Every point of every table is simulated in a single `sim_runner` batch. Saves each table to `path`.
+    Points whose sims fail, or whose results cannot be measured, are NaN.
+    """
+    points = [
+        (device, corner, temp, l, d, b)
+        for device in devices
+        for corner in corners
+        for temp in temperatures
+        for l in device.lengths
+        for d in vds
+        for b in vsb
+    ]
+    sims = [
+        sim_input(device, corner, l, d, b, include=include, temp=temp)
+        for (device, corner, temp, l, d, b) in points
+    ]
+
+    def label(idx: int) -> str:
+        (device, corner, temp, *_) = points[idx]
+        return f"{device.name} {corner.name} {temp}C"
+
+    jobs = iter(sim_runner.run(sims, sim_options, store=store, corner=label))
+
+    luts = []
+    for device in devices:
+        nvgs = int(round(device.vmax / VGS_STEP)) + 1
+        axes = dict(
+            vgs=np.linspace(0, device.vmax, nvgs),
+            vds=np.asarray(vds, dtype=np.float64),
+            vsb=np.asarray(vsb, dtype=np.float64),
+            l=np.asarray(device.lengths, dtype=np.float64),
+        )
+        for (corner, temp) in itertools.product(corners, temperatures):
+            shape = (nvgs, len(vds), len(vsb), len(device.lengths))
+            id, cgg = np.full(shape, np.nan), np.full(shape, np.nan)
+            for (k, _) in enumerate(device.lengths):
+                for (i, _) in enumerate(vds):
+                    for (j, _) in enumerate(vsb):
+                        job = next(jobs)
+                        if not job.ok:
+                            continue
+                        try:
+                            (id[:, i, j, k], cgg[:, i, j, k]) = _measure(
+                                job.result, axes["vgs"], device.vmax
+                            )
+                        except (ValueError, KeyError, IndexError) as e:
+                            where = f"{device.name} {corner.name} {temp}C"
+                            print(f"{where}: unmeasurable, {e}")
+            lut = from_sweeps(
+                device.name, corner.name, device.width, axes, id, cgg, temp=temp
+            )
+            print(f"Saved {lut.save(path)}")
+            luts.append(lut)
+    return luts
+
+
+def _measure(result: hs.SimResult, vgs: np.ndarray, vmax: float) -> tuple:
+    """
+    Drain current and gate capacitance magnitudes along `vgs`, from a `sim_input` result.
+    Raises `ValueError`, or `KeyError` or `IndexError` for missing signals or analyses, if it is malformed.
+    """
+    (dc, tr) = (result.an[0].data, result.an[1].data)
+    id = np.abs(np.asarray(dc["xtop.vd:p"]))
+    if len(id) != len(vgs):
+        raise ValueError(f"DC sweep of {len(id)} points, expected {len(vgs)}")
+    slope = vmax / TRAMP
+    t = np.asarray(tr["time"])
+    cgg = np.interp(vgs, slope * t, np.abs(np.asarray(tr["xtop.vramp:p"]))) / slope
+    return (id, cgg)
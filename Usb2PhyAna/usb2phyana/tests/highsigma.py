@@ -0,0 +1,266 @@
+"""
+# High-Sigma Yield
+
+Estimates of rare mismatch failure probabilities, e.g. 4-6 sigma, far below what plain Monte Carlo can resolve,
+by scaled-sigma sampling: Monte Carlo (`tests/montecarlo.py`) with every device's mismatch scaled up by each of several factors `s`.
+
+Failures are common at large `s`. Their probability `P(s)` is fit to the model
+
+```
+P(s) = C * Q(t / s)
+```
+
+where `Q` is the standard normal tail probability. It is exact for a failure region bounded by a plane `t` sigma from nominal,
+in the space of normalized mismatch variables - e.g. a limit on an offset or current linear in each device's mismatch - with `C = 1`.
+It holds asymptotically for smooth boundaries, and for several of them, e.g. a two-sided limit, with `C` their multiplicity.
+Where `C` is known, fixing it leaves only `t` to fit, and greatly tightens the extrapolation.
+Extrapolating it to `s = 1` gives the nominal failure probability, with a confidence interval from the binomial uncertainty of each `P(s)`.
+Where too few scales have failures to fit, e.g. with few runs, the result is instead an upper bound, per `bound`.
+
+Unlike importance sampling, this needs no model of where the failure region lies,
+and its accuracy does not degrade with the (large) number of mismatch variables.
+A few hundred sims, spread over four scales, typically resolve failure probabilities to well within an order of magnitude.
+"""
+
+# Std-Lib Imports
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Callable, Optional, Sequence
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+import hdl21.sim as hs
+
+# Local Imports
+from .result_store import ResultStore, result_store
+from .mismatch import Sigma, pelgrom, scaled
+from .montecarlo import Target, montecarlo
+from . import sim_runner
+
+# Default mismatch scale factors. Suited to nominal failure rates of roughly 4-6 sigma.
+SCALES = (3.0, 4.0, 5.0, 6.0)
+
+# Whether a single sim's result is a failure
+Fails = Callable[[sim_runner.JobResult], bool]
+
+
+@dataclass
+class YieldEstimate:
+    """# High-Sigma Failure-Probability Estimate"""
+
+    p: float  # Failure probability, at nominal mismatch
+    lo: float  # Lower confidence bound of `p`
+    hi: float  # Upper confidence bound of `p`
+    scales: Sequence[float]  # Mismatch scale factors simulated
+    fails: Sequence[int]  # Failures, per scale
+    runs: Sequence[int]  # Measured sims, per scale
+    bounded: bool = False  # Whether `p` is only an upper bound, per `bound`
+
+    @property
+    def sigma(self) -> float:
+        """Equivalent one-sided sigma level of `p`"""
+        return sigma_level(self.p)
+
+    def __str__(self) -> str:
+        if self.bounded:
+            return (
+                f"P(fail) < {self.hi:.3g}, > {self.sigma:.2f} sigma "
+                f"({sum(self.fails)} failures in {sum(self.runs)} runs)"
+            )
+        return (
+            f"P(fail) {self.p:.3g} [{self.lo:.3g}, {self.hi:.3g}], {self.sigma:.2f} sigma "
+            f"({sum(self.fails)} failures in {sum(self.runs)} runs)"
+        )
+
+
+def sigma_level(p: float) -> float:
+    """One-sided standard-normal sigma level of failure probability `p`"""
+    if not 0 < p < 1:
+        return math.inf if p <= 0 else -math.inf
+    return -NormalDist().inv_cdf(p)
+
+
+def tail(x: np.ndarray) -> np.ndarray:
+    """Natural log of the standard normal tail probability `Q(x)`, accurate far into the tail"""
+    return np.log(0.5 * np.vectorize(math.erfc)(np.asarray(x) / math.sqrt(2)))
+
+
+def binomial_upper(k: int, n: int, alpha: float) -> float:
+    """One-sided (Clopper-Pearson) upper confidence bound, at level `1 - alpha`, of a probability with `k` occurrences in `n` trials"""
+    if k >= n:
+        return 1.0
+
+    def cdf(p: float) -> float:
+        """Probability of at most `k` occurrences, at probability `p`"""
+        terms = [
+            math.lgamma(n + 1)
+            - math.lgamma(i + 1)
+            - math.lgamma(n - i + 1)
+            + i * math.log(p)
+            + (n - i) * math.log1p(-p)
+            for i in range(k + 1)
+        ]
+        return sum(math.exp(t) for t in terms)
+
+    # Bisect for `cdf(p) = alpha`; `cdf` decreases with `p`
+    lo, hi = k / n, 1.0
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        lo, hi = (mid, hi) if cdf(mid) > alpha else (lo, mid)
+    return hi
+
+
+def fit(
+    scales: Sequence[float],
+    fails: Sequence[int],
+    runs: Sequence[int],
+    multiplicity: Optional[float] = None,
+    z: float = 1.96,
+) -> YieldEstimate:
+    """
+    Extrapolate failure counts `fails` of `runs` sims at each mismatch scale in `scales` to nominal mismatch.
+    The model's prefactor `C` is fixed at `multiplicity`, e.g. 1 for a one-sided linear limit and 2 for a two-sided one, or fit if None.
+    Requires a scale with failures per fit parameter; with fewer, returns the upper bound of `bound`.
+    The confidence interval, 95% by default, is widened by any excess scatter of the fit beyond the binomial uncertainty of each point.
+    """
+    s, k, n = (np.asarray(x, dtype=np.float64) for x in (scales, fails, runs))
+    keep = (k > 0) & (n > 0)
+    nparams = 2 if multiplicity is None else 1
+    if keep.sum() < nparams:
+        return bound(scales, fails, runs, multiplicity, z)
+    s, k, n = s[keep], k[keep], n[keep]
+
+    # Weighted least-squares fit of `ln P(s)`, weighted by its inverse binomial variance `n * p / (1 - p)`
+    p = np.minimum(k / n, 1 - 0.5 / n)
+    y = np.log(p)
+    w = n * p / (1 - p)
+
+    def lnc(t: float) -> float:
+        """Best-fit `ln C` for threshold `t`"""
+        if multiplicity is not None:
+            return math.log(multiplicity)
+        return float(np.sum(w * (y - tail(t / s))) / np.sum(w))
+
+    def sse(t: float) -> float:
+        return float(np.sum(w * (y - lnc(t) - tail(t / s)) ** 2))
+
+    # Search `t` on a grid, then refine by golden-section search around its best point
+    grid = np.linspace(0.1, 20, 400)
+    best = int(np.argmin([sse(t) for t in grid]))
+    lo, hi = grid[max(best - 1, 0)], grid[min(best + 1, len(grid) - 1)]
+    ratio = (math.sqrt(5) - 1) / 2
+    for _ in range(40):
+        a, b = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+        lo, hi = (lo, b) if sse(a) < sse(b) else (a, hi)
+    t = (lo + hi) / 2
+    c = lnc(t)
+
+    # Parameter covariance, from the fit's Jacobian with respect to `(ln C, t)`
+    x = t / s
+    dydt = -np.exp(-(x**2) / 2 - tail(x)) / (math.sqrt(2 * math.pi) * s)
+    J = np.stack([np.ones_like(s), dydt], axis=1)[:, 2 - nparams :]
+    cov = np.linalg.inv(J.T @ (w[:, None] * J))
+
+    # Inflate the covariance by the reduced chi-squared of the fit, if there are spare degrees of freedom
+    dof = len(s) - nparams
+    if dof > 0:
+        cov = cov * max(1.0, sse(t) / dof)
+
+    # Extrapolate to `s = 1`
+    y1 = c + float(tail(t))
+    grad = np.array(
+        [1.0, -math.exp(-(t**2) / 2 - float(tail(t))) / math.sqrt(2 * math.pi)]
+    )[2 - nparams :]
+    half = z * math.sqrt(float(grad @ cov @ grad))
+    return YieldEstimate(
+        p=min(math.exp(y1), 1.0),
+        lo=min(math.exp(y1 - half), 1.0),
+        hi=min(math.exp(y1 + half), 1.0),
+        scales=list(scales),
+        fails=[int(x) for x in fails],
+        runs=[int(x) for x in runs],
+    )
+
+
+def bound(
+    scales: Sequence[float],
+    fails: Sequence[int],
+    runs: Sequence[int],
+    multiplicity: Optional[float] = None,
+    z: float = 1.96,
+) -> YieldEstimate:
+    """
+    Upper bound of the nominal failure probability, for failure counts too few to `fit`.
+    At each scale `s`, the binomial upper confidence bound `u` of `P(s)` bounds the model's threshold, `t >= s * Qinv(u / C)`.
+    The largest such `t` bounds `P(1) = C * Q(t)`. `C` is `multiplicity`, or 1 if None, in which case the bound assumes a single limit.
+    Reported as `p = hi`, with `lo` zero, and `bounded` set.
+    """
+    c = 1.0 if multiplicity is None else multiplicity
+    alpha = NormalDist().cdf(-z)
+    t = 0.0
+    for (s, k, n) in zip(scales, fails, runs):
+        if n > 0:
+            u = binomial_upper(int(k), int(n), alpha)
+            if u < c:
+                t = max(t, s * sigma_level(u / c))
+    hi = min(c * math.exp(float(tail(t))), 1.0)
+    return YieldEstimate(
+        p=hi,
+        lo=0.0,
+        hi=hi,
+        scales=list(scales),
+        fails=[int(x) for x in fails],
+        runs=[int(x) for x in runs],
+        bounded=True,
+    )
+
+
+def highsigma(
+    tb: h.Module,
+    sim: Callable[[h.Module], hs.Sim],
+    fails: Fails,
+    name: str = "",
+    corner: str = "",
+    scales: Sequence[float] = SCALES,
+    runs: int = 100,
+    multiplicity: Optional[float] = None,
+    sigma: Sigma = pelgrom(),
+    first_seed: int = 0,
+    store: ResultStore = result_store,
+) -> YieldEstimate:
+    """
+    Estimate the probability that mismatch makes testbench `tb` fail, per `fails(job)` of its sim `sim(variant)`.
+    Runs `runs` mismatch variants at each of `scales`, each with distinct seeds, and extrapolates per `fit`.
+    Each sim's failure is recorded to the `montecarlo` table as `name`, suffixed by its scale.
+    """
+
+    def measure(job: sim_runner.JobResult) -> float:
+        return float(fails(job))
+
+    counts, measured = [], []
+    for (idx, scale) in enumerate(scales):
+        result = montecarlo(
+            tb=tb,
+            sim=sim,
+            measure=measure,
+            target=Target(stat="mean", rtol=0.0, min_runs=runs, max_runs=runs),
+            name=f"{name}_s{scale:g}",
+            corner=corner,
+            sigma=scaled(sigma, scale),
+            first_seed=first_seed + idx * runs,
+            store=store,
+        )
+        stats = result.stats
+        counts.append(int(round(stats.mean * stats.n)))
+        measured.append(stats.n)
+        print(
+            f"{tb.name} {name} {corner}: {counts[-1]} of {stats.n} fail at {scale:g}x mismatch"
+        )
+
+    estimate = fit(scales, counts, measured, multiplicity)
+    print(f"{tb.name} {name} {corner}: {estimate}")
+    return estimate
@@ -0,0 +1,93 @@
+"""
+# Clock Jitter
+
+Jitter and phase-noise estimates of an oscillator, from the edge times of a (transient-noise) simulation.
+
+Every measure is derived from the array of rising-edge times:
+
+* Period jitter: the RMS deviation of each period from their mean.
+* Cycle-to-cycle jitter: the RMS difference of successive periods.
+* Accumulated jitter: the RMS deviation of the time spanned by `n` cycles, for each of several `n`.
+  It grows as `sqrt(n)` for a free-running oscillator, and saturates for a locked one.
+* Phase noise: the spectrum of the edges' time-interval error, sampled once per cycle, as `L(f)` in dBc/Hz.
+
+Results of several random seeds are combined with `stats.Running`, whose confidence interval tightens as each is added.
+"""
+
+# Std-Lib Imports
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+# PyPi Imports
+import numpy as np
+
+# Default accumulated-jitter spans (cycles)
+LAGS = (1, 10, 100)
+
+
+def tie(edges: np.ndarray) -> np.ndarray:
+    """Time-interval error of each of `edges`: its departure from a least-squares fit ideal clock"""
+    k = np.arange(len(edges))
+    slope, intercept = np.polyfit(k, edges, 1)
+    return edges - (intercept + slope * k)
+
+
+def accumulated(edges: np.ndarray, lags: Sequence[int] = LAGS) -> np.ndarray:
+    """RMS accumulated jitter (s) over each of `lags` cycles. NaN for lags as long as `edges`."""
+    return np.array(
+        [np.std(edges[n:] - edges[:-n]) if n < len(edges) else np.nan for n in lags]
+    )
+
+
+@dataclass
+class JitterResult:
+    """# Jitter Results, of a Single Simulation"""
+
+    nedges: int  # Number of edges measured
+    freq: float  # Mean frequency (Hz)
+    period: float  # RMS period jitter (s)
+    cycle: float  # RMS cycle-to-cycle jitter (s)
+    tie: float  # RMS time-interval error (s)
+    accumulated: Tuple[float, ...]  # RMS accumulated jitter (s), per `LAGS`
+
+
+def measure(edges: np.ndarray, lags: Sequence[int] = LAGS) -> JitterResult:
+    """Measure the jitter of rising-edge times `edges`"""
+    edges = np.asarray(edges, dtype=np.float64)
+    if len(edges) < 3:
+        raise ValueError(f"Too few edges ({len(edges)}) to measure jitter")
+    periods = np.diff(edges)
+    return JitterResult(
+        nedges=len(edges),
+        freq=float(1 / periods.mean()),
+        period=float(np.std(periods)),
+        cycle=float(np.sqrt(np.mean(np.diff(periods) ** 2))),
+        tie=float(np.std(tie(edges))),
+        accumulated=tuple(float(x) for x in accumulated(edges, lags)),
+    )
+
+
+def phase_noise(edges: np.ndarray, nseg: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Phase-noise estimate `(f, L)`, offset frequencies (Hz) and single-sideband phase noise (dBc/Hz), from rising-edge times `edges`.
+    A Welch estimate: the excess phase `2 * pi * f0 * tie` is sampled once per cycle, split into `nseg` Hann-windowed segments,
+    and their periodograms averaged. Offsets therefore span `f0 * nseg / len(edges)` to `f0 / 2`.
+    """
+    edges = np.asarray(edges, dtype=np.float64)
+    f0 = (len(edges) - 1) / (edges[-1] - edges[0])
+    phi = 2 * np.pi * f0 * tie(edges)
+
+    nper = len(phi) // nseg
+    if nper < 4:
+        raise ValueError(f"Too few edges ({len(edges)}) for {nseg} segments")
+    segments = phi[: nseg * nper].reshape(nseg, nper)
+    segments = segments - segments.mean(axis=1, keepdims=True)
+    window = np.hanning(nper)
+
+    # One-sided power spectral density of the phase (rad^2/Hz)
+    spectra = np.abs(np.fft.rfft(segments * window, axis=1)) ** 2
+    psd = 2 * spectra.mean(axis=0) / (f0 * np.sum(window**2))
+    f = np.fft.rfftfreq(nper, d=1 / f0)
+
+    # L(f) is half the one-sided phase spectrum. Skip DC.
+    return f[1:], 10 * np.log10(psd[1:] / 2)
@@ -0,0 +1,211 @@
+"""
+# Dac Linearity
+
+Static linearity of a Dac's transfer curve, e.g. the output current of `PmosIdac` or the frequency of an ILO, versus code,
+at each of many (PVT) conditions at once.
+
+Results arrive as a `(nconditions, ncodes)` array, with NaN for failed or unmeasurable points.
+Every measure is then a single array operation over all conditions:
+
+* LSB size: the endpoint-line step per code, between the first and last valid codes.
+* DNL: each code step, in LSBs, minus one.
+* INL: each code's deviation, in LSBs, from the endpoint line, and from the least-squares best-fit line.
+* Monotonicity violations: steps against the Dac's overall direction, i.e. DNL below -1.
+* Gain and offset: the best-fit line's slope per code, and value at code zero.
+
+Conditions which violate a set of `Limits` are flagged, and the worst condition per measure identified.
+`frequency_linearity` analyzes the code-sweep results of the ILO Dac tests directly.
+
+Example:
+
+```
+values = np.array([[iout(r) for r in cond] for cond in result.results])
+lin = analyze(values, result.codes, [str(c) for c in result.conditions])
+print(lin.report(Limits(dnl=0.5, inl=1.0)))
+```
+"""
+
+# Std-Lib Imports
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+# PyPi Imports
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Limits:
+    """# Linearity Limits, in LSBs"""
+
+    dnl: float = 0.5  # Largest allowed |DNL|
+    inl: float = 1.0  # Largest allowed |INL|, best-fit
+    monotonic: bool = True  # Whether any monotonicity violation fails
+
+
+@dataclass
+class Linearity:
+    """# Dac Linearity, per Condition"""
+
+    conditions: Sequence[str]  # Condition names, shape (ncond,)
+    codes: np.ndarray  # Codes, shape (ncodes,)
+    values: np.ndarray  # Dac outputs, shape (ncond, ncodes). NaN where invalid.
+    lsb: np.ndarray  # Endpoint LSB size, shape (ncond,)
+    gain: np.ndarray  # Best-fit slope per code, shape (ncond,)
+    offset: np.ndarray  # Best-fit value at code zero, shape (ncond,)
+    dnl: np.ndarray  # DNL (LSB), shape (ncond, ncodes - 1)
+    inl: np.ndarray  # Endpoint INL (LSB), shape (ncond, ncodes)
+    inl_fit: np.ndarray  # Best-fit INL (LSB), shape (ncond, ncodes)
+    nonmonotonic: np.ndarray  # Steps against the Dac's direction, shape (ncond, ncodes - 1)
+
+    @property
+    def valid(self) -> np.ndarray:
+        return np.isfinite(self.values)
+
+    @property
+    def max_dnl(self) -> np.ndarray:
+        return _nanmax(np.abs(self.dnl))
+
+    @property
+    def max_inl(self) -> np.ndarray:
+        return _nanmax(np.abs(self.inl))
+
+    @property
+    def max_inl_fit(self) -> np.ndarray:
+        return _nanmax(np.abs(self.inl_fit))
+
+    @property
+    def lo(self) -> np.ndarray:
+        """Smallest valid output, per condition"""
+        return _nanmin(self.values)
+
+    @property
+    def hi(self) -> np.ndarray:
+        """Largest valid output, per condition"""
+        return _nanmax(self.values)
+
+    def failing(self, limits: Limits = Limits()) -> np.ndarray:
+        """Conditions violating `limits`, or without enough valid points to measure, shape (ncond,)"""
+        fails = ~(self.max_dnl <= limits.dnl) | ~(self.max_inl_fit <= limits.inl)
+        if limits.monotonic:
+            fails |= self.nonmonotonic.any(axis=1)
+        return fails
+
+    def worst(self) -> Dict[str, str]:
+        """Worst condition per measure, among those measurable"""
+        measures = dict(
+            dnl=self.max_dnl,
+            inl=self.max_inl,
+            inl_fit=self.max_inl_fit,
+            nonmonotonic=self.nonmonotonic.sum(axis=1).astype(float),
+        )
+        return {
+            name: self.conditions[int(np.argmax(np.nan_to_num(m, nan=-np.inf)))]
+            for (name, m) in measures.items()
+        }
+
+    def report(self, limits: Limits = Limits(), scale: float = 1.0) -> str:
+        """
+        Summary table, one row per condition, with those violating `limits` flagged.
+        LSB, gain and offset are multiplied by `scale`, e.g. to µA or MHz.
+        """
+        failing = self.failing(limits)
+        header = f"{'condition':<32} {'lsb':>10} {'gain':>10} {'offset':>10} {'dnl':>6} {'inl':>6} {'inlfit':>6} {'nonmono':>7}"
+        rows = [
+            f"{cond:<32} {lsb:>10.4g} {gain:>10.4g} {offset:>10.4g} {dnl:>6.2f} {inl:>6.2f} {inlfit:>6.2f} {nm:>7d}{' FAIL' if fail else ''}"
+            for (cond, lsb, gain, offset, dnl, inl, inlfit, nm, fail) in zip(
+                self.conditions,
+                scale * self.lsb,
+                scale * self.gain,
+                scale * self.offset,
+                self.max_dnl,
+                self.max_inl,
+                self.max_inl_fit,
+                self.nonmonotonic.sum(axis=1),
+                failing,
+            )
+        ]
+        worst = ", ".join(f"{name}: {cond}" for (name, cond) in self.worst().items())
+        summary = f"{np.count_nonzero(failing)} of {len(failing)} conditions fail {limits}. Worst {worst}"
+        return "\n".join([header, *rows, summary])
+
+
+def analyze(
+    values: np.ndarray,
+    codes: Optional[Sequence[int]] = None,
+    conditions: Optional[Sequence[str]] = None,
+) -> Linearity:
+    """
+    Analyze the linearity of Dac outputs `values`, shape `(nconditions, ncodes)`, at each of `codes`, by default `0, 1, 2, ...`.
+    Non-finite values are excluded. The Dac may be increasing or decreasing with code.
+    """
+    y = np.atleast_2d(np.asarray(values, dtype=np.float64))
+    ncond, ncodes = y.shape
+    x = (
+        np.arange(ncodes, dtype=np.float64)
+        if codes is None
+        else np.asarray(codes, dtype=np.float64)
+    )
+    if conditions is None:
+        conditions = [str(i) for i in range(ncond)]
+    valid = np.isfinite(y)
+    rows = np.arange(ncond)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Endpoint line, through the first and last valid codes
+        first = np.argmax(valid, axis=1)
+        last = ncodes - 1 - np.argmax(valid[:, ::-1], axis=1)
+        lsb = (y[rows, last] - y[rows, first]) / (x[last] - x[first])
+        endpoint = y[rows, first][:, None] + lsb[:, None] * (x - x[first][:, None])
+
+        # Least-squares best-fit line, over valid codes
+        n = valid.sum(axis=1)
+        xm, ym = np.where(valid, x, 0.0), np.where(valid, y, 0.0)
+        sx, sy = xm.sum(axis=1), ym.sum(axis=1)
+        sxx, sxy = (xm * xm).sum(axis=1), (xm * ym).sum(axis=1)
+        gain = (n * sxy - sx * sy) / (n * sxx - sx**2)
+        offset = (sy - gain * sx) / n
+
+        dnl = np.diff(y, axis=1) / (lsb[:, None] * np.diff(x)) - 1
+        inl = (y - endpoint) / lsb[:, None]
+        inl_fit = (y - (offset[:, None] + gain[:, None] * x)) / gain[:, None]
+
+    return Linearity(
+        conditions=list(conditions),
+        codes=x,
+        values=y,
+        lsb=lsb,
+        gain=gain,
+        offset=offset,
+        dnl=dnl,
+        inl=inl,
+        inl_fit=inl_fit,
+        nonmonotonic=dnl < -1,
+    )
+
+
+def frequency_linearity(result: Any) -> Linearity:
+    """
+    Linearity of frequency versus code, across all conditions of ILO code-sweep `result`. Failed and non-oscillating points are excluded.
+    `result` has `codes` and `cond_results`, each with a `cond` and per-code `summaries`, each with a `freq` and whether it is `valid`.
+    """
+    freqs = np.array(
+        [
+            [s.freq if s.valid else np.nan for s in c.summaries]
+            for c in result.cond_results
+        ]
+    )
+    return analyze(freqs, result.codes, [str(c.cond) for c in result.cond_results])
+
+
+def _nanmax(a: np.ndarray) -> np.ndarray:
+    """Row-wise maximum, ignoring NaN. NaN for all-NaN rows."""
+    return np.where(
+        np.isnan(a).all(axis=1),
+        np.nan,
+        np.max(np.where(np.isnan(a), -np.inf, a), axis=1),
+    )
+
+
+def _nanmin(a: np.ndarray) -> np.ndarray:
+    """Row-wise minimum, ignoring NaN. NaN for all-NaN rows."""
+    return -_nanmax(-a)
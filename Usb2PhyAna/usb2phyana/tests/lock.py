@@ -0,0 +1,90 @@
+"""
+# Injection Lock Detection
+
+Lock state and lock time of an oscillator injected by a reference `n` times slower, from their simulated edge times.
+
+The oscillator's phase relative to the reference is found at each oscillator edge, in oscillator cycles:
+the count of oscillator edges, less `n` times the (interpolated) count of reference edges at the same time.
+It is therefore unwrapped by construction. Locked, it settles to a constant; unlocked, it drifts by their frequency difference,
+one cycle per cycle-slip. Averaging it over each reference period removes the within-period disturbance of the injection itself.
+
+Example:
+
+```
+ring = crossings(t, vring, rising=True)
+ref = crossings(t, vinj, vdd / 2, rising=True)
+result = classify(*phase(ring, ref, n=8))
+```
+"""
+
+# Std-Lib Imports
+from enum import Enum
+from dataclasses import dataclass
+from typing import Tuple
+
+# PyPi Imports
+import numpy as np
+
+
+class LockState(Enum):
+    LOCKED = "locked"
+    UNLOCKED = "unlocked"
+    UNKNOWN = "unknown"  # Neither, yet. Requires a longer simulation.
+
+
+@dataclass
+class LockResult:
+    """# Injection Lock Results"""
+
+    state: LockState
+    # Time from the first reference edge until the phase settles (s). NaN unless locked.
+    lock_time: float = np.nan
+    phase: float = np.nan  # Final phase, averaged over the final window (cycles)
+    drift: float = np.nan  # Phase change over the final window (cycles)
+
+
+def phase(edges: np.ndarray, ref: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Phase of oscillator `edges` relative to reference `ref`, in oscillator cycles, averaged over each reference period.
+    Both are arrays of (rising) edge times. Returns the start time of each reference period, and the phase over it.
+    Reference periods without any oscillator edges are omitted.
+    """
+    edges, ref = np.asarray(edges), np.asarray(ref)
+    edges = edges[(edges >= ref[0]) & (edges < ref[-1])]
+    cycles = np.arange(len(edges)) - n * np.interp(edges, ref, np.arange(len(ref)))
+
+    # Average per reference period
+    period = np.searchsorted(ref, edges, side="right") - 1
+    counts = np.bincount(period, minlength=len(ref) - 1)
+    sums = np.bincount(period, weights=cycles, minlength=len(ref) - 1)
+    full = counts > 0
+    return ref[:-1][full], sums[full] / counts[full]
+
+
+def classify(
+    t: np.ndarray, phi: np.ndarray, tol: float = 0.05, window: int = 16
+) -> LockResult:
+    """
+    Classify the phase `phi` per reference period, starting at times `t`, as produced by `phase`.
+    Locked if it varies by less than `tol` cycles over its final `window` periods, with its lock time
+    the start of the period after its last departure of more than `tol` from its final value.
+    Unlocked if it slips a full cycle over that window. Unknown otherwise, including if shorter than `window`.
+    """
+    if len(phi) < window:
+        return LockResult(LockState.UNKNOWN)
+
+    final = phi[-window:]
+    drift = float(final[-1] - final[0])
+    if np.ptp(final) < tol:
+        settled = float(final.mean())
+        outside = np.flatnonzero(np.abs(phi - settled) > tol)
+        start = outside[-1] + 1 if len(outside) else 0
+        return LockResult(
+            LockState.LOCKED,
+            lock_time=float(t[start] - t[0]),
+            phase=settled,
+            drift=drift,
+        )
+
+    state = LockState.UNLOCKED if abs(drift) >= 1 else LockState.UNKNOWN
+    return LockResult(state, phase=float(final.mean()), drift=drift)
@@ -0,0 +1,368 @@
+"""
+# Pole-Zero Macromodels
+
+Linear behavioral models of amplifier blocks, e.g. the `PreAmp` and `Fcasc`, for faster top-level sims.
+
+Each model is a rational function of frequency, fit to a block's AC response by vector fitting
+(Gustavsen & Semlyen, 1999): repeated least-squares fits which relocate a set of starting poles,
+followed by a fit of the residues at the final poles.
+
+```
+H(s) = d + sum_k r_k / (s - p_k)
+```
+
+A fit model is realized as a state-space network of ideal elements: one grounded capacitor per state,
+and voltage-controlled current sources for the state, input and output matrices.
+Realizations are pin-compatible with the block they model. They have the same ports, including bundle ports,
+and so can replace its instances in any testbench. Ports other than the modeled input and output are terminated to `ref`.
+
+Models describe small-signal behavior around the operating point at which they were extracted:
+the input and output DC levels are part of each `Macro`, and the fit response includes the extraction bench's load.
+Supply, bias and large-signal (e.g. slewing and clipping) behavior are not modeled.
+
+Example:
+
+```
+macros = extract(points, sim=ac_sim, response=out, levels=levels, name="FcascTb")
+module = macros[0].module(like=Fcasc(h.Default), inp="inp", out="out")
+```
+"""
+
+# Std-Lib Imports
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+import hdl21.sim as hs
+
+# Local Imports
+from .sim_options import sim_options
+from .result_store import ResultStore, result_store
+from .acfeatures import flatten
+from . import sim_runner
+
+# Result-store table name
+TABLE = "macromodel"
+
+
+@dataclass
+class Rational:
+    """# Rational Model, in Pole-Residue Form"""
+
+    # Poles (rad/s). Real poles first, then complex poles in conjugate pairs, upper first.
+    poles: np.ndarray
+    residues: np.ndarray  # Residue of each pole
+    d: float  # Direct (infinite-frequency) term
+
+    def __call__(self, freq: np.ndarray) -> np.ndarray:
+        """Complex response at frequencies `freq` (Hz)"""
+        s = 2j * np.pi * np.asarray(freq, dtype=np.float64)
+        return self.d + np.sum(
+            self.residues[None, :] / (s[:, None] - self.poles[None, :]), axis=1
+        )
+
+    def state_space(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """
+        Real state-space realization `(A, B, C, D)`. Each real pole is a single state;
+        each complex pair `σ ± jω`, with residues `a ± jb`, a pair of states with
+        `A = [[σ, ω], [-ω, σ]]`, `B = [2, 0]` and `C = [a, b]`.
+        """
+        n = len(self.poles)
+        A, B, C = np.zeros((n, n)), np.zeros(n), np.zeros(n)
+        for (idx, pole, residue) in _blocks(self.poles, self.residues):
+            if pole.imag == 0:
+                A[idx, idx], B[idx], C[idx] = pole.real, 1.0, residue.real
+            else:
+                A[idx : idx + 2, idx : idx + 2] = [
+                    [pole.real, pole.imag],
+                    [-pole.imag, pole.real],
+                ]
+                B[idx], C[idx : idx + 2] = 2.0, [residue.real, residue.imag]
+        return A, B, C, float(self.d)
+
+
+def vectfit(
+    freq: np.ndarray,
+    response: np.ndarray,
+    npoles: int = 6,
+    iterations: int = 10,
+    weight: bool = True,
+) -> Rational:
+    """
+    Fit a stable, real-valued rational model of `npoles` poles to complex `response` at frequencies `freq` (Hz).
+    If `weight`, errors are relative to the response's magnitude, so that e.g. both a large DC gain and a small high-frequency gain are fit.
+    """
+    freq = np.asarray(freq, dtype=np.float64)
+    resp = np.asarray(response, dtype=np.complex128)
+    # Fit in frequency normalized to the top of the band, for conditioning
+    w0 = 2 * np.pi * freq.max()
+    s = 2j * np.pi * freq / w0
+    weights = 1 / np.maximum(np.abs(resp), 1e-12 * np.abs(resp).max()) if weight else 1
+
+    # Starting poles: lightly damped pairs, log-spaced across the band, and a real pole if `npoles` is odd
+    fmin = max(freq.min() / freq.max(), 1e-12)
+    betas = np.logspace(np.log10(fmin), 0, npoles // 2)
+    poles = [-np.sqrt(fmin)] if npoles % 2 else []
+    for beta in betas:
+        poles += [complex(-beta / 100, beta), complex(-beta / 100, -beta)]
+    poles = np.array(poles, dtype=np.complex128)
+
+    for _ in range(iterations):
+        # Solve for `H * sigma` and `sigma`, sharing poles, with `sigma(inf) = 1`
+        phi = _basis(s, poles)
+        n = phi.shape[1]
+        M = np.hstack([phi, np.ones((len(s), 1)), -resp[:, None] * phi])
+        x = _lstsq(M * np.atleast_1d(weights)[:, None], resp * weights)
+        # The zeros of `sigma` are the new poles
+        A, B, _, _ = Rational(poles, np.zeros_like(poles), 0.0).state_space()
+        poles = _arrange(np.linalg.eigvals(A - np.outer(B, x[n + 1 :])))
+        # Flip any unstable poles into the left half-plane
+        poles = -np.abs(poles.real) + 1j * poles.imag
+
+    # Residues at the final poles
+    phi = _basis(s, poles)
+    M = np.hstack([phi, np.ones((len(s), 1))])
+    x = _lstsq(M * np.atleast_1d(weights)[:, None], resp * weights)
+    residues = np.zeros_like(poles)
+    for (idx, pole, _) in _blocks(poles, residues):
+        if pole.imag == 0:
+            residues[idx] = x[idx]
+        else:
+            residues[idx] = complex(x[idx], x[idx + 1])
+            residues[idx + 1] = residues[idx].conjugate()
+    return Rational(poles=poles * w0, residues=residues * w0, d=float(x[-1]))
+
+
+def rms_error(model: Rational, freq: np.ndarray, response: np.ndarray) -> float:
+    """RMS error of `model` relative to `response`'s magnitude"""
+    resp = np.asarray(response, dtype=np.complex128)
+    return float(np.sqrt(np.mean(np.abs(model(freq) - resp) ** 2 / np.abs(resp) ** 2)))
+
+
+def _blocks(
+    poles: np.ndarray, residues: np.ndarray
+) -> Iterator[Tuple[int, complex, complex]]:
+    """`(index, pole, residue)` of each real pole, and of the upper pole of each complex pair"""
+    idx = 0
+    while idx < len(poles):
+        yield (idx, poles[idx], residues[idx])
+        idx += 1 if poles[idx].imag == 0 else 2
+
+
+def _basis(s: np.ndarray, poles: np.ndarray) -> np.ndarray:
+    """Real-coefficient partial-fraction basis. Complex pairs contribute `1/(s-p) + 1/(s-p*)` and `j/(s-p) - j/(s-p*)`."""
+    cols = []
+    for (_, pole, _) in _blocks(poles, poles):
+        if pole.imag == 0:
+            cols.append(1 / (s - pole.real))
+        else:
+            a, b = 1 / (s - pole), 1 / (s - pole.conjugate())
+            cols += [a + b, 1j * (a - b)]
+    return np.stack(cols, axis=1)
+
+
+def _lstsq(M: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+    """Real least-squares solution of complex system `M @ x = rhs`, with column scaling"""
+    real = np.vstack([M.real, M.imag])
+    scale = np.linalg.norm(real, axis=0)
+    scale[scale == 0] = 1
+    rhs = np.concatenate([rhs.real, rhs.imag])
+    (x, *_) = np.linalg.lstsq(real / scale, rhs, rcond=None)
+    return x / scale
+
+
+def _arrange(values: np.ndarray) -> np.ndarray:
+    """Eigenvalues `values`, as real values, then conjugate pairs"""
+    tol = 1e-9 * np.maximum(np.abs(values), 1e-300)
+    real = np.sort(values[np.abs(values.imag) <= tol].real).astype(np.complex128)
+    upper = values[values.imag > tol]
+    pairs = [p for u in upper for p in (u, u.conjugate())]
+    return np.concatenate([real, np.array(pairs, dtype=np.complex128)])
+
+
+@dataclass
+class Macro:
+    """# Extracted Macromodel, around an Operating Point"""
+
+    model: Rational
+    in_dc: float  # Input DC level (V), relative to `ref`. Unused for differential inputs.
+    out_dc: float  # Output DC (or common-mode) level (V), relative to `ref`
+    rms: float  # Relative RMS fit error
+
+    def module(
+        self,
+        like: h.Module,
+        inp: str,
+        out: str,
+        ref: str = "VSS",
+        cnorm: float = 1e-12,
+        rterm: float = 10e3,
+        name: Optional[str] = None,
+    ) -> h.Module:
+        """
+        Behavioral realization, pin-compatible with module `like`. Its port (or `Diff` bundle port) `inp` drives `out`,
+        each relative to port `ref`. States are stored on capacitors of `cnorm` farads, and unmodeled ports are terminated by `rterm` ohms.
+        """
+        A, B, C, D = self.model.state_space()
+        new = h.Module(name=name or f"{like.name}Macro")
+        for port in like.ports.values():
+            new.add(
+                h.Signal(
+                    name=port.name,
+                    width=port.width,
+                    vis=port.vis,
+                    direction=port.direction,
+                    desc=port.desc,
+                )
+            )
+        for (bname, bundle) in like.bundle_ports.items():
+            new.add(
+                h.BundleInstance(name=bname, of=bundle.of, port=True, role=bundle.role)
+            )
+        vss = getattr(new, ref)
+
+        # Unmodeled ports, terminated
+        for pname in [*like.ports, *like.bundle_ports]:
+            if pname in (inp, out, ref):
+                continue
+            sigs = _diff(getattr(new, pname)) or (getattr(new, pname),)
+            for (idx, sig) in enumerate(sigs):
+                new.add(h.Res(r=rterm)(p=sig, n=vss), name=f"r{pname}{idx}")
+
+        # Input: a differential pair, or a single-ended level around `in_dc`
+        inputs = _diff(getattr(new, inp))
+        if inputs is None:
+            iref = new.add(h.Signal(name="iref"))
+            new.add(h.Vdc(dc=self.in_dc)(p=iref, n=vss), name="viref")
+            inputs = (getattr(new, inp), iref)
+        cp, cn = inputs
+
+        # States, each a capacitor, charged by the state and input matrices
+        states = [new.add(h.Signal(name=f"x{i}")) for i in range(len(B))]
+        for (i, x) in enumerate(states):
+            new.add(h.Cap(c=cnorm)(p=x, n=vss), name=f"c{i}")
+            for (j, xj) in enumerate(states):
+                if A[i, j] != 0:
+                    g = A[i, j] * cnorm
+                    new.add(
+                        h.Vccs(gain=g)(p=vss, n=x, cp=xj, cn=vss), name=f"ga{i}_{j}"
+                    )
+            if B[i] != 0:
+                g = B[i] * cnorm
+                new.add(h.Vccs(gain=g)(p=vss, n=x, cp=cp, cn=cn), name=f"gb{i}")
+
+        # Output: the output matrix sums onto a resistor
+        y = new.add(h.Signal(name="y"))
+        new.add(h.Res(r=1e3)(p=y, n=vss), name="ry")
+        for (i, x) in enumerate(states):
+            if C[i] != 0:
+                new.add(
+                    h.Vccs(gain=C[i] / 1e3)(p=vss, n=y, cp=x, cn=vss), name=f"gc{i}"
+                )
+        if D != 0:
+            new.add(h.Vccs(gain=D / 1e3)(p=vss, n=y, cp=cp, cn=cn), name="gd")
+
+        # And drives the output around its DC level: single-ended, or split across a differential pair
+        ocm = new.add(h.Signal(name="ocm"))
+        new.add(h.Vdc(dc=self.out_dc)(p=ocm, n=vss), name="vocm")
+        outputs = _diff(getattr(new, out))
+        if outputs is None:
+            new.add(
+                h.Vcvs(gain=1)(p=getattr(new, out), n=ocm, cp=y, cn=vss), name="eout"
+            )
+        else:
+            (op, on) = outputs
+            new.add(h.Vcvs(gain=0.5)(p=op, n=ocm, cp=y, cn=vss), name="eoutp")
+            new.add(h.Vcvs(gain=-0.5)(p=on, n=ocm, cp=y, cn=vss), name="eoutn")
+        return new
+
+
+def _diff(conn: Any) -> Optional[Tuple[Any, Any]]:
+    """The `(p, n)` signals of `Diff` bundle `conn`, or None for scalar signals"""
+    if isinstance(conn, h.BundleInstance):
+        return (conn.p, conn.n)
+    return None
+
+
+def extract(
+    points: Sequence[Any],
+    sim: Callable[[Any], hs.Sim],
+    response: Callable[[Any], np.ndarray],
+    levels: Callable[[Any], Tuple[float, float]],
+    name: str,
+    npoles: int = 6,
+    store: ResultStore = result_store,
+) -> List[Optional[Macro]]:
+    """
+    Extract a `Macro` at each of testbench parameters `points`, e.g. one per PVT corner, all simulated in a single `sim_runner` batch.
+    Each sim, `sim(params)`, must include an op analysis followed by an AC analysis.
+    `response(ac_result)` is the block's complex AC response, and `levels(op_result)` its `(input, output)` DC levels.
+    Records each point's parameters, poles, residues and fit error, labeled `name`. Failed sims have no macro.
+    """
+    jobs = sim_runner.run(
+        [sim(p) for p in points], sim_options, store=store, corner=name
+    )
+    macros = []
+    for (params, job) in zip(points, jobs):
+        macro = None
+        if job.ok:
+            op = next(an for an in job.result.an if not hasattr(an, "freq"))
+            ac = next(an for an in job.result.an if hasattr(an, "freq"))
+            resp = np.asarray(response(ac))
+            model = vectfit(ac.freq, resp, npoles=npoles)
+            (in_dc, out_dc) = levels(op)
+            macro = Macro(
+                model=model,
+                in_dc=float(in_dc),
+                out_dc=float(out_dc),
+                rms=rms_error(model, ac.freq, resp),
+            )
+        macros.append(macro)
+        store.put(
+            TABLE,
+            dict(
+                tb=name,
+                status=job.status,
+                **flatten(params),
+                **(_record(macro) if macro is not None else dict()),
+            ),
+        )
+    return macros
+
+
+def load(name: str, store: ResultStore = result_store, **where: Any) -> List[Macro]:
+    """Previously extracted macros labeled `name`, e.g. for a top-level sim, filtered by recorded fields `where`, e.g. `**{"pvt.p": "TYP"}`"""
+    records = store.records(TABLE, tb=name, **where)
+    return [_macro(r) for r in records if "poles" in r]
+
+
+def _record(macro: Macro) -> dict:
+    """JSON-friendly record of `macro`"""
+    pairs = lambda z: [[float(v.real), float(v.imag)] for v in z]
+    return dict(
+        poles=pairs(macro.model.poles),
+        residues=pairs(macro.model.residues),
+        d=macro.model.d,
+        in_dc=macro.in_dc,
+        out_dc=macro.out_dc,
+        rms=macro.rms,
+    )
+
+
+def _macro(record: dict) -> Macro:
+    """Inverse of `_record`"""
+    unpair = lambda z: np.array([complex(*v) for v in z], dtype=np.complex128)
+    return Macro(
+        model=Rational(
+            poles=unpair(record["poles"]),
+            residues=unpair(record["residues"]),
+            d=record["d"],
+        ),
+        in_dc=record["in_dc"],
+        out_dc=record["out_dc"],
+        rms=record["rms"],
+    )
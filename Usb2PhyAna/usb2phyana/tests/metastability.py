@@ -0,0 +1,80 @@
+"""
+# Decision Time & Metastability
+
+Clock-to-output decision times of latching comparators, e.g. the `Slicer`, and their regeneration time-constant.
+
+A regenerative latch resolves an input `vd` in roughly
+
+```
+delay = t0 + tau * ln(V / vd)
+```
+
+so delay grows logarithmically as the input shrinks, with slope `tau`: the metastability time constant.
+`fit_tau` fits `tau` to a measured delay-versus-input curve, over its small-signal (regenerative) region.
+
+Decision times are extracted from a differential output waveform, for many clock edges at once,
+as the delay from each edge to the output's next zero crossing - i.e. to its flip, when each decision differs from the last.
+"""
+
+# Std-Lib Imports
+from dataclasses import dataclass
+from typing import Optional
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .eye import crossings
+
+
+def decision_times(
+    t: np.ndarray, v: np.ndarray, edges: np.ndarray, window: float
+) -> np.ndarray:
+    """
+    Delay from each of clock `edges` to the next zero crossing of differential output `v`, shape `(len(edges),)`.
+    NaN where the output does not cross within `window` of the edge: an unresolved, or unchanged, decision.
+    """
+    edges = np.asarray(edges, dtype=np.float64)
+    cross = crossings(np.asarray(t), np.asarray(v))
+    idx = np.searchsorted(cross, edges, side="right")
+    found = idx < len(cross)
+    delay = np.where(found, cross[np.minimum(idx, len(cross) - 1)] - edges, np.nan)
+    return np.where(delay <= window, delay, np.nan)
+
+
+@dataclass
+class TauFit:
+    """# Regeneration Time-Constant Fit, `delay = t0 - tau * ln(vd)`"""
+
+    tau: float  # Regeneration time constant (s)
+    t0: float  # Delay (s) at unit input, 1V
+    r2: float  # Coefficient of determination of the fit
+    npoints: int  # Number of points fit
+
+    def delay(self, vd: np.ndarray) -> np.ndarray:
+        """Fit delay (s) at inputs `vd` (V)"""
+        return self.t0 - self.tau * np.log(vd)
+
+    def sensitivity(self, budget: float) -> float:
+        """Smallest input (V) resolved within `budget` (s)"""
+        return float(np.exp((self.t0 - budget) / self.tau))
+
+
+def fit_tau(vd: np.ndarray, delay: np.ndarray, vmax: Optional[float] = None) -> TauFit:
+    """
+    Fit the regeneration time constant to decision `delay`s at inputs `vd`, by least squares of delay against `ln(vd)`.
+    Only resolved (finite) delays at inputs up to `vmax`, by default all, are fit;
+    larger inputs are resolved by the input pair's large-signal current, rather than by regeneration.
+    """
+    vd, delay = np.asarray(vd, dtype=np.float64), np.asarray(delay, dtype=np.float64)
+    keep = np.isfinite(delay) & (vd > 0)
+    if vmax is not None:
+        keep &= vd <= vmax
+    if np.sum(keep) < 2:
+        return TauFit(tau=np.nan, t0=np.nan, r2=np.nan, npoints=int(np.sum(keep)))
+    x, y = np.log(vd[keep]), delay[keep]
+    slope, intercept = np.polyfit(x, y, 1)
+    resid = y - (slope * x + intercept)
+    total = np.sum((y - y.mean()) ** 2)
+    r2 = 1 - np.sum(resid**2) / total if total > 0 else 1.0
+    return TauFit(tau=-slope, t0=intercept, r2=float(r2), npoints=int(np.sum(keep)))
@@ -0,0 +1,146 @@
+"""
+# Mismatch Variants
+
+Per-seed mismatch variants of a testbench, for Monte Carlo analysis (`tests/montecarlo.py`).
+
+Each variant is a copy of the testbench hierarchy, including generated modules, e.g. Tetris stacks, in which every module instance is unique,
+and every transistor's gate is driven through a small series voltage source: its random threshold offset.
+Offsets are drawn per device from a Pelgrom model, `sigma(dVth) = avt / sqrt(W * L)`,
+and are reproducible per seed. The original testbench is left unmodified.
+
+This is a PDK-agnostic model of threshold mismatch only. It requires nothing of the PDK's own statistical models,
+and works with any simulator; a seed's offsets can be read back from its variant's netlist.
+
+Example:
+
+```
+tb = SlicerTb(params)
+sims = [sim_for(variant(tb, seed)) for seed in range(100)]
+```
+"""
+
+# Std-Lib Imports
+from itertools import count
+from typing import Any, Callable, Dict, Optional
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+
+# Threshold mismatch coefficient (V * µm), typical of 130nm-class devices
+AVT = 5e-3
+
+# Function of each device `Instance` to its offset standard deviation (V), or None if it has no mismatch
+Sigma = Callable[[h.Instance], Optional[float]]
+
+
+def pelgrom(avt: float = AVT, unit: float = 1e-6) -> Sigma:
+    """
+    Pelgrom threshold-mismatch model, for MOS instances with `w` and `l` parameters in units of `unit` meters, µm by default,
+    e.g. PDK device modules. Generic `h.Mos` primitives' `w` and `l` are in meters, and are required:
+    raises `ValueError` for those without them, rather than silently leaving them matched.
+    Multipliers `mult`, `npar` and `m`, where present, scale the effective area.
+    Other instances without numeric `w` and `l`, or without a gate port `g`, have no mismatch.
+    """
+
+    def sigma(inst: h.Instance) -> Optional[float]:
+        params = getattr(inst.of, "params", None)
+        scale = unit
+        if isinstance(inst.of, h.PrimitiveCall) and inst.of.prim is h.primitives.Mos:
+            if params.w is None or params.l is None:
+                msg = f"Mos instance `{inst.name}` has no `w` and `l`, and so no mismatch. Size it, or model it with a custom `Sigma`."
+                raise ValueError(msg)
+            scale = 1.0
+        try:
+            w, l = float(params.w), float(params.l)
+        except (AttributeError, TypeError, ValueError):
+            return None
+        if "g" not in inst.conns:
+            return None
+        mult = 1.0
+        for name in ("mult", "npar", "m"):
+            try:
+                mult *= float(getattr(params, name))
+            except (AttributeError, TypeError, ValueError):
+                pass
+        area = w * l * mult * (scale / 1e-6) ** 2  # µm^2
+        return avt / np.sqrt(area)
+
+    return sigma
+
+
+def scaled(sigma: Sigma, scale: float) -> Sigma:
+    """Mismatch model `sigma`, with every device's deviation scaled by `scale`. For high-sigma sampling (`tests/highsigma.py`)."""
+
+    def scaled_sigma(inst: h.Instance) -> Optional[float]:
+        s = sigma(inst)
+        return None if s is None else scale * s
+
+    return scaled_sigma
+
+
+def variant(tb: h.Module, seed: int, sigma: Sigma = pelgrom()) -> h.Module:
+    """
+    Mismatch variant of testbench `tb` for random seed `seed`.
+    Returns a new, elaborated top-level module of the same name and ports.
+    """
+    h.elaborate(tb)
+    rng = np.random.default_rng(seed)
+    return _Varier(rng, sigma).copy(tb, top=True)
+
+
+class _Varier:
+    """Copies a module hierarchy, uniquifying each module instance and adding gate offsets"""
+
+    def __init__(self, rng: np.random.Generator, sigma: Sigma) -> None:
+        self.rng = rng
+        self.sigma = sigma
+        self.ids = count()
+
+    def copy(self, module: h.Module, top: bool = False) -> h.Module:
+        name = module.name if top else f"{module.name}_mm{next(self.ids)}"
+        new = h.Module(name=name)
+        signals: Dict[int, h.Signal] = dict()
+        for sig in [*module.ports.values(), *module.signals.values()]:
+            signals[id(sig)] = new.add(
+                h.Signal(
+                    name=sig.name,
+                    width=sig.width,
+                    vis=sig.vis,
+                    direction=sig.direction,
+                    desc=sig.desc,
+                )
+            )
+        for inst in module.instances.values():
+            conns = {port: _remap(conn, signals) for (port, conn) in inst.conns.items()}
+            child = inst.of.result if isinstance(inst.of, h.GeneratorCall) else inst.of
+            if isinstance(child, h.Module):
+                of = self.copy(child)
+            else:
+                of = inst.of
+                sigma = self.sigma(inst)
+                if sigma is not None:
+                    # Drive the gate through its offset source
+                    gate = new.add(h.Signal(name=f"{inst.name}_g"))
+                    offset = float(self.rng.normal(0.0, sigma))
+                    new.add(
+                        h.Vdc(dc=offset)(p=gate, n=conns["g"]), name=f"{inst.name}_vos"
+                    )
+                    conns["g"] = gate
+            new.add(of(**conns), name=inst.name)
+        return new
+
+
+def _remap(conn: Any, signals: Dict[int, h.Signal]) -> Any:
+    """Re-target connection `conn` onto the copied `signals`"""
+    if isinstance(conn, h.Signal):
+        return signals[id(conn)]
+    if isinstance(conn, h.Slice):
+        return _remap(conn.parent, signals)[conn.index]
+    if isinstance(conn, h.Concat):
+        return h.Concat(*[_remap(p, signals) for p in conn.parts])
+    if isinstance(conn, h.NoConn):
+        return h.NoConn()
+    raise TypeError(f"Unsupported connection {conn} for mismatch variants")
@@ -0,0 +1,192 @@
+"""
+# Monte Carlo
+
+Mismatch Monte Carlo analysis: per-seed mismatch variants (`tests/mismatch.py`) of a testbench,
+run in batches through `sim_runner`, each measured to a single value.
+
+Rather than a fixed number of seeds, runs continue until a `Target` confidence on a statistic of the measured values is reached -
+e.g. the standard deviation to within 10%. Each value is recorded to the result store's `montecarlo` table as its sim completes,
+and updates the running mean, variance and quantiles (`tests/stats.py`). Once the target is met,
+the not-yet-started sims of the current batch are skipped.
+
+Runs which mostly fail, e.g. from a broken testbench or a non-converging corner, stop early too:
+after `Target.max_streak` consecutive failures, or once more than `Target.max_failed` of the runs so far have failed.
+The reason is reported in `McResult.aborted`.
+
+Example:
+
+```
+result = montecarlo(
+    tb=SlicerTb(params),
+    sim=lambda tb: slicer_sim(tb, pvt),
+    measure=offset,
+    target=Target(stat="std", rtol=0.1),
+    name="offset",
+    corner=str(pvt),
+)
+```
+"""
+
+# Std-Lib Imports
+import math, threading
+from dataclasses import dataclass
+from typing import Callable
+
+# Hdl Imports
+import hdl21 as h
+import hdl21.sim as hs
+
+# Local Imports
+from .sim_options import sim_options
+from .result_store import ResultStore, result_store
+from .stats import Running, Statistic
+from .mismatch import Sigma, pelgrom, variant
+from . import sim_runner
+
+# Result-store table name
+TABLE = "montecarlo"
+
+# Measurement of a single sim. NaN, or raising `ValueError`, for a sim which cannot be measured.
+Measure = Callable[[sim_runner.JobResult], float]
+
+
+@dataclass(frozen=True)
+class Target:
+    """
+    # Monte Carlo Stopping Target
+    Runs stop once the confidence interval of statistic `stat` has a half-width of at most `tol`,
+    or `rtol` times the statistic's magnitude, whichever is larger. Or once `max_runs` sims have run.
+    Runs are instead aborted after `max_streak` consecutive failures,
+    or once at least `min_runs` have completed, of which more than a fraction `max_failed` failed.
+    """
+
+    stat: Statistic = "std"  # "mean", "std", or a quantile in (0, 1)
+    tol: float = 0.0  # Absolute tolerance
+    rtol: float = 0.1  # Relative tolerance
+    z: float = 1.96  # Confidence, in standard normal deviations. 95% by default.
+    min_runs: int = 16
+    max_runs: int = 1000
+    max_streak: int = 16  # Consecutive failures
+    max_failed: float = 0.5  # Fraction of failures
+
+    def met(self, stats: Running) -> bool:
+        if stats.n < self.min_runs:
+            return False
+        limit = max(self.tol, self.rtol * abs(stats.value(self.stat)))
+        return stats.interval(self.stat, self.z) <= limit
+
+    def abort(self, completed: int, failed: int, streak: int) -> str:
+        """Reason to abort after `completed` runs, `failed` of them, the last `streak` consecutively. Empty to continue."""
+        if streak >= self.max_streak:
+            return f"{streak} consecutive failures"
+        if completed >= self.min_runs and failed > self.max_failed * completed:
+            return f"{failed} of {completed} runs failed"
+        return ""
+
+
+@dataclass
+class McResult:
+    """# Monte Carlo Results"""
+
+    stats: Running  # Statistics of the measured values
+    runs: int  # Sims run, excluding those skipped
+    failed: int  # Sims which failed, or could not be measured
+    converged: bool  # Whether the `Target` was met
+    aborted: str = ""  # Reason runs were aborted for failures, if they were
+
+    def __str__(self) -> str:
+        s = self.stats
+        status = "" if self.converged else ", not converged"
+        if self.aborted:
+            status = f", aborted: {self.aborted}"
+        return (
+            f"mean {s.mean:.4g} +/- {s.interval('mean'):.2g}, std {s.std:.4g} +/- {s.interval('std'):.2g} "
+            f"({s.n} of {self.runs} runs{status})"
+        )
+
+
+def montecarlo(
+    tb: h.Module,
+    sim: Callable[[h.Module], hs.Sim],
+    measure: Measure,
+    target: Target = Target(),
+    name: str = "",
+    corner: str = "",
+    sigma: Sigma = pelgrom(),
+    batch: int = 32,
+    first_seed: int = 0,
+    store: ResultStore = result_store,
+    outputs: sim_runner.JobOutputs = sim_runner.JobOutputs(),
+) -> McResult:
+    """
+    Run mismatch Monte Carlo of testbench `tb` until `target` is met.
+    Each seed's variant is simulated by `sim(variant)`, and measured by `measure(job)`.
+    Values are recorded as `name`, labeled with `tb`'s name and `corner`.
+    Stops early, and reports why, if too many sims fail, per `target.abort`.
+    """
+    stats = Running()
+    lock = threading.Lock()
+    runs = failed = streak = 0
+    aborted = ""
+    seed = first_seed
+
+    def record(seed: int, job: sim_runner.JobResult) -> None:
+        nonlocal failed, streak, aborted
+        value = math.nan
+        if job.ok:
+            try:
+                value = float(measure(job))
+            except ValueError:
+                pass
+        store.put(
+            TABLE,
+            dict(
+                tb=tb.name,
+                corner=corner,
+                name=name,
+                seed=seed,
+                value=value,
+                status=job.status,
+            ),
+        )
+        with lock:
+            stats.add(value)
+            ok = math.isfinite(value)
+            failed += not ok
+            streak = 0 if ok else streak + 1
+            aborted = aborted or target.abort(stats.n + failed, failed, streak)
+
+    while runs < target.max_runs and not target.met(stats) and not aborted:
+        seeds = list(range(seed, seed + min(batch, target.max_runs - runs)))
+        seed += len(seeds)
+
+        def done(idx: int, job: sim_runner.JobResult) -> None:
+            record(seeds[idx], job)
+
+        def skip(idx: int) -> bool:
+            with lock:
+                return bool(aborted) or target.met(stats)
+
+        jobs = sim_runner.run(
+            [sim(variant(tb, s, sigma)) for s in seeds],
+            sim_options,
+            outputs=outputs,
+            store=store,
+            corner=corner,
+            skip=skip,
+            done=done,
+        )
+        runs += sum(job.status != sim_runner.SimStatus.SKIPPED for job in jobs)
+        print(
+            f"{tb.name} {name} {corner}: {stats.value(target.stat):.4g} +/- {stats.interval(target.stat):.2g} after {stats.n} runs"
+        )
+
+    if aborted:
+        print(f"{tb.name} {name} {corner}: aborted, {aborted}")
+    return McResult(
+        stats=stats,
+        runs=runs,
+        failed=failed,
+        converged=target.met(stats),
+        aborted=aborted,
+    )
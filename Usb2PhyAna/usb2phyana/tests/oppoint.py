@@ -0,0 +1,450 @@
+"""
+# Device Operating Points & Saturation Margins
+
+Operating points of every transistor in a testbench, across many conditions (e.g. PVT corners) at once,
+and rules flagging those short of saturation.
+
+Extraction is in three steps:
+
+* `devices` walks an (elaborated) testbench's hierarchy, and finds each transistor, and the sim-result node at each of its terminals.
+  Transistors are recognized by a list of `Catalog`s, functions from an `h.Instance` to a `Leaf`, or `None` for non-transistors.
+  Catalogs cover generic `h.Mos` primitives, the `s130` PDK's device modules, and Tetris `Nmos` and `Pmos` stacks, which are treated as single devices.
+* Each condition's DC operating point is simulated, all in a single `sim_runner` batch, yielding each device's terminal voltages.
+* Everything else is interpolated at those terminal voltages from the gm/Id lookup tables of `tests/gmid.py`,
+  for the device's flavor and length, and the condition's process corner and temperature, scaled by its width.
+  Tables are built by the `test_gmid_luts` tests, and those of Tetris stacks by `test_tetris`.
+  `missing_tables` lists those not yet built; `extract` raises `FileNotFoundError` for them before simulating anything.
+
+Results are an `OpPoints`: a structured array of shape `(devices, conditions)`, with fields per `FIELDS`.
+Each device's region is "triode" where its `vds` is short of `vdsat`, "weak" (inversion) where its gm/Id exceeds `WEAK`, and otherwise "sat";
+or "unknown" where any of its terminal voltages are missing.
+
+Example:
+
+```
+ops = extract(tb, sims=[sim(pvt) for pvt in conditions], conditions=conditions, corner=lambda pvt: (pvt.p, pvt.t))
+print(report(violations(ops, [Rule(margin=0.1, paths="xtop.dut.*psrc*")])))
+```
+"""
+
+# Std-Lib Imports
+from fnmatch import fnmatch
+from functools import lru_cache
+from pathlib import Path
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+import hdl21.sim as hs
+from hdl21.pdk import Corner
+from vlsirtools.spice.sim_data import OpResult
+
+# Local Imports
+from .sim_options import sim_options
+from .result_store import ResultStore, result_store
+from .gmid import Lut, filename
+from . import sim_runner
+from ..pdk import s130
+from ..tetris import mos as tetris_mos
+
+TABLE = "oppoint"
+
+# Structured-array fields of `OpPoints.data`
+FIELDS = [
+    ("vgs", np.float64),
+    ("vds", np.float64),
+    ("vsb", np.float64),
+    ("vdsat", np.float64),
+    ("margin", np.float64),  # `vds - vdsat`
+    ("gm", np.float64),
+    ("gds", np.float64),
+    ("id", np.float64),
+    ("region", "U8"),
+]
+# gm/Id (1/V) above which a device is considered in weak inversion
+WEAK = 20.0
+# Device terminals, in `Leaf.ports` order
+TERMINALS = ("d", "g", "s", "b")
+
+# Process corner and temperature (C) of a condition, selecting its gm/Id tables
+TableCorner = Tuple[Corner, int]
+
+
+@dataclass
+class Leaf:
+    """# Transistor, as recognized by a `Catalog`"""
+
+    table: str  # gm/Id table name, e.g. "nmos_lvt"
+    mostype: h.MosType
+    l: float  # Length-axis value of `table`
+    width: float  # Total width (µm)
+    ports: Sequence[str] = TERMINALS  # Port names of its drain, gate, source and body
+
+
+# Function from an instance to its `Leaf`, or `None` if not a recognized transistor
+Catalog = Callable[[h.Instance], Optional[Leaf]]
+
+
+@dataclass
+class Mos:
+    """# Transistor in a Testbench"""
+
+    path: str  # Hierarchical instance path, e.g. "xtop.dut.psrc_0"
+    leaf: Leaf
+    nodes: Sequence[str]  # Sim-result node of each of `TERMINALS`. "0" is ground.
+
+
+# Generic `h.Mos` flavors, per `(MosType, MosVth)`, and gm/Id table names
+GENERIC = {
+    (h.MosType.NMOS, h.MosVth.STD): "nmos",
+    (h.MosType.NMOS, h.MosVth.LOW): "nmos_lvt",
+    (h.MosType.PMOS, h.MosVth.STD): "pmos",
+    (h.MosType.PMOS, h.MosVth.HIGH): "pmos_hvt",
+}
+
+
+def generic(inst: h.Instance) -> Optional[Leaf]:
+    """Catalog of generic `h.Mos` primitives, i.e. before PDK compilation"""
+    of = inst.of
+    if not isinstance(of, h.PrimitiveCall) or of.prim is not h.primitives.Mos:
+        return None
+    params = of.params
+    if params.model == "v5":
+        table = f"{params.tp.name.lower()}_v5"
+    else:
+        table = GENERIC.get((params.tp, params.vth))
+    if table is None:
+        return None
+    w, l = float(params.w or 0) * 1e6, float(params.l or 0) * 1e6
+    mult = int(params.npar) * int(params.mult)
+    return Leaf(table=table, mostype=params.tp, l=l, width=w * mult)
+
+
+def tetris(inst: h.Instance) -> Optional[Leaf]:
+    """Catalog of Tetris `Nmos` and `Pmos` stacks. Their length axis is `nser`."""
+    of = inst.of
+    if not isinstance(of, h.GeneratorCall):
+        return None
+    if of.gen in (tetris_mos.Nmos, tetris_mos.NmosPhys):
+        mostype, unit, body = h.MosType.NMOS, tetris_mos.NMOS_PARAMS, "VSS"
+    elif of.gen is tetris_mos.Pmos:
+        mostype, unit, body = h.MosType.PMOS, tetris_mos.PMOS_PARAMS, "VDD"
+    else:
+        return None
+    return Leaf(
+        table=f"tetris_{mostype.name.lower()}",
+        mostype=mostype,
+        l=of.params.nser,
+        width=float(unit.w) * 1e6 * of.params.npar,
+        ports=("d", "g", "s", body),
+    )
+
+
+def s130_catalog() -> Catalog:
+    """Catalog of the `s130` PDK's device modules"""
+    tables = {
+        s130.modules.nmos: ("nmos", h.MosType.NMOS),
+        s130.modules.nmos_lvt: ("nmos_lvt", h.MosType.NMOS),
+        s130.modules.nmos_v5: ("nmos_v5", h.MosType.NMOS),
+        s130.modules.pmos: ("pmos", h.MosType.PMOS),
+        s130.modules.pmos_hvt: ("pmos_hvt", h.MosType.PMOS),
+        s130.modules.pmos_v5: ("pmos_v5", h.MosType.PMOS),
+    }
+
+    def catalog(inst: h.Instance) -> Optional[Leaf]:
+        of = inst.of
+        if not isinstance(of, h.ExternalModuleCall):
+            return None
+        found = next((v for (k, v) in tables.items() if k is of.module), None)
+        if found is None:
+            return None
+        (table, mostype) = found
+        params = of.params
+        width = _float(params.w) * _float(getattr(params, "m", 1) or 1)
+        return Leaf(table=table, mostype=mostype, l=_float(params.l), width=width)
+
+    return catalog
+
+
+def _float(value) -> float:
+    """Float value of a number, `h.Prefixed` or `h.Scalar` parameter"""
+    return float(getattr(value, "inner", value))
+
+
+def default_catalogs() -> List[Catalog]:
+    """Tetris stacks, then `s130` and generic devices"""
+    return [tetris, s130_catalog(), generic]
+
+
+def devices(tb: h.Module, catalogs: Optional[Sequence[Catalog]] = None) -> List[Mos]:
+    """Every transistor in testbench `tb`, in hierarchy order. Instances recognized by `catalogs` are not descended into."""
+    catalogs = default_catalogs() if catalogs is None else catalogs
+    h.elaborate(tb)
+    # The testbench's ports, i.e. `VSS`, are ground
+    nodes = {name: ["0"] * port.width for (name, port) in tb.ports.items()}
+    found = []
+    _walk(tb, "xtop", nodes, catalogs, found)
+    return found
+
+
+def _walk(
+    module: h.Module,
+    path: str,
+    nodes: Dict[str, List[str]],
+    catalogs: Sequence[Catalog],
+    found: List[Mos],
+) -> None:
+    """Add the transistors of `module`, at instance `path`, with port nodes `nodes`, to `found`"""
+    for (name, sig) in module.signals.items():
+        if sig.width == 1:
+            nodes[name] = [f"{path}.{name}"]
+        else:
+            nodes[name] = [f"{path}.{name}_{idx}" for idx in range(sig.width)]
+
+    for inst in module.instances.values():
+        leaf = _leaf(inst, catalogs)
+        if leaf is not None:
+            terminals = [_bits(inst.conns[port], nodes)[0] for port in leaf.ports]
+            found.append(Mos(f"{path}.{inst.name}", leaf, terminals))
+            continue
+
+        child = inst.of.result if isinstance(inst.of, h.GeneratorCall) else inst.of
+        if not isinstance(child, h.Module):
+            continue  # Primitives and external modules other than transistors
+        ports = {
+            name: _bits(inst.conns[name], nodes)
+            for name in child.ports
+            if name in inst.conns
+        }
+        _walk(child, f"{path}.{inst.name}", ports, catalogs, found)
+
+
+def _leaf(inst: h.Instance, catalogs: Sequence[Catalog]) -> Optional[Leaf]:
+    """The `Leaf` of `inst`, per the first of `catalogs` to recognize it, if any"""
+    for catalog in catalogs:
+        leaf = catalog(inst)
+        if leaf is not None:
+            return leaf
+    return None
+
+
+def _bits(conn: Any, nodes: Dict[str, List[str]]) -> List[str]:
+    """Node of each bit of connection `conn`, LSB first"""
+    if isinstance(conn, h.Signal):
+        return nodes[conn.name]
+    if isinstance(conn, h.Slice):
+        bits = _bits(conn.parent, nodes)
+        return bits[conn.index] if isinstance(conn.index, slice) else [bits[conn.index]]
+    if isinstance(conn, h.Concat):
+        return [bit for part in conn.parts for bit in _bits(part, nodes)]
+    raise TypeError(f"Unsupported connection {conn}")
+
+
+@lru_cache(maxsize=None)
+def _lut(path: str, table: str, corner: Corner, temp: int, mtime: int) -> Lut:
+    """Load a table, cached per file modification time `mtime`, so that rebuilt tables are reloaded"""
+    return Lut.load(path, table, corner, temp)
+
+
+def tables(
+    path: Union[str, Path] = "scratch/gmid",
+) -> Callable[[str, TableCorner], Lut]:
+    """Loader of gm/Id tables from directory `path`, each loaded once per build"""
+
+    def load(table: str, corner: TableCorner) -> Lut:
+        (process, temp) = corner
+        fname = Path(path) / filename(table, process, temp)
+        return _lut(str(path), table, process, temp, fname.stat().st_mtime_ns)
+
+    return load
+
+
+def missing_tables(
+    mos: Sequence[Mos],
+    corners: Iterable[TableCorner],
+    path: Union[str, Path] = "scratch/gmid",
+) -> List[str]:
+    """Files of the gm/Id tables of devices `mos` at `corners`, each a process corner and temperature, which are not (yet) built in directory `path`"""
+    fnames = {filename(m.leaf.table, *c) for m in mos for c in corners}
+    return sorted(f for f in fnames if not (Path(path) / f).exists())
+
+
+@dataclass
+class OpPoints:
+    """# Operating Points, per Device, per Condition"""
+
+    devices: List[Mos]
+    conditions: List[Hashable]
+    data: np.ndarray  # Structured, per `FIELDS`, shape `(len(devices), len(conditions))`
+
+    @property
+    def paths(self) -> List[str]:
+        return [mos.path for mos in self.devices]
+
+    def matching(self, pattern: str) -> np.ndarray:
+        """Boolean mask of the devices whose paths match glob `pattern`"""
+        return np.array([fnmatch(p, pattern) for p in self.paths], dtype=bool)
+
+
+def oppoints(
+    mos: Sequence[Mos],
+    voltages: Sequence[Dict[str, float]],
+    conditions: Sequence[Hashable],
+    corner: Callable[[Hashable], TableCorner],
+    luts: Callable[[str, TableCorner], Lut],
+) -> OpPoints:
+    """
+    Operating points of devices `mos`, from node `voltages` per each of `conditions`, e.g. `OpResult.data`.
+    Interpolates from table `luts(table, corner(condition))`, at the condition's process corner and temperature. Missing nodes are NaN.
+    """
+    data = np.zeros((len(mos), len(conditions)), dtype=FIELDS)
+    sign = np.array([1 if m.leaf.mostype == h.MosType.NMOS else -1 for m in mos])
+    for (c, (cond, volts)) in enumerate(zip(conditions, voltages)):
+        v = np.array(
+            [[0.0 if n == "0" else volts.get(n, np.nan) for n in m.nodes] for m in mos]
+        ).reshape(len(mos), len(TERMINALS))
+        (vd, vg, vs, vb) = v.T
+        col = data[:, c]
+        col["vgs"] = sign * (vg - vs)
+        col["vds"] = sign * (vd - vs)
+        col["vsb"] = sign * (vs - vb)
+
+        # Interpolate per table, all of its devices at once
+        for table in sorted({m.leaf.table for m in mos}):
+            idx = np.array([i for (i, m) in enumerate(mos) if m.leaf.table == table])
+            lut = luts(table, corner(cond))
+            scale = np.array([mos[i].leaf.width for i in idx]) / lut.width
+            args = (col["vgs"][idx], col["vds"][idx], col["vsb"][idx])
+            l = np.array([mos[i].leaf.l for i in idx])
+            col["vdsat"][idx] = lut("vdsat", *args, l)
+            for name in ("gm", "gds", "id"):
+                col[name][idx] = scale * lut(name, *args, l)
+
+    data["margin"] = data["vds"] - data["vdsat"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gmid = data["gm"] / data["id"]
+    region = np.where(gmid > WEAK, "weak", "sat")
+    region = np.where(data["margin"] < 0, "triode", region)
+    data["region"] = np.where(np.isnan(data["margin"]), "unknown", region)
+    return OpPoints(devices=list(mos), conditions=list(conditions), data=data)
+
+
+def extract(
+    tb: h.Module,
+    sims: Sequence[hs.Sim],
+    conditions: Sequence[Hashable],
+    corner: Callable[[Hashable], TableCorner],
+    name: str = "oppoint",
+    catalogs: Optional[Sequence[Catalog]] = None,
+    luts: Optional[Callable[[str, TableCorner], Lut]] = None,
+    store: ResultStore = result_store,
+) -> OpPoints:
+    """
+    Operating points of every transistor in `tb`, at each of `conditions`, each simulated by the same-index of `sims`,
+    all in a single `sim_runner` batch. Each sim's first operating-point analysis is used; failed sims' are NaN.
+    `corner(condition)` is each condition's process corner and temperature (C), e.g. `(pvt.p, pvt.t)`, selecting its gm/Id tables.
+    Records each device's operating point per condition, labeled `name`.
+    Unless `luts` are provided, raises `FileNotFoundError` if any default gm/Id tables are missing, before simulating.
+    """
+    mos = devices(tb, catalogs)
+    if luts is None:
+        missing = missing_tables(mos, {corner(cond) for cond in conditions})
+        if missing:
+            msg = f"gm/Id tables {missing} not built. Build them with `test_gmid_luts` and `test_tetris`, in `MAX` mode."
+            raise FileNotFoundError(msg)
+    labels = lambda idx: str(conditions[idx])
+    jobs = sim_runner.run(sims, sim_options, store=store, corner=labels)
+    voltages = [_op(job.result).data if job.ok else {} for job in jobs]
+    ops = oppoints(mos, voltages, conditions, corner, luts or tables())
+
+    for (c, cond) in enumerate(ops.conditions):
+        for (d, m) in enumerate(ops.devices):
+            rec = ops.data[d, c]
+            store.put(
+                TABLE,
+                dict(
+                    tb=name,
+                    path=m.path,
+                    table=m.leaf.table,
+                    condition=str(cond),
+                    **{f: rec[f].item() for (f, _) in FIELDS},
+                ),
+            )
+    return ops
+
+
+def _op(result: hs.SimResult) -> OpResult:
+    """The (first) operating-point analysis result of `result`"""
+    return next(an for an in result.an if isinstance(an, OpResult))
+
+
+@dataclass
+class Rule:
+    """
+    # Saturation-Margin Rule
+    Devices whose paths match glob `paths` need `vds - vdsat` of at least `margin` (V).
+    Where several rules match a device, the last applies; a margin of `-inf` exempts it, e.g. for switches.
+    """
+
+    margin: float = 0.1
+    paths: str = "*"
+
+
+@dataclass
+class Violation:
+    """# Device Short of Its Saturation Margin, at a Condition"""
+
+    path: str
+    condition: Hashable
+    margin: float  # Actual `vds - vdsat`. NaN if unresolved.
+    required: float
+    region: str
+
+
+def violations(ops: OpPoints, rules: Sequence[Rule]) -> List[Violation]:
+    """Devices violating `rules`, at each condition. Unresolved (NaN) margins of checked devices violate."""
+    required = np.full(len(ops.devices), np.nan)
+    for rule in rules:
+        required[ops.matching(rule.paths)] = rule.margin
+    checked = np.isfinite(required)[:, None]
+    failing = checked & ~(ops.data["margin"] >= required[:, None])
+    return [
+        Violation(
+            path=ops.devices[d].path,
+            condition=ops.conditions[c],
+            margin=float(ops.data["margin"][d, c]),
+            required=float(required[d]),
+            region=str(ops.data["region"][d, c]),
+        )
+        for (d, c) in zip(*np.nonzero(failing))
+    ]
+
+
+def report(found: Sequence[Violation]) -> str:
+    """Summary table, one row per violation, worst margin first"""
+    header = (
+        f"{'device':<48} {'condition':<32} {'margin':>8} {'required':>8} {'region':>8}"
+    )
+    ordered = sorted(found, key=lambda v: -np.inf if np.isnan(v.margin) else v.margin)
+    rows = [
+        f"{v.path:<48} {str(v.condition):<32} {v.margin:>8.3f} {v.required:>8.3f} {v.region:>8}"
+        for v in ordered
+    ]
+    ndev = len({v.path for v in found})
+    summary = f"{len(found)} violations, by {ndev} devices"
+    return "\n".join([header, *rows, summary])
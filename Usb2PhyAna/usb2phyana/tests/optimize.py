@@ -0,0 +1,342 @@
+"""
+# Design Optimization
+
+Batched, derivative-free optimization of generator parameters, e.g. device sizes and bias currents,
+against an objective and a set of constraints on measured metrics, each across PVT conditions.
+
+Candidate designs are proposed by the cross-entropy method: each generation samples a batch of points
+from a Gaussian over the (unit-normalized) parameter space, evaluates them all at once,
+and moves the Gaussian toward the generation's best. Parameters are snapped to their `Range`'s grid,
+so as the search converges it re-proposes the same points, which are then free:
+every evaluation is cached in the result store, keyed by its parameters and its evaluation context
+(e.g. conditions, testbench settings and targets), and reused across generations and runs.
+
+Designs are ranked feasible-first: by total constraint violation, and among feasible designs by objective.
+
+Sim-based evaluation (`simulated`) runs every uncached design at every condition in a single `sim_runner` batch.
+
+Example:
+
+```
+evaluate = simulated(
+    name="ilo_power",
+    sims=lambda point: [sim_input(IloFreqTb, params(point, pvt)) for pvt in conditions],
+    measure=metrics,
+    conditions=conditions,
+)
+result = optimize(evaluate, space, objective="power", constraints=[Constraint("fmin", lo=480e6)])
+```
+"""
+
+# Std-Lib Imports
+import json, math, hashlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21.sim as hs
+
+# Local Imports
+from .sim_options import sim_options
+from .result_store import ResultStore, result_store
+from . import sim_runner
+
+# Result-store table name
+TABLE = "optimize"
+
+# A design point, by parameter name, and its measured metrics, by metric name
+Point = Dict[str, float]
+Metrics = Dict[str, float]
+# Evaluation of a batch of design points, in order
+Evaluate = Callable[[List[Point]], List[Metrics]]
+
+
+@dataclass(frozen=True)
+class Range:
+    """# Parameter Range"""
+
+    lo: float  # Smallest value
+    hi: float  # Largest value
+    # Grid spacing from `lo`, e.g. 1 for integer parameters. Continuous if None.
+    step: Optional[float] = None
+    # Whether to search geometrically, e.g. for values spanning decades
+    log: bool = False
+
+    def value(self, u: float) -> float:
+        """Parameter value at unit coordinate `u`, snapped to the grid"""
+        u = min(max(u, 0.0), 1.0)
+        if self.log:
+            x = self.lo * (self.hi / self.lo) ** u
+        else:
+            x = self.lo + (self.hi - self.lo) * u
+        if self.step is not None:
+            x = self.lo + self.step * round((x - self.lo) / self.step)
+            x = min(
+                x, self.lo + self.step * math.floor((self.hi - self.lo) / self.step)
+            )
+            x = round(x, 12)
+        return x
+
+    def unit(self, x: float) -> float:
+        """Unit coordinate of parameter value `x`"""
+        if self.log:
+            return math.log(x / self.lo) / math.log(self.hi / self.lo)
+        return (x - self.lo) / (self.hi - self.lo)
+
+
+# Parameter space, by parameter name
+Space = Dict[str, Range]
+
+
+@dataclass(frozen=True)
+class Constraint:
+    """# Constraint on a Metric, `lo <= metric <= hi`"""
+
+    metric: str
+    lo: float = -math.inf
+    hi: float = math.inf
+
+    def violation(self, metrics: Metrics) -> float:
+        """Violation, relative to the bound's magnitude. Zero if met, infinite if the metric is missing or NaN."""
+        x = metrics.get(self.metric, math.nan)
+        if not math.isfinite(x):
+            return math.inf
+        if x < self.lo:
+            return (self.lo - x) / max(abs(self.lo), 1e-30)
+        if x > self.hi:
+            return (x - self.hi) / max(abs(self.hi), 1e-30)
+        return 0.0
+
+
+@dataclass
+class Evaluation:
+    """# Evaluated Design Point"""
+
+    point: Point
+    metrics: Metrics
+    objective: float  # Objective, to be minimized. Infinite if unmeasurable.
+    violation: float  # Total constraint violation
+    generation: int
+
+    @property
+    def feasible(self) -> bool:
+        return self.violation == 0
+
+    def rank(self) -> Tuple[float, float]:
+        """Sort key: feasible first, then by objective"""
+        return (self.violation, self.objective)
+
+
+@dataclass
+class OptResult:
+    """# Optimization Result"""
+
+    best: Evaluation  # Best design found
+    # Every distinct design evaluated, in order
+    history: List[Evaluation] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        status = "feasible" if self.best.feasible else "infeasible"
+        return f"Best ({status}) {self.best.point}: {self.best.metrics}, of {len(self.history)} designs"
+
+
+def key(point: Point, context: str = "") -> str:
+    """Cache key of design `point`, evaluated in `context`. Contexts are keyed by hash, so may be long."""
+    digest = hashlib.sha256(context.encode()).hexdigest()[:16]
+    return json.dumps(dict(context=digest, point=point), sort_keys=True)
+
+
+def complete(metrics: Metrics) -> bool:
+    """Whether `metrics` are all measured: non-empty, and all finite"""
+    return bool(metrics) and all(math.isfinite(v) for v in metrics.values())
+
+
+def cached(
+    evaluate: Evaluate,
+    name: str,
+    store: ResultStore = result_store,
+    context: str = "",
+) -> Evaluate:
+    """
+    Cache `evaluate`'s metrics in the result store's `optimize` table, as `name`.
+    Points already recorded, including those from earlier runs, are not re-evaluated; nor are duplicates within a batch.
+    Records are keyed by `context` as well as by point: anything else `evaluate` depends on,
+    e.g. its conditions, testbench parameters and targets, so that changing any of them re-evaluates.
+    Incomplete metrics, empty or non-finite, e.g. from failed sims, are neither recorded nor cached, so are retried.
+    """
+    cache: Dict[str, Metrics] = {
+        record["key"]: record["metrics"]
+        for record in store.records(TABLE, name=name)
+        if complete(record["metrics"])
+    }
+
+    def evaluate_cached(points: List[Point]) -> List[Metrics]:
+        new: Dict[str, Point] = dict()
+        for point in points:
+            k = key(point, context)
+            if k not in cache:
+                new[k] = point
+        fresh: Dict[str, Metrics] = dict()
+        if new:
+            for (k, metrics) in zip(new, evaluate(list(new.values()))):
+                fresh[k] = metrics
+                if complete(metrics):
+                    cache[k] = metrics
+                    store.put(
+                        TABLE, dict(name=name, key=k, point=new[k], metrics=metrics)
+                    )
+        return [
+            cache.get(k, fresh.get(k))
+            for k in (key(point, context) for point in points)
+        ]
+
+    return evaluate_cached
+
+
+def simulated(
+    name: str,
+    sims: Callable[[Point], List[hs.Sim]],
+    measure: Callable[[Point, List[sim_runner.JobResult]], Metrics],
+    conditions: Sequence[Hashable],
+    context: str = "",
+    store: ResultStore = result_store,
+) -> Evaluate:
+    """
+    Sim-based, cached evaluation. Each design `point` is simulated by `sims(point)`, one sim per each of `conditions`,
+    and its jobs reduced to metrics by `measure(point, jobs)`. Failed jobs are passed along, for `measure` to judge.
+    Every uncached sim of a batch of points runs in a single `sim_runner` batch, each labeled by its condition.
+    Cached per `cached`, in the context of `conditions` and `context`.
+    """
+
+    def label(idx: int) -> str:
+        return str(conditions[idx % len(conditions)])
+
+    def evaluate(points: List[Point]) -> List[Metrics]:
+        per_point = [sims(point) for point in points]
+        flat = [s for point_sims in per_point for s in point_sims]
+        if any(len(point_sims) != len(conditions) for point_sims in per_point):
+            raise ValueError(
+                f"Each point needs one sim per condition, {len(conditions)}"
+            )
+        jobs = sim_runner.run(flat, sim_options, store=store, corner=label)
+        metrics, start = [], 0
+        for (point, point_sims) in zip(points, per_point):
+            metrics.append(measure(point, jobs[start : start + len(point_sims)]))
+            start += len(point_sims)
+        return metrics
+
+    context = "\n".join([*(str(c) for c in conditions), context])
+    return cached(evaluate, name, store, context)
+
+
+def optimize(
+    evaluate: Evaluate,
+    space: Space,
+    objective: str,
+    constraints: Sequence[Constraint] = (),
+    x0: Optional[Point] = None,
+    batch: int = 16,
+    generations: int = 10,
+    elite: float = 0.25,
+    smoothing: float = 0.7,
+    seed: int = 0,
+    polish: bool = True,
+) -> OptResult:
+    """
+    Minimize metric `objective` over `space`, subject to `constraints`, by the cross-entropy method.
+    Each of `generations` evaluates `batch` points at once, sampled around `x0`, by default the center of `space`.
+    The sampling distribution moves toward the best `elite` fraction of each generation, by `smoothing`,
+    and generations stop early once it has collapsed onto the grid.
+    If `polish`, the best design is then refined by a compass search, down to the grid.
+    """
+    names = list(space)
+    rng = np.random.default_rng(seed)
+    mean = np.array(
+        [space[n].unit(x0[n]) if x0 is not None else 0.5 for n in names], dtype=float
+    )
+    std = np.full(len(names), 0.3)
+    # Grid resolution, in unit coordinates
+    resolution = np.array([_resolution(space[n]) for n in names])
+    seen: Dict[str, Evaluation] = dict()
+
+    def run(points: List[Point], generation: int) -> List[Evaluation]:
+        """Evaluate `points`, and add them to `seen`"""
+        evaluations = []
+        for (point, m) in zip(points, evaluate(points)):
+            value = m.get(objective, math.nan)
+            evaluation = Evaluation(
+                point=point,
+                metrics=m,
+                objective=value if math.isfinite(value) else math.inf,
+                violation=sum(c.violation(m) for c in constraints),
+                generation=generation,
+            )
+            evaluations.append(evaluation)
+            seen.setdefault(key(point), evaluation)
+        return evaluations
+
+    def best() -> Evaluation:
+        return min(seen.values(), key=Evaluation.rank)
+
+    def report(generation: int) -> None:
+        top = best()
+        print(
+            f"Generation {generation}: {len(seen)} designs. Best {top.point} {top.metrics}"
+        )
+
+    # Global search: cross-entropy generations
+    for generation in range(generations):
+        units = np.clip(mean + std * rng.standard_normal((batch, len(names))), 0, 1)
+        if generation == 0:
+            units[0] = mean
+        points = [{n: space[n].value(u) for (n, u) in zip(names, row)} for row in units]
+        evaluations = run(points, generation)
+
+        # Move toward this generation's elite, always including the best design so far
+        ranked = sorted(evaluations, key=Evaluation.rank)
+        nelite = max(2, int(round(elite * batch)))
+        elites = [best(), *ranked[: nelite - 1]]
+        units = np.array([[space[n].unit(e.point[n]) for n in names] for e in elites])
+        mean = smoothing * units.mean(axis=0) + (1 - smoothing) * mean
+        std = smoothing * units.std(axis=0) + (1 - smoothing) * std
+        report(generation)
+        if np.all(std <= resolution / 2):
+            break
+
+    # Local search: a compass search around the best design, probing each parameter up and down in a single batch.
+    # Steps halve whenever none improves, down to the grid.
+    step = np.maximum(std, resolution)
+    generation = max((e.generation for e in seen.values()), default=-1) + 1
+    while polish:
+        center = best()
+        u = np.array([space[n].unit(center.point[n]) for n in names])
+        points = []
+        for (idx, n) in enumerate(names):
+            for sign in (-1, 1):
+                point = dict(center.point)
+                point[n] = space[n].value(u[idx] + sign * step[idx])
+                if key(point) not in seen and point not in points:
+                    points.append(point)
+        if points:
+            run(points, generation)
+            report(generation)
+            generation += 1
+        if best() is center:
+            if np.all(step <= resolution):
+                break
+            step = np.maximum(step / 2, resolution)
+
+    history = list(seen.values())
+    return OptResult(best=best(), history=history)
+
+
+def _resolution(r: Range) -> float:
+    """Grid step of range `r`, in unit coordinates. Continuous ranges resolve to a thousandth."""
+    if r.step is None:
+        return 1e-3
+    if r.log:
+        return math.log((r.lo + r.step) / r.lo) / math.log(r.hi / r.lo)
+    return r.step / (r.hi - r.lo)
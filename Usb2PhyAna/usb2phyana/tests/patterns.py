@@ -0,0 +1,191 @@
+"""
+# Bit Patterns
+
+Data patterns for high-speed stimulus: PRBS sequences, and USB 2.0 High-Speed packets.
+And comparison of received bits against them.
+
+USB packets are produced as line states per UI: `+1` for J, `-1` for K, and `0` for the SE0 of the idle bus.
+The encoding follows the USB 2.0 spec: bytes sent LSB-first, bit-stuffing after six consecutive ones,
+NRZI (a zero toggles the line, a one holds it), and the High-Speed SYNC and EOP patterns.
+"""
+
+# Std-Lib Imports
+from enum import Enum
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# PyPi Imports
+import numpy as np
+
+
+# PRBS generator polynomials `x^n + x^m + 1`, as `(n, m)`
+PRBS_TAPS = {7: (7, 6), 15: (15, 14), 31: (31, 28)}
+
+
+def prbs(order: int, nbits: int, seed: int = -1) -> np.ndarray:
+    """
+    First `nbits` of the PRBS sequence of `order`, one of 7, 15 or 31, as an array of 0/1 values.
+    Generated by the recurrence `s[k] = s[k-n] ^ s[k-m]`, a block of `m` bits at a time.
+    The `seed` sets the initial `n`-bit register state, all ones by default.
+    """
+    n, m = PRBS_TAPS[order]
+    seed &= (1 << n) - 1
+    if not seed:
+        raise ValueError("PRBS seed must be non-zero")
+    s = np.empty(n + nbits, dtype=np.uint8)
+    s[:n] = (seed >> np.arange(n)) & 1
+    for k in range(n, n + nbits, m):
+        j = min(k + m, n + nbits) - k
+        s[k : k + j] = s[k - n : k - n + j] ^ s[k - m : k - m + j]
+    return s[n:]
+
+
+class Pid(Enum):
+    """USB Packet Identifiers, the four-bit type field"""
+
+    # Tokens
+    OUT = 0b0001
+    IN = 0b1001
+    SOF = 0b0101
+    SETUP = 0b1101
+    # Data
+    DATA0 = 0b0011
+    DATA1 = 0b1011
+    DATA2 = 0b0111
+    MDATA = 0b1111
+    # Handshakes
+    ACK = 0b0010
+    NAK = 0b1010
+    STALL = 0b1110
+    NYET = 0b0110
+
+    @property
+    def is_data(self) -> bool:
+        return self in (Pid.DATA0, Pid.DATA1, Pid.DATA2, Pid.MDATA)
+
+    @property
+    def is_token(self) -> bool:
+        return self in (Pid.OUT, Pid.IN, Pid.SOF, Pid.SETUP)
+
+
+# High-Speed SYNC: 31 zeros then a one, i.e. "KJKJ...KJKK" once NRZI-encoded
+HS_SYNC = np.array([0] * 31 + [1], dtype=np.uint8)
+# High-Speed EOP: "01111111", sent without bit-stuffing, a deliberate stuffing error
+HS_EOP = np.array([0] + [1] * 7, dtype=np.uint8)
+
+
+def lsb_first(data: bytes) -> np.ndarray:
+    """Bits of `data`, LSB of each byte first"""
+    return np.unpackbits(np.frombuffer(bytes(data), dtype=np.uint8), bitorder="little")
+
+
+def crc16(data: bytes) -> int:
+    """USB data-packet CRC16: polynomial `x^16 + x^15 + x^2 + 1`, initialized to all ones, complemented"""
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc ^ 0xFFFF
+
+
+def crc5(bits: Sequence[int]) -> int:
+    """USB token CRC5 over `bits` in transmit order: polynomial `x^5 + x^2 + 1`, initialized to all ones, complemented"""
+    crc = 0x1F
+    for bit in bits:
+        crc = (crc >> 1) ^ 0x14 if (crc ^ bit) & 1 else crc >> 1
+    return crc ^ 0x1F
+
+
+def packet_bits(pid: Pid, payload: bytes = b"") -> np.ndarray:
+    """
+    Un-stuffed bits of a packet, from its PID through its CRC, in transmit order.
+    Data packets append the CRC16 of `payload`.
+    Token packets take an 11-bit `payload` - the address then endpoint, or frame number - as two LSB-first bytes, and append its CRC5.
+    """
+    pid_bits = lsb_first(bytes([pid.value | ((~pid.value & 0xF) << 4)]))
+    if pid.is_data:
+        crc = crc16(payload)
+        return np.concatenate(
+            [pid_bits, lsb_first(payload + crc.to_bytes(2, "little"))]
+        )
+    if pid.is_token:
+        if len(payload) != 2:
+            raise ValueError(
+                f"Token payloads are 11 bits, as two bytes, not {payload!r}"
+            )
+        fields = lsb_first(payload)[:11]
+        crc = lsb_first(bytes([crc5(fields)]))[:5]
+        return np.concatenate([pid_bits, fields, crc])
+    if payload:
+        raise ValueError(f"{pid.name} packets have no payload")
+    return pid_bits
+
+
+def bit_stuff(bits: np.ndarray) -> np.ndarray:
+    """Insert a zero after every six consecutive ones"""
+    out: List[int] = []
+    run = 0
+    for bit in bits.tolist():
+        out.append(bit)
+        run = run + 1 if bit else 0
+        if run == 6:
+            out.append(0)
+            run = 0
+    return np.array(out, dtype=np.uint8)
+
+
+def nrzi(bits: np.ndarray, initial: int = 1) -> np.ndarray:
+    """NRZI-encode `bits`: each zero toggles the line, each one holds it. The line starts at `initial`."""
+    toggles = np.cumsum(np.asarray(bits) == 0)
+    return ((initial + toggles) % 2).astype(np.uint8)
+
+
+def hs_packet(pid: Pid, payload: bytes = b"") -> np.ndarray:
+    """Line states of a High-Speed packet, from SYNC through EOP, as +1 (J) / -1 (K) per UI"""
+    bits = bit_stuff(np.concatenate([HS_SYNC, packet_bits(pid, payload)]))
+    line = nrzi(np.concatenate([bits, HS_EOP]))
+    return 2 * line.astype(np.int8) - 1
+
+
+def hs_packets(
+    packets: Iterable[np.ndarray], idle: int = 16, lead: int = 16
+) -> np.ndarray:
+    """Line states of a sequence of encoded `packets`, separated by `idle` UIs of SE0, after `lead` UIs of SE0"""
+    se0 = np.zeros(idle, dtype=np.int8)
+    parts = [np.zeros(lead, dtype=np.int8)]
+    for pkt in packets:
+        parts += [pkt, se0]
+    return np.concatenate(parts)
+
+
+def align(rx: np.ndarray, tx: np.ndarray, maxlag: int) -> Tuple[int, bool]:
+    """
+    Align received bits `rx` to transmitted bits `tx`: find the `lag` in `[0, maxlag]`, and polarity,
+    for which `rx[k + lag]` best matches `tx[k]`. Returns `(lag, inverted)`.
+    """
+    rx, tx = np.asarray(rx, dtype=bool), np.asarray(tx, dtype=bool)
+    n = min(len(rx) - maxlag, len(tx))
+    if n <= 0:
+        raise ValueError(
+            f"Too few received bits ({len(rx)}) to align over {maxlag} lags"
+        )
+    windows = np.lib.stride_tricks.sliding_window_view(rx, n)[: maxlag + 1]
+    mismatches = np.count_nonzero(windows != tx[:n], axis=1)
+    inverted = mismatches > n // 2
+    lag = int(np.argmin(np.where(inverted, n - mismatches, mismatches)))
+    return lag, bool(inverted[lag])
+
+
+def first_error(
+    rx: np.ndarray, tx: np.ndarray, lag: int = 0, inverted: bool = False
+) -> Optional[int]:
+    """Index into `tx` of the first bit received in error, per alignment `(lag, inverted)` from `align`. None if error-free.
+    Transmitted bits beyond the end of `rx` are errors, as they were never received."""
+    rx, tx = np.asarray(rx, dtype=bool), np.asarray(tx, dtype=bool)
+    got = rx[lag : lag + len(tx)] ^ inverted
+    errors = got != tx[: len(got)]
+    if errors.any():
+        return int(np.argmax(errors))
+    if len(got) < len(tx):
+        return len(got)
+    return None
@@ -0,0 +1,135 @@
+"""
+# Phase Interpolator Linearity
+
+Code-to-phase linearity of a phase interpolator (PI), at each of many (PVT) conditions at once.
+
+Each PI's output delay is measured per code, and converted to phase modulo the period of its input clock.
+An ideal PI steps through a full period over its codes, so its ideal step is `360 / ncodes` degrees,
+in whichever direction its codes run. For a `(nconditions, ncodes)` array of delays, all at once:
+
+* Steps: each code's phase advance over the previous code's, including the wrap from the last code back to the first.
+* DNL: each step's departure from ideal (degrees).
+* INL: each code's departure from the ideal, best-offset code-to-phase line (degrees).
+  Its peak-to-peak and RMS values summarize each condition's code-to-phase nonlinearity.
+* Monotonicity violations: steps against the PI's direction.
+
+Phases are unwrapped by their deviation from the ideal line, so failed (NaN) codes leave gaps rather than
+corrupting every later code.
+
+Example:
+
+```
+delays = np.array([[tdelay(r) for r in cond] for cond in results])
+lin = analyze(delays, period, conditions)
+print(lin.report("cmospi2"))
+```
+"""
+
+# Std-Lib Imports
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .linearity import _nanmax
+
+
+@dataclass
+class PiLinearity:
+    """# Phase Interpolator Linearity, per Condition"""
+
+    conditions: List[str]  # Condition names, shape (ncond,)
+    phase: np.ndarray  # Unwrapped phase (degrees), shape (ncond, ncodes). NaN where invalid.
+    lsb: np.ndarray  # Ideal step (degrees), signed by the PI's direction, shape (ncond,)
+    steps: np.ndarray  # Phase steps (degrees), shape (ncond, ncodes). Step `k` is from code `k - 1`, wrapping.
+    dnl: np.ndarray  # DNL (degrees), shape (ncond, ncodes)
+    inl: np.ndarray  # INL (degrees), shape (ncond, ncodes)
+
+    @property
+    def nonmonotonic(self) -> np.ndarray:
+        """Steps against the PI's direction, shape (ncond, ncodes)"""
+        return np.sign(self.lsb)[:, None] * self.steps < 0
+
+    @property
+    def max_dnl(self) -> np.ndarray:
+        return _nanmax(np.abs(self.dnl))
+
+    @property
+    def max_inl(self) -> np.ndarray:
+        return _nanmax(np.abs(self.inl))
+
+    @property
+    def inl_pp(self) -> np.ndarray:
+        """Peak-to-peak INL (degrees), per condition"""
+        return _nanmax(self.inl) + _nanmax(-self.inl)
+
+    @property
+    def inl_rms(self) -> np.ndarray:
+        """RMS INL (degrees), per condition"""
+        inl = np.where(np.isnan(self.inl), 0.0, self.inl)
+        n = np.count_nonzero(~np.isnan(self.inl), axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt((inl**2).sum(axis=1) / n)
+
+    def report(self, title: str = "") -> str:
+        """Summary table, one row per condition, and the worst condition by INL"""
+        header = f"{title:<32} {'dnl':>7} {'inl':>7} {'inl_pp':>7} {'inl_rms':>7} {'nonmono':>7}"
+        rows = [
+            f"{cond:<32} {dnl:>7.2f} {inl:>7.2f} {pp:>7.2f} {rms:>7.2f} {nm:>7d}"
+            for (cond, dnl, inl, pp, rms, nm) in zip(
+                self.conditions,
+                self.max_dnl,
+                self.max_inl,
+                self.inl_pp,
+                self.inl_rms,
+                self.nonmonotonic.sum(axis=1),
+            )
+        ]
+        worst = self.conditions[int(np.argmax(np.nan_to_num(self.max_inl, nan=-1)))]
+        summary = f"LSB {360.0 / self.steps.shape[1]:.3f} degrees. Worst INL at {worst}. {np.count_nonzero(self.nonmonotonic.any(axis=1))} non-monotonic conditions."
+        return "\n".join([header, *rows, summary])
+
+
+def wrap(deg: np.ndarray) -> np.ndarray:
+    """Wrap phases (degrees) into [-180, 180)"""
+    return (deg + 180.0) % 360.0 - 180.0
+
+
+def analyze(
+    delays: np.ndarray, period: float, conditions: Optional[Sequence[str]] = None
+) -> PiLinearity:
+    """Analyze the linearity of PI output `delays` (s), shape `(nconditions, ncodes)`, of a clock with period `period` (s)"""
+    delays = np.atleast_2d(np.asarray(delays, dtype=np.float64))
+    ncond, ncodes = delays.shape
+    if conditions is None:
+        conditions = [str(i) for i in range(ncond)]
+    codes = np.arange(ncodes)
+    phase = 360.0 * (delays % period) / period
+
+    # Steps between successive codes, wrapping from the last back to the first.
+    # The PI's direction, per condition, is that of most of its steps.
+    steps = wrap(phase - np.roll(phase, 1, axis=1))
+    with np.errstate(invalid="ignore"):
+        direction = np.where(np.nanmedian(steps, axis=1) < 0, -1.0, 1.0)
+    lsb = direction * 360.0 / ncodes
+
+    # Deviation of each code from the ideal line through the first valid code, and its best-fit offset
+    valid = np.isfinite(phase)
+    first = np.argmax(valid, axis=1)
+    ref = phase[np.arange(ncond), first]
+    ideal = lsb[:, None] * (codes - first[:, None])
+    dev = wrap(phase - ref[:, None] - ideal)
+    with np.errstate(invalid="ignore"):
+        offset = np.nansum(dev, axis=1) / valid.sum(axis=1)
+    inl = dev - offset[:, None]
+
+    return PiLinearity(
+        conditions=list(conditions),
+        phase=ref[:, None] + offset[:, None] + ideal + inl,
+        lsb=lsb,
+        steps=steps,
+        dnl=steps - lsb[:, None],
+        inl=inl,
+    )
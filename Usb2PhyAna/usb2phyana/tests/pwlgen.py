@@ -0,0 +1,130 @@
+"""
+# PWL Stimulus
+
+Differential piecewise-linear voltage sources, for driving data patterns into high-speed benches.
+
+Waveforms are written to files of `time value` pairs, one pair per line, which the netlist references by path.
+Netlist size and parse time therefore stay flat however long the pattern.
+Each file holds only the breakpoints at the start and end of each edge; runs of equal symbols add nothing.
+
+Example:
+
+```
+levels = 2 * prbs(7, 127).astype(int) - 1
+stim = diff_pwl("scratch/prbs7", levels, ui=2.083e-9, trf=100e-12, vc=0.2, vd=0.4)
+tb.pwl = DiffPwlGen(stim)(out=tb.pads, VSS=tb.VSS)
+```
+"""
+
+# Std-Lib Imports
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+from hdl21 import Diff
+
+
+@h.paramclass
+class PwlParams:
+    """Spectre PWL Voltage-Source Parameters"""
+
+    file = h.Param(
+        dtype=h.Literal, desc="Quoted path of the `time value` waveform file"
+    )
+    type = h.Param(dtype=h.Literal, desc="Source Type", default=h.Literal("pwl"))
+
+
+def quoted(path: Union[str, Path]) -> h.Literal:
+    """Waveform-file `path` as a quoted literal. Spectre would parse an unquoted path as an expression."""
+    return h.Literal(f'"{path}"')
+
+
+Vpwl = h.ExternalModule(
+    name="vsource",
+    port_list=[h.Port(name="p"), h.Port(name="n")],
+    paramtype=PwlParams,
+    desc="Spectre built-in voltage source, in file-based PWL mode",
+)
+
+
+@h.paramclass
+class DiffPwlParams:
+    """Differential PWL Generator Parameters"""
+
+    p = h.Param(dtype=str, desc="Positive-half waveform file")
+    n = h.Param(dtype=str, desc="Negative-half waveform file")
+
+
+@h.generator
+def DiffPwlGen(params: DiffPwlParams) -> h.Module:
+    """# Differential PWL Generator
+    A pair of file-based PWL voltage sources, as written by `diff_pwl`."""
+
+    pg = h.Module()
+    pg.VSS = VSS = h.Port()
+    pg.out = out = Diff(role=Diff.Roles.SINK, port=True)
+    pg.vp = Vpwl(file=quoted(params.p))(p=out.p, n=VSS)
+    pg.vn = Vpwl(file=quoted(params.n))(p=out.n, n=VSS)
+    return pg
+
+
+def edges(
+    levels: np.ndarray,
+    ui: float,
+    trf: float,
+    delay: float = 0.0,
+    jitter: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Breakpoints `(t, v)` of a waveform holding each of `levels` for a UI, after `delay`.
+    Each change of level is a linear edge of duration `trf`, centered on its UI boundary,
+    and optionally displaced by `jitter`, an array of time offsets per UI boundary.
+    """
+    levels = np.asarray(levels, dtype=float)
+    boundaries = delay + ui * np.arange(1, len(levels))
+    if jitter is not None:
+        boundaries = boundaries + np.asarray(jitter)[: len(boundaries)]
+    changes = np.flatnonzero(levels[1:] != levels[:-1])
+    tc = boundaries[changes]
+
+    t = np.empty(2 * len(changes) + 2)
+    v = np.empty(2 * len(changes) + 2)
+    t[0], v[0] = 0.0, levels[0]
+    t[1:-1:2], v[1:-1:2] = tc - trf / 2, levels[changes]
+    t[2:-1:2], v[2:-1:2] = tc + trf / 2, levels[changes + 1]
+    t[-1], v[-1] = delay + ui * len(levels), levels[-1]
+    return t, v
+
+
+def write_pwl(path: Union[str, Path], t: np.ndarray, v: np.ndarray) -> Path:
+    """Write PWL waveform `(t, v)` to `path`. Returns its absolute path, as referenced from the simulator's run directory."""
+    path = Path(path).resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savetxt(path, np.stack([t, v], axis=1), fmt=["%.12e", "%.6e"])
+    return path
+
+
+def diff_pwl(
+    path: Union[str, Path],
+    levels: np.ndarray,
+    ui: float,
+    trf: float,
+    vc: float,
+    vd: float,
+    delay: float = 0.0,
+    jitter: Optional[np.ndarray] = None,
+) -> DiffPwlParams:
+    """
+    Write a differential waveform of `levels`, in units of `vd / 2` about common-mode `vc`,
+    to files `<path>.p.pwl` and `<path>.n.pwl`. E.g. levels +1 and -1 for NRZ data, and 0 for a USB SE0.
+    Returns parameters for a `DiffPwlGen` driving it. Arguments are in volts and seconds.
+    """
+    t, s = edges(levels, ui, trf, delay, jitter)
+    path = Path(path)
+    p = write_pwl(path.with_name(path.name + ".p.pwl"), t, vc + s * vd / 2)
+    n = write_pwl(path.with_name(path.name + ".n.pwl"), t, vc - s * vd / 2)
+    return DiffPwlParams(p=str(p), n=str(n))
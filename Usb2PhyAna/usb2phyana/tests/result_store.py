@@ -0,0 +1,65 @@
+"""
+# Result Store
+
+Append-only store of simulation-derived records, one JSON object per line, grouped into named tables.
+Records are small summaries (measurements, telemetry, statuses), not waveforms.
+Safe to write from the worker threads of `sim_runner`.
+"""
+
+# Std-Lib Imports
+import json, threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Union
+
+
+class ResultStore:
+    """
+    # Result Store
+    Each table is a file `<root>/<table>.jsonl`.
+    """
+
+    def __init__(self, root: Union[str, Path] = "scratch/results") -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def path(self, table: str) -> Path:
+        return self.root / f"{table}.jsonl"
+
+    def put(self, table: str, record: Dict[str, Any]) -> None:
+        """Append `record` to `table`."""
+        line = json.dumps(record, default=_default)
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with self.path(table).open("a") as f:
+                f.write(line + "\n")
+
+    def records(self, table: str, **where: Any) -> Iterator[Dict[str, Any]]:
+        """Iterate over the records in `table`, filtered to those matching every field in `where`."""
+        path = self.path(table)
+        if not path.exists():
+            return
+        with path.open() as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if all(record.get(k) == v for k, v in where.items()):
+                    yield record
+
+    def clear(self, table: str) -> None:
+        """Remove all records from `table`."""
+        with self._lock:
+            self.path(table).unlink(missing_ok=True)
+
+
+def _default(obj: Any) -> Any:
+    """JSON-encode the non-JSON types commonly found in our records"""
+    if hasattr(obj, "value"):  # Enums
+        return obj.value
+    if hasattr(obj, "item"):  # Numpy scalars
+        return obj.item()
+    return str(obj)
+
+
+# Default, module-wide store
+result_store = ResultStore()
@@ -0,0 +1,129 @@
+"""
+# Ring-Oscillator Characterization
+
+Bias solving and sensitivity analysis shared by the ring-oscillator testbenches,
+e.g. the CML ring of `serdes_generics/cmlro` and the CMOS ILO of `ilo`.
+Each testbench's sims measure the ring's period as `tperiod`, in their first analysis.
+
+* `solve_ibias` finds the bias current at which the ring runs at a target frequency, at each of several conditions,
+  all conditions iterating concurrently by Brent's method (`tests/search.py`).
+* `sensitivities` finds the normalized sensitivities of its frequency, and any other metrics, to its parameters (`tests/sensitivity.py`).
+
+Example:
+
+```
+sim = lambda pvt, ib: sim_input(IloFreqTb, TbParams(pvt=pvt, ib=ib * µ))
+roots = solve_ibias(simulated(sim), conds, lo=100, hi=290, name="IloFreqTb", table="ilo_ibias")
+```
+"""
+
+# Std-Lib Imports
+from typing import Any, Callable, List, Sequence, Tuple, Union
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21.sim as hs
+
+# Local Imports
+from .sim_options import sim_options
+from .result_store import ResultStore, result_store
+from .search import Root, brent
+from .sensitivity import Factor, Metrics, Sensitivity, sensitivity
+from .sensitivity import simulated as simulated_metrics
+from . import sim_runner
+
+# Frequency (Hz) of each `(condition, bias current (µA))` point, in order. NaN where unmeasured.
+Frequencies = Callable[[List[Tuple[Any, float]]], List[float]]
+
+
+def freq(result: hs.SimResult) -> float:
+    """Ring frequency (Hz), from the period measured by `result`'s first analysis"""
+    return 1 / result.an[0].measurements["tperiod"]
+
+
+def simulated(
+    sim: Callable[[Any, float], hs.Sim], store: ResultStore = result_store
+) -> Frequencies:
+    """
+    Sim-based frequencies: each point is simulated by `sim(condition, ib)`, with `ib` in µA,
+    all in a single `sim_runner` batch, labeled by condition. Failed sims are NaN.
+    """
+
+    def freqs(points: List[Tuple[Any, float]]) -> List[float]:
+        sims = [sim(cond, ib) for (cond, ib) in points]
+        label = lambda idx: str(points[idx][0])
+        jobs = sim_runner.run(sims, sim_options, store=store, corner=label)
+        return [freq(job.result) if job.ok else np.nan for job in jobs]
+
+    return freqs
+
+
+def solve_ibias(
+    freqs: Frequencies,
+    conds: Sequence[Any],
+    lo: float,
+    hi: float,
+    name: str,
+    table: str,
+    target: float = 480e6,
+    ftol: float = 1e6,
+    rtol: float = 1e-3,
+    store: ResultStore = result_store,
+) -> List[Root]:
+    """
+    Solve for the bias current (µA), between `lo` and `hi`, at which the ring runs at frequency `target` (Hz), at each of `conds`,
+    to within `ftol` (Hz) of `target`, or `rtol` of the current. Each round of `freqs` covers every unfinished condition.
+    Rings which fail to oscillate, or whose sims fail (NaN), are taken to be too slow.
+    Records each condition's current, frequency and number of sims to `table` of `store`, labeled testbench `name`.
+    """
+
+    def measure(points: List[Tuple[int, float]]) -> List[float]:
+        found = freqs([(conds[idx], ib) for (idx, ib) in points])
+        return [float(np.nan_to_num(f, nan=0.0)) - target for f in found]
+
+    roots = brent(measure, range(len(conds)), lo=lo, hi=hi, rtol=rtol, ftol=ftol)
+
+    results = [roots[idx] for idx in range(len(conds))]
+    for (cond, root) in zip(conds, results):
+        store.put(
+            table,
+            dict(
+                tb=name,
+                corner=str(cond),
+                target=target,
+                ib=root.x * 1e-6,
+                freq=root.fx + target,
+                sims=root.evaluations,
+                bracketed=root.bracketed,
+                converged=root.converged,
+            ),
+        )
+        print(
+            f"{cond}: ib {root.x:.2f}µA for {(root.fx + target) / 1e6:.1f}MHz, "
+            f"in {root.evaluations} sims{'' if root.converged else ' (not converged)'}"
+        )
+    return results
+
+
+def sensitivities(
+    sim: Callable[[Any], hs.Sim],
+    nominal: Any,
+    factors: Sequence[Union[str, Factor]],
+    metrics: Callable[[hs.SimResult], Metrics],
+    central: bool = True,
+) -> Sensitivity:
+    """
+    Sensitivity of ring frequency, and of `metrics(result)`, e.g. supply current, to each of `factors`, around paramclass `nominal`.
+    Each parameter set is simulated by `sim(params)`. Central differences if `central`, else the cheaper forward differences.
+    """
+
+    def measure(job: sim_runner.JobResult) -> Metrics:
+        return dict(freq=freq(job.result), **metrics(job.result))
+
+    result = sensitivity(
+        simulated_metrics(sim, measure), nominal, factors, central=central
+    )
+    print(result.report())
+    return result
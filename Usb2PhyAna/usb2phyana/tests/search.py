@@ -0,0 +1,231 @@
+"""
+# Parallel Searches
+
+Searches over many independent keys at once, e.g. the largest tolerable jitter amplitude at each of several jitter frequencies,
+or the bias current giving a target frequency at each of several PVT corners.
+
+Searches advance in rounds. Each round probes every unfinished search, and evaluates them all as a single batch,
+so a parallel simulation runner stays busy even as searches finish.
+
+* `bisect` finds pass/fail thresholds. Each search assumes a monotonic pass/fail outcome: passing below some threshold, and failing above it.
+  When a search probes several points in a round, they are ordered from its lowest, and everything from its first failure on is taken to fail -
+  so a single failure ends the round's work for that search.
+* `brent` finds roots of a continuous measurement, by Brent's method: inverse-quadratic and secant steps,
+  safeguarded by bisection of a bracket which always holds a sign change. It needs no derivatives,
+  and typically converges in a handful of evaluations where bisection would need a dozen or more.
+"""
+
+# Std-Lib Imports
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict, Generator, Hashable, List, Sequence, Tuple
+
+# A batch of `(key, value)` points to evaluate, and its pass/fail results
+Points = List[Tuple[Hashable, float]]
+Evaluate = Callable[[Points], Sequence[bool]]
+# And its measured values, for root-finding
+Measure = Callable[[Points], Sequence[float]]
+
+
+@dataclass
+class Bracket:
+    """# Search Bracket, for a single key"""
+
+    lo: float  # Largest value known, or assumed, to pass
+    hi: float  # Smallest value known to fail
+    evaluations: int = 0  # Number of points evaluated
+
+    @property
+    def passed_all(self) -> bool:
+        """Whether the search's upper limit passed, i.e. the threshold is beyond the searched range"""
+        return math.isinf(self.hi)
+
+
+def bisect(
+    evaluate: Evaluate,
+    keys: Sequence[Hashable],
+    lo: float,
+    hi: float,
+    rtol: float = 0.05,
+    width: int = 1,
+    log: bool = False,
+) -> Dict[Hashable, Bracket]:
+    """
+    Find the pass/fail threshold of `evaluate` for each of `keys`, between `lo` and `hi`.
+
+    The first round evaluates `hi` for every key. Keys which pass there are done, with `Bracket.hi` of infinity.
+    The rest are bisected until `hi - lo <= rtol * hi`, probing `width` points per search per round;
+    more when fewer searches remain, to keep every batch `len(keys) * width` points wide.
+    Points are spaced geometrically if `log`, e.g. for amplitudes spanning decades.
+    Values at or below `lo` are assumed to pass.
+    """
+    brackets = {key: Bracket(lo=lo, hi=hi) for key in keys}
+
+    # First round: the upper limit
+    results = evaluate([(key, hi) for key in keys])
+    for (key, passed) in zip(keys, results):
+        brackets[key].evaluations += 1
+        if passed:
+            brackets[key].lo, brackets[key].hi = hi, math.inf
+
+    batch = len(keys) * width
+    while True:
+        active = [
+            k for k in keys if brackets[k].hi - brackets[k].lo > rtol * brackets[k].hi
+        ]
+        if not active:
+            return brackets
+
+        # Spread the batch across the remaining searches
+        npts = max(width, batch // len(active))
+        points: Points = []
+        for key in active:
+            b = brackets[key]
+            points += [(key, x) for x in _interior(b.lo, b.hi, npts, log)]
+        results = evaluate(points)
+
+        # Update each bracket from its lowest failure
+        for key in active:
+            b = brackets[key]
+            mine = [(x, ok) for ((k, x), ok) in zip(points, results) if k == key]
+            b.evaluations += len(mine)
+            for (x, ok) in mine:
+                if not ok:
+                    b.hi = x
+                    break
+                b.lo = x
+
+
+def _interior(lo: float, hi: float, n: int, log: bool) -> List[float]:
+    """`n` points evenly spaced strictly between `lo` and `hi`, geometrically if `log`"""
+    fracs = [(i + 1) / (n + 1) for i in range(n)]
+    if log and lo > 0:
+        return [lo * (hi / lo) ** f for f in fracs]
+    return [lo + (hi - lo) * f for f in fracs]
+
+
+@dataclass
+class Root:
+    """# Root-Finding Result, for a single key"""
+
+    x: float  # Best estimate of the root
+    fx: float  # Measured value at `x`
+    evaluations: int = 0  # Number of points evaluated
+    bracketed: bool = True  # Whether the search range held a sign change. If not, `x` is its endpoint nearest a root.
+    converged: bool = False  # Whether `x` met the tolerances within the iteration limit
+
+
+# A single root search, per `_brent`
+_Search = Generator[float, float, Root]
+
+
+def brent(
+    measure: Measure,
+    keys: Sequence[Hashable],
+    lo: float,
+    hi: float,
+    xtol: float = 0.0,
+    rtol: float = 1e-3,
+    ftol: float = 0.0,
+    maxiter: int = 20,
+) -> Dict[Hashable, Root]:
+    """
+    Find a root of `measure` for each of `keys`, between `lo` and `hi`, by Brent's method.
+
+    The first round measures both `lo` and `hi` for every key. Keys without a sign change between them are done,
+    with `Root.bracketed` False. Later rounds measure one point per unfinished search,
+    until the root is bracketed within `xtol + rtol * |x|`, or `|measure| <= ftol`, or `maxiter` further rounds have passed.
+    `measure` must return finite values; map e.g. failed sims onto the appropriate side of the root.
+    """
+    roots: Dict[Hashable, Root] = dict()
+    evaluations = {key: 2 for key in keys}
+
+    # Each search runs as a coroutine, yielding its next point and receiving its measurement
+    searches: Dict[Hashable, _Search] = dict()
+    points: Dict[Hashable, float] = dict()
+
+    def advance(key: Hashable, step: Callable[[], float]) -> None:
+        try:
+            points[key] = step()
+        except StopIteration as stop:
+            roots[key] = stop.value
+            roots[key].evaluations = evaluations[key]
+            del searches[key]
+
+    # First round: both ends of the range
+    values = measure([(key, x) for key in keys for x in (lo, hi)])
+    for (idx, key) in enumerate(keys):
+        flo, fhi = values[2 * idx], values[2 * idx + 1]
+        searches[key] = search = _brent(lo, hi, flo, fhi, xtol, rtol, ftol, maxiter)
+        advance(key, lambda: next(search))
+
+    while searches:
+        active = list(searches)
+        values = measure([(key, points[key]) for key in active])
+        for (key, fx) in zip(active, values):
+            evaluations[key] += 1
+            advance(key, lambda: searches[key].send(fx))
+
+    return {key: roots[key] for key in keys}
+
+
+def _brent(
+    a: float,
+    b: float,
+    fa: float,
+    fb: float,
+    xtol: float,
+    rtol: float,
+    ftol: float,
+    maxiter: int,
+) -> _Search:
+    """
+    Brent's method, as a coroutine: yields each point to measure, is sent its measurement, and returns the `Root`.
+    Follows the formulation of `scipy.optimize.brentq`. `(a, fa)` and `(b, fb)` are the range's measured endpoints.
+    """
+    if fa * fb > 0:
+        (x, fx) = (a, fa) if abs(fa) < abs(fb) else (b, fb)
+        return Root(x=x, fx=fx, bracketed=False)
+    if fa == 0:
+        return Root(x=a, fx=fa, converged=True)
+
+    # `cur` is the best estimate so far, `pre` the previous one, and `blk` the far side of the bracket
+    xpre, fpre, xcur, fcur = a, fa, b, fb
+    xblk, fblk, spre, scur = a, fa, 0.0, 0.0
+    for iteration in range(maxiter + 1):
+        if fpre * fcur < 0:
+            xblk, fblk = xpre, fpre
+            spre = scur = xcur - xpre
+        if abs(fblk) < abs(fcur):
+            xpre, xcur, xblk = xcur, xblk, xcur
+            fpre, fcur, fblk = fcur, fblk, fcur
+
+        delta = (xtol + rtol * abs(xcur)) / 2
+        sbis = (xblk - xcur) / 2
+        if abs(fcur) <= ftol or abs(sbis) < delta:
+            return Root(x=xcur, fx=fcur, converged=True)
+        if iteration == maxiter:
+            return Root(x=xcur, fx=fcur)
+
+        if abs(spre) > delta and abs(fcur) < abs(fpre):
+            if xpre == xblk:
+                # Secant
+                stry = -fcur * (xcur - xpre) / (fcur - fpre)
+            else:
+                # Inverse quadratic interpolation
+                dpre = (fpre - fcur) / (xpre - xcur)
+                dblk = (fblk - fcur) / (xblk - xcur)
+                stry = (
+                    -fcur * (fblk * dblk - fpre * dpre) / (dblk * dpre * (fblk - fpre))
+                )
+            if 2 * abs(stry) < min(abs(spre), 3 * abs(sbis) - delta):
+                spre, scur = scur, stry
+            else:
+                # Interpolation would step too far, or too slowly. Bisect.
+                spre = scur = sbis
+        else:
+            spre = scur = sbis
+
+        xpre, fpre = xcur, fcur
+        xcur += scur if abs(scur) > delta else math.copysign(delta, sbis)
+        fcur = yield xcur
@@ -0,0 +1,200 @@
+"""
+# Sensitivity Analysis
+
+Finite-difference sensitivities of measured metrics, e.g. frequency and supply current, to generator and testbench parameters,
+e.g. `IloParams.cl`, `TbParams.ib`, or the supply voltage and temperature of a `Pvt`.
+
+Each `Factor` names a (possibly nested) paramclass field by its dotted path, e.g. `"cml.rl"` or `"pvt.t"`,
+and is perturbed up and down around a nominal set of parameters. The nominal and every perturbation are evaluated as a single batch.
+Results are normalized sensitivities: the fractional change of each metric, per fractional change of each factor.
+So e.g. a sensitivity of -0.5 of frequency to `cl` means a 10% larger `cl` slows the ring by about 5%.
+
+Example:
+
+```
+result = sensitivity(
+    simulated(lambda p: sim_input(CmlRoFreqTb, p), measure),
+    nominal=TbParams(pvt=Pvt(), cml=cml),
+    factors=["cml.rl", "cml.cl", "cml.ib", "pvt.v", Factor("pvt.t", step=10, scale=100)],
+)
+print(result.report())
+```
+"""
+
+# Std-Lib Imports
+import math, dataclasses
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+import hdl21.sim as hs
+
+# Local Imports
+from .sim_options import sim_options
+from .result_store import ResultStore, result_store
+from . import sim_runner
+
+# Metrics of a single evaluation, by name
+Metrics = Dict[str, float]
+# Evaluation of a batch of parameter sets, in order
+Evaluate = Callable[[List[Any]], List[Metrics]]
+
+
+@dataclass(frozen=True)
+class Factor:
+    """# Perturbed Parameter"""
+
+    path: str  # Dotted path to a numeric paramclass field, e.g. "cml.rl"
+    # Absolute step. If None, `rel` times the nominal value.
+    step: Optional[float] = None
+    # Value per which the sensitivity is normalized, e.g. 100 for "per 100C". If None, the nominal value.
+    scale: Optional[float] = None
+
+
+@dataclass
+class Sensitivity:
+    """# Normalized Sensitivities, per Metric and Factor"""
+
+    factors: List[str]  # Factor paths, shape (nfactors,)
+    metrics: List[str]  # Metric names, shape (nmetrics,)
+    nominal: Metrics  # Metrics at the nominal parameters
+    steps: np.ndarray  # Applied steps, after rounding, shape (nfactors,)
+    # Fractional metric change per fractional factor change, shape (nmetrics, nfactors).
+    # NaN where a perturbation could not be measured, or a nominal metric is zero.
+    matrix: np.ndarray
+
+    def ranked(self, metric: str) -> List[tuple]:
+        """`(factor, sensitivity)` pairs for `metric`, by decreasing magnitude"""
+        row = self.matrix[self.metrics.index(metric)]
+        order = np.argsort(-np.nan_to_num(np.abs(row), nan=-1))
+        return [(self.factors[i], float(row[i])) for i in order]
+
+    def report(self) -> str:
+        """
+        Sensitivity table, one row per factor, and each metric's dominant factor.
+        Metrics without any measured sensitivity are listed as unmeasured, rather than tabulated.
+        """
+        measured = ~np.all(np.isnan(self.matrix), axis=1)
+        metrics = [m for (m, ok) in zip(self.metrics, measured) if ok]
+        header = f"{'factor':<16} " + " ".join(f"{m:>10}" for m in metrics)
+        rows = [
+            f"{factor:<16} "
+            + " ".join(f"{s:>10.3f}" for s in self.matrix[measured, idx])
+            for (idx, factor) in enumerate(self.factors)
+        ]
+        lines = [header, *rows]
+        if metrics:
+            dominant = ", ".join(f"{m}: {self.ranked(m)[0][0]}" for m in metrics)
+            lines.append(f"Dominant {dominant}")
+        unmeasured = [m for (m, ok) in zip(self.metrics, measured) if not ok]
+        if unmeasured:
+            lines.append(f"Unmeasured {', '.join(unmeasured)}")
+        return "\n".join(lines)
+
+
+def get(params: Any, path: str) -> Any:
+    """Value of the field at dotted `path` of paramclass `params`"""
+    for name in path.split("."):
+        params = getattr(params, name)
+    return params
+
+
+def replace(params: Any, path: str, value: Any) -> Any:
+    """Copy of paramclass `params`, with the field at dotted `path` set to `value`"""
+    name, _, rest = path.partition(".")
+    if rest:
+        value = replace(getattr(params, name), rest, value)
+    return dataclasses.replace(params, **{name: value})
+
+
+def perturb(value: Any, step: float) -> Any:
+    """`value` plus `step`, keeping its type. Integers step by at least one."""
+    if isinstance(value, bool) or value is None:
+        raise TypeError(f"Cannot perturb non-numeric value {value}")
+    if isinstance(value, int):
+        return value + int(math.copysign(max(1, round(abs(step))), step))
+    if isinstance(value, h.Prefixed):
+        return value + h.Prefixed.new(step)
+    if isinstance(value, float):
+        return value + step
+    raise TypeError(f"Cannot perturb non-numeric value {value}")
+
+
+def sensitivity(
+    evaluate: Evaluate,
+    nominal: Any,
+    factors: Sequence[Union[str, Factor]],
+    rel: float = 0.05,
+    central: bool = True,
+) -> Sensitivity:
+    """
+    Normalized sensitivities of the metrics of `evaluate` to each of `factors`, around paramclass `nominal`.
+    Factors step by `rel` of their nominal value, unless given an absolute `Factor.step`,
+    by central differences if `central`, else forward differences.
+    The nominal and all `(1 + central) * len(factors)` perturbations are evaluated in one batch.
+    Raises `RuntimeError` if the nominal yields no metrics, e.g. if its sim fails.
+    """
+    factors = [f if isinstance(f, Factor) else Factor(path=f) for f in factors]
+    signs = (1, -1) if central else (1,)
+
+    batch, steps, scales = [nominal], [], []
+    for factor in factors:
+        value = get(nominal, factor.path)
+        x = float(value)
+        step = factor.step if factor.step is not None else rel * abs(x)
+        if step == 0:
+            raise ValueError(f"Zero step for {factor.path}, at nominal value {value}")
+        for sign in signs:
+            batch.append(replace(nominal, factor.path, perturb(value, sign * step)))
+        # The step actually applied, e.g. after rounding integers
+        steps.append(float(get(batch[-len(signs)], factor.path)) - x)
+        scales.append(factor.scale if factor.scale is not None else abs(x))
+
+    results = evaluate(batch)
+    nom = results[0]
+    if not nom:
+        raise RuntimeError(f"Nominal evaluation failed, at {nominal}")
+    metrics = list(nom)
+    matrix = np.full((len(metrics), len(factors)), np.nan)
+    for (idx, (step, scale)) in enumerate(zip(steps, scales)):
+        up = results[1 + len(signs) * idx]
+        down = results[2 + len(signs) * idx] if central else nom
+        for (row, metric) in enumerate(metrics):
+            dy = up.get(metric, math.nan) - down.get(metric, math.nan)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                matrix[row, idx] = (
+                    np.float64(dy) * scale / (len(signs) * step * abs(nom[metric]))
+                )
+    matrix[~np.isfinite(matrix)] = np.nan
+
+    return Sensitivity(
+        factors=[f.path for f in factors],
+        metrics=metrics,
+        nominal=nom,
+        steps=np.array(steps),
+        matrix=matrix,
+    )
+
+
+def simulated(
+    sim: Callable[[Any], hs.Sim],
+    measure: Callable[[sim_runner.JobResult], Metrics],
+    store: ResultStore = result_store,
+    corner: str = "sensitivity",
+) -> Evaluate:
+    """
+    Sim-based evaluation: each parameter set is simulated by `sim(params)`, and measured by `measure(job)`,
+    all in a single `sim_runner` batch. Failed sims measure as no metrics: NaN sensitivities, or an error for the nominal.
+    """
+
+    def evaluate(batch: List[Any]) -> List[Metrics]:
+        jobs = sim_runner.run(
+            [sim(p) for p in batch], sim_options, store=store, corner=corner
+        )
+        return [measure(job) if job.ok else dict() for job in jobs]
+
+    return evaluate
@@ -0,0 +1,534 @@
+"""
+# Simulation Runner
+
+Runs batches of `hdl21.sim.Sim`s, one simulator process per job.
+Failures are classified from the simulator log, rather than raised for the whole batch.
+Convergence failures are retried under a list of progressively relaxed `OptionProfile`s.
+Each job runs under wall-time and memory limits, and returns a `JobResult` with an explicit `SimStatus`.
+Each `JobResult` also carries `SimTelemetry` parsed from the simulator log,
+which is optionally recorded to a `ResultStore`.
+Sim compilation happens in the calling thread, before jobs are queued; each stage is traced via `tracing.tracer`.
+Per-job `JobOutputs` optionally keep each raw waveform file, for lazy access via `waveforms.RawFile`,
+and skip decoding transient waveforms into results.
+"""
+
+# Std-Lib Imports
+import re, subprocess, resource, time, shutil, uuid
+import concurrent.futures
+from enum import Enum
+from copy import copy
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+# Hdl & PDK Imports
+import hdl21 as h
+import hdl21.sim as hs
+import vlsir.spice_pb2 as vsp
+from vlsirtools.spice import SimOptions, SupportedSimulators, ResultFormat
+from vlsirtools.spice.spectre import SpectreSim, NutBinAnalysis, NumType
+
+# Local Imports
+from .sim_options import sim_options
+from .result_store import ResultStore
+from .telemetry import SimTelemetry, parse_log
+from . import telemetry
+from .tracing import tracer
+from .waveforms import RawFile
+
+
+class SimStatus(Enum):
+    """# Simulation Job Status"""
+
+    OK = "ok"  # Produced results on its first attempt
+    RECOVERED = "recovered"  # Produced results after one or more relaxed-option retries
+    FAILED = "failed"  # Produced no results. See `JobResult.failure` for why.
+    SKIPPED = "skipped"  # Not run, per its batch's `skip` predicate
+
+
+class FailureKind(Enum):
+    """# Simulation Failure Classification"""
+
+    CONVERGENCE = "convergence"
+    TIMEOUT = "timeout"
+    MEMORY = "memory"
+    LICENSE = "license"
+    NETLIST = "netlist"
+    UNKNOWN = "unknown"
+
+
+# Simulator-log patterns per `FailureKind`, checked in order.
+# Netlist errors come last, as Spectre's front-end ("SFE") also reports on other failures.
+FAILURE_PATTERNS: List[Tuple[FailureKind, re.Pattern]] = [
+    (
+        FailureKind.LICENSE,
+        re.compile(
+            r"licen[sc]e\s+(check\s*out|checkout|request)?\s*(failed|unavailable|denied|error)"
+            r"|unable to (check\s*out|obtain|get)\s+(a\s+)?licen[sc]e"
+            r"|no licen[sc]e",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        FailureKind.MEMORY,
+        re.compile(
+            r"out of memory|cannot allocate memory|memory allocation failed|bad_alloc",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        FailureKind.CONVERGENCE,
+        re.compile(
+            r"no convergence|did not converge|failed to converge|convergence (failure|difficult)"
+            r"|no dc solution|time ?step too small|singular (jacobian|matrix)",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        FailureKind.NETLIST,
+        re.compile(
+            r"ERROR \(SFE-\d+\)|syntax error|undefined (model|subcircuit|parameter)"
+            r"|unknown (parameter|instance|primitive)|cannot open (file|include)",
+            re.IGNORECASE,
+        ),
+    ),
+]
+
+
+def classify(log: str) -> FailureKind:
+    """Classify a failed simulation from (the text of) its log."""
+    for kind, pattern in FAILURE_PATTERNS:
+        if pattern.search(log):
+            return kind
+    return FailureKind.UNKNOWN
+
+
+@dataclass(frozen=True)
+class OptionProfile:
+    """# Simulator Option Profile
+    A named set of Spectre `options`, added to a `Sim` on retry."""
+
+    name: str
+    options: str  # Spectre `options` statement parameters
+
+    def literal(self) -> hs.Literal:
+        return hs.Literal(
+            f"""
+            simulator lang=spectre
+            {self.name}_opts options {self.options}
+        """
+        )
+
+
+# Default retry profiles, in order of escalation.
+RETRY_PROFILES: Tuple[OptionProfile, ...] = (
+    OptionProfile("relaxed", "reltol=1e-3 vabstol=1e-5 iabstol=1e-11"),
+    OptionProfile("homotopy", "reltol=1e-3 gmin=1e-10 homotopy=all"),
+    OptionProfile(
+        "liberal", "reltol=1e-2 vabstol=1e-4 iabstol=1e-10 gmin=1e-9 homotopy=all"
+    ),
+)
+
+
+@dataclass(frozen=True)
+class JobLimits:
+    """# Per-Job Resource Limits"""
+
+    walltime: Optional[float] = 3600.0  # Wall-clock seconds per simulator process
+    memory: Optional[int] = None  # Address-space bytes per simulator process
+
+
+@dataclass(frozen=True)
+class JobOutputs:
+    """# Per-Job Output Handling"""
+
+    # Directory in which to keep each job's raw waveform file.
+    # If `None`, raw files are deleted along with each job's run-directory.
+    rawdir: Optional[Path] = None
+    # Whether to decode transient waveforms into each `SimResult`.
+    # If `False`, transient results carry only measurements; waveforms remain available from the raw file.
+    waveforms: bool = True
+
+
+@dataclass
+class JobResult:
+    """# Result of a Single Simulation Job"""
+
+    status: SimStatus
+    result: Optional[hs.SimResult] = None  # Results, set unless `status` is `FAILED`
+    failure: Optional[FailureKind] = None  # Classification of the last failed attempt
+    attempts: int = 1  # Number of simulator invocations
+    profile: Optional[str] = None  # Name of the `OptionProfile` which succeeded, if any
+    log: str = ""  # Tail of the simulator log, for failed jobs
+    telemetry: Optional[SimTelemetry] = None  # Metrics of the last simulator run
+    raw: Optional[Path] = None  # Path of the kept raw waveform file, if any
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (SimStatus.OK, SimStatus.RECOVERED)
+
+
+class _SimFailure(Exception):
+    """Internal exception for a failed simulator process"""
+
+    def __init__(self, kind: FailureKind, log: str) -> None:
+        super().__init__(kind.value)
+        self.kind = kind
+        self.log = log
+        self.walltime: Optional[float] = None
+
+
+class LimitedSpectreSim(SpectreSim):
+    """
+    # Resource-Limited Spectre Sim
+    A `SpectreSim` which runs its simulator process under `JobLimits`, and retains its log.
+    """
+
+    def __init__(
+        self,
+        inp,
+        opts: SimOptions,
+        limits: JobLimits,
+        job: str = "",
+        outputs: JobOutputs = JobOutputs(),
+        raw: Optional[Path] = None,
+    ) -> None:
+        super().__init__(inp=inp, opts=opts)
+        self.limits = limits
+        self.job = job  # Job name, for tracing
+        self.outputs = outputs
+        self.raw = raw  # Destination of our raw waveform file, if kept
+        self.log = ""
+
+    def run(self) -> hs.SimResult:
+        with tracer.span("netlist", job=self.job):
+            self.write_netlist()
+        with tracer.span("simulate", job=self.job):
+            self.run_spectre_process()
+        with tracer.span("parse", job=self.job):
+            return self.parse_results()
+
+    def run_subprocess(self, cmd) -> None:
+        def preexec():
+            if self.limits.memory is not None:
+                mem = int(self.limits.memory)
+                resource.setrlimit(resource.RLIMIT_AS, (mem, mem))
+
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            cwd=str(self.rundir),
+            preexec_fn=preexec,
+        )
+        self.subprocesses.append(proc)
+        try:
+            stdout, _ = proc.communicate(timeout=self.limits.walltime)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            stdout, _ = proc.communicate()
+            self.log = stdout.decode(errors="replace")
+            raise _SimFailure(FailureKind.TIMEOUT, self.log)
+
+        self.log = stdout.decode(errors="replace")
+        if proc.returncode != 0:
+            kind = classify(self.log)
+            if kind == FailureKind.UNKNOWN and proc.returncode == -9:
+                # Killed from outside, almost always by the kernel's OOM killer
+                kind = FailureKind.MEMORY
+            raise _SimFailure(kind, self.log)
+
+    def parse_results(self) -> hs.SimResult:
+        if self.outputs.waveforms and self.raw is None:
+            return super().parse_results()
+
+        raw = self.path("netlist.raw")
+        if self.raw is not None:
+            self.raw.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(raw), str(self.raw))
+            raw = self.raw
+        return self.parse_raw(RawFile(raw))
+
+    def parse_raw(self, raw: RawFile) -> hs.SimResult:
+        """Parse results from memory-mapped `raw`, decoding transient waveforms only if `outputs.waveforms`."""
+        dispatch = dict(
+            ac=self.parse_ac, dc=self.parse_dc, op=self.parse_op, tran=self.parse_tran
+        )
+        results = []
+        for an in self.inp.an:
+            an_type = an.WhichOneof("an")
+            inner = getattr(an, an_type)
+            if an_type not in dispatch:
+                msg = f"Invalid or Unsupported analysis {an} with type {an_type}"
+                raise RuntimeError(msg)
+            if inner.analysis_name not in raw:
+                raise RuntimeError(f"Cannot read results for analysis {an}")
+            plot = raw[inner.analysis_name]
+            skip = an_type == "tran" and not self.outputs.waveforms
+            nutbin = NutBinAnalysis(
+                analysis_name=plot.name,
+                numtype=NumType.COMPLEX if plot.complex else NumType.REAL,
+                data=dict() if skip else plot.to_dict(),
+                units=dict(),
+            )
+            results.append(dispatch[an_type](inner, nutbin))
+        return hs.SimResult(an=results)
+
+
+@dataclass(frozen=True)
+class _Batch:
+    """Settings shared by each job in a batch"""
+
+    opts: SimOptions
+    limits: JobLimits
+    profiles: Sequence[OptionProfile]
+    outputs: JobOutputs
+    store: Optional[ResultStore]
+    # Unique identifier of the batch, distinguishing its raw files from those of other batches
+    name: str
+
+
+def _run_once(
+    inp: vsp.SimInput, job: str, raw: Optional[Path], batch: _Batch
+) -> Tuple[hs.SimResult, SimTelemetry]:
+    """Run a single simulator process. Raises `_SimFailure` on failure."""
+    sim = LimitedSpectreSim(
+        inp=inp,
+        opts=batch.opts,
+        limits=batch.limits,
+        job=job,
+        outputs=batch.outputs,
+        raw=raw,
+    )
+    start = time.perf_counter()
+    try:
+        sim.setup()
+        result = sim.run()
+        return result, parse_log(sim.log, walltime=time.perf_counter() - start)
+    except _SimFailure as e:
+        e.walltime = time.perf_counter() - start
+        raise
+    except MemoryError:
+        e = _SimFailure(FailureKind.MEMORY, sim.log)
+        e.walltime = time.perf_counter() - start
+        raise e
+    except Exception as err:
+        # Failures after a successful simulator exit, generally in parsing its results.
+        log = sim.log + f"\n{type(err).__name__}: {err}"
+        e = _SimFailure(classify(sim.log), log)
+        e.walltime = time.perf_counter() - start
+        raise e
+    finally:
+        sim.cleanup()
+
+
+def _log_tail(log: str, lines: int = 100) -> str:
+    return "\n".join(log.splitlines()[-lines:])
+
+
+def tb_name(sim: hs.Sim) -> str:
+    """Name of the testbench of `sim`, without any generator-parameter suffix, e.g. `IloFreqTb`."""
+    return sim.tb.name.split("(")[0]
+
+
+def compile_sim(sim: hs.Sim) -> vsp.SimInput:
+    """
+    Elaborate and export `sim` to a VLSIR `SimInput`.
+    Hdl21 elaboration is not thread-safe, so this runs in the calling thread, before jobs are queued.
+    """
+    job = tb_name(sim)
+    with tracer.span("elaborate", job=job):
+        h.elaborate(sim.tb)
+    with tracer.span("compile", job=job):
+        return hs.to_proto(sim)
+
+
+def with_profile(inp: vsp.SimInput, profile: OptionProfile) -> vsp.SimInput:
+    """Copy of `inp`, with the options of `profile` added"""
+    attempt = vsp.SimInput()
+    attempt.CopyFrom(inp)
+    attempt.ctrls.append(vsp.Control(literal=profile.literal().text))
+    return attempt
+
+
+def _raw_path(
+    batch: _Batch, job: str, corner: str, idx: Optional[int] = None
+) -> Optional[Path]:
+    """Path at which to keep the raw file of job `job`, at `corner`, number `idx` in `batch`"""
+    if batch.outputs.rawdir is None:
+        return None
+    parts = [job, re.sub(r"[^\w.-]+", "_", corner).strip("_"), batch.name]
+    if idx is not None:
+        parts.append(str(idx))
+    return Path(batch.outputs.rawdir) / f"{'.'.join(p for p in parts if p)}.raw"
+
+
+def _batch(
+    opts: Optional[SimOptions],
+    limits: JobLimits,
+    profiles: Sequence[OptionProfile],
+    outputs: JobOutputs,
+    store: Optional[ResultStore],
+) -> _Batch:
+    name = uuid.uuid4().hex[:8]
+    return _Batch(_check_opts(opts), limits, profiles, outputs, store, name)
+
+
+def run_job(
+    sim: hs.Sim,
+    opts: Optional[SimOptions] = None,
+    limits: JobLimits = JobLimits(),
+    profiles: Sequence[OptionProfile] = RETRY_PROFILES,
+    outputs: JobOutputs = JobOutputs(),
+    store: Optional[ResultStore] = None,
+    corner: str = "",
+) -> JobResult:
+    """
+    Run `sim`, retrying convergence failures with each of `profiles` in turn.
+    If `store` is provided, the job's telemetry is recorded there, labeled by testbench name and `corner`.
+    """
+    batch = _batch(opts, limits, profiles, outputs, store)
+    job = tb_name(sim)
+    raw = _raw_path(batch, job, corner)
+    return _run_job(compile_sim(sim), job, corner, raw, batch)
+
+
+def _run_job(
+    inp: vsp.SimInput,
+    job: str,
+    corner: str,
+    raw: Optional[Path],
+    batch: _Batch,
+    queued: Optional[float] = None,
+) -> JobResult:
+    """Run a compiled job, at `corner`, and record its telemetry. `queued` is its trace-time of submission, if queued."""
+
+    if queued is not None:
+        tracer.complete("queue", queued, tracer.now() - queued, job=job, corner=corner)
+    with tracer.span("job", job=job, corner=corner):
+        result = _attempts(inp, job, raw, batch)
+
+    if batch.store is not None and result.telemetry is not None:
+        telemetry.record(
+            result.telemetry,
+            tb=job,
+            corner=corner,
+            store=batch.store,
+            status=result.status,
+            failure=result.failure,
+            attempts=result.attempts,
+        )
+    return result
+
+
+def _attempts(
+    inp: vsp.SimInput, job: str, raw: Optional[Path], batch: _Batch
+) -> JobResult:
+    """Run `inp`, and then each of its relaxed-option retries, until one succeeds or fails for other reasons."""
+    attempts = 0
+    failure: Optional[_SimFailure] = None
+
+    for profile in (None, *batch.profiles):
+        attempt = inp if profile is None else with_profile(inp, profile)
+        attempts += 1
+        try:
+            result, tel = _run_once(attempt, job, raw, batch)
+        except _SimFailure as e:
+            failure = e
+            if e.kind != FailureKind.CONVERGENCE:
+                break  # Only convergence failures are worth retrying
+            continue
+
+        return JobResult(
+            status=SimStatus.OK if profile is None else SimStatus.RECOVERED,
+            result=result,
+            attempts=attempts,
+            profile=None if profile is None else profile.name,
+            telemetry=tel,
+            raw=raw,
+        )
+
+    return JobResult(
+        status=SimStatus.FAILED,
+        failure=failure.kind,
+        attempts=attempts,
+        log=_log_tail(failure.log),
+        telemetry=parse_log(failure.log, walltime=failure.walltime),
+    )
+
+
+def run(
+    sims: Sequence[hs.Sim],
+    opts: Optional[SimOptions] = None,
+    limits: JobLimits = JobLimits(),
+    profiles: Sequence[OptionProfile] = RETRY_PROFILES,
+    outputs: JobOutputs = JobOutputs(),
+    max_workers: Optional[int] = None,
+    store: Optional[ResultStore] = None,
+    corner: Union[str, Callable[[int], str]] = "",
+    skip: Optional[Callable[[int], bool]] = None,
+    done: Optional[Callable[[int, JobResult], None]] = None,
+) -> List[JobResult]:
+    """
+    Run `sims` concurrently, one simulator process per job.
+    Unlike `h.sim.run`, a failing job does not fail the batch,
+    and results are returned in the same order as `sims`.
+
+    For batches which can end early, e.g. once any of their sims shows an error,
+    `done` is called with each job's index and result as it completes,
+    and `skip` with each job's index as it is about to start. Jobs for which `skip` returns True are not run,
+    and have status `SKIPPED`. Both are called from worker threads.
+
+    Jobs are labeled, in telemetry, traces and raw-file names, by `corner`:
+    either a label shared by the batch, or a function of each job's index returning its own, e.g. its process corner.
+    """
+
+    batch = _batch(opts, limits, profiles, outputs, store)
+    labels = [corner(idx) if callable(corner) else corner for idx in range(len(sims))]
+    corners = ", ".join(sorted(set(labels)))
+    with tracer.span("run", corner=corners, jobs=len(sims)):
+        # Compile everything up front, in this thread
+        jobs = [(compile_sim(s), tb_name(s)) for s in sims]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+
+            def run_one(idx: int, inp: vsp.SimInput, job: str, queued: float):
+                if skip is not None and skip(idx):
+                    return JobResult(status=SimStatus.SKIPPED, attempts=0)
+                label = labels[idx]
+                raw = _raw_path(batch, job, label, idx)
+                result = _run_job(inp, job, label, raw, batch, queued)
+                if done is not None:
+                    done(idx, result)
+                return result
+
+            futures = [
+                executor.submit(run_one, idx, inp, job, tracer.now())
+                for (idx, (inp, job)) in enumerate(jobs)
+            ]
+            return [f.result() for f in futures]
+
+
+def _check_opts(opts: Optional[SimOptions]) -> SimOptions:
+    """Check for options we support, and give each job its own run-directory."""
+    opts = copy(opts or sim_options)
+    if opts.simulator != SupportedSimulators.SPECTRE:
+        raise ValueError(f"Unsupported simulator {opts.simulator} for `sim_runner`")
+    if opts.fmt != ResultFormat.SIM_DATA:
+        raise ValueError(f"`sim_runner` requires `ResultFormat.SIM_DATA` results")
+    opts.rundir = None
+    return opts
+
+
+def results(jobs: Sequence[JobResult]) -> List[hs.SimResult]:
+    """
+    Get the `SimResult`s from a list of `jobs`, raising if any have failed.
+    For callers which require a complete set of results, as `h.sim.run` does.
+    """
+    failed = [(i, j) for (i, j) in enumerate(jobs) if not j.ok]
+    if failed:
+        summary = ", ".join(
+            f"{i}: {(j.failure or j.status).value}" for (i, j) in failed
+        )
+        raise RuntimeError(f"{len(failed)} of {len(jobs)} sims failed ({summary})")
+    return [j.result for j in jobs]
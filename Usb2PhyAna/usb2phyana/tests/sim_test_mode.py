@@ -1,13 +1,21 @@
 import io
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
 import hdl21 as h
 
-# Set the default PDK to `s130`, in case others are in memory
-import s130
+from ..pdk import s130
 
-h.pdk.set_default(s130.pdk)
+
+@lru_cache(maxsize=None)
+def set_default_pdk() -> None:
+    """
+    Set the default PDK to `s130`, in case others are in memory.
+    Deferred until first use, as importing the PDK is slow, and unnecessary for test collection.
+    Called once per test, by the autouse `default_pdk` fixture in `conftest.py`.
+    """
+    h.pdk.set_default(s130.pdk)
 
 
 class SimTestMode(Enum):
@@ -0,0 +1,256 @@
+"""
+# Statistical Eye
+
+Eye diagrams and BER contours from a single simulated pulse response.
+
+For a (near-)linear channel, the output for any bit sequence is the superposition of shifted copies of its single-bit pulse response.
+Sampled at a given phase, each other bit adds its "cursor" - the pulse response one or more UIs away - or nothing,
+each with probability one half. The distribution of the sampled voltage is therefore the convolution of those
+two-point distributions, computed here directly on a voltage grid, for every sampling phase at once.
+Random (Gaussian) and deterministic (dual-Dirac) jitter then blur these distributions along the phase axis.
+
+Example:
+
+```
+pr = PulseResponse.from_tran(t, v, ui=2.083e-9, delay=1e-9)
+eye = stateye(pr, rj=5e-12, dj=50e-12)
+metrics = eye.metrics(ber=1e-12)
+```
+"""
+
+# Std-Lib Imports
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# PyPi Imports
+import numpy as np
+
+
+@dataclass
+class PulseResponse:
+    """
+    # Pulse Response
+    Response to a single-UI pulse, uniformly sampled at `osr` samples per UI.
+    Stored relative to `baseline`, the settled output for an all-zeros pattern.
+    Sample zero is the start of the pulse.
+    """
+
+    y: np.ndarray  # Samples, relative to `baseline`
+    ui: float  # Unit interval (s)
+    osr: int  # Samples per UI
+    baseline: float  # Settled output for an all-zeros pattern
+
+    @classmethod
+    def from_tran(
+        cls,
+        t: np.ndarray,
+        v: np.ndarray,
+        ui: float,
+        delay: float,
+        osr: int = 64,
+        baseline: Optional[float] = None,
+    ) -> "PulseResponse":
+        """Create from transient waveform `(t, v)`, for a pulse starting at time `delay`.
+        The `baseline` defaults to the output at `delay`, i.e. just before the pulse arrives."""
+        if baseline is None:
+            baseline = float(np.interp(delay, t, v))
+        step = ui / osr
+        npts = int((t[-1] - delay) / step) + 1
+        tu = delay + step * np.arange(npts)
+        y = np.interp(tu, t, v) - baseline
+        return cls(y=y, ui=float(ui), osr=osr, baseline=baseline)
+
+    @property
+    def center(self) -> int:
+        """Index of the center of the pulse's main UI, our reference sampling point.
+        The center of the UI-wide window holding the most of its magnitude."""
+        window = np.convolve(np.abs(self.y), np.ones(self.osr), mode="valid")
+        return int(np.argmax(window)) + self.osr // 2
+
+    def cursors(self, pad: int = 0) -> Tuple[np.ndarray, int]:
+        """
+        Cursor matrix `h`, shaped `(osr, ncursors)`, where `h[r, c]` is sample `r + c * osr` of the pulse response.
+        Row `r` holds all the cursors for sampling phase `r` within a UI.
+        The response is zero-padded by `pad` UIs on each side. Returns `h` and the column index of the pulse start.
+        """
+        nui = -(-len(self.y) // self.osr)
+        y = np.zeros((nui + 2 * pad) * self.osr)
+        y[pad * self.osr : pad * self.osr + len(self.y)] = self.y
+        return y.reshape(-1, self.osr).T, pad
+
+
+@dataclass
+class EyeMetrics:
+    """# Eye Metrics, at a target BER"""
+
+    ber: float  # Target bit error rate
+    height: float  # Inner-eye height (V), at the best sampling phase
+    width: float  # Inner-eye width (s)
+    phase: float  # Best sampling phase (s), relative to the pulse-response `center`
+    threshold: float  # Best decision threshold (V), at `phase`
+
+
+@dataclass
+class StatEye:
+    """
+    # Statistical Eye
+    Voltage distributions over one UI of sampling phases, conditioned on the value of the sampled bit.
+    Phases are relative to the pulse-response `center`, spanning `[-UI/2, UI/2)`.
+    """
+
+    phases: np.ndarray  # Sampling phases (s), shape (nphases,)
+    volts: np.ndarray  # Voltage-bin centers (V), shape (nvolts,)
+    pdf1: np.ndarray  # Voltage distribution given a one, shape (nphases, nvolts)
+    pdf0: np.ndarray  # Voltage distribution given a zero, shape (nphases, nvolts)
+
+    @property
+    def pdf(self) -> np.ndarray:
+        """The unconditional voltage distribution, e.g. for plotting as an eye diagram"""
+        return (self.pdf1 + self.pdf0) / 2
+
+    def ber(self) -> np.ndarray:
+        """Bit error rate for a decision threshold at each voltage bin and phase, shape (nphases, nvolts).
+        Ones error below the threshold, and zeros above it."""
+        below1 = np.cumsum(self.pdf1, axis=1)
+        above0 = np.cumsum(self.pdf0[:, ::-1], axis=1)[:, ::-1] - self.pdf0
+        return np.clip((below1 + above0) / 2, 0, 1)
+
+    def contour(self, ber: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Inner-eye contour at bit error rate `ber`. Returns the `(lower, upper)` voltages per phase, NaN where closed."""
+        ok = self.ber() <= ber
+        opened = ok.any(axis=1)
+        lo = np.where(opened, self.volts[np.argmax(ok, axis=1)], np.nan)
+        hi = np.where(opened, self.volts[::-1][np.argmax(ok[:, ::-1], axis=1)], np.nan)
+        return lo, hi
+
+    def metrics(self, ber: float = 1e-12) -> EyeMetrics:
+        """Inner-eye opening at bit error rate `ber`"""
+        lo, hi = self.contour(ber)
+        dv = self.volts[1] - self.volts[0]
+        heights = np.nan_to_num(hi - lo + dv, nan=0.0)
+        # Of equally-tall phases, take the middle
+        tallest = np.flatnonzero(heights == heights.max())
+        best = int(tallest[len(tallest) // 2])
+        step = self.phases[1] - self.phases[0]
+        if heights[best] > 0:  # Center of the inner eye
+            threshold = (lo[best] + hi[best]) / 2
+        else:  # Closed. Use the least-bad threshold.
+            threshold = self.volts[int(np.argmin(self.ber()[best]))]
+        return EyeMetrics(
+            ber=ber,
+            height=float(heights[best]),
+            width=float(np.count_nonzero(heights) * step),
+            phase=float(self.phases[best]),
+            threshold=float(threshold),
+        )
+
+
+def stateye(
+    pr: PulseResponse,
+    rj: float = 0.0,
+    dj: float = 0.0,
+    nvolts: int = 512,
+) -> StatEye:
+    """
+    Statistical eye of pulse response `pr`, for random NRZ data.
+    Optionally adds Gaussian random jitter of RMS `rj` (s),
+    and dual-Dirac deterministic jitter of peak-to-peak `dj` (s).
+    """
+    osr = pr.osr
+    step = pr.ui / osr
+
+    # Jitter kernel, over phase offsets `[-nj, nj]` samples
+    nj = int(np.ceil((dj / 2 + 8 * rj) / step))
+    kernel = _jitter_kernel(nj, rj / step, dj / 2 / step)
+
+    # Cursors for every phase in `[-UI/2 - nj, UI/2 + nj)` around the center
+    pad = nj // osr + 2
+    h, start = pr.cursors(pad)
+    offsets = np.arange(-osr // 2 - nj, osr - osr // 2 + nj)
+    samples = pr.center + start * osr + offsets
+    rows, main = samples % osr, samples // osr
+    cursors = h[rows]  # (nphases, ncursors)
+    mains = cursors[np.arange(len(rows)), main]
+    cursors[np.arange(len(rows)), main] = 0
+
+    # Voltage grid, wide enough for every combination of cursors, with zero on a bin
+    vlo = min(np.minimum(h, 0).sum(axis=1).min(), 0)
+    vhi = max(np.maximum(h, 0).sum(axis=1).max(), 0)
+    dv = (vhi - vlo) / nvolts or 1.0
+    ilo, ihi = int(np.floor(vlo / dv)) - 1, int(np.ceil(vhi / dv)) + 1
+    volts = dv * np.arange(ilo, ihi + 1)
+
+    # Distribution of the inter-symbol interference: each cursor is present or absent with probability 1/2
+    isi = np.zeros((len(rows), len(volts)))
+    isi[:, -ilo] = 1
+    for c in range(cursors.shape[1]):
+        if np.any(cursors[:, c]):
+            isi = (isi + _shift(isi, cursors[:, c] / dv)) / 2
+    pdf1, pdf0 = _shift(isi, mains / dv), isi
+
+    # Blur along the phase axis by the jitter distribution, keeping the central UI
+    if nj:
+        pdf1 = _phase_convolve(pdf1, kernel)
+        pdf0 = _phase_convolve(pdf0, kernel)
+
+    return StatEye(
+        phases=step * offsets[nj : len(offsets) - nj],
+        volts=pr.baseline + volts,
+        pdf1=pdf1,
+        pdf0=pdf0,
+    )
+
+
+def _shift(pdf: np.ndarray, bins: np.ndarray) -> np.ndarray:
+    """Shift each row of `pdf` by its (fractional) number of `bins`, splitting mass linearly between neighbors.
+    Mass shifted off either end is dropped."""
+    nrows, ncols = pdf.shape
+    lo = np.floor(bins).astype(int)
+    frac = (bins - lo)[:, None]
+    src = np.arange(ncols)[None, :] - lo[:, None]
+
+    def take(idx: np.ndarray) -> np.ndarray:
+        valid = (idx >= 0) & (idx < ncols)
+        vals = np.take_along_axis(pdf, np.clip(idx, 0, ncols - 1), axis=1)
+        return np.where(valid, vals, 0)
+
+    return (1 - frac) * take(src) + frac * take(src - 1)
+
+
+def _jitter_kernel(n: int, sigma: float, dd: float) -> np.ndarray:
+    """Jitter distribution over integer offsets `[-n, n]`: a Gaussian of RMS `sigma`, split between Diracs at `+/- dd`."""
+    k = np.arange(-n, n + 1, dtype=float)
+    if sigma > 0:
+        pdf = lambda mu: np.exp(-0.5 * ((k - mu) / sigma) ** 2)
+    else:  # No random jitter. Split each Dirac between its neighboring offsets.
+        pdf = lambda mu: np.maximum(1 - np.abs(k - mu), 0)
+    kernel = pdf(-dd) + pdf(dd)
+    return kernel / kernel.sum()
+
+
+def _phase_convolve(pdf: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """Convolve `pdf` along its phase axis with `kernel`, keeping only the fully-overlapped phases"""
+    n = len(kernel) // 2
+    out = np.zeros((pdf.shape[0] - 2 * n, pdf.shape[1]))
+    for (i, w) in enumerate(kernel):
+        out += w * pdf[i : i + len(out)]
+    return out
+
+
+def plot(eye: StatEye, ax=None, bers=(1e-3, 1e-6, 1e-9, 1e-12)):
+    """Plot the eye's density, and its BER contours at each of `bers`"""
+    import matplotlib.pyplot as plt
+
+    if ax is None:
+        _, ax = plt.subplots()
+    t = eye.phases / 1e-12
+    density = np.log10(np.maximum(eye.pdf.T, 1e-30))
+    ax.pcolormesh(t, eye.volts, density, shading="nearest", vmin=-12, vmax=0)
+    for ber in bers:
+        lo, hi = eye.contour(ber)
+        (line,) = ax.plot(t, lo, label=f"BER {ber:.0e}")
+        ax.plot(t, hi, color=line.get_color())
+    ax.set_xlabel("Phase (ps)")
+    ax.set_ylabel("Voltage (V)")
+    ax.legend()
+    return ax
@@ -0,0 +1,84 @@
+"""
+# Streaming Statistics
+
+Statistics of a stream of results, e.g. one per random seed, updated as each arrives,
+with confidence intervals on each. Shared by the jitter (`tests/tnoise.py`) and Monte Carlo (`tests/montecarlo.py`) harnesses.
+
+Intervals are large-sample approximations, without any assumption on the values' distribution beyond finite variance:
+normal for the mean and standard deviation, and by order statistics for quantiles.
+"""
+
+# Std-Lib Imports
+import math, bisect
+from dataclasses import dataclass, field
+from typing import List, Tuple, Union
+
+# A statistic: "mean", "std", or a quantile in (0, 1)
+Statistic = Union[str, float]
+
+
+@dataclass
+class Running:
+    """
+    # Running Statistics
+    Mean and variance of a stream of values (by Welford's method), and its quantiles.
+    Non-finite values, e.g. of failed sims, are skipped.
+    """
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # Sum of squared deviations from the mean
+    values: List[float] = field(default_factory=list, repr=False)  # Sorted
+
+    def add(self, x: float) -> None:
+        if not math.isfinite(x):
+            return
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        bisect.insort(self.values, x)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else math.nan
+
+    def quantile(self, q: float) -> float:
+        """The `q` quantile, interpolated between order statistics"""
+        if not self.n:
+            return math.nan
+        pos = q * (self.n - 1)
+        lo = int(math.floor(pos))
+        hi = min(lo + 1, self.n - 1)
+        return self.values[lo] + (pos - lo) * (self.values[hi] - self.values[lo])
+
+    def value(self, stat: Statistic) -> float:
+        """Value of statistic `stat`"""
+        if stat == "mean":
+            return self.mean if self.n else math.nan
+        if stat == "std":
+            return self.std
+        return self.quantile(float(stat))
+
+    def bounds(self, stat: Statistic, z: float = 1.96) -> Tuple[float, float]:
+        """Confidence interval `(lo, hi)` of statistic `stat`, 95% by default"""
+        if self.n < 2:
+            return (-math.inf, math.inf)
+        if stat == "mean":
+            half = z * self.std / math.sqrt(self.n)
+            return (self.mean - half, self.mean + half)
+        if stat == "std":
+            half = z * self.std / math.sqrt(2 * (self.n - 1))
+            return (self.std - half, self.std + half)
+        # Quantile: the order statistics bracketing `n * q`, plus or minus `z` binomial standard deviations
+        q = float(stat)
+        spread = z * math.sqrt(self.n * q * (1 - q))
+        lo, hi = math.floor(self.n * q - spread), math.ceil(self.n * q + spread)
+        if lo < 0 or hi > self.n - 1:
+            return (-math.inf, math.inf)  # Too few values to bound it
+        return (self.values[lo], self.values[hi])
+
+    def interval(self, stat: Statistic = "mean", z: float = 1.96) -> float:
+        """Half-width of the confidence interval of statistic `stat`, 95% by default"""
+        lo, hi = self.bounds(stat, z)
+        return (hi - lo) / 2
@@ -0,0 +1,188 @@
+"""
+# Simulator Telemetry
+
+Runtime metrics parsed from the Spectre log (its stdout), captured by `sim_runner` alongside every result.
+Stored in the `ResultStore` table `telemetry`, and summarized per testbench and corner.
+"""
+
+# Std-Lib Imports
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Local Imports
+from .result_store import ResultStore, result_store
+
+TABLE = "telemetry"
+
+
+@dataclass
+class SimTelemetry:
+    """# Runtime Metrics of a Single Simulator Run"""
+
+    cpu: Optional[float] = None  # Simulator-reported CPU time (s)
+    elapsed: Optional[float] = None  # Simulator-reported elapsed time (s)
+    # Wall time of the simulator process, measured by us (s)
+    walltime: Optional[float] = None
+    accepted_steps: Optional[int] = None  # Accepted transient time-steps
+    rejected_steps: Optional[int] = None  # Rejected transient time-steps
+    newton_iters: Optional[int] = None  # Newton iterations, summed across analyses
+    nodes: Optional[int] = None  # Circuit nodes
+    equations: Optional[int] = None  # Matrix size
+    peak_memory: Optional[float] = None  # Peak resident memory (bytes)
+    inventory: Dict[str, int] = field(default_factory=dict)  # Device count, per type
+
+
+# Regular expressions for the summary lines of a Spectre log.
+# Spectre prints several "Time accumulated" lines; the last is the total.
+_TIME_ACCUMULATED = re.compile(
+    r"Time accumulated:\s*CPU\s*=\s*([^,]+),\s*elapsed\s*=\s*(.+?)\.?\s*$", re.MULTILINE
+)
+_ACCEPTED = re.compile(r"Number of accepted \w+ steps\s*=\s*(\d+)", re.IGNORECASE)
+_REJECTED = re.compile(r"Number of rejected \w+ steps\s*=\s*(\d+)", re.IGNORECASE)
+_ITERS = re.compile(
+    r"(?:Total number of|Number of Newton)\s+iterations\s*=\s*(\d+)", re.IGNORECASE
+)
+_EQUATIONS = re.compile(r"equations\s*(?:=|:)?\s*(\d+)", re.IGNORECASE)
+_PEAK_MEMORY = re.compile(
+    r"Peak resident memory used\s*=\s*([\d.]+)\s*([kMGT]?)bytes", re.IGNORECASE
+)
+_INVENTORY_LINE = re.compile(r"^\s*(\S+)\s+(\d+)\s*$")
+_DURATION = re.compile(r"([\d.]+)\s*(ms|us|h|m|s)?")
+
+_SECONDS = dict(us=1e-6, ms=1e-3, s=1.0, m=60.0, h=3600.0)
+_BYTES = {"": 1, "k": 1e3, "m": 1e6, "g": 1e9, "t": 1e12}
+
+
+def _seconds(text: str) -> Optional[float]:
+    """Parse a Spectre duration, e.g. `1.2 s`, `12 ms` or `1m 5.3s`."""
+    total, found = 0.0, False
+    for (num, unit) in _DURATION.findall(text):
+        if num in ("", "."):
+            continue
+        total += float(num) * _SECONDS[unit or "s"]
+        found = True
+    return total if found else None
+
+
+def _inventory(log: str) -> Dict[str, int]:
+    """Parse the "Circuit inventory" block, a list of `<type> <count>` lines ending with a blank line."""
+    inventory: Dict[str, int] = dict()
+    lines = iter(log.splitlines())
+    for line in lines:
+        if line.strip().lower().startswith("circuit inventory"):
+            break
+    for line in lines:
+        m = _INVENTORY_LINE.match(line)
+        if m is None:
+            break
+        inventory[m.group(1)] = int(m.group(2))
+    return inventory
+
+
+def parse_log(log: str, walltime: Optional[float] = None) -> SimTelemetry:
+    """Parse `SimTelemetry` from a Spectre log. Metrics not found in `log` are left `None`."""
+
+    tel = SimTelemetry(walltime=walltime)
+
+    times = _TIME_ACCUMULATED.findall(log)
+    if times:
+        cpu, elapsed = times[-1]
+        tel.cpu, tel.elapsed = _seconds(cpu), _seconds(elapsed)
+
+    def total(pattern: re.Pattern) -> Optional[int]:
+        counts = pattern.findall(log)
+        return sum(int(c) for c in counts) if counts else None
+
+    tel.accepted_steps = total(_ACCEPTED)
+    tel.rejected_steps = total(_REJECTED)
+    tel.newton_iters = total(_ITERS)
+
+    mems = _PEAK_MEMORY.findall(log)
+    if mems:
+        tel.peak_memory = max(float(n) * _BYTES[u.lower()] for (n, u) in mems)
+
+    tel.inventory = _inventory(log)
+    tel.nodes = tel.inventory.get("nodes", None)
+    eqns = _EQUATIONS.findall(log)
+    if eqns:
+        tel.equations = int(eqns[-1])
+    return tel
+
+
+def record(
+    tel: SimTelemetry,
+    tb: str,
+    corner: str = "",
+    store: ResultStore = result_store,
+    **extra,
+) -> None:
+    """Record `tel` for testbench `tb` at `corner` in `store`."""
+    store.put(TABLE, dict(tb=tb, corner=corner, **extra, **asdict(tel)))
+
+
+@dataclass
+class TelemetrySummary:
+    """# Telemetry Summary, for a single (testbench, corner) group"""
+
+    tb: str
+    corner: str
+    runs: int
+    cpu_total: float  # Total simulator CPU time (s)
+    cpu_max: float  # Slowest single run's CPU time (s)
+    walltime_total: float
+    accepted_steps: float  # Mean, per run
+    rejected_steps: float  # Mean, per run
+    newton_iters: float  # Mean, per run
+    equations: float  # Mean, per run
+    peak_memory: float  # Max, across runs (bytes)
+
+
+def summarize(records: Iterable[dict]) -> List[TelemetrySummary]:
+    """Summarize telemetry `records` per (testbench, corner), slowest groups first."""
+
+    groups: Dict[Tuple[str, str], List[dict]] = dict()
+    for r in records:
+        groups.setdefault((r["tb"], r["corner"]), []).append(r)
+
+    def vals(rs: List[dict], key: str) -> List[float]:
+        return [r[key] for r in rs if r.get(key, None) is not None]
+
+    def mean(xs: List[float]) -> float:
+        return sum(xs) / len(xs) if xs else float("nan")
+
+    summaries = []
+    for ((tb, corner), rs) in groups.items():
+        cpu = vals(rs, "cpu")
+        summaries.append(
+            TelemetrySummary(
+                tb=tb,
+                corner=corner,
+                runs=len(rs),
+                cpu_total=sum(cpu),
+                cpu_max=max(cpu, default=float("nan")),
+                walltime_total=sum(vals(rs, "walltime")),
+                accepted_steps=mean(vals(rs, "accepted_steps")),
+                rejected_steps=mean(vals(rs, "rejected_steps")),
+                newton_iters=mean(vals(rs, "newton_iters")),
+                equations=mean(vals(rs, "equations")),
+                peak_memory=max(vals(rs, "peak_memory"), default=float("nan")),
+            )
+        )
+    return sorted(summaries, key=lambda s: s.cpu_total, reverse=True)
+
+
+def report(store: ResultStore = result_store, **where) -> List[TelemetrySummary]:
+    """Print a per-testbench, per-corner telemetry summary from `store`."""
+    summaries = summarize(store.records(TABLE, **where))
+    print(
+        f"{'tb':<24} {'corner':<28} {'runs':>5} {'cpu(s)':>10} {'max(s)':>9} "
+        f"{'steps':>9} {'rej':>7} {'newton':>9} {'eqns':>7} {'mem(MB)':>8}"
+    )
+    for s in summaries:
+        print(
+            f"{s.tb[:24]:<24} {s.corner[:28]:<28} {s.runs:>5} {s.cpu_total:>10.1f} {s.cpu_max:>9.1f} "
+            f"{s.accepted_steps:>9.0f} {s.rejected_steps:>7.0f} {s.newton_iters:>9.0f} "
+            f"{s.equations:>7.0f} {s.peak_memory / 1e6:>8.1f}"
+        )
+    return summaries
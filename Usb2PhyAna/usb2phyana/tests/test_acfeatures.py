@@ -0,0 +1,47 @@
+"""
+# AC Response Feature Tests
+"""
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .acfeatures import features
+
+
+def test_features():
+    """Features of known responses: a two-pole amp, a three-pole amp, and a peaking second-order response"""
+    freq = np.logspace(0, 12, 2401)
+    s = 2j * np.pi * freq
+
+    def pole(fp):
+        return 1 / (1 + s / (2 * np.pi * fp))
+
+    two = 1000 * pole(1e3) * pole(1e7)
+    three = 1000 * pole(1e3) * pole(1e6) * pole(1e6)
+    w0, q = 2 * np.pi * 1e6, 2.0
+    peaked = 1 / (1 + s / (q * w0) + (s / w0) ** 2)
+    result = features(freq, np.stack([two, three, peaked]))
+
+    assert np.allclose(result.dc_gain, [60, 60, 0], atol=1e-3)
+    assert abs(result.bw[0] / 1e3 - 1) < 0.01
+    # Unity gain near the gain-bandwidth product, less the second pole's effect
+    assert abs(result.ugbw[0] / 1e6 - 1) < 0.01
+    assert abs(result.phase_margin[0] - (90 - np.degrees(np.arctan(0.1)))) < 0.5
+    # Two poles never reach 180 degrees of lag: no gain margin
+    assert np.isnan(result.gain_margin[0])
+    # The peaking response starts at 0dB, and falls back through it where `(w/w0)^2 = 2 - 1/Q^2`
+    assert abs(result.ugbw[2] / (1e6 * np.sqrt(2 - 1 / q**2)) - 1) < 0.01
+    # A response below unity gain throughout has no unity-gain bandwidth, nor phase margin
+    below = features(freq, 0.5 * pole(1e3))
+    assert np.isnan(below.ugbw[0]) and np.isnan(below.phase_margin[0])
+
+    # Three poles: 180 degrees at the double pole, where the gain is 60dB - 60dB - 6dB
+    assert abs(result.gain_margin[1] - 6.02) < 0.1
+    assert 0 < result.phase_margin[1] < 30
+
+    # Second-order peaking, `Q / sqrt(1 - 1 / 4Q^2)`
+    expected = 20 * np.log10(q / np.sqrt(1 - 1 / (4 * q**2)))
+    assert abs(result.peaking[2] - expected) < 0.05
+    assert np.allclose(result.peaking[:2], 0)
+    assert result.point(0)["dc_gain"] == result.dc_gain[0]
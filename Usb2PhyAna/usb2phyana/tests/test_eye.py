@@ -0,0 +1,74 @@
+"""
+# Eye Diagram Tests
+"""
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .eye import fold, measure, check, crossings, HS_TX_TEMPLATE1, HS_RX_TEMPLATE4
+
+
+def nrz(nbits: int, amplitude: float, trf: float, jitter: float = 0.0, seed: int = 0):
+    """NRZ waveform of random bits, with linear edges of `trf` UIs, and uniform random edge jitter of peak-to-peak `jitter` UIs"""
+    rng = np.random.default_rng(seed)
+    levels = amplitude * (2 * rng.integers(0, 2, nbits) - 1)
+    edges = np.arange(1, nbits) + jitter * (rng.random(nbits - 1) - 0.5)
+    changes = np.flatnonzero(levels[1:] != levels[:-1])
+    t = np.concatenate(
+        [
+            [0],
+            np.stack([edges[changes] - trf / 2, edges[changes] + trf / 2], 1).ravel(),
+            [nbits],
+        ]
+    )
+    v = np.concatenate(
+        [
+            [levels[0]],
+            np.stack([levels[changes], levels[changes + 1]], 1).ravel(),
+            [levels[-1]],
+        ]
+    )
+    return t, v
+
+
+def test_crossings():
+    t = np.array([0.0, 1.0, 2.0, 3.0])
+    v = np.array([-1.0, 1.0, 1.0, -3.0])
+    assert np.allclose(crossings(t, v), [0.5, 2.25])
+    assert np.allclose(crossings(t, v, rising=True), [0.5])
+
+
+def test_clean_eye():
+    """A jitter-free eye is fully open, and passes both USB HS templates"""
+    t, v = nrz(2000, amplitude=0.4, trf=0.1)
+    eye = fold(t, v, ui=1.0)
+    assert abs(eye.t0 % 1) < 1e-6 or abs(eye.t0 % 1 - 1) < 1e-6
+    result = measure(eye)
+    assert abs(result.height - 0.8) < 1e-9
+    assert result.jitter_pp < 1e-9
+    assert abs(result.level1 - 0.4) < 1e-9 and abs(result.level0 + 0.4) < 1e-9
+    assert check(eye, HS_TX_TEMPLATE1).passed
+    assert check(eye, HS_RX_TEMPLATE4).passed
+
+
+def test_jitter():
+    """Edge jitter shows up in the crossing statistics, and the eye width"""
+    t, v = nrz(5000, amplitude=0.4, trf=0.1, jitter=0.2)
+    result = measure(fold(t, v, ui=1.0, osr=128))
+    assert 0.18 < result.jitter_pp <= 0.2
+    assert abs(result.jitter_rms - 0.2 / np.sqrt(12)) < 0.005
+    assert abs(result.width - (1 - result.jitter_pp)) < 1e-9
+
+
+def test_template_failures():
+    """Too small a swing violates the hexagon, and too large a swing the outer limits"""
+    t, v = nrz(500, amplitude=0.25, trf=0.1)
+    small = check(fold(t, v, ui=1.0), HS_TX_TEMPLATE1)
+    assert not small.passed and small.inner_violations > 0 and small.inner_margin < 0
+
+    t, v = nrz(500, amplitude=0.5, trf=0.1)
+    large = check(fold(t, v, ui=1.0), HS_TX_TEMPLATE1)
+    # Only the UIs following a transition get the relaxed outer limit
+    assert not large.passed and large.outer_violations > 0
+    assert large.inner_violations == 0
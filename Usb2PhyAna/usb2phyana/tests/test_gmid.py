@@ -0,0 +1,55 @@
+"""
+# gm/Id Lookup Table Tests
+"""
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .gmid import AXES, Lut, from_sweeps
+
+
+def square_law(vth: float = 0.4, k: float = 1e-3, lam: float = 0.1) -> Lut:
+    """Table of a square-law device, with channel-length modulation decreasing with length"""
+    axes = dict(
+        vgs=np.linspace(0, 1.8, 181),
+        vds=np.linspace(0.2, 1.8, 9),
+        vsb=np.array([0.0, 0.5]),
+        l=np.array([0.15, 0.5, 1.0]),
+    )
+    vgs, vds, vsb, l = np.meshgrid(*(axes[a] for a in AXES), indexing="ij")
+    vov = np.maximum(vgs - vth - 0.2 * vsb, 1e-3)
+    id = k / 2 * vov**2 * (1 + lam / l * vds)
+    cgg = 1e-15 * l * np.ones_like(id)
+    return from_sweeps("sq", "TYP", 1.0, axes, id, cgg)
+
+
+def test_interp(tmp_path):
+    """Interpolation is exact for quantities linear along each axis, vectorized, clamped, and round-trips through save & load"""
+    lut = square_law()
+    vds = np.array([0.3, 0.75, 1.25])
+    l = np.array([[0.2], [0.8]])
+    expected = 1e-15 * np.clip(l, 0.15, 1.0) * np.ones_like(vds)
+    assert np.allclose(lut("cgg", 1.0, vds, 0.25, l), expected)
+    assert lut("cgg", 1.0, vds, 0.25, l).shape == (2, 3)
+    assert np.isclose(lut("cgg", 1.0, 1.0, l=5.0), 1e-15)
+
+    assert lut.save(tmp_path).name == "sq.TYP.25C.npz"
+    loaded = Lut.load(tmp_path, "sq", "TYP")
+    assert loaded.width == lut.width and loaded.corner == "TYP" and loaded.temp == 25
+    assert np.array_equal(loaded("id", 1.0, vds), lut("id", 1.0, vds))
+
+
+def test_at_gmid():
+    """Inverts gm/Id on the strong-inversion side, where square-law gm/Id = 2/Vov"""
+    lut = square_law()
+    vov = np.array([0.1, 0.2, 0.4])
+    gmid = 2 / vov
+    # Derived `vdsat` is the overdrive, and `gds` tracks `id * lam / (l + lam * vds)`
+    assert np.allclose(lut.at_gmid(gmid, "vdsat", vds=0.6, l=0.5), vov, rtol=0.02)
+    id = lut.at_gmid(gmid, "id", vds=0.6, l=0.5)
+    assert np.allclose(id, 1e-3 / 2 * vov**2 * (1 + 0.2 * 0.6), rtol=0.05)
+    gds = lut.at_gmid(gmid, "gds", vds=0.6, l=0.5)
+    assert np.allclose(gds / id, 0.2 / (1 + 0.2 * 0.6), rtol=0.05)
+    # Beyond the peak, or below the grid's strongest inversion: NaN
+    assert np.all(np.isnan(lut.at_gmid([1e4, 0.5], "id", vds=0.6)))
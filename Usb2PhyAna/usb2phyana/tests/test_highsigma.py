@@ -0,0 +1,73 @@
+"""
+# High-Sigma Yield Tests
+"""
+
+import math
+import numpy as np
+from statistics import NormalDist
+
+from .highsigma import SCALES, binomial_upper, fit, sigma_level, tail
+
+
+def q(x: float) -> float:
+    return NormalDist().cdf(-x)
+
+
+def test_fit():
+    """Extrapolate one- and two-sided linear failure limits, 4-6 sigma from nominal, from sampled failure counts at each scale"""
+    rng = np.random.default_rng(0)
+    for multiplicity in (1, 2):
+        for t in (4.0, 5.0, 6.0):
+            runs = [100] * len(SCALES)
+            fails = [rng.binomial(100, multiplicity * q(t / s)) for s in SCALES]
+            truth = multiplicity * q(t)
+            for fixed in (multiplicity, None):
+                est = fit(SCALES, fails, runs, multiplicity=fixed)
+                assert est.lo < truth < est.hi
+            # With its multiplicity known, to within a sigma
+            est = fit(SCALES, fails, runs, multiplicity=multiplicity)
+            assert abs(est.sigma - sigma_level(truth)) < 1.0
+
+
+def test_fit_bound():
+    """Too few failures to fit: an upper bound, which covers the truth, from the binomial bound at each scale"""
+    rng = np.random.default_rng(0)
+    runs = [16] * len(SCALES)
+    for t in (12.0, 15.0):
+        truth = 2 * q(t)
+        covered = []
+        for _ in range(100):
+            fails = [rng.binomial(16, 2 * q(t / s)) for s in SCALES]
+            est = fit(SCALES, fails, runs, multiplicity=2)
+            if est.bounded:
+                assert est.lo == 0 and est.p == est.hi
+                assert "P(fail) <" in str(est)
+                covered.append(truth < est.hi)
+        assert covered and np.mean(covered) > 0.9
+
+    # A single failing scale fits a known multiplicity, but only bounds a fit one
+    fails = [0, 0, 0, 1]
+    assert not fit(SCALES, fails, runs, multiplicity=1).bounded
+    assert fit(SCALES, fails, runs).bounded
+
+
+def test_binomial_upper():
+    # No occurrences: `1 - alpha ** (1 / n)`
+    assert np.isclose(binomial_upper(0, 100, 0.025), 1 - 0.025 ** (1 / 100))
+    assert binomial_upper(100, 100, 0.025) == 1.0
+    # Bounds grow with occurrences, and exceed the observed rate
+    bounds = [binomial_upper(k, 100, 0.025) for k in range(5)]
+    assert all(np.diff(bounds) > 0)
+    assert all(b > k / 100 for (k, b) in enumerate(bounds))
+
+
+def test_tail():
+    assert np.isclose(tail(2.0), math.log(q(2.0)))
+    assert np.isclose(
+        tail(30.0), -(30.0**2) / 2 - math.log(30 * math.sqrt(2 * math.pi)), rtol=1e-3
+    )
+
+
+def test_sigma_level():
+    assert np.isclose(sigma_level(q(4.5)), 4.5)
+    assert sigma_level(0.0) == np.inf
@@ -0,0 +1,72 @@
+"""
+# Import-Time Tests
+
+Check that importing our packages stays fast, and defers the heavy stuff -
+the PDK and its cell library, and plotting - until used.
+Each import is measured in a fresh interpreter, as every test (and every pytest-xdist worker) pays for it.
+"""
+
+# Std-Lib Imports
+import sys, json, subprocess
+from pathlib import Path
+from typing import List, Tuple
+
+# PyPi Imports
+import pytest
+
+# The directory from which `usb2phyana` and `serdes_generics` are importable
+root = Path(__file__).parent.parent.parent
+
+
+def collected_test_modules() -> List[str]:
+    """The dotted names of every test module pytest collects from our packages"""
+    paths = sorted(
+        path.relative_to(root)
+        for package in ("usb2phyana", "serdes_generics")
+        for path in (root / package).rglob("test_*.py")
+    )
+    return [".".join(path.with_suffix("").parts) for path in paths]
+
+
+# Import-time budgets, in seconds, per module
+BUDGETS = {
+    "usb2phyana": 3.0,
+    "usb2phyana.tests.sim_test_mode": 3.0,
+    "serdes_generics.cmlparams": 3.0,
+}
+# Budget for each collected test module, which generally imports circuits and testbench helpers too
+TEST_MODULE_BUDGET = 5.0
+BUDGETS.update({module: TEST_MODULE_BUDGET for module in collected_test_modules()})
+
+# Modules which should not be loaded by importing any of the above
+DEFERRED = ["s130", "sitepdks", "matplotlib"]
+
+
+def import_time(module: str) -> Tuple[float, List[str]]:
+    """Import `module` in a fresh interpreter. Returns its import time, and the names of all loaded modules."""
+    code = f"""
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps(dict(elapsed=elapsed, modules=sorted(sys.modules))))
+"""
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=root, capture_output=True, check=True
+    )
+    result = json.loads(proc.stdout.decode().splitlines()[-1])
+    return result["elapsed"], result["modules"]
+
+
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_import_time(module: str):
+    """Test `module` imports within its budget, and without loading `DEFERRED` modules"""
+
+    budget = BUDGETS[module]
+    elapsed, modules = import_time(module)
+    print(f"{module}: {elapsed:.3f}s")
+
+    loaded = {m.split(".")[0] for m in modules}
+    eager = [d for d in DEFERRED if d in loaded]
+    assert not eager, f"Importing {module} eagerly loads {eager}"
+    assert elapsed < budget, f"Importing {module} took {elapsed:.3f}s"
@@ -0,0 +1,38 @@
+"""
+# Clock Jitter Tests
+"""
+
+import numpy as np
+
+from .jitter import measure, phase_noise
+
+# Nominal frequency, and RMS white period jitter
+F0 = 480e6
+SIGMA = 1e-12
+
+
+def free_running(nedges: int, seed: int = 0) -> np.ndarray:
+    """Edge times of a free-running clock with white period jitter: a random walk of its phase"""
+    rng = np.random.default_rng(seed)
+    periods = 1 / F0 + SIGMA * rng.standard_normal(nedges - 1)
+    return np.concatenate([[0], np.cumsum(periods)])
+
+
+def test_measure():
+    edges = free_running(100_000)
+    result = measure(edges, lags=(1, 100))
+    assert np.isclose(result.freq, F0, rtol=1e-4)
+    assert np.isclose(result.period, SIGMA, rtol=0.02)
+    # Successive differences of white periods: sqrt(2) larger
+    assert np.isclose(result.cycle, np.sqrt(2) * SIGMA, rtol=0.02)
+    # Accumulated jitter grows with the square root of its span
+    assert np.isclose(result.accumulated[0], SIGMA, rtol=0.02)
+    assert np.isclose(result.accumulated[1], 10 * SIGMA, rtol=0.05)
+
+
+def test_phase_noise():
+    """White period jitter is white FM: `L(f) = SIGMA^2 * F0^3 / f^2`"""
+    f, L = phase_noise(free_running(2**16), nseg=16)
+    band = (f > 1e6) & (f < 20e6)
+    expected = 10 * np.log10(SIGMA**2 * F0**3 / f[band] ** 2)
+    assert abs(np.mean(L[band] - expected)) < 1.0
@@ -0,0 +1,52 @@
+"""
+# Dac Linearity Tests
+"""
+
+from types import SimpleNamespace as NS
+
+import numpy as np
+
+from .linearity import Limits, analyze, frequency_linearity
+
+
+def test_analyze():
+    codes = np.arange(32)
+    ideal = 2.0 + 0.5 * codes
+    # A major-carry error at code 16, a decreasing Dac, and one with a failed point
+    carry = ideal + np.where(codes >= 16, -0.75, 0.0)
+    values = np.stack([ideal, carry, ideal[::-1], np.where(codes == 7, np.nan, ideal)])
+    lin = analyze(values, codes, ["ideal", "carry", "decreasing", "failed"])
+
+    assert np.allclose(lin.lsb, [0.5, (17.5 - 0.75 - 2.0) / 31, -0.5, 0.5])
+    assert np.allclose(lin.gain[[0, 2, 3]], [0.5, -0.5, 0.5])
+    assert np.allclose(lin.offset[[0, 3]], 2.0)
+    assert np.allclose(lin.max_dnl[[0, 2, 3]], 0.0)
+    assert np.allclose(lin.max_inl_fit[[0, 2, 3]], 0.0)
+
+    # The carry steps back by half an LSB
+    assert np.isclose(lin.dnl[1, 15], (0.5 - 0.75) / lin.lsb[1] - 1)
+    assert lin.nonmonotonic[1, 15] and lin.nonmonotonic.sum() == 1
+    assert np.isnan(lin.dnl[3, 6]) and np.isnan(lin.inl[3, 7])
+
+    assert list(lin.failing(Limits())) == [False, True, False, False]
+    assert lin.worst()["nonmonotonic"] == "carry"
+    assert np.allclose(lin.lo, [2.0, 2.0, 2.0, 2.0])
+    assert "1 of 4 conditions fail" in lin.report()
+
+
+def test_analyze_invalid():
+    """Conditions with too few valid points fail, rather than raising"""
+    values = np.array([[np.nan] * 8, [1.0] + [np.nan] * 7])
+    lin = analyze(values)
+    assert lin.failing().all()
+    assert np.isnan(lin.lsb).all()
+
+
+def test_frequency_linearity():
+    """Code sweeps' invalid points are excluded, per condition"""
+    summaries = [NS(freq=100.0 + 10 * code, valid=code != 2) for code in range(4)]
+    result = NS(codes=[0, 1, 2, 3], cond_results=[NS(cond="typ", summaries=summaries)])
+    lin = frequency_linearity(result)
+    assert lin.conditions == ["typ"]
+    assert np.isnan(lin.values[0, 2])
+    assert np.isclose(lin.lsb[0], 10.0)
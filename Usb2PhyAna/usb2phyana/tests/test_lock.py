@@ -0,0 +1,47 @@
+"""
+# Injection Lock Detection Tests
+"""
+
+import numpy as np
+
+from .lock import LockState, phase, classify
+
+
+# Reference period, and oscillator cycles per reference period
+T = 1.0
+N = 8
+
+
+def oscillator(freq: float, nref: int = 200, settle: float = 0.0) -> np.ndarray:
+    """Edge times of an oscillator at `freq`, plus an initial phase error decaying with time-constant `settle`"""
+    t = np.arange(int(nref * T * freq)) / freq
+    if settle:
+        t = t + 0.3 / freq * np.exp(-t / settle)
+    return t
+
+
+def test_locked():
+    ref = T * np.arange(200)
+    t, phi = phase(oscillator(N / T, settle=10 * T), ref, N)
+    assert len(t) == 199
+    result = classify(t, phi)
+    assert result.state == LockState.LOCKED
+    # An initial error of 0.3 cycles settles within 0.05 after ln(6) time-constants
+    assert 17 * T <= result.lock_time <= 19 * T
+
+
+def test_unlocked():
+    ref = T * np.arange(200)
+    result = classify(*phase(oscillator(1.01 * N / T), ref, N))
+    assert result.state == LockState.UNLOCKED
+    assert np.isnan(result.lock_time)
+    # Slipping 0.08 cycles per reference period
+    assert np.isclose(result.drift, 15 * 0.08, rtol=0.01)
+
+
+def test_unknown():
+    ref = T * np.arange(200)
+    assert (
+        classify(*phase(oscillator(1.001 * N / T), ref, N)).state == LockState.UNKNOWN
+    )
+    assert classify(*phase(oscillator(N / T), ref[:10], N)).state == LockState.UNKNOWN
@@ -0,0 +1,88 @@
+"""
+# Pole-Zero Macromodel Tests
+"""
+
+import io
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+
+# Local Imports
+from .macromodel import Macro, Rational, vectfit, rms_error, _macro, _record
+
+
+def amp(freq: np.ndarray) -> np.ndarray:
+    """A 60dB amp with a 1kHz dominant pole, a resonant pair at 100MHz, and a left-half-plane zero at 1GHz"""
+    s = 2j * np.pi * freq
+    w0 = 2 * np.pi * 100e6
+    return (
+        1000
+        * (1 + s / (2 * np.pi * 1e9))
+        / (1 + s / (2 * np.pi * 1e3))
+        / (1 + s / (0.7 * w0) + (s / w0) ** 2)
+    )
+
+
+def test_vectfit():
+    """Recovers the poles and response of a known amp, and its state-space realization matches"""
+    freq = np.logspace(0, 12, 241)
+    resp = amp(freq)
+    model = vectfit(freq, resp, npoles=3)
+
+    assert rms_error(model, freq, resp) < 1e-6
+    expected = np.sort_complex(
+        np.concatenate(
+            [
+                [-2 * np.pi * 1e3],
+                np.roots([1, 2 * np.pi * 100e6 / 0.7, (2 * np.pi * 100e6) ** 2]),
+            ]
+        )
+    )
+    assert np.allclose(np.sort_complex(model.poles), expected, rtol=1e-6)
+
+    A, B, C, D = model.state_space()
+    s = 2j * np.pi * freq
+    ss = np.array([C @ np.linalg.solve(si * np.eye(3) - A, B) + D for si in s])
+    assert np.allclose(ss, model(freq), rtol=1e-9)
+
+    # Records round-trip
+    again = _macro(_record(Macro(model=model, in_dc=0.9, out_dc=0.5, rms=0.0))).model
+    assert np.allclose(again(freq), model(freq))
+
+
+def test_macro_module():
+    """Realizations are pin-compatible with the modeled block, and netlist"""
+
+    @h.module
+    class Amp:
+        VDD, VSS = h.Ports(2)
+        inp = h.Diff(port=True, role=h.Diff.Roles.SINK)
+        out = h.Diff(port=True, role=h.Diff.Roles.SOURCE)
+        pbias = h.Input()
+
+    model = Rational(
+        poles=np.array([-1e4, complex(-1e8, 5e8), complex(-1e8, -5e8)]),
+        residues=np.array([1e7, complex(1e8, 2e8), complex(1e8, -2e8)]),
+        d=0.0,
+    )
+    macro = Macro(model=model, in_dc=0.0, out_dc=1.2, rms=0.0)
+    module = macro.module(like=Amp, inp="inp", out="out")
+
+    assert module.name == "AmpMacro"
+    assert list(module.ports) == list(Amp.ports)
+    assert list(module.bundle_ports) == list(Amp.bundle_ports)
+    # Three states, and no instances for zero-valued matrix entries
+    assert len([i for i in module.instances if i.startswith("c")]) == 3
+    assert "gd" not in module.instances
+
+    @h.module
+    class Tb:
+        VSS = h.Port()
+        VDD, pbias = h.Signals(2)
+        inp, out = h.Diff(), h.Diff()
+        dut = module(VDD=VDD, VSS=VSS, inp=inp, out=out, pbias=pbias)
+
+    h.netlist(Tb, dest=io.StringIO(), fmt="spice")
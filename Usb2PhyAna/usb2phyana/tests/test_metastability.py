@@ -0,0 +1,38 @@
+"""
+# Decision Time & Metastability Tests
+"""
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .metastability import decision_times, fit_tau
+
+
+def test_decision_times():
+    """Delays to each flip of a latch output, and NaN for a decision which never resolves"""
+    edges = np.array([2e-9, 4e-9, 6e-9, 8e-9])
+    flips = edges + np.array([100e-12, 250e-12, np.inf, 400e-12])
+    t = np.linspace(0, 10e-9, 10001)
+    # Output flips polarity at each finite flip time, starting negative
+    nflips = np.sum(t[:, None] >= flips[None, :], axis=1)
+    v = np.where(nflips % 2, 1.0, -1.0)
+    delays = decision_times(t, v, edges, window=1e-9)
+    assert np.allclose(delays[[0, 1, 3]], [100e-12, 250e-12, 400e-12], atol=2e-12)
+    assert np.isnan(delays[2])
+
+
+def test_fit_tau():
+    """Recovers tau and sensitivity from a regenerative delay curve, excluding its large-signal region"""
+    tau, t0 = 50e-12, 100e-12
+    vd = np.logspace(-6, -1, 11)
+    delay = t0 - tau * np.log(vd)
+    # Large inputs saturate at a minimum delay, and the smallest never resolves
+    delay = np.where(vd > 10e-3, t0 - tau * np.log(10e-3), delay)
+    delay[0] = np.nan
+    fit = fit_tau(vd, delay, vmax=20e-3)
+    assert abs(fit.tau / tau - 1) < 1e-6
+    assert abs(fit.t0 / t0 - 1) < 1e-6
+    assert fit.r2 > 0.999 and fit.npoints == 8
+    assert abs(fit.sensitivity(fit.delay(1e-5)) / 1e-5 - 1) < 1e-6
+    assert np.isnan(fit_tau(vd[:1], delay[:1]).tau)
@@ -0,0 +1,126 @@
+"""
+# Mismatch Variant Tests
+"""
+
+import io
+from typing import List
+
+import numpy as np
+import pytest
+import hdl21 as h
+from hdl21.prefix import µ
+
+from .mismatch import pelgrom, variant
+
+
+@h.paramclass
+class MosParams:
+    w = h.Param(dtype=float, desc="Width (µm)")
+    l = h.Param(dtype=float, desc="Length (µm)")
+    mult = h.Param(dtype=int, desc="Multiplier", default=1)
+
+
+Mos = h.ExternalModule(
+    name="mos",
+    port_list=[h.Port(name=name) for name in "dgsb"],
+    paramtype=MosParams,
+)
+
+
+@h.module
+class Inv:
+    i = h.Input()
+    z = h.Output()
+    VDD, VSS = h.Ports(2)
+    n = Mos(w=4, l=1)(g=i, d=z, s=VSS, b=VSS)
+    p = Mos(w=1, l=1, mult=4)(g=i, d=z, s=VDD, b=VDD)
+
+
+@h.module
+class Ring:
+    VDD, VSS = h.Ports(2)
+    stg = h.Signal(width=3)
+    i0 = Inv(i=stg[0], z=stg[1], VDD=VDD, VSS=VSS)
+    i1 = Inv(i=stg[1], z=stg[2], VDD=VDD, VSS=VSS)
+    i2 = Inv(i=stg[2], z=stg[0], VDD=VDD, VSS=VSS)
+
+
+@h.module
+class RingTb:
+    VSS = h.Port()
+    VDD = h.Signal()
+    vvdd = h.Vdc(dc=1.8)(p=VDD, n=VSS)
+    ring = Ring(VDD=VDD, VSS=VSS)
+
+
+@h.generator
+def GenericPair(_: h.HasNoParams) -> h.Module:
+    """Pair of generic, SI-sized `h.Mos` devices, of 4µm^2 total area each, behind a generator"""
+
+    @h.module
+    class GenericPair:
+        VSS = h.Port()
+        a, b = h.Signals(2)
+        n = h.Nmos(w=2 * µ, l=2 * µ)(d=a, g=b, s=VSS, b=VSS)
+        p = h.Pmos(w=1 * µ, l=2 * µ, npar=2)(d=b, g=a, s=VSS, b=VSS)
+
+    return GenericPair
+
+
+@h.module
+class GenericTb:
+    VSS = h.Port()
+    pair = GenericPair()(VSS=VSS)
+
+
+def offsets(module: h.Module) -> List[float]:
+    """Offset voltages of every gate-offset source below `module`"""
+    vos = []
+    for inst in module.instances.values():
+        if isinstance(inst.of, h.GeneratorCall):
+            vos += offsets(inst.of.result)
+        elif isinstance(inst.of, h.Module):
+            vos += offsets(inst.of)
+        elif inst.name.endswith("_vos"):
+            vos.append(float(inst.of.params.dc))
+    return vos
+
+
+def test_variant():
+    tb = variant(RingTb, seed=1)
+    assert tb.name == "RingTb"
+    assert list(tb.ports) == ["VSS"]
+    h.netlist(tb, dest=io.StringIO())
+
+    # One offset per transistor, unique per instance and repeatable per seed
+    vos = offsets(tb)
+    assert len(vos) == 6
+    assert len(set(vos)) == 6
+    assert offsets(variant(RingTb, seed=1)) == vos
+    assert offsets(variant(RingTb, seed=2)) != vos
+
+    # The original is unmodified
+    assert not offsets(RingTb)
+    assert len(Inv.instances) == 2
+
+
+def test_pelgrom():
+    vos = np.array([offsets(variant(RingTb, seed)) for seed in range(300)])
+    # Both devices have an area of 4 µm^2, for a sigma of half `avt`
+    assert np.isclose(vos.std(), 0.5 * 5e-3, rtol=0.05)
+    assert pelgrom()(RingTb.instances["vvdd"]) is None
+
+
+def test_generic():
+    """Generic `h.Mos` devices within generated modules vary, with meter-valued sizes; those unsized are an error"""
+    vos = np.array([offsets(variant(GenericTb, seed)) for seed in range(300)])
+    assert vos.shape == (300, 2)
+    assert np.isclose(vos.std(), 0.5 * 5e-3, rtol=0.05)
+
+    @h.module
+    class Unsized:
+        VSS = h.Port()
+        n = h.Nmos()(d=VSS, g=VSS, s=VSS, b=VSS)
+
+    with pytest.raises(ValueError):
+        variant(Unsized, seed=0)
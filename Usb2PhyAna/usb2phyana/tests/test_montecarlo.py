@@ -0,0 +1,16 @@
+"""
+# Monte Carlo Tests
+"""
+
+# Local Imports
+from .montecarlo import Target
+
+
+def test_abort():
+    """Aborts on a streak of failures, or a failing majority once `min_runs` have completed"""
+    target = Target(min_runs=16, max_streak=8, max_failed=0.5)
+    assert target.abort(completed=7, failed=7, streak=7) == ""
+    assert target.abort(completed=8, failed=8, streak=8) == "8 consecutive failures"
+    assert target.abort(completed=15, failed=10, streak=1) == ""
+    assert target.abort(completed=16, failed=8, streak=1) == ""
+    assert target.abort(completed=16, failed=9, streak=1) == "9 of 16 runs failed"
@@ -0,0 +1,125 @@
+"""
+# Device Operating Point Tests
+"""
+
+# Std-Lib Imports
+import os
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+from hdl21.pdk import Corner
+from hdl21.prefix import m, µ
+
+# Local Imports
+from .gmid import AXES, from_sweeps
+from .oppoint import Rule, devices, generic, oppoints, report, tetris, violations
+from .oppoint import missing_tables, tables
+from ..tetris.mos import Pmos
+
+
+@h.module
+class Mirror:
+    """Nmos mirror with two outputs, each a unit of a device array"""
+
+    VSS, iin = h.Ports(2)
+    out = h.Port(width=2)
+    mirror_base = h.Nmos(w=1 * µ, l=500 * m * µ)
+    diode = mirror_base(d=iin, g=iin, s=VSS, b=VSS)
+    outs = 2 * mirror_base(d=out, g=iin, s=VSS, b=VSS)
+
+
+@h.module
+class Tb:
+    VSS = h.Port()
+    iin, VDD = h.Signals(2)
+    out = h.Signal(width=2)
+    mirror = Mirror(iin=iin, out=out, VSS=VSS)
+    load = Pmos(nser=2, npar=3)(d=out[0], g=VSS, s=VDD, VDD=VDD, VSS=VSS)
+
+
+def test_devices():
+    """Finds transistors through hierarchy, arrays and bus slices, and treats Tetris stacks as single devices"""
+    found = {mos.path: mos for mos in devices(Tb, catalogs=[tetris, generic])}
+    paths = [
+        "xtop.mirror.diode",
+        "xtop.mirror.outs_0",
+        "xtop.mirror.outs_1",
+        "xtop.load",
+    ]
+    assert sorted(found) == sorted(paths)
+    assert found["xtop.mirror.outs_1"].nodes == ["xtop.out_1", "xtop.iin", "0", "0"]
+    assert found["xtop.mirror.diode"].leaf.table == "nmos"
+    assert np.isclose(found["xtop.mirror.diode"].leaf.l, 0.5)
+    load = found["xtop.load"]
+    assert load.leaf.table == "tetris_pmos" and load.leaf.l == 2
+    assert np.isclose(load.leaf.width, 3 * 1.26)
+    assert load.nodes == ["xtop.out_0", "0", "xtop.VDD", "xtop.VDD"]
+
+
+def test_missing_tables(tmp_path):
+    """Lists the tables, per device flavor, corner and temperature, not yet built"""
+    mos = devices(Tb, catalogs=[tetris, generic])
+    (tmp_path / "nmos.TYP.25C.npz").touch()
+    corners = [(Corner.TYP, 25), (Corner.TYP, 75), (Corner.FAST, 25)]
+    missing = missing_tables(mos, corners, tmp_path)
+    assert missing == [
+        "nmos.FAST.25C.npz",
+        "nmos.TYP.75C.npz",
+        "tetris_pmos.FAST.25C.npz",
+        "tetris_pmos.TYP.25C.npz",
+        "tetris_pmos.TYP.75C.npz",
+    ]
+
+
+def test_tables_reload(tmp_path):
+    """Tables load per corner and temperature, and those rebuilt within a process are reloaded, not served from cache"""
+    axes = dict(
+        vgs=np.linspace(0, 1.8, 3),
+        vds=np.linspace(0, 1.8, 3),
+        vsb=np.array([0.0]),
+        l=np.array([0.5]),
+    )
+    zeros = np.zeros([len(axes[a]) for a in AXES])
+    fname = from_sweeps("nmos", "TYP", 1.0, axes, zeros, zeros).save(tmp_path)
+    from_sweeps("nmos", "TYP", 3.0, axes, zeros, zeros, temp=75).save(tmp_path)
+    load = tables(tmp_path)
+    assert load("nmos", (Corner.TYP, 25)).width == 1.0
+    assert load("nmos", (Corner.TYP, 75)).width == 3.0
+    from_sweeps("nmos", "TYP", 2.0, axes, zeros, zeros).save(tmp_path)
+    os.utime(fname, ns=(0, os.stat(fname).st_mtime_ns + 1))
+    assert load("nmos", (Corner.TYP, 25)).width == 2.0
+
+
+def test_violations():
+    """Margins from a square-law table, flagged per rule, with the last matching rule applying"""
+    axes = dict(
+        vgs=np.linspace(0, 1.8, 181),
+        vds=np.linspace(0, 1.8, 19),
+        vsb=np.array([0.0]),
+        l=np.array([0.5, 1.0]),
+    )
+    vgs, vds, _, _ = np.meshgrid(*(axes[a] for a in AXES), indexing="ij")
+    vov = np.maximum(vgs - 0.4, 1e-3)
+    triode = np.where(vds < vov, 2 * vov * vds - vds**2, vov**2)
+    id = 1e-4 * triode * (1 + 0.05 * vds)
+    lut = from_sweeps("nmos", "TYP", 1.0, axes, id, np.zeros_like(id))
+
+    # Without the Tetris catalog, the stack's units are found too; keep only the mirror
+    mos = [m for m in devices(Tb, catalogs=[generic]) if ".mirror." in m.path]
+    # Diode at 0.7V; outputs at 0.6V and 0.1V
+    volts = {"xtop.iin": 0.7, "xtop.out_0": 0.6, "xtop.out_1": 0.1}
+    ops = oppoints(mos, [volts], ["typ"], lambda _: (Corner.TYP, 25), lambda *_: lut)
+    data = {mos.path: ops.data[i, 0] for (i, mos) in enumerate(ops.devices)}
+    assert np.isclose(data["xtop.mirror.diode"]["vdsat"], 0.3, rtol=0.05)
+    assert data["xtop.mirror.outs_0"]["region"] == "sat"
+    assert data["xtop.mirror.outs_1"]["region"] == "triode"
+    assert np.isclose(data["xtop.mirror.outs_0"]["id"], 1e-4 * 0.09 * 1.03, rtol=0.05)
+
+    found = violations(ops, [Rule(margin=0.1), Rule(margin=-np.inf, paths="*outs_1")])
+    assert found == []
+    found = violations(ops, [Rule(margin=0.35)])
+    assert sorted(v.path for v in found) == ["xtop.mirror.outs_0", "xtop.mirror.outs_1"]
+    assert "2 violations, by 2 devices" in report(found)
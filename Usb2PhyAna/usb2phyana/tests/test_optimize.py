@@ -0,0 +1,87 @@
+"""
+# Design Optimization Tests
+"""
+
+# Local Imports
+from .result_store import ResultStore
+from .optimize import Constraint, Range, cached, optimize
+
+
+def test_range():
+    """Grid snapping, within bounds, and geometric spacing"""
+    r = Range(lo=2, hi=20, step=4)
+    assert [r.value(u) for u in (-1, 0, 0.5, 1, 2)] == [2, 2, 10, 18, 18]
+    r = Range(lo=1e-15, hi=1e-13, log=True)
+    assert abs(r.value(0.5) - 1e-14) < 1e-20
+    assert abs(r.unit(1e-14) - 0.5) < 1e-9
+
+
+def test_optimize(tmp_path):
+    """Finds the constrained optimum of a known function, caching repeated points, across runs"""
+    store = ResultStore(tmp_path)
+    evaluated = []
+
+    def evaluate(points):
+        evaluated.extend(points)
+        # "Power" grows with width and current. "Frequency" grows with current, and falls with width.
+        return [
+            dict(power=p["w"] + 2 * p["ib"], freq=p["ib"] * 10 / p["w"]) for p in points
+        ]
+
+    space = dict(w=Range(lo=1, hi=16, step=1), ib=Range(lo=1, hi=100, step=1))
+    constraints = [Constraint("freq", lo=20)]
+    kwargs = dict(
+        space=space,
+        objective="power",
+        constraints=constraints,
+        batch=16,
+        generations=30,
+    )
+    result = optimize(cached(evaluate, "test", store), **kwargs)
+
+    # The optimum is the smallest width, and the smallest current meeting the frequency constraint
+    assert result.best.feasible
+    assert result.best.point == dict(w=1, ib=2)
+    # Only distinct points are evaluated
+    assert len(evaluated) == len(result.history)
+    assert len(result.history) < 30 * 16
+
+    # Re-running with the same seed takes every point from the store
+    count = len(evaluated)
+    again = optimize(cached(evaluate, "test", store), **kwargs)
+    assert again.best.point == result.best.point
+    assert len(evaluated) == count
+
+
+def test_cached_context(tmp_path):
+    """Points evaluated in one context are not reused in another"""
+    store = ResultStore(tmp_path)
+    evaluated = []
+
+    def evaluate(points):
+        evaluated.extend(points)
+        return [dict(power=p["w"]) for p in points]
+
+    point = dict(w=1)
+    cached(evaluate, "test", store, context="TT 27C")([point])
+    cached(evaluate, "test", store, context="TT 27C")([point])
+    assert len(evaluated) == 1
+    cached(evaluate, "test", store, context="SS 75C")([point])
+    assert len(evaluated) == 2
+
+
+def test_cached_incomplete(tmp_path):
+    """Failed evaluations are retried, rather than recorded"""
+    store = ResultStore(tmp_path)
+    evaluated = []
+
+    def evaluate(points):
+        evaluated.extend(points)
+        fail = len(evaluated) == 1
+        return [dict(power=float("nan") if fail else p["w"]) for p in points]
+
+    point = dict(w=1)
+    assert cached(evaluate, "test", store)([point])[0]["power"] != 1
+    assert cached(evaluate, "test", store)([point]) == [dict(power=1)]
+    assert cached(evaluate, "test", store)([point]) == [dict(power=1)]
+    assert len(evaluated) == 2
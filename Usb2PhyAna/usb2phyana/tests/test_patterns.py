@@ -0,0 +1,91 @@
+"""
+# Bit Pattern Tests
+"""
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .patterns import (
+    prbs,
+    Pid,
+    crc16,
+    crc5,
+    lsb_first,
+    bit_stuff,
+    nrzi,
+    hs_packet,
+    hs_packets,
+    align,
+    first_error,
+)
+
+
+def test_prbs():
+    """Each PRBS has period `2^n - 1`, with one more one than zeros per period"""
+    for order in (7, 15):
+        period = 2**order - 1
+        s = prbs(order, 2 * period)
+        assert np.array_equal(s[:period], s[period:])
+        assert s[:period].sum() == 2 ** (order - 1)
+        # And no shorter period
+        assert not np.array_equal(s[: period // 2], s[period // 2 : 2 * (period // 2)])
+    # Seven zeros never occur in PRBS7, but seven ones do
+    s = "".join(map(str, prbs(7, 127 + 7)))
+    assert "0" * 7 not in s and "1" * 7 in s
+    # Block-wise generation matches the recurrence, bit by bit
+    s = prbs(31, 1000)
+    full = np.concatenate([np.ones(31, dtype=np.uint8), s])
+    assert np.array_equal(full[31:], full[:-31] ^ full[3:-28])
+
+
+def test_crcs():
+    """The standard CRC-16/USB and CRC-5/USB check values"""
+    assert crc16(b"123456789") == 0xB4C8
+    assert crc5(lsb_first(b"123456789")) == 0x19
+
+
+def test_bit_stuff():
+    bits = np.array([1] * 6 + [1] * 7 + [0, 1, 1])
+    stuffed = bit_stuff(bits)
+    assert stuffed.tolist() == [1] * 6 + [0] + [1] * 6 + [0] + [1, 0, 1, 1]
+
+
+def test_nrzi():
+    assert nrzi(np.array([0, 0, 1, 1, 0])).tolist() == [0, 1, 1, 1, 0]
+    assert nrzi(np.array([1, 0]), initial=0).tolist() == [0, 1]
+
+
+def test_hs_packet():
+    """A High-Speed ACK: SYNC, PID, EOP"""
+    line = hs_packet(Pid.ACK)
+    assert len(line) == 32 + 8 + 8
+    # SYNC is KJKJ...KJKK, starting from J
+    assert line[:32].tolist() == [-1, 1] * 15 + [-1, -1]
+    # EOP ends on seven un-toggled UIs
+    assert len(set(line[-7:].tolist())) == 1
+
+    # Data packets carry their payload and CRC16, stuffed.
+    # Stuffing limits the line to seven equal UIs, everywhere but the EOP.
+    data = hs_packet(Pid.DATA0, b"\xff" * 4)
+    assert len(data) > 32 + 8 + 32 + 16 + 8
+    changes = np.flatnonzero(np.diff(data[:-8]))
+    assert np.diff(changes).max() <= 7
+
+    stream = hs_packets([line, data], idle=4, lead=2)
+    assert len(stream) == 2 + len(line) + 4 + len(data) + 4
+    assert np.all(stream[:2] == 0)
+
+
+def test_bit_compare():
+    """Aligning received bits by lag and polarity, and finding the first error"""
+    tx = prbs(7, 300)
+    rx = np.concatenate([np.zeros(5, dtype=np.uint8), 1 - tx])
+    lag, inverted = align(rx, tx, maxlag=16)
+    assert (lag, inverted) == (5, True)
+    assert first_error(rx, tx, lag, inverted) is None
+
+    rx[5 + 123] ^= 1
+    assert first_error(rx, tx, lag, inverted) == 123
+    # Bits never received are errors too
+    assert first_error(rx[:100], tx, lag, inverted) == 95
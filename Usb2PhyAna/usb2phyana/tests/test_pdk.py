@@ -3,7 +3,6 @@ from dataclasses import dataclass, replace
 
 # PyPi Imports
 import numpy as np
-import matplotlib.pyplot as plt
 
 # HDL Imports
 import hdl21 as h
@@ -14,19 +13,16 @@ from hdl21.prefix import m, µ, UNIT
 from hdl21.primitives import MosType, Vdc, Nmos, Pmos
 
 # PDK Imports
-import sitepdks as _
-import s130
-from s130 import MosParams, IoMosParams
+from ..pdk import s130
 
 # Local Imports
 from .sim_options import sim_options
 from ..tests.sim_test_mode import SimTestMode
+from . import gmid
+from ..pvt import TEMPERATURES
 
-nmos = s130.modules.nmos
-nmos_lvt = s130.modules.nmos_lvt
-pmos = s130.modules.pmos
-pmos_hvt = s130.modules.pmos_hvt
-pmos_v5 = s130.modules.pmos_v5
+# Gate-voltage step of I-V sweeps
+VGS_STEP = 10 * m
 
 
 def test_pdk(simtestmode: SimTestMode):
@@ -39,11 +35,11 @@ def test_pdk(simtestmode: SimTestMode):
         VDD = h.Signal()
         v = Vdc(dc=1800 * m)(p=VDD, n=VSS)
 
-        inmos = nmos(MosParams())(d=VDD, g=VDD, s=VSS, b=VSS)
-        inmos_lvt = nmos_lvt(MosParams())(d=VDD, g=VDD, s=VSS, b=VSS)
-        ipmos = pmos(MosParams())(d=VSS, g=VSS, s=VDD, b=VDD)
-        ipmos_hvt = pmos_hvt(MosParams())(d=VSS, g=VSS, s=VDD, b=VDD)
-        ipmos_v5 = pmos_v5(IoMosParams())(d=VSS, g=VSS, s=VDD, b=VDD)
+        inmos = s130.modules.nmos(s130.MosParams())(d=VDD, g=VDD, s=VSS, b=VSS)
+        inmos_lvt = s130.modules.nmos_lvt(s130.MosParams())(d=VDD, g=VDD, s=VSS, b=VSS)
+        ipmos = s130.modules.pmos(s130.MosParams())(d=VSS, g=VSS, s=VDD, b=VDD)
+        ipmos_hvt = s130.modules.pmos_hvt(s130.MosParams())(d=VSS, g=VSS, s=VDD, b=VDD)
+        ipmos_v5 = s130.modules.pmos_v5(s130.IoMosParams())(d=VSS, g=VSS, s=VDD, b=VDD)
 
     if simtestmode == SimTestMode.NETLIST:
         h.netlist(Tb, dest=io.StringIO())
@@ -95,11 +91,11 @@ def test_iv(simtestmode: SimTestMode):
         return  # Nothing to do here
 
     duts = [
-        MosDut(nmos(MosParams()), MosType.NMOS),
-        MosDut(nmos_lvt(MosParams()), MosType.NMOS),
-        MosDut(pmos(MosParams()), MosType.PMOS),
-        MosDut(pmos_hvt(MosParams()), MosType.PMOS),
-        MosDut(pmos_v5(IoMosParams()), MosType.PMOS),
+        MosDut(s130.modules.nmos(s130.MosParams()), MosType.NMOS),
+        MosDut(s130.modules.nmos_lvt(s130.MosParams()), MosType.NMOS),
+        MosDut(s130.modules.pmos(s130.MosParams()), MosType.PMOS),
+        MosDut(s130.modules.pmos_hvt(s130.MosParams()), MosType.PMOS),
+        MosDut(s130.modules.pmos_v5(s130.IoMosParams()), MosType.PMOS),
     ]
 
     for dut in duts:
@@ -126,7 +122,7 @@ def iv(mosdut: MosDut) -> hs.SimResult:
         vgs = hs.Param(val=1800 * m)
         vds = hs.Param(val=1800 * m)
         polarity = hs.Param(val=1 if mosdut.mostype == MosType.NMOS else -1)
-        dc = hs.Dc(var=vgs, sweep=LinearSweep(start=0, stop=2500 * m, step=10 * m))
+        dc = hs.Dc(var=vgs, sweep=LinearSweep(start=0, stop=2500 * m, step=VGS_STEP))
 
     MosIvSim.add(*s130.install.include(Corner.TYP))
     return MosIvSim.run(sim_options)
@@ -134,8 +130,10 @@ def iv(mosdut: MosDut) -> hs.SimResult:
 
 def postprocess(dut: MosDut, result: hs.SimResult) -> None:
     """Post-process and plot results from an `iv()` run on `dut`."""
+    import matplotlib.pyplot as plt
+
     result = result.an[0]  # Get the DC sweep
-    step = float(10 * m)  # FIXME: get this from the sweep above
+    step = float(VGS_STEP)
 
     id = np.abs(result.data["xtop.vd:p"])
     gm = np.diff(id) / step
@@ -154,3 +152,82 @@ def postprocess(dut: MosDut, result: hs.SimResult) -> None:
     ax.grid()
     fig.savefig(f"scratch/gm_over_id.{dut.mos.name}.png")
     # np.save("scratch/gm_over_id.npy", gm_over_id)
+
+
+# Lengths (µm) tabulated for core and 5V devices
+CORE_LENGTHS = (0.15, 0.25, 0.5, 1.0, 2.0)
+V5_LENGTHS = (0.5, 1.0, 2.0, 4.0)
+
+
+def lut_devices() -> list:
+    """The PDK's device flavors, each 1µm wide, for gm/Id tables"""
+    core = dict(lengths=CORE_LENGTHS, width=1.0)
+    return [
+        gmid.Device(
+            "nmos",
+            MosType.NMOS,
+            lambda l: s130.modules.nmos(s130.MosParams(w=1, l=l)),
+            **core,
+        ),
+        gmid.Device(
+            "nmos_lvt",
+            MosType.NMOS,
+            lambda l: s130.modules.nmos_lvt(s130.MosParams(w=1, l=l)),
+            **core,
+        ),
+        gmid.Device(
+            "pmos",
+            MosType.PMOS,
+            lambda l: s130.modules.pmos(s130.MosParams(w=1, l=l)),
+            **core,
+        ),
+        gmid.Device(
+            "pmos_hvt",
+            MosType.PMOS,
+            lambda l: s130.modules.pmos_hvt(s130.MosParams(w=1, l=l)),
+            **core,
+        ),
+        gmid.Device(
+            "nmos_v5",
+            MosType.NMOS,
+            lambda l: s130.modules.nmos_v5(s130.IoMosParams(w=1, l=l)),
+            lengths=V5_LENGTHS,
+            width=1.0,
+            vmax=3.3,
+        ),
+        gmid.Device(
+            "pmos_v5",
+            MosType.PMOS,
+            lambda l: s130.modules.pmos_v5(s130.IoMosParams(w=1, l=l)),
+            lengths=V5_LENGTHS,
+            width=1.0,
+            vmax=3.3,
+        ),
+    ]
+
+
+def test_gmid_luts(simtestmode: SimTestMode, tmp_path):
+    """
+    Build gm/Id lookup tables, for every device flavor, at one corner and temperature (or all, for MAX).
+    MIN mode builds a single-point table, to check the flow, in `tmp_path`, leaving the real tables intact.
+    """
+    devices = lut_devices()
+    if simtestmode == SimTestMode.NETLIST:
+        sim = gmid.sim_input(
+            devices[0], Corner.TYP, 0.15, 0.9, 0.0, include=lambda corner: []
+        )
+        h.netlist(sim.tb, dest=io.StringIO())
+    elif simtestmode == SimTestMode.MIN:
+        gmid.build(
+            devices[:1],
+            [Corner.TYP],
+            s130.install.include,
+            vds=(0.9,),
+            vsb=(0.0,),
+            path=tmp_path,
+        )
+    elif simtestmode == SimTestMode.TYP:
+        gmid.build(devices, [Corner.TYP], s130.install.include)
+    else:
+        corners = [Corner.SLOW, Corner.TYP, Corner.FAST]
+        gmid.build(devices, corners, s130.install.include, temperatures=TEMPERATURES)
@@ -0,0 +1,54 @@
+"""
+# Phase Interpolator Linearity Tests
+"""
+
+import numpy as np
+
+from .pilinearity import analyze, wrap
+
+
+def test_wrap():
+    assert np.allclose(
+        wrap(np.array([0.0, 180.0, 190.0, -190.0, 720.0])), [0, -180, -170, 170, 0]
+    )
+
+
+def test_analyze():
+    period = 2e-9
+    ncodes = 32
+    codes = np.arange(ncodes)
+    ideal = 0.3e-9 + period * codes / ncodes
+    # An ideal PI, wrapping through the period; one with a bowed code-to-phase curve;
+    # one running backwards; and one with a failed code.
+    bow = ideal + 20e-12 * np.sin(np.pi * codes / ncodes)
+    delays = np.stack([ideal, bow, ideal[::-1], np.where(codes == 5, np.nan, ideal)])
+    lin = analyze(delays, period, ["ideal", "bow", "backwards", "failed"])
+
+    lsb = 360.0 / ncodes
+    assert np.allclose(lin.lsb, [lsb, lsb, -lsb, lsb])
+    assert np.allclose(lin.max_dnl[[0, 2]], 0.0)
+    assert np.allclose(lin.max_inl[[0, 2, 3]], 0.0)
+    assert not lin.nonmonotonic[[0, 2, 3]].any()
+
+    # The bow peaks at 20ps, i.e. 3.6 degrees, mid-range
+    assert np.isclose(lin.inl_pp[1], 3.6, atol=0.05)
+    assert 0 < lin.inl_rms[1] < lin.max_inl[1]
+
+    # The failed code leaves gaps in its own, and its successor's step, but in nothing else
+    assert (
+        np.isnan(lin.inl[3, 5]) and np.isnan(lin.dnl[3, 5]) and np.isnan(lin.dnl[3, 6])
+    )
+    assert np.count_nonzero(np.isnan(lin.dnl[3])) == 2
+
+    # Phases unwrap into a continuous line across the period
+    assert np.allclose(np.diff(lin.phase[0]), lsb)
+    assert "Worst INL at bow" in lin.report("pi")
+
+
+def test_analyze_nonmonotonic():
+    period = 1e-9
+    delays = period * np.arange(16) / 16
+    delays[8] -= 0.1e-9  # Steps back by 0.6 LSB
+    lin = analyze(delays, period)
+    assert lin.nonmonotonic[0, 8] and lin.nonmonotonic.sum() == 1
+    assert np.isclose(lin.dnl[0, 8], -1.6 * 360.0 / 16)
@@ -0,0 +1,49 @@
+"""
+# PWL Stimulus Tests
+"""
+
+# Std-Lib Imports
+import io
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+
+# Local Imports
+from .pwlgen import DiffPwlGen, Vpwl, diff_pwl, edges, quoted
+
+
+def test_edges():
+    """Breakpoints only at level changes, each edge centered on its UI boundary"""
+    t, v = edges(np.array([1, 1, -1, -1, 1]), ui=1.0, trf=0.2)
+    assert np.allclose(t, [0, 1.9, 2.1, 3.9, 4.1, 5])
+    assert np.allclose(v, [1, 1, -1, -1, 1, 1])
+
+
+def test_edges_jitter():
+    """Jitter displaces each edge by its UI boundary's offset, after `delay`"""
+    jitter = np.array([0.05, -0.1, 0.3, 0.2])
+    t, v = edges(np.array([1, -1, -1, 1, 1]), ui=1.0, trf=0.2, delay=0.5, jitter=jitter)
+    mids = (t[1:-1:2] + t[2:-1:2]) / 2
+    assert np.allclose(mids, [1.55, 3.8])
+    assert np.allclose(t[[0, -1]], [0, 5.5])
+
+
+def test_diff_pwl_netlist(tmp_path):
+    """Writes a differential pattern, and netlists a bench driving it through `DiffPwlGen`"""
+    stim = diff_pwl(tmp_path / "pat", np.array([1, -1, 0, 1]), 1e-9, 1e-10, 0.2, 0.4)
+    p = np.loadtxt(stim.p)
+    assert np.allclose(p[[0, -1], 1], [0.4, 0.4])
+
+    tb = h.sim.tb("PwlTb")
+    tb.pads = h.Diff()
+    tb.pwl = DiffPwlGen(stim)(out=tb.pads, VSS=tb.VSS)
+    tb.s = h.Signal()
+    tb.single = Vpwl(file=quoted(stim.n))(p=tb.s, n=tb.VSS)
+    netlist = io.StringIO()
+    h.netlist(tb, dest=netlist, fmt="spectre")
+    netlist = netlist.getvalue()
+    assert netlist.count(f'file="{stim.p}"') == 1
+    assert netlist.count(f'file="{stim.n}"') == 2
@@ -0,0 +1,36 @@
+"""
+# Ring-Oscillator Characterization Tests
+"""
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .result_store import ResultStore
+from .ringosc import solve_ibias
+
+
+def test_solve_ibias(tmp_path):
+    """Solves each condition's bias current in shared rounds, treats failures as too slow, and records each"""
+    store = ResultStore(tmp_path)
+    # Frequency proportional to bias current, at 4MHz/µA and 2MHz/µA. Failing below 60µA.
+    gains = dict(fast=4e6, slow=2e6)
+    rounds = []
+
+    def freqs(points):
+        rounds.append(len(points))
+        return [gains[cond] * ib if ib >= 60 else np.nan for (cond, ib) in points]
+
+    roots = solve_ibias(
+        freqs, ["fast", "slow"], lo=50, hi=300, name="Ring", table="ibias", store=store
+    )
+    # Within the default 1MHz of target, i.e. 0.25µA and 0.5µA
+    assert np.allclose([root.x for root in roots], [120, 240], atol=0.5)
+    assert all(root.converged and abs(root.fx) <= 1e6 for root in roots)
+    # Both ends of the range for both conditions, then at most one point per condition
+    assert rounds[0] == 4 and max(rounds[1:]) <= 2
+
+    records = list(store.records("ibias", tb="Ring"))
+    assert [r["corner"] for r in records] == ["fast", "slow"]
+    assert np.isclose(records[1]["ib"], roots[1].x * 1e-6)
+    assert records[1]["sims"] == roots[1].evaluations
@@ -0,0 +1,76 @@
+"""
+# Parallel Bisection Tests
+"""
+
+# Std-Lib Imports
+import math
+
+# Local Imports
+from .search import bisect, brent
+
+
+def test_bisect():
+    """Finds each key's threshold, in batches, and stops at once for keys passing at the upper limit"""
+    thresholds = {"a": 0.3, "b": 1.7, "c": 5.0, "d": 20.0}
+    batches = []
+
+    def evaluate(points):
+        batches.append(len(points))
+        return [x <= thresholds[key] for (key, x) in points]
+
+    brackets = bisect(evaluate, list(thresholds), lo=0.1, hi=10.0, rtol=0.01, width=2)
+    for (key, t) in thresholds.items():
+        b = brackets[key]
+        if t >= 10:
+            assert b.passed_all and b.lo == 10 and b.evaluations == 1
+        else:
+            assert b.lo <= t < b.hi and b.hi - b.lo <= 0.01 * b.hi
+    # Later rounds probe `width` points per search, and more as searches finish
+    assert batches[0] == 4
+    assert all(6 <= n <= 8 for n in batches[1:]) and batches[-1] == 8
+
+
+def test_bisect_log():
+    """Geometric spacing, and thresholds below the searched range"""
+    evaluate = lambda points: [x <= 1e-3 for (_, x) in points]
+    brackets = bisect(evaluate, [0, 1], lo=1e-2, hi=1e2, rtol=0.1, log=True)
+    b = brackets[0]
+    # Never passing: the bracket closes onto `lo`
+    assert b.lo == 1e-2 and b.hi <= 1.1e-2
+    assert not b.passed_all and not math.isinf(b.hi)
+
+
+def test_brent():
+    """Finds each key's root to tolerance, in fewer rounds than bisection, and flags keys without a sign change"""
+    targets = {"a": 0.3, "b": 1.7, "c": 5.0, "d": 20.0}
+    batches = []
+
+    def measure(points):
+        batches.append(len(points))
+        return [
+            math.tanh(x - targets[key]) + 0.1 * (x - targets[key])
+            for (key, x) in points
+        ]
+
+    roots = brent(measure, list(targets), lo=0.1, hi=10.0, xtol=1e-6, rtol=0)
+    for (key, t) in targets.items():
+        r = roots[key]
+        if t >= 10:
+            assert not r.bracketed and not r.converged
+            assert r.x == 10 and r.evaluations == 2
+        else:
+            assert r.bracketed and r.converged
+            assert abs(r.x - t) < 1e-6
+            assert r.evaluations < 20
+    # The first round measures both ends, and later rounds one point per search
+    assert batches[0] == 8 and batches[1] == 3
+    assert len(batches) == max(r.evaluations for r in roots.values()) - 1
+
+
+def test_brent_ftol():
+    """Stops once the measurement is within `ftol`, or at the iteration limit"""
+    measure = lambda points: [x**3 - 2 for (_, x) in points]
+    root = brent(measure, [0], lo=0.0, hi=4.0, rtol=0, ftol=1e-3)[0]
+    assert root.converged and abs(root.fx) <= 1e-3
+    root = brent(measure, [0], lo=0.0, hi=4.0, rtol=0, maxiter=2)[0]
+    assert not root.converged and root.evaluations == 4
@@ -0,0 +1,85 @@
+"""
+# Sensitivity Analysis Tests
+"""
+
+# Std-Lib Imports
+import math
+
+# PyPi Imports
+import pytest
+
+# Hdl Imports
+import hdl21 as h
+from hdl21.prefix import f, µ
+
+# Local Imports
+from .sensitivity import Factor, sensitivity
+
+
+@h.paramclass
+class Inner:
+    cl = h.Param(dtype=h.Prefixed, desc="Load Cap", default=10 * f)
+    n = h.Param(dtype=int, desc="Stages", default=4)
+
+
+@h.paramclass
+class Outer:
+    inner = h.Param(dtype=Inner, desc="Inner Params", default=Inner())
+    ib = h.Param(dtype=h.Prefixed, desc="Bias Current", default=100 * µ)
+    t = h.Param(dtype=int, desc="Temperature (C)", default=25)
+
+
+def test_sensitivity():
+    """Normalized sensitivities of known functions, in a single batch, with integer and absolute-step factors"""
+    batches = []
+
+    def evaluate(batch):
+        batches.append(len(batch))
+        return [
+            dict(
+                freq=float(p.ib) / (float(p.inner.cl) * p.inner.n),
+                power=float(p.ib) * (1 + 0.01 * p.t),
+            )
+            for p in batch
+        ]
+
+    factors = ["inner.cl", "inner.n", "ib", Factor("t", step=10, scale=100)]
+    result = sensitivity(evaluate, Outer(), factors, rel=0.05)
+
+    # Nominal plus an up and down step per factor, all at once
+    assert batches == [9]
+    freq, power = (dict(result.ranked(m)) for m in ("freq", "power"))
+    # Inverse proportionality, to within the central difference's error
+    assert abs(freq["inner.cl"] + 1) < 0.01
+    assert abs(freq["ib"] - 1) < 1e-9
+    assert power["inner.cl"] == 0 and power["inner.n"] == 0
+    # Integer factors step by at least one: here 4 +/- 1
+    assert result.steps[1] == 1
+    assert abs(freq["inner.n"] + 1 / (1 - 0.25**2)) < 1e-9
+    # Absolute step, per 100C: 1% per C, relative to 1.25 at 25C
+    assert abs(power["t"] - 1 / 1.25) < 1e-9
+    assert result.ranked("freq")[-1][0] == "t"
+
+
+def test_sensitivity_failures():
+    """Unmeasurable perturbations give NaN sensitivities, an unmeasurable nominal an error"""
+    evaluate = lambda batch: [
+        dict(x=float(p.ib)) if p.t == 25 else dict() for p in batch
+    ]
+    result = sensitivity(evaluate, Outer(), ["ib", "t"], central=False)
+    assert abs(result.matrix[0, 0] - 1) < 1e-9
+    assert math.isnan(result.matrix[0, 1])
+
+    with pytest.raises(RuntimeError):
+        sensitivity(evaluate, Outer(t=75), ["ib"])
+
+
+def test_report_unmeasured():
+    """Metrics with no measured sensitivity are reported as such, and have no dominant factor"""
+    evaluate = lambda batch: [
+        dict(x=float(p.ib), y=1.0 if p == Outer() else math.nan) for p in batch
+    ]
+    report = sensitivity(evaluate, Outer(), ["ib", "t"]).report()
+    assert report.splitlines()[0].split() == ["factor", "x"]
+    assert "Dominant x: ib" in report
+    assert report.splitlines()[-1] == "Unmeasured y"
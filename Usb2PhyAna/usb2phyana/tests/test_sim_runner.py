@@ -0,0 +1,65 @@
+"""
+# Sim Runner Tests
+"""
+
+# Local Imports
+from .sim_runner import classify, FailureKind, JobResult, SimStatus, RETRY_PROFILES
+from .sim_runner import JobLimits, JobOutputs, _batch, _raw_path
+
+
+def test_classify():
+    """Test classifying failures from simulator logs"""
+
+    log = "ERROR (SPECTRE-16080): No DC solution found (no convergence)."
+    assert classify(log) == FailureKind.CONVERGENCE
+    log = "ERROR (SPECTRE-16192): No convergence achieved with the minimum time step specified."
+    assert classify(log) == FailureKind.CONVERGENCE
+    log = 'ERROR (SFE-23): "netlist.scs" 12: The instance `xdut` is referencing an undefined model or subcircuit.'
+    assert classify(log) == FailureKind.NETLIST
+    log = "ERROR (SPECTRE-3): License checkout failed for Spectre."
+    assert classify(log) == FailureKind.LICENSE
+    log = "ERROR (SPECTRE-17): Cannot allocate memory."
+    assert classify(log) == FailureKind.MEMORY
+    assert classify("Segmentation fault") == FailureKind.UNKNOWN
+
+
+def test_job_result():
+    """Test `JobResult` status flags and retry profiles"""
+
+    assert JobResult(status=SimStatus.OK).ok
+    assert JobResult(status=SimStatus.RECOVERED).ok
+    assert not JobResult(status=SimStatus.FAILED).ok
+    assert not JobResult(status=SimStatus.SKIPPED, attempts=0).ok
+
+    names = [p.name for p in RETRY_PROFILES]
+    assert len(set(names)) == len(names)
+    for p in RETRY_PROFILES:
+        assert f"{p.name}_opts options" in p.literal().text
+
+
+def test_raw_path():
+    """Test that raw files are unique per job, corner and batch"""
+
+    outputs = JobOutputs(rawdir="raw")
+    one = _batch(None, JobLimits(), RETRY_PROFILES, outputs, None)
+    two = _batch(None, JobLimits(), RETRY_PROFILES, outputs, None)
+    assert one.name != two.name
+
+    paths = {
+        _raw_path(batch, "Tb", corner, idx)
+        for batch in (one, two)
+        for corner in ("TYP/HIGH 25", "SLOW/LOW -25")
+        for idx in (0, 1)
+    }
+    assert len(paths) == 8
+    assert (
+        _raw_path(one, "Tb", "TYP/HIGH 25", 3).name
+        == f"Tb.TYP_HIGH_25.{one.name}.3.raw"
+    )
+    assert _raw_path(one, "Tb", "").name == f"Tb.{one.name}.raw"
+    assert (
+        _raw_path(
+            _batch(None, JobLimits(), RETRY_PROFILES, JobOutputs(), None), "Tb", ""
+        )
+        is None
+    )
@@ -0,0 +1,67 @@
+"""
+# Statistical Eye Tests
+"""
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .stateye import PulseResponse, stateye
+
+
+def pulse(cursors, osr: int = 32) -> PulseResponse:
+    """A pulse response holding each value of `cursors` for a full UI"""
+    return PulseResponse(y=np.repeat(cursors, osr), ui=1.0, osr=osr, baseline=0)
+
+
+def test_ideal_pulse():
+    """An ISI-free pulse leaves the eye fully open, everywhere but its edges"""
+    eye = stateye(pulse([1.0]))
+    m = eye.metrics(ber=1e-12)
+    assert abs(m.height - 1) < 0.01
+    assert abs(m.width - 1) < 0.1
+    assert abs(m.threshold - 0.5) < 0.01
+    assert np.allclose(eye.pdf1.sum(axis=1), 1)
+    assert np.allclose(eye.pdf0.sum(axis=1), 1)
+
+
+def test_isi():
+    """A post-cursor closes the inner eye by its amplitude, on both rails"""
+    m = stateye(pulse([1.0, 0.25])).metrics(ber=1e-12)
+    assert abs(m.height - 0.75) < 0.01
+
+    # Two post-cursors which together exceed the main cursor close it.
+    # The best thresholds then err on one of four patterns, of either ones or zeros.
+    eye = stateye(pulse([1.0, 0.6, 0.6]))
+    assert eye.metrics(ber=1e-12).height == 0
+    assert abs(eye.ber().min() - 0.125) < 1e-6
+
+
+def test_baseline():
+    """Voltages are reported relative to the all-zeros baseline"""
+    pr = pulse([2.0])
+    pr.baseline = -1.0
+    m = stateye(pr).metrics(ber=1e-12)
+    assert abs(m.threshold) < 0.02
+    assert abs(m.height - 2) < 0.02
+
+
+def test_jitter():
+    """Random and deterministic jitter close the eye horizontally"""
+    pr = pulse([1.0], osr=128)
+    w0 = stateye(pr).metrics(ber=1e-12).width
+    wrj = stateye(pr, rj=0.01).metrics(ber=1e-12).width
+    wdj = stateye(pr, dj=0.2).metrics(ber=1e-12).width
+    # Q(1e-12) is about 7.03 sigmas, on each side
+    assert abs((w0 - wrj) - 2 * 7.03 * 0.01) < 0.03
+    assert abs((w0 - wdj) - 0.2) < 0.03
+
+
+def test_from_tran():
+    """Resampling from a non-uniform transient waveform"""
+    t = np.concatenate([np.linspace(0, 2, 7), np.linspace(2.001, 10, 1001)])
+    v = np.where((t > 2) & (t <= 3), 1.0, -0.5)
+    pr = PulseResponse.from_tran(t, v, ui=1.0, delay=2.0, osr=16)
+    assert pr.baseline == -0.5
+    assert pr.osr == 16 and len(pr.y) == 8 * 16 + 1
+    assert abs(pr.y[8] - 1.5) < 1e-9
@@ -0,0 +1,38 @@
+"""
+# Streaming Statistics Tests
+"""
+
+import math
+import numpy as np
+
+from .stats import Running
+
+
+def test_running():
+    rng = np.random.default_rng(1)
+    values = 5 + rng.standard_normal(400)
+    r = Running()
+    widths = []
+    for x in values:
+        r.add(x)
+        widths.append(r.interval())
+    r.add(np.nan)
+    assert r.n == 400
+    assert np.isclose(r.mean, values.mean())
+    assert np.isclose(r.std, values.std(ddof=1))
+    assert widths[-1] < widths[100] < widths[10]
+    assert np.isclose(r.quantile(0.9), np.quantile(values, 0.9))
+
+
+def test_bounds():
+    """Each interval covers its true value, for a standard normal"""
+    rng = np.random.default_rng(3)
+    r = Running()
+    for x in rng.standard_normal(2000):
+        r.add(x)
+    for (stat, truth) in (("mean", 0.0), ("std", 1.0), (0.5, 0.0), (0.9, 1.2816)):
+        lo, hi = r.bounds(stat)
+        assert lo < truth < hi
+        assert lo < r.value(stat) < hi
+    # Too few values to bound an extreme quantile
+    assert r.interval(0.9999) == math.inf
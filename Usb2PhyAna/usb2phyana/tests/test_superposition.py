@@ -0,0 +1,47 @@
+"""
+# Edge-Response Superposition Tests
+"""
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .superposition import EdgeResponses
+
+
+def rc(t: np.ndarray, tau: float) -> np.ndarray:
+    """Unit step response of a single-pole RC filter"""
+    return np.where(t > 0, 1 - np.exp(-np.maximum(t, 0) / tau), 0)
+
+
+def test_linear_rc():
+    """Superposition reproduces a linear RC filter's response to a random pattern"""
+    ui, osr, tau = 1.0, 16, 0.7
+    rise, fall = 2.0, 22.0
+    t = np.linspace(0, 42, 42 * 256 + 1)
+    v = rc(t - rise, tau) - rc(t - fall, tau)
+    edges = EdgeResponses.from_tran(t, v, ui=ui, rise=rise, fall=fall, osr=osr)
+    assert abs(edges.high - 1) < 1e-6 and abs(edges.low) < 1e-6
+
+    bits = np.random.default_rng(0).integers(0, 2, 500)
+    synth = edges.synthesize(bits, initial=False)
+    tt = edges.time(len(synth))
+
+    # Reference: the sum of the RC response to every edge
+    transitions = np.diff(np.concatenate([[0], bits]))
+    ref = sum(d * rc(tt - k * ui, tau) for (k, d) in enumerate(transitions) if d)
+    assert np.max(np.abs(synth - ref)) < 1e-6
+
+
+def test_asymmetric_edges():
+    """Rising and falling edges keep their own shapes, and settle to their own levels"""
+    osr = 8
+    rise = np.concatenate([np.linspace(0.5, 2, osr), 2 * np.ones(3 * osr)])
+    fall = np.concatenate([np.linspace(2, 0.5, 2 * osr), 0.5 * np.ones(2 * osr)])
+    edges = EdgeResponses(rise=rise, fall=fall, ui=1.0, osr=osr)
+
+    v = edges.synthesize([0, 1, 1, 1, 1, 0, 0, 0, 0])
+    assert np.allclose(v[:osr], 0.5)
+    assert np.allclose(v[osr : 2 * osr], 0.5 + 1.5 * np.linspace(0, 1, osr))
+    assert np.allclose(v[5 * osr : 7 * osr], np.linspace(2, 0.5, 2 * osr))
+    assert np.allclose(v[-osr:], 0.5)
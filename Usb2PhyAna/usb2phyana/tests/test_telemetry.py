@@ -0,0 +1,59 @@
+"""
+# Simulator Telemetry Tests
+"""
+
+# Local Imports
+from .result_store import ResultStore
+from .telemetry import parse_log, record, summarize, TABLE
+
+log = """
+Circuit inventory:
+              nodes 1234
+              bsim4 560
+           resistor 12
+            vsource 4
+
+Number of accepted tran steps = 20345.
+Number of rejected tran steps = 123.
+Total number of iterations = 45678
+Time accumulated: CPU = 2.5 s, elapsed = 2.7 s.
+Peak resident memory used = 96.4 Mbytes.
+Time accumulated: CPU = 1m 5.3s, elapsed = 1m 7.25 s.
+"""
+
+
+def test_parse_log():
+    """Test parsing telemetry from a Spectre log"""
+
+    tel = parse_log(log, walltime=68.0)
+    assert tel.cpu == 65.3
+    assert tel.elapsed == 67.25
+    assert tel.walltime == 68.0
+    assert tel.accepted_steps == 20345
+    assert tel.rejected_steps == 123
+    assert tel.newton_iters == 45678
+    assert tel.nodes == 1234
+    assert tel.inventory["bsim4"] == 560
+    assert tel.peak_memory == 96.4e6
+
+    # Metrics missing from the log are left `None`
+    assert parse_log("").cpu is None
+
+
+def test_summarize(tmp_path):
+    """Test recording and summarizing telemetry per testbench and corner"""
+
+    store = ResultStore(tmp_path)
+    tel = parse_log(log)
+    for corner in ["typ", "typ", "slow"]:
+        record(tel, tb="IloFreqTb", corner=corner, store=store)
+    record(tel, tb="IdacSweepTb", corner="typ", store=store)
+
+    assert len(list(store.records(TABLE, tb="IloFreqTb"))) == 3
+    summaries = summarize(store.records(TABLE))
+    assert len(summaries) == 3
+    assert (summaries[0].tb, summaries[0].corner, summaries[0].runs) == (
+        "IloFreqTb",
+        "typ",
+        2,
+    )
@@ -0,0 +1,39 @@
+"""
+# Transient-Noise Jitter Tests
+"""
+
+import numpy as np
+
+from .result_store import ResultStore
+from .jitter import measure, phase_noise
+from .tnoise import OFFSETS, TABLE, record, report, summary
+from .test_jitter import F0, SIGMA, free_running
+
+
+def test_record(tmp_path):
+    """
+    Seeds of white period jitter are recorded, and summarized, as white FM, `L(f) = SIGMA^2 * F0^3 / f^2`,
+    which integrates to their accumulated jitter, `SIGMA * sqrt(N)` over `N` cycles
+    """
+    store = ResultStore(tmp_path)
+    seeds = range(8)
+    for seed in seeds:
+        edges = free_running(2**16, seed=seed)
+        (f, pn) = phase_noise(edges, nseg=16)
+        record(measure(edges), f, pn, "Tb", "typ", "free", seed, store)
+    # A re-run of the last seed replaces, rather than adds to, its first run
+    record(measure(edges), f, pn, "Tb", "typ", "free", seeds[-1], store)
+
+    stats = report(store, tb="Tb", mode="free")
+    assert stats["period"].n == len(seeds)
+    assert np.isclose(stats["period"].mean, SIGMA, rtol=0.02)
+    for (field, offset) in OFFSETS.items():
+        expected = 10 * np.log10(SIGMA**2 * F0**3 / offset**2)
+        assert abs(stats[field].mean - expected) < 1.5, field
+
+    # Period jitter implied by the 10MHz phase noise, against that accumulated over 100 cycles
+    sigma_pn = np.sqrt(10 ** (stats["pn_10MHz"].mean / 10) * 10e6**2 / F0**3)
+    assert np.isclose(stats["acc_100"].mean, 10 * sigma_pn, rtol=0.15)
+
+    # Only matching records are summarized
+    assert summary(store.records(TABLE, mode="locked"))["period"].n == 0
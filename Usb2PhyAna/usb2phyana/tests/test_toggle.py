@@ -0,0 +1,27 @@
+"""
+# Maximum Toggle Frequency Tests
+"""
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .toggle import toggles
+
+
+def test_toggles():
+    """Divide-by-two and pulse-per-edge outputs pass; missed edges and partial swing fail"""
+    t = np.linspace(0, 20e-9, 20001)
+    period = 1e-9
+    vin = np.sin(2 * np.pi * t / period)
+    div = 0.25 * np.sign(np.sin(np.pi * t / period + 0.3))
+    assert toggles(t, vin, div, ratio=0.5, swing=0.5, skip=2e-9)
+    # A divider which has stopped toggling, or toggles at the input rate
+    assert not toggles(t, vin, 0.25 * np.ones_like(t), ratio=0.5, swing=0.5)
+    assert not toggles(t, vin, 0.25 * np.sign(vin + 0.1), ratio=0.5, swing=0.5)
+
+    # Pulses at every input edge, with one pulse too small
+    pulses = np.where(np.abs(vin) < 0.3, 0.25, -0.25)
+    assert toggles(t, vin, pulses, ratio=2, swing=0.5, skip=2e-9)
+    weak = np.where(np.abs(t - 10e-9) < 0.1e-9, 0.2 * pulses, pulses)
+    assert not toggles(t, vin, weak, ratio=2, swing=0.5, skip=2e-9)
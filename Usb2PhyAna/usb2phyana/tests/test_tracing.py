@@ -0,0 +1,40 @@
+"""
+# Sweep Tracing Tests
+"""
+
+# Std-Lib Imports
+import json
+import concurrent.futures
+
+# Local Imports
+from .tracing import Tracer
+
+
+def test_tracer(tmp_path):
+    """Test recording spans across threads, and exporting them as a Chrome trace"""
+
+    tracer = Tracer()
+    with tracer.span("disabled"):
+        pass
+    assert not tracer.events
+
+    tracer.enabled = True
+
+    def job(i: int):
+        with tracer.span("simulate", job=i):
+            pass
+
+    with tracer.span("run"):
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            list(executor.map(job, range(4)))
+
+    path = tracer.save(tmp_path / "trace.json")
+    events = json.load(open(path))["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    assert sorted(e["name"] for e in spans) == ["run"] + 4 * ["simulate"]
+    assert all(e["dur"] >= 0 for e in spans)
+
+    # Each thread gets a name
+    threads = {e["tid"] for e in spans}
+    named = {e["tid"] for e in events if e["ph"] == "M"}
+    assert threads == named
@@ -0,0 +1,90 @@
+"""
+# Waveform Reader Tests
+"""
+
+# PyPi Imports
+import numpy as np
+
+# Local Imports
+from .waveforms import RawFile, WaveformCache, minmax, lttb
+
+
+def write_nutbin(path, plots) -> None:
+    """Write a `nutbin` file, from a list of (analysis-name, {signal-name: real-valued data}) pairs"""
+    with open(path, "wb") as f:
+        f.write(b"Title: test\nDate: today\n")
+        for (name, data) in plots:
+            names = list(data.keys())
+            npts = len(data[names[0]])
+            f.write(
+                f"Plotname: Transient Analysis `{name}': time = (0 s -> 1 s)\n".encode()
+            )
+            f.write(b"Flags: real\n")
+            f.write(f"No. Variables: {len(names)}\n".encode())
+            f.write(f"No. Points: {npts}\n".encode())
+            for (i, n) in enumerate(names):
+                prefix = "Variables:" if i == 0 else ""
+                f.write(f"{prefix}\t{i}\t{n}\tV\n".encode())
+            f.write(b"Binary:\n")
+            points = np.stack([data[n] for n in names], axis=1)
+            f.write(points.astype(">f8").tobytes())
+
+
+def test_raw_file(tmp_path):
+    """Test memory-mapped, windowed signal decoding"""
+
+    t = np.linspace(0, 1, 1001)
+    vp, vn = np.sin(2 * np.pi * 5 * t), np.cos(2 * np.pi * 5 * t)
+    path = tmp_path / "netlist.raw"
+    write_nutbin(
+        path,
+        [
+            ("op", dict(time=np.zeros(1), vdd=np.ones(1))),
+            ("tr", dict(time=t, p=vp, n=vn)),
+        ],
+    )
+
+    raw = RawFile(path)
+    assert set(raw.plots) == {"op", "tr"}
+    tr = raw["tr"]
+    assert tr.vars == ["time", "p", "n"]
+    assert tr.npts == 1001
+
+    x, y = tr.signal("p")
+    assert np.allclose(x, t)
+    assert np.allclose(y, vp)
+
+    x, y = tr.diff("p", "n", start=0.25, stop=0.5)
+    assert x[0] >= 0.25 and x[-1] <= 0.5
+    assert len(x) == 251
+    assert np.allclose(y, np.sin(2 * np.pi * 5 * x) - np.cos(2 * np.pi * 5 * x))
+
+    x, y = tr.signal("n", dtype=np.float32)
+    assert y.dtype == np.float32 and x.dtype == np.float64
+
+    assert np.allclose(raw["op"].to_dict()["vdd"], [1.0])
+
+    cache = WaveformCache(tmp_path / "cache")
+    x, y = cache.signal(raw, "tr", "p")
+    assert y.dtype == np.float32 and x.dtype == np.float64
+    assert np.allclose(y, vp, atol=1e-6)
+    assert np.array_equal(x, t)
+
+
+def test_downsample():
+    """Test shape-preserving down-sampling"""
+
+    x = np.linspace(0, 1, 100_001)
+    y = np.sin(2 * np.pi * 3 * x)
+    y[50_000] = 5.0  # A narrow glitch
+
+    xs, ys = minmax(x, y, 500)
+    assert len(xs) <= 1002
+    assert ys.max() == 5.0
+    assert np.all(np.diff(xs) > 0)
+
+    xs, ys = lttb(x, y, 1000)
+    assert len(xs) == 1000
+    assert (xs[0], xs[-1]) == (x[0], x[-1])
+    assert ys.max() == 5.0
+    assert np.all(np.diff(xs) > 0)
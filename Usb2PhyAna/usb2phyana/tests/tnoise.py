@@ -0,0 +1,181 @@
+"""
+# Transient-Noise Jitter
+
+Runs transient-noise simulations of an oscillator across many random seeds in parallel, and measures each one's jitter (`tests/jitter.py`).
+
+Each seed's result is recorded to the result store's `jitter` table as soon as its sim completes,
+and the running mean and confidence interval across seeds is printed as each arrives.
+`report` recomputes them from the store, so a long run can be checked on while still in progress.
+Seeds which have been run more than once count once, by their latest record.
+
+Example:
+
+```
+def sim(seed: int) -> hs.Sim:
+    ... # Add `noise_tran(tstop, seed)` to a testbench's `Sim`
+def edges(tr: Plot) -> np.ndarray:
+    ... # Rising-edge times of the oscillator's output
+run_seeds(sim, edges, seeds=range(32), tb="IloFreqTb", corner=str(pvt), mode="free")
+```
+"""
+
+# Std-Lib Imports
+import threading
+from pathlib import Path
+from dataclasses import asdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21.sim as hs
+
+# Local Imports
+from .sim_options import sim_options
+from .result_store import ResultStore, result_store
+from .waveforms import Plot, RawFile
+from .jitter import LAGS, JitterResult, measure, phase_noise
+from .stats import Running
+from . import sim_runner
+
+# Result-store table name
+TABLE = "jitter"
+
+# Offset frequencies (Hz) at which each seed's phase noise is recorded, by field name
+OFFSETS = {"pn_1MHz": 1e6, "pn_10MHz": 10e6, "pn_100MHz": 100e6}
+
+# Fields summarized across seeds
+FIELDS = ("freq", "period", "cycle", "tie", *(f"acc_{n}" for n in LAGS), *OFFSETS)
+# Measured fields of each record. The rest, e.g. its `tb`, `corner` and `seed`, identify it.
+MEASURED = ("nedges", *FIELDS)
+
+
+def noise_tran(
+    tstop: float, seed: int, fmax: float = 20e9, name: str = "tr"
+) -> hs.Literal:
+    """
+    Transient-noise analysis `name`, through `tstop`, with device noise up to `fmax` from random seed `seed`.
+    A literal Spectre `tran` statement, as `hs.Tran` has no noise parameters.
+    Its results are therefore read from each job's raw file, rather than its `SimResult`.
+    """
+    return hs.Literal(
+        f"""
+        simulator lang=spectre
+        {name} tran stop={float(tstop)} noisefmax={fmax} noiseseed={seed} noisescale=1
+    """
+    )
+
+
+def record(
+    result: JitterResult,
+    f: np.ndarray,
+    pn: np.ndarray,
+    tb: str,
+    corner: str,
+    mode: str,
+    seed: int,
+    store: ResultStore = result_store,
+    **extra,
+) -> Dict:
+    """Record the jitter `result` and phase noise `(f, pn)` of a single seed"""
+    rec = dict(tb=tb, corner=corner, mode=mode, seed=seed, **extra)
+    rec.update({k: v for (k, v) in asdict(result).items() if k != "accumulated"})
+    rec.update({f"acc_{n}": acc for (n, acc) in zip(LAGS, result.accumulated)})
+    logf = np.log10(f)
+    for (field, offset) in OFFSETS.items():
+        rec[field] = float(
+            np.interp(np.log10(offset), logf, pn, left=np.nan, right=np.nan)
+        )
+    store.put(TABLE, rec)
+    return rec
+
+
+def summary(
+    records: Iterable[Dict], fields: Iterable[str] = FIELDS
+) -> Dict[str, Running]:
+    """Running statistics of each of `fields`, across per-seed `records`"""
+    stats = {field: Running() for field in fields}
+    for rec in records:
+        for (field, stat) in stats.items():
+            stat.add(float(rec.get(field, np.nan)))
+    return stats
+
+
+def latest(records: Iterable[Dict]) -> List[Dict]:
+    """The latest of `records` per seed, and per each of their other identifying fields. Re-runs replace, rather than add to, earlier runs."""
+    found = dict()
+    for rec in records:
+        key = tuple(sorted((k, str(v)) for (k, v) in rec.items() if k not in MEASURED))
+        found[key] = rec
+    return list(found.values())
+
+
+def report(store: ResultStore = result_store, **where) -> Dict[str, Running]:
+    """Print the mean, and 95% confidence interval, of each jitter field across the seeds recorded in `store` matching `where`"""
+    stats = summary(latest(store.records(TABLE, **where)))
+    for (field, stat) in stats.items():
+        scale, unit = (1e-6, "MHz") if field == "freq" else (1e12, "ps")
+        if field.startswith("pn_"):
+            scale, unit = 1, "dBc/Hz"
+        print(
+            f"{field:<12} {stat.mean * scale:>10.3f} +/- {stat.interval() * scale:<8.3f} {unit:<7} ({stat.n} seeds)"
+        )
+    return stats
+
+
+def run_seeds(
+    sim: Callable[[int], hs.Sim],
+    edges: Callable[[Plot], np.ndarray],
+    seeds: Iterable[int],
+    tb: str,
+    corner: str,
+    mode: str,
+    store: ResultStore = result_store,
+    rawdir: Path = Path("scratch/tnoise"),
+    **extra,
+) -> List[Optional[JitterResult]]:
+    """
+    Run `sim(seed)` for each of `seeds` in parallel, and measure the jitter of `edges(plot)` of each's transient-noise analysis `tr`.
+    Records each seed's results as it completes, labeled by `tb`, `corner`, `mode` and any `extra` fields.
+    Returns each seed's `JitterResult`, or None where its sim failed.
+    """
+    seeds = list(seeds)
+    results: List[Optional[JitterResult]] = [None] * len(seeds)
+    running = {field: Running() for field in FIELDS}
+    lock = threading.Lock()
+
+    def done(idx: int, job: sim_runner.JobResult) -> None:
+        if not job.ok:
+            print(f"{tb} {mode} seed {seeds[idx]} failed: {job.failure.value}")
+            return
+        try:
+            t = edges(RawFile(job.raw)["tr"])
+            result = measure(t)
+            f, pn = phase_noise(t)
+        except ValueError as e:
+            print(f"{tb} {mode} seed {seeds[idx]} not measurable: {e}")
+            return
+        finally:
+            job.raw.unlink()  # Transient-noise raw files are large; keep only the measurements
+        results[idx] = result
+        rec = record(result, f, pn, tb, corner, mode, seeds[idx], store, **extra)
+        with lock:
+            for (field, stat) in running.items():
+                stat.add(rec[field])
+            period = running["period"]
+            print(
+                f"{tb} {mode} seed {seeds[idx]}: period jitter {period.mean * 1e12:.3f} "
+                f"+/- {period.interval() * 1e12:.3f}ps over {period.n} seeds"
+            )
+
+    outputs = sim_runner.JobOutputs(rawdir=rawdir, waveforms=False)
+    sim_runner.run(
+        [sim(seed) for seed in seeds],
+        sim_options,
+        outputs=outputs,
+        store=store,
+        corner=corner,
+        done=done,
+    )
+    return results
@@ -0,0 +1,188 @@
+"""
+# Maximum Toggle Frequency
+
+Highest input frequencies at which clocked blocks still work, e.g. CML dividers and pulse generators,
+found by parallel bisection (`tests/search.py`) over many keys at once, e.g. every corner and bias point.
+
+A block works at a frequency if its output toggles at the expected rate, relative to its input, and at full swing.
+Both are checked by vectorized edge counting: counts of rising zero-crossings of the (differential) input and output,
+and the peak of every complete output half-cycle between consecutive crossings.
+
+`fmax_map` maps a CML block's maximum frequency across conditions and bias points, and records each to the result store's
+`cml_fmax` table. Points at which no frequency is ever seen to work, including those whose sims all fail, are flagged `below_range`,
+with no `fmax`, rather than reported at the search's lower limit.
+
+Example:
+
+```
+brackets = fmax(
+    sim=lambda key, freq: sim_input(params(key, freq)),
+    works=lambda key, freq, result: divides(params(key, freq), result),
+    keys=range(len(points)),
+)
+```
+"""
+
+# Std-Lib Imports
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21 as h
+import hdl21.sim as hs
+from hdl21.pdk import Corner
+from hdl21.prefix import m
+
+# Local Imports
+from .sim_options import sim_options
+from .result_store import ResultStore, result_store
+from .search import Bracket, bisect
+from .eye import crossings
+from . import sim_runner
+from ..pdk import s130
+
+# Result-store table name of `fmax_map`
+TABLE = "cml_fmax"
+
+# Conditions of `fmax_map`, as `(process, supply voltage, temperature (C))` of a 1.8V block:
+# typical, and the slow and fast extremes
+CONDITIONS = [
+    (Corner.TYP, 1800 * m, 25),
+    (Corner.SLOW, 1620 * m, 75),
+    (Corner.FAST, 1980 * m, -25),
+]
+
+
+def toggles(
+    t: np.ndarray,
+    vin: np.ndarray,
+    vout: np.ndarray,
+    ratio: float,
+    swing: float,
+    frac: float = 0.7,
+    skip: float = 0.0,
+) -> bool:
+    """
+    Whether output `vout` toggles `ratio` times per toggle of input `vin`, e.g. 0.5 for a divide-by-two, at full swing.
+    Every complete output half-cycle must peak beyond `frac` of half of `swing`, its expected peak-to-peak swing.
+    Edge counts may differ by one, for edges at the window's boundaries. Ignores the first `skip` seconds, e.g. for startup.
+    """
+    keep = t >= t[0] + skip
+    t, vin, vout = t[keep], vin[keep], vout[keep]
+    nin = len(crossings(t, vin, rising=True))
+    nout = len(crossings(t, vout, rising=True))
+    if nin == 0 or abs(nout - ratio * nin) > 1:
+        return False
+
+    # Half-cycles: the spans between consecutive output crossings. The first and last are incomplete.
+    starts = np.flatnonzero((vout[1:] > 0) != (vout[:-1] > 0)) + 1
+    if len(starts) < 2:
+        return False
+    peaks = np.maximum.reduceat(np.abs(vout), starts)[:-1]
+    return bool(np.all(peaks >= frac * swing / 2))
+
+
+def fmax(
+    sim: Callable[[Hashable, float], hs.Sim],
+    works: Callable[[Hashable, float, hs.SimResult], bool],
+    keys: Sequence[Hashable],
+    lo: float = 0.1,
+    hi: float = 10.0,
+    rtol: float = 0.02,
+    width: int = 2,
+    corner: Union[str, Callable[[Hashable], str]] = "fmax",
+    store: ResultStore = result_store,
+    failures: Optional[Counter] = None,
+) -> Dict[Hashable, Bracket]:
+    """
+    Highest frequency at which `works(key, freq, result)`, for each of `keys`, between `lo` and `hi`, in the units of `sim(key, freq)`.
+    Each search's `Bracket.lo` is the highest frequency found to work, or assumed to, and `Bracket.hi` the lowest found to fail.
+    Frequencies are bisected geometrically, probing `width` per search per round, each round a single `sim_runner` batch.
+    Failed sims fail, and are counted per key in `failures`, if provided.
+    Sims are labeled by `corner`, or by `corner(key)` if it is callable.
+    """
+
+    def evaluate(points: List[Tuple[Hashable, float]]) -> List[bool]:
+        sims = [sim(key, freq) for (key, freq) in points]
+        label = corner if not callable(corner) else lambda idx: corner(points[idx][0])
+        jobs = sim_runner.run(sims, sim_options, store=store, corner=label)
+        if failures is not None:
+            failures.update(key for ((key, _), job) in zip(points, jobs) if not job.ok)
+        return [
+            job.ok and works(key, freq, job.result)
+            for ((key, freq), job) in zip(points, jobs)
+        ]
+
+    return bisect(evaluate, keys, lo=lo, hi=hi, rtol=rtol, width=width, log=True)
+
+
+def tran_input(tb: h.Module, pvt: Any, tstop: h.Prefixed) -> hs.Sim:
+    """Transient Sim `tr` of testbench `tb` through `tstop`, at the process corner `pvt.p` and temperature `pvt.t` (C)"""
+    sim = hs.Sim(tb=tb)
+    sim.tran(tstop=tstop, name="tr")
+    sim.literal(
+        f"""
+        simulator lang=spice
+        .temp {pvt.t}
+        simulator lang=spectre
+    """
+    )
+    sim.add(*s130.install.include(pvt.p))
+    return sim
+
+
+def fmax_map(
+    block: str,
+    conds: Sequence[Any],
+    cmls: Sequence[Any],
+    sim: Callable[[Any, Any, float], hs.Sim],
+    works: Callable[[Any, Any, float, hs.SimResult], bool],
+    lo: float = 0.1,
+    hi: float = 10.0,
+    store: ResultStore = result_store,
+) -> Dict[Tuple[int, int], Bracket]:
+    """
+    Maximum input frequency (GHz) of CML block `block` at each of `conds`, and each of CML parameters `cmls`, per `fmax`.
+    Each `(condition, cml)` pair, keyed by their indices, is simulated by `sim(cond, cml, ghz)` and judged by `works(cond, cml, ghz, result)`.
+    All are bisected concurrently. Records each to the result store, flagging those which work across the whole searched range,
+    and those never seen to work at all, whose `fmax` is None.
+    """
+    keys = [(c, k) for c in range(len(conds)) for k in range(len(cmls))]
+    seen = set()  # Keys with any frequency seen to work
+    failures = Counter()
+
+    def works_at(key: Tuple[int, int], ghz: float, result: hs.SimResult) -> bool:
+        ok = works(conds[key[0]], cmls[key[1]], ghz, result)
+        if ok:
+            seen.add(key)
+        return ok
+
+    brackets = fmax(
+        sim=lambda key, ghz: sim(conds[key[0]], cmls[key[1]], ghz),
+        works=works_at,
+        keys=keys,
+        lo=lo,
+        hi=hi,
+        corner=lambda key: str(conds[key[0]]),
+        store=store,
+        failures=failures,
+    )
+    for ((c, k), b) in brackets.items():
+        record = dict(
+            block=block,
+            corner=str(conds[c]),
+            rl=float(cmls[k].rl),
+            cl=float(cmls[k].cl),
+            ib=float(cmls[k].ib),
+            fmax=b.lo if (c, k) in seen else None,
+            above_range=b.passed_all,
+            below_range=(c, k) not in seen,
+            failed_sims=failures[(c, k)],
+            evaluations=b.evaluations,
+        )
+        print(record)
+        store.put(TABLE, record)
+    return brackets
@@ -0,0 +1,118 @@
+"""
+# Sweep Tracing
+
+Lightweight timing spans around the stages of our simulation sweeps,
+exported in the Chrome trace-event format, viewable in `chrome://tracing` or https://ui.perfetto.dev.
+
+Tracing is disabled by default, and costs roughly nothing while disabled.
+Enable it by setting the environment variable `USB2PHY_TRACE` to an output path,
+or by calling `tracer.enable(path)`. Traces are written at interpreter exit, or on `tracer.save()`.
+
+Example:
+
+```
+with tracer.span("simulate", job="IloFreqTb"):
+    ...
+```
+"""
+
+# Std-Lib Imports
+import os, json, time, atexit, threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Union
+
+
+class Tracer:
+    """
+    # Tracer
+    Thread-safe collector of Chrome trace events.
+    Spans are recorded per thread, so each sim-runner worker gets its own timeline row.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.path: Optional[Path] = None
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._named_threads = set()
+        self._t0 = time.perf_counter_ns()
+        self._atexit = False
+
+    def enable(self, path: Union[str, Path] = "scratch/trace.json") -> None:
+        """Enable tracing, writing to `path` at exit."""
+        self.enabled = True
+        self.path = Path(path)
+        if not self._atexit:
+            atexit.register(self.save)
+            self._atexit = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def now(self) -> float:
+        """Current time, in microseconds since tracer creation, as trace events require"""
+        return (time.perf_counter_ns() - self._t0) / 1e3
+
+    @contextmanager
+    def span(self, name: str, cat: str = "sim", **args: Any):
+        """Trace a "complete" span named `name` around the body of the `with` block."""
+        if not self.enabled:
+            yield
+            return
+        start = self.now()
+        try:
+            yield
+        finally:
+            self.complete(name, start, self.now() - start, cat, **args)
+
+    def complete(
+        self, name: str, start: float, dur: float, cat: str = "sim", **args: Any
+    ) -> None:
+        """Add a "complete" span event, with explicit `start` and `dur` in microseconds.
+        For spans which cannot be wrapped in a `with` block, e.g. time spent queued."""
+        if not self.enabled:
+            return
+        self._add(dict(name=name, cat=cat, ph="X", ts=start, dur=dur, args=args))
+
+    def _add(self, event: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        event.update(pid=os.getpid(), tid=thread.ident)
+        event["args"] = {k: _jsonable(v) for k, v in event["args"].items()}
+        with self._lock:
+            if thread.ident not in self._named_threads:
+                self._named_threads.add(thread.ident)
+                self.events.append(
+                    dict(
+                        name="thread_name",
+                        ph="M",
+                        pid=os.getpid(),
+                        tid=thread.ident,
+                        args=dict(name=thread.name),
+                    )
+                )
+            self.events.append(event)
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Optional[Path]:
+        """Write all events to `path`, or the path provided on `enable`."""
+        path = Path(path) if path is not None else self.path
+        if path is None or not self.events:
+            return None
+        with self._lock:
+            events = list(self.events)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w") as f:
+            json.dump(dict(traceEvents=events, displayTimeUnit="ms"), f)
+        return path
+
+
+def _jsonable(val: Any) -> Any:
+    if isinstance(val, (str, int, float, bool)) or val is None:
+        return val
+    return str(val)
+
+
+# The module-wide tracer
+tracer = Tracer()
+if os.environ.get("USB2PHY_TRACE", None):
+    tracer.enable(os.environ["USB2PHY_TRACE"])
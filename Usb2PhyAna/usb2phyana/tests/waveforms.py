@@ -0,0 +1,287 @@
+"""
+# Waveforms
+
+Lazily decoded, memory-mapped access to Spectre's `nutbin` waveform files (`netlist.raw`).
+
+`vlsirtools` parses each result file in full, into a dictionary of arrays per analysis.
+For long transients this costs seconds and gigabytes just to read a node or two.
+Here each analysis ("plot") is instead memory-mapped, and signals are decoded one at a time, optionally over a time window.
+Only the pages holding the requested data are ever read.
+
+Example:
+
+```
+raw = RawFile("scratch/IloInjectionTb.raw")
+tr = raw["tr"]
+t, v = tr.diff("xtop.stg0_p", "xtop.stg0_n", start=5e-6, stop=5.1e-6)
+t, v = lttb(t, v, 2000)  # Down-sample for plotting
+```
+"""
+
+# Std-Lib Imports
+import re
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+# PyPi Imports
+import numpy as np
+
+
+@dataclass
+class Plot:
+    """
+    # Plot
+    A single analysis within a `nutbin` file, e.g. a transient or AC analysis.
+    Data is stored point-major: each point holds one value per variable.
+    The first variable is the independent axis, e.g. `time` or `freq`.
+    """
+
+    path: Path  # Path of the containing file
+    name: str  # Analysis name, e.g. "tr"
+    plotname: str  # Full "Plotname" header
+    complex: bool  # Whether the data is complex-valued
+    vars: List[str]  # Variable names, in file order
+    units: List[str]  # Variable units, in file order
+    npts: int  # Number of points
+    offset: int  # Byte-offset of the binary data in `path`
+    _data: Optional[np.memmap] = field(default=None, repr=False)
+
+    @property
+    def dtype(self) -> np.dtype:
+        # Data is big-endian
+        return np.dtype(">c16" if self.complex else ">f8")
+
+    @property
+    def nbytes(self) -> int:
+        return self.npts * len(self.vars) * self.dtype.itemsize
+
+    @property
+    def data(self) -> np.memmap:
+        """The memory-mapped data, shaped (npts, nvars). Mapped on first access."""
+        if self._data is None:
+            self._data = np.memmap(
+                self.path,
+                dtype=self.dtype,
+                mode="r",
+                offset=self.offset,
+                shape=(self.npts, len(self.vars)),
+            )
+        return self._data
+
+    def index(self, name: str) -> int:
+        """Column index of variable `name`"""
+        try:
+            return self.vars.index(name)
+        except ValueError:
+            raise KeyError(f"No variable {name} in analysis {self.name}")
+
+    @property
+    def x(self) -> np.ndarray:
+        """The independent axis, e.g. `time`, as a (non-copied) memory-mapped view"""
+        x = self.data[:, 0]
+        return x.real if self.complex else x
+
+    def window(
+        self, start: Optional[float] = None, stop: Optional[float] = None
+    ) -> slice:
+        """Point-index slice covering independent-axis values `[start, stop]`.
+        Found by binary search over the independent axis, touching only a handful of its pages."""
+        x = self.x
+        lo = 0 if start is None else int(np.searchsorted(x, start, side="left"))
+        hi = self.npts if stop is None else int(np.searchsorted(x, stop, side="right"))
+        return slice(lo, hi)
+
+    def signal(
+        self,
+        name: str,
+        start: Optional[float] = None,
+        stop: Optional[float] = None,
+        dtype: Optional[np.dtype] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Decode signal `name` over independent-axis range `[start, stop]`.
+        Returns a tuple of native-endian copies `(x, y)`, with `y` optionally converted to `dtype`, e.g. `np.float32`.
+        The independent axis `x` stays float64, as e.g. picosecond edges of a microsecond transient need its precision.
+        """
+        idx = self.index(name)
+        win = self.window(start, stop)
+        x = np.array(self.x[win], dtype=np.float64)
+        y = self.data[win, idx]
+        if dtype is None:
+            dtype = y.dtype.newbyteorder("=")
+        return x, np.array(y, dtype=dtype)
+
+    def diff(
+        self,
+        p: str,
+        n: str,
+        start: Optional[float] = None,
+        stop: Optional[float] = None,
+        dtype: Optional[np.dtype] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode the differential signal `p - n`"""
+        x, vp = self.signal(p, start, stop, dtype)
+        _, vn = self.signal(n, start, stop, dtype)
+        return x, vp - vn
+
+    def to_dict(self) -> Dict[str, np.ndarray]:
+        """Decode all signals, in the same form as `vlsirtools`: a dictionary of arrays per variable."""
+        data = np.array(self.data, dtype=self.dtype.newbyteorder("="))
+        return {name: data[:, i] for (i, name) in enumerate(self.vars)}
+
+
+class RawFile:
+    """
+    # Raw File
+    A Spectre `nutbin` results file, with a `Plot` per analysis.
+    Opening one reads only its text headers.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.plots: Dict[str, Plot] = dict()
+        self._read_headers()
+
+    def __getitem__(self, name: str) -> Plot:
+        return self.plots[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.plots
+
+    def _read_headers(self) -> None:
+        filesize = self.path.stat().st_size
+        with self.path.open("rb") as f:
+            f.readline()  # Title, ignored
+            f.readline()  # Run date, ignored
+            while True:
+                plotname = f.readline().decode("ascii")
+                if not plotname:
+                    break
+                plot = _read_plot_header(f, self.path, plotname)
+
+                # Spectre can stop short of the number of points declared in its header,
+                # e.g. when `autostop`-ed. Use whatever is really in the file.
+                rowbytes = len(plot.vars) * plot.dtype.itemsize
+                plot.npts = min(plot.npts, (filesize - plot.offset) // rowbytes)
+                self.plots[plot.name] = plot
+                f.seek(plot.offset + plot.nbytes)
+
+
+def _read_plot_header(f, path: Path, plotname: str) -> Plot:
+    """Read the text header of a single plot from open file `f`, leaving it positioned at the plot's binary data."""
+
+    def header(prefix: str) -> str:
+        line = f.readline().decode("ascii")
+        if not line.startswith(prefix):
+            raise ValueError(f"Invalid nutbin header line {line!r}, expected {prefix}")
+        return line[len(prefix) :].strip()
+
+    flags = header("Flags:")
+    num_vars = int(header("No. Variables:"))
+    num_pts = int(header("No. Points:"))
+
+    vars, units = [], []
+    line = header("Variables:")
+    for i in range(num_vars):
+        if i > 0:
+            line = f.readline().decode("ascii")
+        m = re.match(r"\s*(\d+)\s+(\S+)\s+(\S+)", line)
+        if m is None:
+            raise ValueError(f"Invalid nutbin variable line {line!r}")
+        vars.append(m.group(2))
+        units.append(m.group(3))
+
+    binary = f.readline().decode("ascii")
+    if binary != "Binary:\n":
+        raise ValueError(f"Invalid nutbin header line {binary!r}, expected Binary:")
+
+    return Plot(
+        path=path,
+        name=plotname.split("`")[-1].split("'")[0],
+        plotname=plotname.strip(),
+        complex=flags.lower() == "complex",
+        vars=vars,
+        units=units,
+        npts=num_pts,
+        offset=f.tell(),
+    )
+
+
+def minmax(x: np.ndarray, y: np.ndarray, nbins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Min-max down-sampling: the minimum and maximum point of each of `nbins` equal-count bins, in order.
+    Preserves the envelope of the signal, including narrow glitches, in `2 * nbins` points.
+    """
+    n = len(y)
+    if n <= 2 * nbins:
+        return x, y
+    size = n // nbins
+    rows = y[: size * nbins].reshape(nbins, size)
+    base = np.arange(nbins) * size
+    lo = base + np.argmin(rows, axis=1)
+    hi = base + np.argmax(rows, axis=1)
+    idx = np.unique(np.concatenate([[0], lo, hi, [n - 1]]))
+    return x[idx], y[idx]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets down-sampling to `n` points.
+    Keeps the first and last points, and from each bucket between, the point forming the largest triangle
+    with the prior selected point and the next bucket's average. Preserves the visual shape of the signal.
+    """
+    npts = len(y)
+    if n >= npts or n < 3:
+        return x, y
+
+    # Bucket edges for the `n - 2` interior buckets
+    edges = np.linspace(1, npts - 1, n - 1).astype(int)
+    idx = np.empty(n, dtype=int)
+    idx[0], idx[-1] = 0, npts - 1
+
+    prev = 0
+    for b in range(n - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Average of the next bucket, or the last point for the final bucket
+        if b < n - 3:
+            nlo, nhi = edges[b + 1], edges[b + 2]
+            avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        # Twice the triangle areas, for each candidate in this bucket
+        px, py = x[prev], y[prev]
+        areas = np.abs((px - avg_x) * (y[lo:hi] - py) - (px - x[lo:hi]) * (avg_y - py))
+        prev = lo + int(np.argmax(areas))
+        idx[b + 1] = prev
+
+    return x[idx], y[idx]
+
+
+class WaveformCache:
+    """
+    # Waveform Cache
+    Float32 copies of individual signals, one `.npy` file each, re-loaded memory-mapped. The independent axis is kept float64.
+    For repeatedly post-processing a few signals of a large raw file, e.g. across plotting iterations.
+    """
+
+    def __init__(self, root: Union[str, Path] = "scratch/waveforms") -> None:
+        self.root = Path(root)
+
+    def path(self, raw: RawFile, analysis: str, name: str, suffix: str = "f32") -> Path:
+        safe = re.sub(r"[^\w.\-]", "_", name)
+        return self.root / raw.path.stem / analysis / f"{safe}.{suffix}.npy"
+
+    def signal(
+        self, raw: RawFile, analysis: str, name: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get signal `name` from `analysis` of `raw`, from the cache if present, and adding it if not."""
+        ypath = self.path(raw, analysis, name)
+        xpath = self.path(raw, analysis, raw[analysis].vars[0], suffix="f64")
+        stale = not ypath.exists() or ypath.stat().st_mtime < raw.path.stat().st_mtime
+        if stale:
+            x, y = raw[analysis].signal(name, dtype=np.float32)
+            ypath.parent.mkdir(parents=True, exist_ok=True)
+            np.save(xpath, x)
+            np.save(ypath, y)
+        return np.load(xpath, mmap_mode="r"), np.load(ypath, mmap_mode="r")
@@ -3,7 +3,6 @@ from dataclasses import dataclass, replace
 
 # PyPi Imports
 import numpy as np
-import matplotlib.pyplot as plt
 
 # HDL Imports
 import hdl21 as h
@@ -14,13 +13,17 @@ from hdl21.prefix import m, µ, UNIT
 from hdl21.primitives import MosType, Vdc, Nmos, Pmos
 
 # PDK Imports
-import s130
-import sitepdks as _
+from ...pdk import s130
 
 # Local Imports
 from ...tests.sim_options import sim_options
 from ...tests.sim_test_mode import SimTestMode
-from ..mos import Nmos, Pmos
+from ...tests import gmid
+from ...pvt import TEMPERATURES
+from ..mos import Nmos, Pmos, NMOS_PARAMS, PMOS_PARAMS, LAYOUT_NSERS
+
+# Gate-voltage step of I-V sweeps
+VGS_STEP = 10 * m
 
 
 def test_tetris1():
@@ -95,7 +98,7 @@ def iv(dut: MosDut) -> hs.SimResult:
         vgs = hs.Param(val=1800 * m)
         vds = hs.Param(val=1800 * m)
         polarity = hs.Param(val=1 if dut.tp == MosType.NMOS else -1)
-        dc = hs.Dc(var=vgs, sweep=LinearSweep(start=0, stop=2500 * m, step=10 * m))
+        dc = hs.Dc(var=vgs, sweep=LinearSweep(start=0, stop=2500 * m, step=VGS_STEP))
 
     MosIvSim.add(*s130.install.include(Corner.TYP))
     return MosIvSim.run(sim_options)
@@ -103,8 +106,10 @@ def iv(dut: MosDut) -> hs.SimResult:
 
 def postprocess(dut: MosDut, result: hs.SimResult) -> None:
     """Post-process and plot results from an `iv()` run on `dut`."""
+    import matplotlib.pyplot as plt
+
     result = result.an[0]  # Get the DC sweep
-    step = float(10 * m)  # FIXME: get this from the sweep above
+    step = float(VGS_STEP)
 
     id = np.abs(result.data["xtop.vd:p"])
     gm = np.diff(id) / step
@@ -123,3 +128,59 @@ def postprocess(dut: MosDut, result: hs.SimResult) -> None:
     ax.grid()
     fig.savefig(f"scratch/gm_over_id.{dut.mos.name}.png")
     # np.save("scratch/gm_over_id.npy", gm_over_id)
+
+
+def lut_devices() -> list:
+    """Unit (`npar=1`) Tetris devices, for gm/Id tables. Their length axis is `nser`."""
+
+    def make(gen):
+        def at(nser: float) -> h.Instantiable:
+            mos = gen(nser=int(nser), npar=1)
+            h.pdk.compile(mos)
+            return mos
+
+        return at
+
+    body = ("VSS", "VDD")
+    return [
+        gmid.Device(
+            "tetris_nmos",
+            MosType.NMOS,
+            make(Nmos),
+            lengths=LAYOUT_NSERS,
+            width=float(NMOS_PARAMS.w) * 1e6,
+            body=body,
+        ),
+        gmid.Device(
+            "tetris_pmos",
+            MosType.PMOS,
+            make(Pmos),
+            lengths=LAYOUT_NSERS,
+            width=float(PMOS_PARAMS.w) * 1e6,
+            body=body,
+        ),
+    ]
+
+
+def test_gmid_luts(simtestmode: SimTestMode, tmp_path):
+    """
+    Build gm/Id lookup tables for Tetris devices, at one corner and temperature (or all, for MAX).
+    MIN mode builds a single-point table, to check the flow, in `tmp_path`, leaving the real tables intact.
+    """
+    if simtestmode == SimTestMode.NETLIST:
+        return  # Nothing to do here
+    devices = lut_devices()
+    if simtestmode == SimTestMode.MIN:
+        gmid.build(
+            devices[:1],
+            [Corner.TYP],
+            s130.install.include,
+            vds=(0.9,),
+            vsb=(0.0,),
+            path=tmp_path,
+        )
+    elif simtestmode == SimTestMode.TYP:
+        gmid.build(devices, [Corner.TYP], s130.install.include)
+    else:
+        corners = [Corner.SLOW, Corner.TYP, Corner.FAST]
+        gmid.build(devices, corners, s130.install.include, temperatures=TEMPERATURES)
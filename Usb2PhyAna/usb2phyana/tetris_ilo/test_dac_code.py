@@ -1,10 +1,10 @@
+import pickle
 from typing import List, Optional
 from dataclasses import asdict, replace
 from copy import copy
 
 from pydantic.dataclasses import dataclass
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Hdl Imports
 import hdl21 as h
@@ -13,14 +13,19 @@ from hdl21.pdk import Corner
 from hdl21.prefix import µ, m, n, PICO
 
 # PDK Imports
-import s130
-import sitepdks as _
+from ..pdk import s130
 
 # Local Imports
 from ..tests.sim_options import sim_options
 from ..tests.sim_test_mode import SimTest
+from ..tests import sim_runner
+from ..tests.result_store import result_store
+from ..tests import telemetry
+from ..tests.tracing import tracer
+from ..tests.sim_runner import JobResult, SimStatus
 from ..tests.supplyvals import SupplyVals
 from ..tests.vcode import Vcode
+from ..tests.linearity import frequency_linearity
 from ..pvt import Pvt, Project
 from .tetris_ilo import Ilo, IloParams, OctalClock
 
@@ -121,8 +126,9 @@ def IloFreqTb(params: TbParams) -> h.Module:
 def sim_input(params: TbParams) -> hs.Sim:
     """Ilo Frequency Sim"""
 
-    tb_ = IloFreqTb(params)
-    s130.compile(tb_)
+    with tracer.span("sim_input", tb="IloFreqTb", code=params.code):
+        tb_ = IloFreqTb(params)
+        s130.compile(tb_)
 
     # Create some simulation stimulus
     @hs.sim
@@ -179,20 +185,29 @@ def tperiod(results: hs.SimResult) -> float:
 class SingleSimSummary:
     freq: float
     idd: float
+    status: SimStatus = SimStatus.OK
 
     @classmethod
     def build(cls, sim_result: hs.SimResult) -> "SingleSimSummary":
+        # Note `tperiod` is NaN when the ring fails to oscillate,
+        # or goes slower than we care to simulate. This is common at low Vdd.
+        # Such points are kept as NaN, and masked out by `valid`.
         freq = 1 / tperiod(sim_result)
         idd_ = abs(1e6 * idd(sim_result))
-
-        # Numpy interpolation requires the x-axis array be NaN-free
-        # This often happens at low Vdd, when the ring fails to oscillate,
-        # or goes slower than we care to simulate.
-        # Replace any such NaN values with zero.
-        # If there are any later in the array, this interpolation will fail.
-        freq = np.nan_to_num(freq, copy=True, nan=0)
         return SingleSimSummary(freq, idd=idd_)
 
+    @classmethod
+    def from_job(cls, job: JobResult) -> "SingleSimSummary":
+        if not job.ok:
+            return SingleSimSummary(freq=np.nan, idd=np.nan, status=job.status)
+        summary = cls.build(job.result)
+        summary.status = job.status
+        return summary
+
+    @property
+    def valid(self) -> bool:
+        return self.status != SimStatus.FAILED and bool(np.isfinite(self.freq))
+
 
 @dataclass
 class ConditionResult:
@@ -222,12 +237,13 @@ def run_corners() -> Result:
         for v in [Corner.TYP, Corner.FAST, Corner.SLOW]
         for t in [25, 75, -25]
     ]
-    result = Result(conditions=conditions, codes=codes, results=[])
+    result = Result(conditions=conditions, codes=codes, cond_results=[])
 
     # Run conditions one at a time, parallelizing across codes
     for pvt in conditions:
         print(f"Simulating {pvt}")
-        cond_results = codesweep(pvt)
+        with tracer.span("condition", pvt=str(pvt)):
+            cond_results = codesweep(pvt)
         result.cond_results.append(cond_results)
 
     pickle.dump(asdict(result), open(result_pickle_file, "wb"))
@@ -241,24 +257,27 @@ def codesweep(pvt: Pvt) -> ConditionResult:
     params = [TbParams(pvt=pvt, code=code) for code in codes]
     sims = [sim_input(params=p) for p in params]
 
-    # Run sims
-    opts = replace(sim_options, rundir=None)
-    sim_results = h.sim.run(sims, opts)
-    return ConditionResult(
-        cond=pvt,
-        codes=codes,
-        summaries=[SingleSimSummary.build(s) for s in sim_results],
-    )
+    # Run sims, recording their telemetry.
+    # Failed jobs are reported, and summarized with NaN results.
+    jobs = sim_runner.run(sims, sim_options, store=result_store, corner=str(pvt))
+    for (code, job) in zip(codes, jobs):
+        if not job.ok:
+            print(f"Code {code} at {pvt} failed: {job.failure.value}")
+    with tracer.span("postprocess", pvt=str(pvt)):
+        return ConditionResult(
+            cond=pvt,
+            codes=codes,
+            summaries=[SingleSimSummary.from_job(j) for j in jobs],
+        )
 
 
 def plot(result: Result, title: str, fname: str):
     """Plot a `Result` and save to file `fname`"""
+    import matplotlib.pyplot as plt
 
     fig, ax = plt.subplots()
-    codes = np.array(result.codes)
-
-    for (cond, cond_results) in zip(result.conditions, result.cond_results):
-        plot_cond(ax, codes, cond, cond_results)
+    for cond_results in result.cond_results:
+        plot_cond(ax, cond_results)
 
     # Set up all the other data on our plot
     ax.grid()
@@ -276,9 +295,10 @@ def plot_cond(ax, cond_results: ConditionResult):
     cond = cond_results.cond
     codes = cond_results.codes
     freqs = np.array([r.freq for r in cond_results.summaries])
+    valid = np.array([r.valid for r in cond_results.summaries])
 
-    # And plot the results
-    ax.plot(codes, freqs / 1e6, label=str(cond))
+    # And plot the results. Failed and non-oscillating points are left as gaps.
+    ax.plot(codes, np.where(valid, freqs, np.nan) / 1e6, label=str(cond))
 
 
 def idd(results: hs.SimResult) -> float:
@@ -303,6 +323,8 @@ class TestIloDacCode(SimTest):
 
     def typ(self):
         """Sweep DAC codes at typical PVT conditions"""
+        import matplotlib.pyplot as plt
+
         results = codesweep(pvt=Pvt())
         fig, ax = plt.subplots()
         plot_cond(ax, results)
@@ -312,10 +334,16 @@ class TestIloDacCode(SimTest):
         """Sweep DAC codes across PVT conditions"""
 
         # Run corner simulations to get results
-        result = run_corners(IloFreqTb)
+        result = run_corners()
 
         # Or just read them back from file, if we have one
         # result = Result(**pickle.load(open(result_pickle_file, "rb")))
 
         # And make some pretty pictures
         plot(result, "Cmos Ilo - Dac vs Freq", "scratch/CmosIloDacFreq.png")
+
+        # Summarize linearity, flagging the failing conditions
+        print(frequency_linearity(result).report(scale=1e-6))
+
+        # Summarize simulator runtime, per corner
+        telemetry.report(tb="IloFreqTb")
@@ -0,0 +1,99 @@
+"""
+# Tetris ILO Jitter
+
+Transient-noise jitter and phase noise of the free-running Tetris ILO, across many random seeds in parallel.
+See `tests/tnoise.py`.
+"""
+
+# Std-Lib Imports
+from typing import List, Optional
+
+# PyPi Imports
+import numpy as np
+
+# Hdl Imports
+import hdl21.sim as hs
+from hdl21.pdk import Corner
+from hdl21.prefix import n
+
+# PDK Imports
+from ..pdk import s130
+
+# Local Imports
+from ..tests.sim_test_mode import SimTest
+from ..tests.waveforms import Plot
+from ..tests.eye import crossings
+from ..tests.jitter import JitterResult
+from ..tests.tnoise import noise_tran, run_seeds, report
+from ..pvt import Pvt, Project
+from .test_dac_code import IloFreqTb, TbParams
+
+# Transient length, and the initial start-up time excluded from measurement
+TSTOP = 3000 * n
+SETTLE = 500 * n
+
+
+def noise_sim(params: TbParams, seed: int) -> hs.Sim:
+    """Transient-noise simulation of `IloFreqTb`, with random seed `seed`"""
+
+    tb_ = IloFreqTb(params)
+    s130.compile(tb_)
+
+    @hs.sim
+    class IloNoiseSim:
+        tb = tb_
+        tr = noise_tran(tstop=TSTOP, seed=seed)
+        l = hs.Literal(
+            f"""
+            simulator lang=spice
+            .temp {Project.temper(params.pvt.t)}
+            simulator lang=spectre
+        """
+        )
+        i = hs.Include(s130.resources / "stdcells.sp")
+
+    IloNoiseSim.add(*s130.install.include(params.pvt.p))
+    return IloNoiseSim
+
+
+def edges(tr: Plot) -> np.ndarray:
+    """Rising-edge times of the ring's first stage, after `SETTLE`"""
+    t, v = tr.diff(
+        "xtop.wrapper.cko_stg0_p", "xtop.wrapper.cko_stg0_n", start=float(SETTLE)
+    )
+    return crossings(t, v, rising=True)
+
+
+def ilo_jitter(
+    pvt: Pvt = Pvt(), code: int = 16, nseeds: int = 16
+) -> List[Optional[JitterResult]]:
+    """Free-running jitter of the Tetris ILO at `pvt` and DAC `code`, across `nseeds` seeds"""
+    params = TbParams(pvt=pvt, code=code)
+    results = run_seeds(
+        sim=lambda seed: noise_sim(params, seed),
+        edges=edges,
+        seeds=range(nseeds),
+        tb="TetrisIloFreqTb",
+        corner=str(pvt),
+        mode="free",
+        code=code,
+    )
+    report(tb="TetrisIloFreqTb", corner=str(pvt), mode="free", code=code)
+    return results
+
+
+class TestIloJitter(SimTest):
+    """Tetris Ilo Transient-Noise Jitter Test(s)"""
+
+    tbgen = IloFreqTb
+
+    def min(self):
+        return self.netlist()
+
+    def typ(self):
+        ilo_jitter(Pvt(), nseeds=8)
+
+    def max(self):
+        for p in [Corner.TYP, Corner.FAST, Corner.SLOW]:
+            for v in [Corner.TYP, Corner.FAST, Corner.SLOW]:
+                ilo_jitter(Pvt(p, v, Corner.TYP), nseeds=32)
@@ -12,7 +12,7 @@ from hdl21 import Pair, Diff, inverse
 
 # Local Imports
 from ..tetris.mos import Nmos
-from ..logiccells import Inv
+from .. import logiccells
 from ..idac.tetris_pmos_idac import PmosIdac
 from ..supplies import PhySupplies
 
@@ -55,9 +55,9 @@ def IloStage(params: IloParams) -> h.Module:
 
         # Internal Implementation
         ## Forward Inverters
-        fwd = Pair(Inv(x=16))(i=inp, z=out, VDD=VDD, VSS=VSS)
+        fwd = Pair(logiccells.Inv(x=16))(i=inp, z=out, VDD=VDD, VSS=VSS)
         ## Cross-Coupled Output Inverters
-        cross = Pair(Inv(x=4))(i=out, z=inverse(out), VDD=VDD, VSS=VSS)
+        cross = Pair(logiccells.Inv(x=4))(i=out, z=inverse(out), VDD=VDD, VSS=VSS)
         ## Load Caps
         cl = Pair(C(c=params.cl))(p=out, n=VSS)
 
@@ -134,7 +134,9 @@ def IloDiffLevelShift(params: IloParams) -> h.Module:
         acpair = Pair(IloAcLevelShift(params))(
             inp=inp, out=mid, VDD18=SUPPLIES.VDD18, VSS=SUPPLIES.VSS
         )
-        outstg = Pair(Inv(x=8))(i=mid, z=out, VDD=SUPPLIES.VDD18, VSS=SUPPLIES.VSS)
+        outstg = Pair(logiccells.Inv(x=8))(
+            i=mid, z=out, VDD=SUPPLIES.VDD18, VSS=SUPPLIES.VSS
+        )
         # outstg = IloStage(params)(
         #     inp=mid, out=out, VDD=SUPPLIES.VDD18, VSS=SUPPLIES.VSS
         # )
@@ -156,7 +158,7 @@ def IloAcLevelShift(params: IloParams) -> h.Module:
         ## Implementation
         g = h.Signal()
         cac = h.Cap(c=1 * PICO)(p=inp, n=g)
-        inv = Inv(x=16)(i=g, z=out, VDD=VDD18, VSS=VSS)
+        inv = logiccells.Inv(x=16)(i=g, z=out, VDD=VDD18, VSS=VSS)
         rfb = h.Res(r=100 * K)(p=out, n=g)
 
     return IloAcLevelShift